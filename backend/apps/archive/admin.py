@@ -0,0 +1,17 @@
+from django.contrib import admin
+from apps.stores.scoping import StoreScopedAdminMixin
+from .models import ArchivedEmployee
+
+
+@admin.register(ArchivedEmployee)
+class ArchivedEmployeeAdmin(StoreScopedAdminMixin, admin.ModelAdmin):
+    """Read-only list of archived employees (rows move back when they are reactivated)."""
+
+    store_field = 'employee__store'
+    list_display = ['employee', 'deactivated_at', 'archived_at']
+    date_hierarchy = 'archived_at'
+    raw_id_fields = ['employee']
+    readonly_fields = ['employee', 'deactivated_at', 'archived_at']
+
+    def has_add_permission(self, request):
+        return False
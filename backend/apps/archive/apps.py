@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class ArchiveConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.archive'
+    verbose_name = 'Archive'
+
+    def ready(self):
+        from . import signals  # noqa: F401
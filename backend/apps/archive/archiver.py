@@ -0,0 +1,248 @@
+"""
+Move deactivated employees' availability and skill links to the archive tables.
+
+``archive()`` picks employees that have been inactive, and untouched, for
+longer than ``older_than``, ``ARCHIVE_BATCH_SIZE`` at a time. Each batch is
+its own short transaction:
+
+- copy the employees' ``Availability``, ``AvailabilityException`` and skill
+  link rows to the archive tables
+- delete them from the hot tables with one plain ``DELETE`` per table, so
+  no delete signals fire and nothing is audited or tombstoned
+- clear the employees' skill masks and mark them ``ArchivedEmployee``
+
+It then sleeps ``ARCHIVE_PAUSE`` seconds, so the copy never holds locks for
+long or keeps the database busy. Reactivating an employee brings the rows
+back (``restore()``, called from ``apps.archive.signals``).
+
+On PostgreSQL the archive tables are partitioned by range on
+``deactivated_year``; ``ensure_partitions()`` creates a year's partition
+before its first rows are copied.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models.constants import OnConflict
+from django.utils import timezone
+
+from apps.employees import skillmask
+from apps.employees.models import Availability, AvailabilityException, Employee, Skill
+
+from .models import ArchivedAvailability, ArchivedAvailabilityException, ArchivedEmployee, ArchivedSkillLink
+
+BATCH_SIZE = 200
+PAUSE = 0.5  # seconds
+INSERT_BATCH = 1000
+SkillLink = Employee.skills.through
+
+# (hot model, archive model, columns copied)
+TABLES = [
+    (
+        Availability,
+        ArchivedAvailability,
+        [
+            'id',
+            'employee_id',
+            'day_of_week',
+            'start_time',
+            'end_time',
+            'is_available',
+            'created_at',
+            'updated_at',
+        ],
+    ),
+    (
+        AvailabilityException,
+        ArchivedAvailabilityException,
+        [
+            'id',
+            'employee_id',
+            'start_date',
+            'end_date',
+            'start_time',
+            'end_time',
+            'is_available',
+            'reason',
+            'created_at',
+            'updated_at',
+        ],
+    ),
+    (SkillLink, ArchivedSkillLink, ['id', 'employee_id', 'skill_id']),
+]
+
+
+def ensure_partitions(years):
+    """Create the archive tables' partitions for ``years`` (PostgreSQL only)."""
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        for _, archive_model, _ in TABLES:
+            table = archive_model._meta.db_table
+            for year in sorted(set(years)):
+                cursor.execute(
+                    f'CREATE TABLE IF NOT EXISTS {connection.ops.quote_name(f"{table}_{year}")} '
+                    f'PARTITION OF {connection.ops.quote_name(table)} FOR VALUES FROM ({year}) TO ({year + 1})'
+                )
+
+
+def _delete_rows(model, employee_ids):
+    ops = connection.ops
+    placeholders = ', '.join(['%s'] * len(employee_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {ops.quote_name(model._meta.db_table)} WHERE {ops.quote_name("employee_id")} '
+            f'IN ({placeholders})',
+            list(employee_ids),
+        )
+
+
+def _restore_rows(model, archive_model, columns, employee_ids, now):
+    """
+    Copy archived rows back with one ``INSERT ... SELECT``, keeping their
+    ``created_at`` but setting ``updated_at`` to ``now`` so sync clients pick
+    them up. Rows created after reactivation win over archived ones for the
+    same slot, and skill links whose skill has since been deleted are dropped.
+    """
+    ops = connection.ops
+    placeholders = ', '.join(['%s'] * len(employee_ids))
+    values = ['%s' if column == 'updated_at' else ops.quote_name(column) for column in columns]
+    params = [ops.adapt_datetimefield_value(now)] if 'updated_at' in columns else []
+    where = f'{ops.quote_name("employee_id")} IN ({placeholders})'
+    if model is SkillLink:
+        where += (
+            f' AND {ops.quote_name("skill_id")} IN '
+            f'(SELECT {ops.quote_name("id")} FROM {ops.quote_name(Skill._meta.db_table)})'
+        )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'{ops.insert_statement(on_conflict=OnConflict.IGNORE)} {ops.quote_name(model._meta.db_table)} '
+            f'({", ".join(ops.quote_name(column) for column in columns)}) '
+            f'SELECT {", ".join(values)} FROM {ops.quote_name(archive_model._meta.db_table)} WHERE {where} '
+            f'{ops.on_conflict_suffix_sql(None, OnConflict.IGNORE, None, None)}',
+            params + list(employee_ids),
+        )
+
+
+def candidates(older_than):
+    """Inactive, not yet archived employees last changed more than ``older_than`` ago."""
+    cutoff = timezone.now() - older_than
+    return Employee.objects.filter(is_active=False, updated_at__lt=cutoff, archive__isnull=True)
+
+
+def archive_batch(employee_ids):
+    """Archive one batch of employees; returns ``{table: rows moved}``."""
+    moved = {}
+    with transaction.atomic():
+        # Re-check under a lock so an employee reactivated meanwhile is skipped.
+        locked = Employee.objects.select_for_update(of=('self',)).filter(
+            pk__in=employee_ids, is_active=False, archive__isnull=True
+        )
+        employees = dict(locked.values_list('pk', 'updated_at'))
+        if not employees:
+            return moved
+        years = {pk: updated_at.year for pk, updated_at in employees.items()}
+        ensure_partitions(years.values())
+        for model, archive_model, columns in TABLES:
+            rows = model.objects.filter(employee_id__in=employees).values_list(*columns)
+            copied = archive_model.objects.bulk_create(
+                (
+                    archive_model(deactivated_year=years[row[1]], **dict(zip(columns, row)))
+                    for row in rows.iterator(chunk_size=INSERT_BATCH)
+                ),
+                batch_size=INSERT_BATCH,
+            )
+            _delete_rows(model, employees)
+            moved[model._meta.model_name] = len(copied)
+        Employee.objects.filter(pk__in=employees).update(**skillmask.clear_values())
+        ArchivedEmployee.objects.bulk_create(
+            ArchivedEmployee(employee_id=pk, deactivated_at=updated_at) for pk, updated_at in employees.items()
+        )
+    moved['employees'] = len(employees)
+    return moved
+
+
+def archive(older_than, batch_size=None, pause=None, limit=None, dry_run=False):
+    """
+    Archive employees inactive for longer than ``older_than`` (a ``timedelta``).
+
+    Stops after ``limit`` employees if given. Returns the totals per table;
+    with ``dry_run`` only counts the employees that would be archived.
+    """
+    batch_size = batch_size or getattr(settings, 'ARCHIVE_BATCH_SIZE', BATCH_SIZE)
+    pause = getattr(settings, 'ARCHIVE_PAUSE', PAUSE) if pause is None else pause
+    pending = candidates(older_than).order_by('pk').values_list('pk', flat=True)
+    if dry_run:
+        return {'employees': min(pending.count(), limit) if limit else pending.count()}
+
+    totals = {'employees': 0}
+    last = 0
+    while limit is None or totals['employees'] < limit:
+        size = batch_size if limit is None else min(batch_size, limit - totals['employees'])
+        ids = list(pending.filter(pk__gt=last)[:size])
+        if not ids:
+            break
+        last = ids[-1]
+        for table, count in archive_batch(ids).items():
+            totals[table] = totals.get(table, 0) + count
+        if pause:
+            time.sleep(pause)
+    return totals
+
+
+def restore(employee_ids):
+    """Move archived employees' rows back to the hot tables; returns how many employees were restored."""
+    with transaction.atomic():
+        employee_ids = list(
+            ArchivedEmployee.objects.select_for_update().filter(pk__in=employee_ids).values_list('pk', flat=True)
+        )
+        if not employee_ids:
+            return 0
+        now = timezone.now()
+        for model, archive_model, columns in TABLES:
+            _restore_rows(model, archive_model, columns, employee_ids, now)
+            archive_model.objects.filter(employee_id__in=employee_ids).delete()
+        links = {}
+        for employee_id, skill_id in SkillLink.objects.filter(employee_id__in=employee_ids).values_list(
+            'employee_id', 'skill_id'
+        ):
+            links.setdefault(employee_id, []).append(skill_id)
+        for employee_id in employee_ids:
+            Employee.objects.filter(pk=employee_id).update(**skillmask.compute_masks(links.get(employee_id, [])))
+        ArchivedEmployee.objects.filter(pk__in=employee_ids).delete()
+    return len(employee_ids)
+
+
+def archived_rows(employee):
+    """
+    ``(availability, availability exceptions, skill ids)`` of an archived employee, else ``None``.
+
+    Rows come back as unsaved hot-model instances, so the hot models'
+    serializers render them unchanged.
+    """
+    if not ArchivedEmployee.objects.filter(pk=employee.pk).exists():
+        return None
+    found = []
+    for model, archive_model, columns in TABLES:
+        rows = archive_model.objects.filter(employee_id=employee.pk).values_list(*columns)
+        if model is SkillLink:
+            found.append([row[2] for row in rows])
+        else:
+            found.append([model(**dict(zip(columns, row))) for row in rows])
+    return tuple(found)
+
+
+def older_than(value):
+    """Parse ``'90d'``, ``'26w'``, ``'2y'`` (or plain days) into a ``timedelta``."""
+    units = {'d': 1, 'w': 7, 'y': 365}
+    value = str(value).strip().lower()
+    unit = value[-1] if value[-1:] in units else 'd'
+    number = value[:-1] if value[-1:] in units else value
+    try:
+        days = int(number) * units[unit]
+    except ValueError:
+        raise ValueError(f'Invalid age {value!r}; use e.g. 90d, 26w or 2y.')
+    if days <= 0:
+        raise ValueError('The age must be positive.')
+    return timedelta(days=days)
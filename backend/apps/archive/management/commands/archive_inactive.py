@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.archive import archiver
+
+
+class Command(BaseCommand):
+    help = "Move long-deactivated employees' availability and skill links to the archive tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than', help='Archive employees inactive and unchanged for longer than this, e.g. 90d, 26w or 2y.'
+        )
+        parser.add_argument('--batch-size', type=int, help='Employees per transaction (default: ARCHIVE_BATCH_SIZE).')
+        parser.add_argument('--pause', type=float, help='Seconds to sleep between batches (default: ARCHIVE_PAUSE).')
+        parser.add_argument('--limit', type=int, help='Stop after this many employees.')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the employees to archive.')
+        parser.add_argument(
+            '--restore',
+            type=int,
+            nargs='+',
+            metavar='EMPLOYEE_ID',
+            help='Instead, move these employees\' rows back to the hot tables.',
+        )
+
+    def handle(self, *args, **options):
+        if options['restore']:
+            restored = archiver.restore(options['restore'])
+            self.stdout.write(self.style.SUCCESS(f'Restored {restored} employees.'))
+            return
+        if not options['older_than']:
+            raise CommandError('Give --older-than (or --restore).')
+        try:
+            older_than = archiver.older_than(options['older_than'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        for name in ('batch_size', 'limit'):
+            if options[name] is not None and options[name] <= 0:
+                raise CommandError(f"--{name.replace('_', '-')} must be positive.")
+
+        totals = archiver.archive(
+            older_than,
+            batch_size=options['batch_size'],
+            pause=options['pause'],
+            limit=options['limit'],
+            dry_run=options['dry_run'],
+        )
+        if options['dry_run']:
+            self.stdout.write(f"{totals['employees']} employees would be archived.")
+            return
+        moved = ', '.join(f'{count} {table}' for table, count in totals.items() if table != 'employees')
+        self.stdout.write(
+            self.style.SUCCESS(f"Archived {totals['employees']} employees" + (f' ({moved} rows).' if moved else '.'))
+        )
@@ -0,0 +1,128 @@
+# Generated by Django 5.0.1 on 2026-10-19 05:02
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+PARTITIONED = [
+    ("archive_archivedavailability", "archive_avail_employee_idx"),
+    ("archive_archivedavailabilityexception", "archive_exc_employee_idx"),
+    ("archive_archivedskilllink", "archive_skill_employee_idx"),
+]
+
+
+def partition_by_year(apps, schema_editor):
+    """On PostgreSQL, rebuild the archive tables partitioned by deactivation year."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table, index in PARTITIONED:
+        schema_editor.execute(f"ALTER TABLE {table} RENAME TO {table}_plain")
+        schema_editor.execute(
+            f"CREATE TABLE {table} (LIKE {table}_plain INCLUDING DEFAULTS) PARTITION BY RANGE (deactivated_year)"
+        )
+        schema_editor.execute(f"DROP TABLE {table}_plain")
+        # A partitioned table's primary key has to include the partition key.
+        schema_editor.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id, deactivated_year)")
+        schema_editor.execute(f"CREATE INDEX {index} ON {table} (employee_id)")
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        ("employees", "0005_availability_exceptions"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedEmployee",
+            fields=[
+                (
+                    "employee",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="archive",
+                        serialize=False,
+                        to="employees.employee",
+                    ),
+                ),
+                (
+                    "deactivated_at",
+                    models.DateTimeField(help_text="Last change to the employee before archiving"),
+                ),
+                (
+                    "archived_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+            options={
+                "ordering": ["-archived_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedAvailability",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("employee_id", models.BigIntegerField()),
+                (
+                    "day_of_week",
+                    models.IntegerField(
+                        choices=[
+                            (0, "Monday"),
+                            (1, "Tuesday"),
+                            (2, "Wednesday"),
+                            (3, "Thursday"),
+                            (4, "Friday"),
+                            (5, "Saturday"),
+                            (6, "Sunday"),
+                        ]
+                    ),
+                ),
+                ("start_time", models.TimeField()),
+                ("end_time", models.TimeField()),
+                ("is_available", models.BooleanField()),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                ("deactivated_year", models.SmallIntegerField()),
+            ],
+            options={
+                "verbose_name_plural": "Archived availabilities",
+                "ordering": ["employee_id", "day_of_week", "start_time"],
+                "indexes": [models.Index(fields=["employee_id"], name="archive_avail_employee_idx")],
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedAvailabilityException",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("employee_id", models.BigIntegerField()),
+                ("start_date", models.DateField()),
+                ("end_date", models.DateField()),
+                ("start_time", models.TimeField(null=True)),
+                ("end_time", models.TimeField(null=True)),
+                ("is_available", models.BooleanField()),
+                ("reason", models.CharField(blank=True, max_length=200)),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                ("deactivated_year", models.SmallIntegerField()),
+            ],
+            options={
+                "ordering": ["employee_id", "start_date", "start_time"],
+                "indexes": [models.Index(fields=["employee_id"], name="archive_exc_employee_idx")],
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedSkillLink",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("employee_id", models.BigIntegerField()),
+                ("skill_id", models.BigIntegerField()),
+                ("deactivated_year", models.SmallIntegerField()),
+            ],
+            options={
+                "indexes": [models.Index(fields=["employee_id"], name="archive_skill_employee_idx")],
+            },
+        ),
+        migrations.RunPython(partition_by_year, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,84 @@
+"""
+Cold copies of deactivated employees' availability and skill links.
+
+Rows keep their original primary key, so a restored row gets its id back.
+``employee_id`` is a plain column rather than a foreign key. On PostgreSQL
+the tables are partitioned by ``deactivated_year`` (see
+``apps.archive.archiver``), so old years can be detached or dropped
+wholesale.
+"""
+from django.db import models
+from django.utils import timezone
+
+from apps.employees.models import Availability, Employee
+
+
+class ArchivedEmployee(models.Model):
+    """Marks an employee whose rows were moved to the archive tables."""
+
+    employee = models.OneToOneField(Employee, primary_key=True, on_delete=models.CASCADE, related_name='archive')
+    deactivated_at = models.DateTimeField(help_text='Last change to the employee before archiving')
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-archived_at']
+
+    def __str__(self):
+        return f"Employee #{self.employee_id} archived at {self.archived_at}"
+
+
+class ArchivedAvailability(models.Model):
+    """An ``Availability`` row of an archived employee."""
+
+    id = models.BigIntegerField(primary_key=True)
+    employee_id = models.BigIntegerField()
+    day_of_week = models.IntegerField(choices=Availability.DAYS_OF_WEEK)
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    is_available = models.BooleanField()
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    deactivated_year = models.SmallIntegerField()
+
+    class Meta:
+        ordering = ['employee_id', 'day_of_week', 'start_time']
+        verbose_name_plural = 'Archived availabilities'
+        indexes = [
+            models.Index(fields=['employee_id'], name='archive_avail_employee_idx'),
+        ]
+
+
+class ArchivedAvailabilityException(models.Model):
+    """An ``AvailabilityException`` row of an archived employee."""
+
+    id = models.BigIntegerField(primary_key=True)
+    employee_id = models.BigIntegerField()
+    start_date = models.DateField()
+    end_date = models.DateField()
+    start_time = models.TimeField(null=True)
+    end_time = models.TimeField(null=True)
+    is_available = models.BooleanField()
+    reason = models.CharField(max_length=200, blank=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    deactivated_year = models.SmallIntegerField()
+
+    class Meta:
+        ordering = ['employee_id', 'start_date', 'start_time']
+        indexes = [
+            models.Index(fields=['employee_id'], name='archive_exc_employee_idx'),
+        ]
+
+
+class ArchivedSkillLink(models.Model):
+    """A row of ``Employee.skills.through`` of an archived employee."""
+
+    id = models.BigIntegerField(primary_key=True)
+    employee_id = models.BigIntegerField()
+    skill_id = models.BigIntegerField()
+    deactivated_year = models.SmallIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['employee_id'], name='archive_skill_employee_idx'),
+        ]
@@ -0,0 +1,41 @@
+"""
+Restore an archived employee's rows when they are reactivated.
+
+Covers saves (API, admin) and ``bulk_updated`` sends from bulk operations.
+An archived employee's ``ArchivedEmployee`` row is removed with it by the
+cascade; its archived rows are removed here.
+"""
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from apps.employees.models import Employee
+from apps.employees.signals import bulk_updated
+
+from .archiver import TABLES, restore
+
+
+@receiver(post_init, sender=Employee, dispatch_uid='archive_track_active')
+def track_active(sender, instance, **kwargs):
+    # Only what is already loaded, so deferred fields never hit the DB.
+    instance._archive_was_active = instance.__dict__.get('is_active', True)
+
+
+@receiver(post_save, sender=Employee, dispatch_uid='archive_restore_on_save')
+def restore_on_save(sender, instance, created, raw=False, **kwargs):
+    was_active = instance._archive_was_active
+    active = instance.__dict__.get('is_active', was_active)
+    instance._archive_was_active = active
+    if not raw and not created and active and not was_active:
+        restore([instance.pk])
+
+
+@receiver(bulk_updated, dispatch_uid='archive_restore_on_bulk_update')
+def restore_on_bulk_update(sender, employee_ids, operation, changes, **kwargs):
+    if changes.get('is_active', {}).get('to') is True:
+        restore(employee_ids)
+
+
+@receiver(post_delete, sender=Employee, dispatch_uid='archive_purge_on_delete')
+def purge_on_delete(sender, instance, **kwargs):
+    for _, archive_model, _ in TABLES:
+        archive_model.objects.filter(employee_id=instance.pk).delete()
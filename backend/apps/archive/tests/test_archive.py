@@ -0,0 +1,155 @@
+import pytest
+from datetime import date, time, timedelta
+from decimal import Decimal
+from io import StringIO
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.archive.models import ArchivedAvailability, ArchivedEmployee, ArchivedSkillLink
+from apps.employees.models import Availability, AvailabilityException, Employee, Skill
+from apps.stores.models import Store
+
+
+@pytest.fixture
+def api_client():
+    """Pytest fixture for API client."""
+    return APIClient()
+
+
+def make_employee(name, store, active=True, idle_days=0, skills=()):
+    employee = Employee.objects.create(
+        first_name=name,
+        last_name='Worker',
+        email=f'{name.lower()}@example.com',
+        phone_number='555-0100',
+        hourly_rate=Decimal('20.00'),
+        hire_date=date(2020, 1, 1),
+        birth_date=date(1990, 1, 1),
+        store=store,
+        is_active=active,
+    )
+    employee.skills.set(skills)
+    for day in (0, 1):
+        Availability.objects.create(employee=employee, day_of_week=day, start_time=time(9), end_time=time(17))
+    AvailabilityException.objects.create(employee=employee, start_date=date(2023, 7, 3), end_date=date(2023, 7, 7))
+    Employee.objects.filter(pk=employee.pk).update(updated_at=timezone.now() - timedelta(days=idle_days))
+    return Employee.objects.get(pk=employee.pk)
+
+
+@pytest.fixture
+def staff():
+    store = Store.objects.create(name='Store #1')
+    skills = [Skill.objects.create(name='Register'), Skill.objects.create(name='Stock')]
+    return {
+        'gone': make_employee('Ann', store, active=False, idle_days=800, skills=skills),
+        'recent': make_employee('Ben', store, active=False, idle_days=30, skills=skills[:1]),
+        'active': make_employee('Cam', store, idle_days=800, skills=skills[1:]),
+        'skills': skills,
+    }
+
+
+def archive(*args):
+    out = StringIO()
+    call_command('archive_inactive', *args, '--pause', '0', stdout=out)
+    return out.getvalue()
+
+
+@pytest.mark.django_db
+class TestArchiveInactive:
+    """Tests for moving deactivated employees' rows to the archive tables."""
+
+    def test_moves_long_inactive_employees_rows(self, staff):
+        gone = staff['gone']
+        output = archive('--older-than', '1y')
+        assert output.startswith('Archived 1 employees (2 availability, 1 availabilityexception, 2 employee_skills')
+
+        assert not Availability.objects.filter(employee=gone).exists()
+        assert not AvailabilityException.objects.filter(employee=gone).exists()
+        assert not gone.skills.exists()
+        archived = ArchivedAvailability.objects.filter(employee_id=gone.pk)
+        assert set(archived.values_list('deactivated_year', flat=True)) == {gone.updated_at.year}
+        assert archived.count() == 2
+        assert ArchivedEmployee.objects.filter(employee=gone).exists()
+        assert Employee.objects.filter(skill_mask_0=0).count() == 1
+        for employee in (staff['recent'], staff['active']):
+            assert Availability.objects.filter(employee=employee).count() == 2
+            assert employee.skills.exists()
+
+        assert archive('--older-than', '1y').startswith('Archived 0 employees.')
+
+    def test_batches_limit_and_dry_run(self, staff):
+        assert archive('--older-than', '7d', '--dry-run') == '2 employees would be archived.\n'
+        assert not ArchivedEmployee.objects.exists()
+
+        archive('--older-than', '7d', '--batch-size', '1', '--limit', '1')
+        assert ArchivedEmployee.objects.get().employee == staff['gone']
+        archive('--older-than', '7d', '--batch-size', '1')
+        assert ArchivedEmployee.objects.count() == 2
+
+        for bad in (['--older-than', 'soon'], ['--older-than', '0d'], ['--older-than', '1y', '--batch-size', '0']):
+            with pytest.raises(CommandError):
+                archive(*bad)
+
+    def test_include_archived_read_path(self, api_client, staff):
+        gone = staff['gone']
+        archive('--older-than', '1y')
+
+        response = api_client.get(f'/api/employees/{gone.pk}/')
+        assert (response.data['availability'], response.data['skills']) == ([], [])
+        assert 'archived' not in response.data
+
+        response = api_client.get(f'/api/employees/{gone.pk}/', {'include_archived': 'true'})
+        assert response.data['archived'] is True
+        assert [skill['name'] for skill in response.data['skills']] == ['Register', 'Stock']
+        assert [row['day_of_week'] for row in response.data['availability']] == [0, 1]
+
+        url = f'/api/employees/{gone.pk}/availability/'
+        assert api_client.get(url).data == []
+        assert len(api_client.get(url, {'include_archived': 'true'}).data) == 2
+
+    def test_reactivation_restores_rows(self, api_client, staff):
+        gone, register = staff['gone'], staff['skills'][0]
+        availability_ids = set(Availability.objects.filter(employee=gone).values_list('pk', flat=True))
+        archive('--older-than', '1y')
+
+        response = api_client.patch(f'/api/employees/{gone.pk}/', {'is_active': True}, format='json')
+        assert response.status_code == 200
+        assert set(Availability.objects.filter(employee=gone).values_list('pk', flat=True)) == availability_ids
+        assert AvailabilityException.objects.filter(employee=gone).count() == 1
+        assert not ArchivedEmployee.objects.exists() and not ArchivedSkillLink.objects.exists()
+        # The skill masks are rebuilt, so skill filters find the employee again.
+        response = api_client.get('/api/employees/', {'skills_all': f'{register.pk}', 'is_active': 'true'})
+        assert {row['id'] for row in response.data['results']} == {gone.pk}
+
+    def test_restore_keeps_created_at(self, api_client, staff):
+        gone = staff['gone']
+        created = timezone.now() - timedelta(days=900)
+        Availability.objects.filter(employee=gone).update(created_at=created)
+        AvailabilityException.objects.filter(employee=gone).update(created_at=created)
+        archive('--older-than', '1y')
+        before = timezone.now()
+
+        api_client.patch(f'/api/employees/{gone.pk}/', {'is_active': True}, format='json')
+        for model in (Availability, AvailabilityException):
+            rows = model.objects.filter(employee=gone)
+            assert rows.exists()
+            assert {row.created_at for row in rows} == {created}
+            assert all(row.updated_at >= before for row in rows)
+
+    def test_bulk_reactivation_and_manual_restore(self, api_client, staff):
+        archive('--older-than', '7d')
+        api_client.post(
+            '/api/employees/bulk-update/',
+            {
+                'ids': [staff['gone'].pk],
+                'operation': 'set',
+                'field': 'is_active',
+                'value': True,
+            },
+            format='json',
+        )
+        assert Availability.objects.filter(employee=staff['gone']).count() == 2
+
+        assert archive('--restore', str(staff['recent'].pk)) == 'Restored 1 employees.\n'
+        assert staff['recent'].skills.count() == 1
+        assert not ArchivedEmployee.objects.exists()
@@ -0,0 +1,24 @@
+from django.contrib import admin
+from apps.core.paginators import ApproximateCountPaginator
+from .models import AuditEntry
+
+
+@admin.register(AuditEntry)
+class AuditEntryAdmin(admin.ModelAdmin):
+    """Read-only admin for the audit trail."""
+
+    list_display = ['ts', 'entity', 'entity_id', 'action', 'actor']
+    list_filter = ['entity', 'action']
+    search_fields = ['actor']
+    ordering = ['-ts']
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
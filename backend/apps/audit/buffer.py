@@ -0,0 +1,175 @@
+"""
+Write-behind buffer for audit entries.
+
+Requests only build ``AuditEntry`` objects and hand them over once their
+transaction commits; the rows are written later with batched
+``bulk_create``. Two flush modes are supported (``AUDIT_FLUSH_MODE``):
+
+- ``background``: a daemon thread per worker process flushes every
+  ``AUDIT_FLUSH_INTERVAL`` seconds or as soon as a full batch is waiting.
+- ``commit``: everything queued by a transaction is flushed in one batch
+  right after it commits.
+
+The queue is bounded (``AUDIT_QUEUE_SIZE``). When it is full the producer
+flushes it itself, which slows writers down instead of dropping history.
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_SIZE = 10000
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_ENQUEUE_TIMEOUT = 0.05
+
+
+class AuditBuffer:
+    """Bounded in-process queue of unsaved ``AuditEntry`` objects."""
+
+    def __init__(self, maxsize=None, batch_size=None, flush_interval=None, enqueue_timeout=None):
+        self.maxsize = maxsize or getattr(settings, 'AUDIT_QUEUE_SIZE', DEFAULT_QUEUE_SIZE)
+        self.batch_size = batch_size or getattr(settings, 'AUDIT_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+        self.flush_interval = flush_interval or getattr(settings, 'AUDIT_FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL)
+        self.enqueue_timeout = enqueue_timeout or getattr(settings, 'AUDIT_ENQUEUE_TIMEOUT', DEFAULT_ENQUEUE_TIMEOUT)
+        self._queue = queue.Queue(self.maxsize)
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def __len__(self):
+        return self._queue.qsize()
+
+    def put(self, entry):
+        """Queue one entry, flushing inline if the queue is full."""
+        while True:
+            try:
+                self._queue.put(entry, timeout=self.enqueue_timeout)
+                break
+            except queue.Full:
+                # Backpressure: the writer pays for the flush it is waiting on.
+                self.flush()
+        if self._queue.qsize() >= self.batch_size:
+            self._wakeup.set()
+
+    def flush(self):
+        """Write everything queued so far. Returns the number of rows written."""
+        from .models import AuditEntry
+
+        written = 0
+        with self._flush_lock:
+            while True:
+                batch = self._drain(self.batch_size)
+                if not batch:
+                    return written
+                try:
+                    AuditEntry.objects.bulk_create(batch)
+                except Exception:
+                    logger.exception('Failed to write %d audit entries', len(batch))
+                    raise
+                written += len(batch)
+
+    def _drain(self, limit):
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def ensure_flusher(self):
+        """Start the background flusher for this process if it isn't running."""
+        pid = os.getpid()
+        if self._thread is not None and self._thread.is_alive() and self._pid == pid:
+            return
+        # After a fork the parent's thread is gone; start a fresh one.
+        self._pid = pid
+        self._thread = threading.Thread(target=self._run, name='audit-flusher', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                close_old_connections()
+                self.flush()
+            except Exception:
+                # Already logged; keep the flusher alive for the next batch.
+                pass
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_buffer():
+    """Return the process-wide buffer, creating it on first use."""
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = AuditBuffer()
+                atexit.register(_buffer.flush)
+    return _buffer
+
+
+def _transaction_batch(buffer, connection, using):
+    """
+    Return the list collecting entries for the current transaction level.
+
+    The first entry registers a single on-commit hook that queues and flushes
+    the whole list, so a transaction becomes one batched insert. Lists are
+    tied to the savepoint they were opened in and vanish with it on rollback.
+    """
+    savepoint_ids = set(connection.savepoint_ids)
+    for callback_ids, func, _ in connection.run_on_commit:
+        batch = getattr(func, 'audit_batch', None)
+        if batch is not None and callback_ids == savepoint_ids and not func.done:
+            return batch
+
+    batch = []
+
+    def flush_batch():
+        flush_batch.done = True
+        for entry in batch:
+            buffer.put(entry)
+        buffer.flush()
+
+    flush_batch.audit_batch = batch
+    flush_batch.done = False
+    transaction.on_commit(flush_batch, using=using)
+    return batch
+
+
+def enqueue(entry, using=None):
+    """
+    Hand ``entry`` to the buffer once the current transaction commits.
+
+    Entries from rolled-back transactions are discarded with it.
+    """
+    buffer = get_buffer()
+    if getattr(settings, 'AUDIT_FLUSH_MODE', 'background') != 'commit':
+        transaction.on_commit(lambda: buffer.put(entry), using=using)
+        buffer.ensure_flusher()
+        return
+
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        buffer.put(entry)
+        buffer.flush()
+        return
+    _transaction_batch(buffer, connection, using).append(entry)
+
+
+def flush():
+    """Synchronously write all queued entries (e.g. before shutdown)."""
+    return get_buffer().flush()
@@ -0,0 +1,44 @@
+"""Who is making the current change, for audit entries."""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current_request = ContextVar('audit_current_request', default=None)
+_current_override = ContextVar('audit_current_override', default=None)
+
+
+def get_actor():
+    """Return ``(actor, source)`` for the change being recorded."""
+    override = _current_override.get()
+    if override is not None:
+        return override
+
+    request = _current_request.get()
+    if request is None:
+        return '', ''
+    user = getattr(request, 'user', None)
+    actor = user.get_username() if user is not None and user.is_authenticated else 'anonymous'
+    return actor, f'{request.method} {request.path}'
+
+
+@contextmanager
+def audit_actor(actor, source=''):
+    """Attribute changes made inside the block (e.g. from a command) to ``actor``."""
+    token = _current_override.set((actor, source))
+    try:
+        yield
+    finally:
+        _current_override.reset(token)
+
+
+class AuditContextMiddleware:
+    """Expose the current request to audit signal handlers."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _current_request.set(request)
+        try:
+            return self.get_response(request)
+        finally:
+            _current_request.reset(token)
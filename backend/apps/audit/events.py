@@ -0,0 +1,270 @@
+"""
+In-process fan-out of roster and availability changes to Server-Sent Events
+streams (see ``apps.audit.sse``).
+
+The audit log is the change log shared by every worker: whichever process
+saves an ``Employee``, ``Skill`` or ``Availability``, its entry lands in
+``AuditEntry``. Each ASGI process runs one poller that reads the entries
+after the last one it has seen every ``EVENTS_POLL_INTERVAL`` seconds,
+encodes each matching entry as an SSE frame once, and hands it to every
+subscriber whose filter matches. The event id is the entry id, so a client
+reconnecting with ``Last-Event-ID`` is replayed what it missed from the
+table.
+
+An idle subscriber is a deque and an ``asyncio.Event`` it waits on. However
+many are connected, the process runs one indexed query per interval, and
+none once the last one has left.
+
+On PostgreSQL, entry ids can become visible out of order when two workers
+flush at once. The poller keeps such a gap open for
+``EVENTS_SETTLE_SECONDS`` so the late entries are still delivered, then
+assumes the missing ids were rolled back.
+"""
+import asyncio
+import json
+import logging
+import time
+from collections import deque, namedtuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Max
+
+from apps.employees.models import Employee
+
+from .models import AuditEntry
+
+logger = logging.getLogger(__name__)
+
+ENTITIES = ('employee', 'skill', 'availability')
+POLL_INTERVAL = 0.5  # seconds
+SETTLE_SECONDS = 2
+REPLAY_LIMIT = 1000
+QUEUE_SIZE = 1000
+READ_BATCH = 1000
+
+# ``stores`` is None for chain-wide rows (skills), else the stores the
+# change concerns; an empty set is only sent to unscoped clients.
+Event = namedtuple('Event', ['id', 'entity', 'stores', 'frame'])
+
+ENTRY_FIELDS = ('pk', 'entity', 'entity_id', 'employee_id', 'action', 'changes')
+
+
+def encode(entry_id, data, event=None):
+    """One SSE frame."""
+    kind = f'event: {event}\n' if event else ''
+    payload = json.dumps(data, separators=(',', ':'))
+    return f'id: {entry_id}\n{kind}data: {payload}\n\n'.encode()
+
+
+def to_events(rows):
+    """``Event``s for ``ENTRY_FIELDS`` rows of audited entities, in row order."""
+    rows = [row for row in rows if row[1] in ENTITIES]
+    employee_ids = {row[3] for row in rows if row[3] is not None}
+    stores = dict(Employee.objects.filter(pk__in=employee_ids).values_list('pk', 'store_id')) if employee_ids else {}
+    events = []
+    for pk, entity, entity_id, employee_id, action, changes in rows:
+        data = {'entity': entity, 'id': entity_id, 'action': action, 'fields': sorted(changes)}
+        if entity == 'skill':
+            scope = None
+        else:
+            # A move between stores concerns both; a deleted employee is
+            # only known by the store recorded in its last entry.
+            scope = {value for value in changes.get('store_id', ()) if value is not None}
+            if stores.get(employee_id) is not None:
+                scope.add(stores[employee_id])
+            scope = frozenset(scope)
+            if entity != 'employee':
+                data['employee'] = employee_id
+        events.append(Event(pk, entity, scope, encode(pk, data)))
+    return events
+
+
+class Subscriber:
+    """One open stream: the events it has yet to send and what it wants."""
+
+    __slots__ = ('entities', 'store_ids', 'pending', 'ready', 'reset_id', 'closed', 'maxsize')
+
+    def __init__(self, entities=None, store_ids=None, maxsize=None):
+        self.entities = frozenset(entities) if entities else None
+        self.store_ids = frozenset(store_ids) if store_ids is not None else None
+        self.pending = deque()
+        self.ready = asyncio.Event()
+        # Set when the client fell too far behind; it is told to reset.
+        self.reset_id = None
+        self.closed = False
+        self.maxsize = maxsize or getattr(settings, 'EVENTS_QUEUE_SIZE', QUEUE_SIZE)
+
+    def wants(self, event):
+        if self.entities is not None and event.entity not in self.entities:
+            return False
+        if self.store_ids is None or event.stores is None:
+            return True
+        return not event.stores.isdisjoint(self.store_ids)
+
+    def offer(self, event):
+        if not self.wants(event):
+            return
+        if self.reset_id is not None or len(self.pending) >= self.maxsize:
+            self.pending.clear()
+            self.reset_id = max(event.id, self.reset_id or 0)
+        else:
+            self.pending.append(event)
+        self.ready.set()
+
+    def close(self):
+        self.closed = True
+        self.ready.set()
+
+    async def wait(self, timeout):
+        """Wait until there is something to send, the stream closes or ``timeout`` passes."""
+        if self.pending or self.reset_id is not None or self.closed:
+            return
+        self.ready.clear()
+        try:
+            await asyncio.wait_for(self.ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def take(self):
+        """Frames to send now (empty when there are none)."""
+        if self.reset_id is not None:
+            frame = encode(self.reset_id, {}, event='reset')
+            self.reset_id = None
+            return frame
+        frames = b''.join(event.frame for event in self.pending)
+        self.pending.clear()
+        return frames
+
+
+class Broadcaster:
+    """Reads new audit entries once per process and fans them out to subscribers."""
+
+    def __init__(self):
+        self.subscribers = set()
+        self.cursor = 0  # every entry up to here has been read
+        self.seen = set()  # entries past the cursor already read
+        self.gap_since = None
+        self._loop = None
+        self._task = None
+        self._started = None
+
+    @property
+    def high(self):
+        """Highest entry id read so far."""
+        return max(self.seen, default=self.cursor)
+
+    def _bind(self):
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # A new event loop (e.g. a fresh asyncio.run): nothing carries over.
+            self.__init__()
+            self._loop = loop
+
+    async def subscribe(self, entities=None, store_ids=None, last_event_id=None):
+        """Register a subscriber, replaying what it missed after ``last_event_id``."""
+        self._bind()
+        subscriber = Subscriber(entities, store_ids)
+        self.subscribers.add(subscriber)
+        try:
+            if self._task is None:
+                self._started = self._loop.create_future()
+                self._task = self._loop.create_task(self._run())
+            await asyncio.shield(self._started)
+            if last_event_id is not None:
+                await self._replay(subscriber, last_event_id)
+        except BaseException:
+            self.unsubscribe(subscriber)
+            raise
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        subscriber.close()
+        self.subscribers.discard(subscriber)
+
+    async def _replay(self, subscriber, last_event_id):
+        limit = getattr(settings, 'EVENTS_REPLAY_LIMIT', REPLAY_LIMIT)
+        high = self.high
+        missed = await sync_to_async(self._missed)(last_event_id, high, subscriber, limit + 1)
+        # Live events offered while reading go after the replayed ones.
+        live = list(subscriber.pending)
+        subscriber.pending.clear()
+        if len(missed) > limit:
+            subscriber.reset_id = max(high, subscriber.reset_id or 0)
+        elif subscriber.reset_id is None:
+            replayed = {event.id for event in missed}
+            subscriber.pending.extend(missed)
+            subscriber.pending.extend(event for event in live if event.id not in replayed)
+        subscriber.ready.set()
+
+    @staticmethod
+    def _missed(after, upto, subscriber, limit):
+        rows = AuditEntry.objects.filter(pk__gt=after, pk__lte=upto, entity__in=subscriber.entities or ENTITIES)
+        events = to_events(rows.order_by('pk').values_list(*ENTRY_FIELDS)[:limit])
+        if len(events) >= limit:
+            return events
+        return [event for event in events if subscriber.wants(event)]
+
+    async def _run(self):
+        interval = getattr(settings, 'EVENTS_POLL_INTERVAL', POLL_INTERVAL)
+        try:
+            try:
+                self.cursor = await sync_to_async(self._latest)()
+            except Exception as exc:
+                self._started.set_exception(exc)
+                return
+            self._started.set_result(None)
+            while self.subscribers:
+                full = False
+                try:
+                    events, full = await sync_to_async(self.read)()
+                    self.publish(events)
+                except Exception:
+                    logger.exception('Failed to read change events')
+                if not full:
+                    await asyncio.sleep(interval)
+        finally:
+            self._task = None
+
+    @staticmethod
+    def _latest():
+        return AuditEntry.objects.aggregate(latest=Max('pk'))['latest'] or 0
+
+    def read(self):
+        """Read entries past the cursor; returns ``(events, more waiting)``."""
+        rows = AuditEntry.objects.filter(pk__gt=self.cursor)
+        if self.seen:
+            rows = rows.exclude(pk__in=self.seen)
+        rows = list(rows.order_by('pk').values_list(*ENTRY_FIELDS)[:READ_BATCH])
+        self.seen.update(row[0] for row in rows)
+        self._advance()
+        return to_events(rows), len(rows) == READ_BATCH
+
+    def _advance(self):
+        while self.cursor + 1 in self.seen:
+            self.cursor += 1
+            self.seen.remove(self.cursor)
+        if not self.seen:
+            self.gap_since = None
+            return
+        now = time.monotonic()
+        if self.gap_since is None:
+            self.gap_since = now
+        elif now - self.gap_since >= getattr(settings, 'EVENTS_SETTLE_SECONDS', SETTLE_SECONDS):
+            # The missing ids never committed; move past them.
+            self.cursor = min(self.seen) - 1
+            self.gap_since = None
+            self._advance()
+
+    def publish(self, events):
+        for event in events:
+            for subscriber in self.subscribers:
+                subscriber.offer(event)
+
+
+_broadcaster = Broadcaster()
+
+
+def get_broadcaster():
+    """Return the process-wide broadcaster."""
+    return _broadcaster
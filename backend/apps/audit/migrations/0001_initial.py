@@ -0,0 +1,66 @@
+# Generated by Django 5.0.1 on 2026-10-19 03:13
+
+import django.core.serializers.json
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="AuditEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("entity", models.CharField(max_length=50)),
+                ("entity_id", models.BigIntegerField()),
+                ("employee_id", models.BigIntegerField(blank=True, null=True)),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[
+                            ("create", "Create"),
+                            ("update", "Update"),
+                            ("delete", "Delete"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "changes",
+                    models.JSONField(
+                        default=dict,
+                        encoder=django.core.serializers.json.DjangoJSONEncoder,
+                    ),
+                ),
+                ("actor", models.CharField(blank=True, max_length=150)),
+                ("source", models.CharField(blank=True, max_length=200)),
+                ("ts", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "verbose_name_plural": "Audit entries",
+                "ordering": ["-ts", "-id"],
+                "indexes": [
+                    models.Index(
+                        fields=["entity", "entity_id", "ts"],
+                        name="audit_audit_entity_2c1f7d_idx",
+                    ),
+                    models.Index(
+                        fields=["employee_id", "ts"],
+                        name="audit_audit_employe_47c14c_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
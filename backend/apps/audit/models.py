@@ -0,0 +1,50 @@
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+
+class AuditEntry(models.Model):
+    """
+    Append-only record of a change to an audited row.
+
+    ``changes`` maps field names to ``[old, new]`` pairs. Entries are written
+    in batches by ``apps.audit.buffer`` rather than inside the request.
+    """
+
+    ACTION_CREATE = 'create'
+    ACTION_UPDATE = 'update'
+    ACTION_DELETE = 'delete'
+    ACTION_CHOICES = [
+        (ACTION_CREATE, 'Create'),
+        (ACTION_UPDATE, 'Update'),
+        (ACTION_DELETE, 'Delete'),
+    ]
+
+    entity = models.CharField(max_length=50)
+    entity_id = models.BigIntegerField()
+    # Owning employee for employee and availability rows, so one query
+    # returns an employee's full history.
+    employee_id = models.BigIntegerField(null=True, blank=True)
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    changes = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    actor = models.CharField(max_length=150, blank=True)
+    source = models.CharField(max_length=200, blank=True)
+    ts = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-ts', '-id']
+        verbose_name_plural = 'Audit entries'
+        indexes = [
+            models.Index(fields=['entity', 'entity_id', 'ts']),
+            models.Index(fields=['employee_id', 'ts']),
+        ]
+
+    def __str__(self):
+        return f"{self.action} {self.entity} #{self.entity_id} at {self.ts}"
+
+    def save(self, *args, **kwargs):
+        """Audit entries are immutable once written."""
+        if self.pk is not None:
+            raise ValidationError('Audit entries cannot be modified.')
+        super().save(*args, **kwargs)
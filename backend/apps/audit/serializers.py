@@ -0,0 +1,11 @@
+from rest_framework import serializers
+from .models import AuditEntry
+
+
+class AuditEntrySerializer(serializers.ModelSerializer):
+    """Serializer for AuditEntry model (read-only)."""
+
+    class Meta:
+        model = AuditEntry
+        fields = ['id', 'entity', 'entity_id', 'employee_id', 'action', 'changes', 'actor', 'source', 'ts']
+        read_only_fields = fields
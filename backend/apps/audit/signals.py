@@ -0,0 +1,115 @@
+"""
+Capture field-level diffs for audited models.
+
+A snapshot of each instance's loaded field values is taken in ``post_init``
+so ``post_save`` can diff without re-reading the row. Serializer saves from
+the viewsets and admin edits both go through these handlers.
+"""
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from apps.employees.models import SKILL_MASK_FIELDS, Availability, AvailabilityException, Employee, Skill
+from apps.employees.signals import bulk_updated
+
+from .buffer import enqueue
+from .context import get_actor
+from .models import AuditEntry
+
+AUDITED = {
+    Employee: 'employee',
+    Skill: 'skill',
+    Availability: 'availability',
+    AvailabilityException: 'availability_exception',
+}
+IGNORED_FIELDS = {'id', 'created_at', 'updated_at', *SKILL_MASK_FIELDS}
+
+_TRACKED_ATTNAMES = {
+    model: [field.attname for field in model._meta.concrete_fields if field.name not in IGNORED_FIELDS]
+    for model in AUDITED
+}
+
+
+def _snapshot(instance):
+    # Only read what is already loaded so deferred fields never hit the DB.
+    loaded = instance.__dict__
+    return {name: loaded[name] for name in _TRACKED_ATTNAMES[type(instance)] if name in loaded}
+
+
+def _employee_id(instance):
+    if isinstance(instance, Employee):
+        return instance.pk
+    return getattr(instance, 'employee_id', None)
+
+
+def record(entity, entity_id, action, changes, employee_id=None, using=None):
+    """Queue one audit entry attributed to the current actor."""
+    actor, source = get_actor()
+    enqueue(
+        AuditEntry(
+            entity=entity,
+            entity_id=entity_id,
+            employee_id=employee_id,
+            action=action,
+            changes=changes,
+            actor=actor,
+            source=source,
+        ),
+        using=using,
+    )
+
+
+def take_snapshot(sender, instance, **kwargs):
+    instance._audit_snapshot = _snapshot(instance)
+
+
+def record_save(sender, instance, created, raw=False, using=None, **kwargs):
+    if raw:
+        return
+
+    current = _snapshot(instance)
+    if created:
+        changes = {name: [None, value] for name, value in current.items()}
+        action = AuditEntry.ACTION_CREATE
+    else:
+        previous = getattr(instance, '_audit_snapshot', {})
+        changes = {
+            name: [previous[name], value]
+            for name, value in current.items()
+            if name in previous and previous[name] != value
+        }
+        action = AuditEntry.ACTION_UPDATE
+    instance._audit_snapshot = current
+
+    if changes:
+        record(AUDITED[sender], instance.pk, action, changes, _employee_id(instance), using)
+
+
+def record_delete(sender, instance, using=None, **kwargs):
+    changes = {name: [value, None] for name, value in _snapshot(instance).items()}
+    record(AUDITED[sender], instance.pk, AuditEntry.ACTION_DELETE, changes, _employee_id(instance), using)
+
+
+@receiver(m2m_changed, sender=Employee.skills.through)
+def record_skill_links(sender, instance, action, reverse, pk_set, using=None, **kwargs):
+    if action not in ('post_add', 'post_remove'):
+        return
+    key = 'added' if action == 'post_add' else 'removed'
+    if not reverse:
+        links = {instance.pk: sorted(pk_set)}
+    else:
+        links = {employee_id: [instance.pk] for employee_id in pk_set}
+    for employee_id, skill_ids in links.items():
+        record('employee', employee_id, AuditEntry.ACTION_UPDATE, {'skills': {key: skill_ids}}, employee_id, using)
+
+
+@receiver(bulk_updated)
+def record_bulk_update(sender, employee_ids, operation, changes, **kwargs):
+    summary = {'bulk_operation': operation, **changes}
+    for employee_id in employee_ids:
+        record('employee', employee_id, AuditEntry.ACTION_UPDATE, summary, employee_id)
+
+
+for _model in AUDITED:
+    post_init.connect(take_snapshot, sender=_model, dispatch_uid=f'audit_snapshot_{_model.__name__}')
+    post_save.connect(record_save, sender=_model, dispatch_uid=f'audit_save_{_model.__name__}')
+    post_delete.connect(record_delete, sender=_model, dispatch_uid=f'audit_delete_{_model.__name__}')
@@ -0,0 +1,142 @@
+"""
+``GET /api/events/``: a Server-Sent Events stream of roster and availability changes.
+
+``config.asgi`` routes the path here, ahead of Django's request handling,
+so an open stream holds no thread or middleware. The stream is only served
+under ASGI; under WSGI the path is a 404.
+
+Each event is ``{"entity", "id", "action", "fields"}``, plus ``employee``
+for availability rows, with the audit entry id as its SSE id. Clients that
+reconnect with ``Last-Event-ID`` get what they missed. If they missed more
+than ``EVENTS_REPLAY_LIMIT`` events, or fall ``EVENTS_QUEUE_SIZE`` events
+behind while connected, they get a ``reset`` event and should refetch.
+Callers are authenticated like the API and scoped to their stores, and
+``?entities=employee,skill`` narrows the stream. A comment is sent every
+``EVENTS_KEEPALIVE_SECONDS`` to keep proxies from closing idle streams.
+"""
+import asyncio
+import io
+import json
+from collections import namedtuple
+from importlib import import_module
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.core.handlers.asgi import ASGIRequest
+from django.db import close_old_connections
+from django.utils.functional import SimpleLazyObject
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from apps.stores.scoping import get_request_store_ids
+
+from .events import ENTITIES, get_broadcaster
+
+EVENTS_PATH = '/api/events/'
+KEEPALIVE_SECONDS = 15
+RETRY_MS = 3000
+
+Options = namedtuple('Options', ['entities', 'store_ids', 'last_event_id', 'headers'])
+
+
+def _cors_headers(request):
+    origin = request.headers.get('Origin')
+    if not origin:
+        return []
+    if not (
+        getattr(settings, 'CORS_ALLOW_ALL_ORIGINS', False) or origin in getattr(settings, 'CORS_ALLOWED_ORIGINS', ())
+    ):
+        return []
+    headers = [(b'access-control-allow-origin', origin.encode()), (b'vary', b'Origin')]
+    if getattr(settings, 'CORS_ALLOW_CREDENTIALS', False):
+        headers.append((b'access-control-allow-credentials', b'true'))
+    return headers
+
+
+def open_stream(scope):
+    """Authenticate and parse a stream request; raises ``APIException``s."""
+    close_old_connections()
+    django_request = ASGIRequest(scope, io.BytesIO())
+    engine = import_module(settings.SESSION_ENGINE)
+    django_request.session = engine.SessionStore(django_request.COOKIES.get(settings.SESSION_COOKIE_NAME))
+    django_request.user = SimpleLazyObject(lambda: get_user(django_request))
+    request = Request(django_request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+    django_request.user = request.user
+
+    entities = request.query_params.get('entities')
+    if entities:
+        entities = entities.split(',')
+        unknown = set(entities) - set(ENTITIES)
+        if unknown:
+            raise ValidationError({'entities': f'Unknown entities: {", ".join(sorted(unknown))}.'})
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.query_params.get('last_event_id')
+    if last_event_id:
+        try:
+            last_event_id = int(last_event_id)
+        except ValueError:
+            raise ValidationError({'detail': 'Last-Event-ID must be an event id.'})
+    return Options(
+        entities or None, get_request_store_ids(request), last_event_id or None, _cors_headers(django_request)
+    )
+
+
+async def _reject(send, status, data, headers=()):
+    await send(
+        {
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(b'content-type', b'application/json'), *headers],
+        }
+    )
+    await send({'type': 'http.response.body', 'body': json.dumps(data).encode()})
+
+
+async def _watch_disconnect(receive, subscriber):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+    subscriber.close()
+
+
+async def stream(scope, receive, send):
+    """The ASGI application behind ``EVENTS_PATH``."""
+    if scope['method'] != 'GET':
+        await _reject(send, 405, {'detail': f'Method "{scope["method"]}" not allowed.'}, [(b'allow', b'GET')])
+        return
+    try:
+        options = await sync_to_async(open_stream)(scope)
+    except APIException as exc:
+        await _reject(send, exc.status_code, exc.detail if isinstance(exc.detail, dict) else {'detail': exc.detail})
+        return
+
+    keepalive = getattr(settings, 'EVENTS_KEEPALIVE_SECONDS', KEEPALIVE_SECONDS)
+    broadcaster = get_broadcaster()
+    subscriber = await broadcaster.subscribe(options.entities, options.store_ids, options.last_event_id)
+    watcher = asyncio.ensure_future(_watch_disconnect(receive, subscriber))
+    try:
+        await send(
+            {
+                'type': 'http.response.start',
+                'status': 200,
+                'headers': [
+                    (b'content-type', b'text/event-stream'),
+                    (b'cache-control', b'no-cache'),
+                    (b'x-accel-buffering', b'no'),
+                    *options.headers,
+                ],
+            }
+        )
+        await send({'type': 'http.response.body', 'body': f'retry: {RETRY_MS}\n\n'.encode(), 'more_body': True})
+        while True:
+            await subscriber.wait(keepalive)
+            if subscriber.closed:
+                break
+            await send({'type': 'http.response.body', 'body': subscriber.take() or b':\n\n', 'more_body': True})
+    except OSError:
+        # The client went away mid-send.
+        pass
+    finally:
+        broadcaster.unsubscribe(subscriber)
+        watcher.cancel()
@@ -0,0 +1,218 @@
+import pytest
+from contextlib import contextmanager
+from datetime import date, time
+from decimal import Decimal
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework import status
+from apps.audit import buffer as audit_buffer
+from apps.audit.buffer import AuditBuffer
+from apps.audit.models import AuditEntry
+from apps.employees.models import Employee, Skill, Availability
+
+
+@pytest.fixture
+def api_client():
+    """Pytest fixture for API client."""
+    return APIClient()
+
+
+@pytest.fixture(autouse=True)
+def fresh_buffer(monkeypatch, settings):
+    """Give each test its own buffer without a background thread."""
+    settings.AUDIT_FLUSH_MODE = 'background'
+    buffer = AuditBuffer()
+    monkeypatch.setattr(audit_buffer, '_buffer', buffer)
+    monkeypatch.setattr(AuditBuffer, 'ensure_flusher', lambda self: None)
+    return buffer
+
+
+@pytest.fixture
+def committed(django_capture_on_commit_callbacks, fresh_buffer):
+    """Run on-commit hooks for the block, then flush like the background thread would."""
+
+    @contextmanager
+    def run():
+        with django_capture_on_commit_callbacks(execute=True):
+            yield
+        fresh_buffer.flush()
+
+    return run
+
+
+@pytest.fixture
+def sample_employee(committed):
+    """Create a sample employee (its create entry is flushed)."""
+    with committed():
+        return Employee.objects.create(
+            first_name="John",
+            last_name="Doe",
+            email="john.doe@example.com",
+            phone_number="555-0100",
+            hourly_rate=Decimal("15.50"),
+            hire_date=date(2024, 1, 15),
+            birth_date=date(2000, 5, 20),
+        )
+
+
+@pytest.mark.django_db
+class TestAuditCapture:
+    """Tests for capturing field-level diffs."""
+
+    def test_create_is_recorded(self, sample_employee):
+        """Test that creating an employee writes a create entry."""
+        entry = AuditEntry.objects.get(entity='employee', entity_id=sample_employee.id)
+        assert entry.action == AuditEntry.ACTION_CREATE
+        assert entry.employee_id == sample_employee.id
+        assert entry.changes['email'] == [None, 'john.doe@example.com']
+
+    def test_api_update_records_diff_and_actor(self, api_client, sample_employee, committed):
+        """Test that a PATCH records only the changed fields and who made it."""
+        with committed():
+            response = api_client.patch(
+                f'/api/employees/{sample_employee.id}/', {'hourly_rate': '18.00'}, format='json'
+            )
+        assert response.status_code == status.HTTP_200_OK
+
+        entry = AuditEntry.objects.get(action=AuditEntry.ACTION_UPDATE)
+        assert entry.changes == {'hourly_rate': ['15.50', '18.00']}
+        assert entry.actor == 'anonymous'
+        assert entry.source == f'PATCH /api/employees/{sample_employee.id}/'
+
+    def test_unchanged_save_is_not_recorded(self, sample_employee, committed):
+        """Test that saving without changes writes nothing."""
+        with committed():
+            sample_employee.save()
+        assert not AuditEntry.objects.filter(action=AuditEntry.ACTION_UPDATE).exists()
+
+    def test_availability_delete_is_linked_to_employee(self, sample_employee, committed):
+        """Test that availability history is attached to its employee."""
+        with committed():
+            slot = Availability.objects.create(
+                employee=sample_employee, day_of_week=0, start_time=time(9, 0), end_time=time(17, 0)
+            )
+            slot.delete()
+
+        actions = list(
+            AuditEntry.objects.filter(entity='availability', employee_id=sample_employee.id)
+            .order_by('id')
+            .values_list('action', flat=True)
+        )
+        assert actions == [AuditEntry.ACTION_CREATE, AuditEntry.ACTION_DELETE]
+
+    def test_skill_links_are_recorded(self, sample_employee, committed):
+        """Test that M2M skill changes are recorded on the employee."""
+        skill = Skill.objects.create(name='Register')
+        with committed():
+            sample_employee.skills.add(skill)
+
+        entry = AuditEntry.objects.get(entity='employee', changes__has_key='skills')
+        assert entry.changes == {'skills': {'added': [skill.id]}}
+
+    def test_bulk_update_is_recorded_per_employee(self, api_client, sample_employee, committed):
+        """Test that set-based bulk updates still leave per-employee history."""
+        with committed():
+            api_client.post(
+                '/api/employees/bulk-update/', {'ids': [sample_employee.id], 'operation': 'deactivate'}, format='json'
+            )
+        entry = AuditEntry.objects.get(action=AuditEntry.ACTION_UPDATE)
+        assert entry.employee_id == sample_employee.id
+        assert entry.changes['bulk_operation'] == 'deactivate'
+
+    def test_rolled_back_changes_are_not_recorded(self, sample_employee):
+        """Test that entries from a rolled-back transaction are discarded."""
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                sample_employee.first_name = 'Rolled'
+                sample_employee.save()
+                raise RuntimeError
+        audit_buffer.flush()
+        assert not AuditEntry.objects.filter(action=AuditEntry.ACTION_UPDATE).exists()
+
+
+@pytest.mark.django_db
+class TestAuditBuffer:
+    """Tests for the write-behind buffer."""
+
+    def test_request_only_queues_the_entry(
+        self, api_client, sample_employee, fresh_buffer, django_capture_on_commit_callbacks
+    ):
+        """Test that in background mode the request does no audit INSERT."""
+        with CaptureQueriesContext(connection) as queries:
+            with django_capture_on_commit_callbacks(execute=True):
+                api_client.patch(f'/api/employees/{sample_employee.id}/', {'first_name': 'Jon'}, format='json')
+        assert not any('audit_auditentry' in q['sql'] for q in queries.captured_queries)
+        assert len(fresh_buffer) == 1
+
+        assert fresh_buffer.flush() == 1
+        assert AuditEntry.objects.filter(action=AuditEntry.ACTION_UPDATE).count() == 1
+
+    def test_flushes_in_batches(self):
+        """Test that a flush writes queued entries with batched inserts."""
+        buffer = AuditBuffer(batch_size=50)
+        for i in range(120):
+            buffer.put(AuditEntry(entity='employee', entity_id=i, action='update'))
+
+        with CaptureQueriesContext(connection) as queries:
+            assert buffer.flush() == 120
+        inserts = [q for q in queries.captured_queries if q['sql'].startswith('INSERT')]
+        assert len(inserts) == 3
+
+    def test_full_queue_applies_backpressure(self):
+        """Test that a full queue is flushed by the producer instead of dropping entries."""
+        buffer = AuditBuffer(maxsize=5, batch_size=5, enqueue_timeout=0.001)
+        for i in range(12):
+            buffer.put(AuditEntry(entity='employee', entity_id=i, action='update'))
+
+        assert len(buffer) <= 5
+        buffer.flush()
+        assert AuditEntry.objects.count() == 12
+
+
+@pytest.mark.django_db
+class TestAuditAPI:
+    """Tests for GET /api/audit/."""
+
+    def test_filter_by_employee(self, api_client, sample_employee):
+        """Test listing one employee's history."""
+        AuditEntry.objects.create(entity='employee', entity_id=999, employee_id=999, action='update')
+
+        response = api_client.get(f'/api/audit/?employee={sample_employee.id}')
+        assert response.status_code == status.HTTP_200_OK
+        assert [e['entity_id'] for e in response.data['results']] == [sample_employee.id]
+
+    def test_filter_by_entity(self, api_client, sample_employee):
+        """Test filtering by entity and entity id."""
+        response = api_client.get(f'/api/audit/?entity=employee&entity_id={sample_employee.id}')
+        assert response.data['count'] == 1
+
+    def test_entries_are_read_only(self, api_client, sample_employee):
+        """Test that the audit API cannot modify entries."""
+        entry = AuditEntry.objects.get()
+        response = api_client.delete(f'/api/audit/{entry.id}/')
+        assert response.status_code == status.HTTP_405_METHOD_NOT_ALLOWED
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAuditCommitMode:
+    """Tests for AUDIT_FLUSH_MODE = 'commit'."""
+
+    def test_transaction_is_flushed_in_one_batch(self, settings):
+        """Test that all entries from a transaction are written together after commit."""
+        settings.AUDIT_FLUSH_MODE = 'commit'
+        with CaptureQueriesContext(connection) as queries:
+            with transaction.atomic():
+                skill = Skill.objects.create(name='Register')
+                skill.description = 'Cash register operations'
+                skill.save()
+                assert AuditEntry.objects.count() == 0
+
+        assert list(AuditEntry.objects.order_by('id').values_list('action', flat=True)) == [
+            AuditEntry.ACTION_CREATE,
+            AuditEntry.ACTION_UPDATE,
+        ]
+        inserts = [
+            q for q in queries.captured_queries if q['sql'].startswith('INSERT') and 'audit_auditentry' in q['sql']
+        ]
+        assert len(inserts) == 1
@@ -0,0 +1,230 @@
+import asyncio
+import json
+import time
+import pytest
+from datetime import date
+from decimal import Decimal
+from asgiref.sync import async_to_sync, sync_to_async
+from django.db import transaction
+from apps.audit.events import Broadcaster, get_broadcaster
+from apps.audit.models import AuditEntry
+from apps.employees.models import Employee, Skill
+from apps.stores.models import Store
+from config.asgi import application
+
+
+def call(path='/api/events/', method='GET', query='', headers=(), act=None, until=0):
+    """Request ``path`` from the ASGI app, run ``act`` once connected and disconnect after ``until`` events."""
+
+    async def main():
+        messages = []
+        requests = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+        gone = asyncio.Event()
+
+        async def receive():
+            if requests:
+                return requests.pop()
+            await gone.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': method,
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode(),
+            'query_string': query.encode(),
+            'headers': [(b'host', b'localhost'), *((name.encode(), value.encode()) for name, value in headers)],
+            'server': ('localhost', 80),
+            'client': ('127.0.0.1', 1234),
+        }
+        task = asyncio.ensure_future(application(scope, receive, send))
+        deadline = time.monotonic() + 5
+        while len(messages) < 2 and not task.done() and time.monotonic() < deadline:
+            await asyncio.sleep(0.005)
+        if act is not None:
+            await sync_to_async(act)()
+        while len(events(messages)) < until and not task.done() and time.monotonic() < deadline:
+            await asyncio.sleep(0.005)
+        gone.set()
+        await asyncio.wait_for(task, 5)
+        return messages
+
+    return async_to_sync(main)()
+
+
+def parse(messages):
+    body = b''.join(message.get('body', b'') for message in messages[1:]).decode()
+    frames = []
+    for block in body.split('\n\n'):
+        frame = dict(line.split(': ', 1) for line in block.splitlines() if ': ' in line)
+        if 'data' in frame:
+            frame['data'] = json.loads(frame['data'])
+        frames.append(frame)
+    return frames
+
+
+def events(messages):
+    return [frame for frame in parse(messages) if 'data' in frame]
+
+
+@pytest.fixture(autouse=True)
+def fast_poll(settings):
+    settings.EVENTS_POLL_INTERVAL = 0.01
+    settings.AUDIT_FLUSH_MODE = 'commit'
+
+
+@pytest.fixture
+def stores():
+    return Store.objects.create(name='Store #1'), Store.objects.create(name='Store #2')
+
+
+@pytest.fixture
+def employees(stores):
+    return [
+        Employee.objects.create(
+            first_name=name,
+            last_name='Worker',
+            email=f'{name.lower()}@example.com',
+            phone_number='555-0100',
+            hourly_rate=Decimal('20.00'),
+            hire_date=date(2024, 1, 1),
+            birth_date=date(1990, 1, 1),
+            store=store,
+        )
+        for name, store in zip(('Ann', 'Ben'), stores)
+    ]
+
+
+def entry(entity, entity_id, employee_id=None, action='update', **changes):
+    return AuditEntry.objects.create(
+        entity=entity, entity_id=entity_id, employee_id=employee_id, action=action, changes=changes
+    )
+
+
+@pytest.mark.django_db
+class TestEventStream:
+    """Tests for the /api/events/ Server-Sent Events stream."""
+
+    def test_pushes_compact_change_events(self, employees, django_capture_on_commit_callbacks):
+        ann = employees[0]
+
+        def act():
+            with django_capture_on_commit_callbacks(execute=True), transaction.atomic():
+                ann.hourly_rate = Decimal('21.00')
+                ann.save()
+                Skill.objects.create(name='Forklift')
+
+        messages = call(act=act, until=2)
+        assert messages[0]['status'] == 200
+        assert (b'content-type', b'text/event-stream') in messages[0]['headers']
+        received = events(messages)
+        skill = Skill.objects.get(name='Forklift')
+        assert [frame['data'] for frame in received] == [
+            {'entity': 'employee', 'id': ann.pk, 'action': 'update', 'fields': ['hourly_rate']},
+            {'entity': 'skill', 'id': skill.pk, 'action': 'create', 'fields': ['description', 'name']},
+        ]
+        assert int(received[-1]['id']) == AuditEntry.objects.latest('id').pk
+        # The poller stops with the last subscriber.
+        assert not get_broadcaster().subscribers
+
+    def test_resumes_after_last_event_id(self, employees):
+        ann = employees[0]
+        first = entry('employee', ann.pk, ann.pk, status=['active', 'inactive'])
+        second = entry('availability', 7, ann.pk, action='create', day_of_week=[None, 2])
+        entry('availability_exception', 3, ann.pk, action='delete', reason=['Vacation', None])
+        third = entry('skill', 4, action='delete', name=['Stock', None])
+
+        received = events(call(headers=[('last-event-id', str(first.pk))], until=2))
+        assert [int(frame['id']) for frame in received] == [second.pk, third.pk]
+        assert received[0]['data'] == {
+            'entity': 'availability',
+            'id': 7,
+            'action': 'create',
+            'fields': ['day_of_week'],
+            'employee': ann.pk,
+        }
+
+    def test_clients_too_far_behind_are_told_to_reset(self, employees, settings):
+        settings.EVENTS_REPLAY_LIMIT = 1
+        ann = employees[0]
+        first = entry('employee', ann.pk, ann.pk, status=['active', 'inactive'])
+        entry('employee', ann.pk, ann.pk, status=['inactive', 'active'])
+        last = entry('employee', ann.pk, ann.pk, status=['active', 'inactive'])
+
+        received = events(call(query=f'last_event_id={first.pk}', until=1))
+        assert received == [{'id': str(last.pk), 'event': 'reset', 'data': {}}]
+
+    def test_filters_by_store_and_entity(self, employees, stores):
+        ann, ben = employees
+
+        def act():
+            entry('employee', ann.pk, ann.pk, first_name=['Ann', 'Anne'])
+            entry('employee', ben.pk, ben.pk, first_name=['Ben', 'Benny'])
+            entry('availability', 1, ann.pk, is_available=[True, False])
+            # Moving into the caller's store is their business too.
+            entry('employee', ben.pk, ben.pk, store_id=[stores[1].pk, stores[0].pk])
+            entry('skill', 2, name=['Stock', 'Stocking'])
+
+        received = events(
+            call(query='entities=employee,skill', headers=[('x-store-id', str(stores[0].pk))], act=act, until=3)
+        )
+        assert [(frame['data']['entity'], frame['data']['id']) for frame in received] == [
+            ('employee', ann.pk),
+            ('employee', ben.pk),
+            ('skill', 2),
+        ]
+        assert received[1]['data']['fields'] == ['store_id']
+
+    def test_rejected_requests(self):
+        assert call(method='POST')[0]['status'] == 405
+        assert call(query='entities=payroll')[0]['status'] == 400
+        assert call(headers=[('x-store-id', 'x')])[0]['status'] == 400
+        assert call(headers=[('last-event-id', 'abc')])[0]['status'] == 400
+
+    def test_other_paths_are_served_by_django(self):
+        messages = call(path='/api/skills/', headers=[('accept', 'application/json')])
+        assert messages[0]['status'] == 200
+
+
+@pytest.mark.django_db
+class TestBroadcaster:
+    """Tests for reading the audit log past out-of-order commits."""
+
+    def test_gaps_wait_for_late_entries(self, settings):
+        settings.EVENTS_SETTLE_SECONDS = 60
+        first = entry('skill', 1, name=['A', 'B'])
+        missing = entry('skill', 2, name=['A', 'B']).pk
+        third = entry('skill', 3, name=['A', 'B'])
+        AuditEntry.objects.filter(pk=missing).delete()
+
+        broadcaster = Broadcaster()
+        broadcaster.cursor = first.pk - 1
+        read, _ = broadcaster.read()
+        assert [event.id for event in read] == [first.pk, third.pk]
+        assert (broadcaster.cursor, broadcaster.high) == (first.pk, third.pk)
+
+        # The entry in the gap commits late: it is still delivered.
+        AuditEntry.objects.bulk_create([AuditEntry(pk=missing, entity='skill', entity_id=2, action='update')])
+        read, _ = broadcaster.read()
+        assert [event.id for event in read] == [missing]
+        assert broadcaster.cursor == third.pk and not broadcaster.seen
+
+    def test_gaps_are_skipped_after_settling(self, settings):
+        settings.EVENTS_SETTLE_SECONDS = 0
+        first = entry('skill', 1, name=['A', 'B'])
+        missing = entry('skill', 2, name=['A', 'B']).pk
+        third = entry('skill', 3, name=['A', 'B'])
+        AuditEntry.objects.filter(pk=missing).delete()
+
+        broadcaster = Broadcaster()
+        broadcaster.cursor = first.pk - 1
+        broadcaster.read()
+        assert broadcaster.cursor == first.pk
+        broadcaster.read()
+        assert broadcaster.cursor == third.pk
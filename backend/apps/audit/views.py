@@ -0,0 +1,51 @@
+from django.db.models import Q
+from django_filters import rest_framework as filters
+from rest_framework import viewsets
+from rest_framework.filters import OrderingFilter
+
+from apps.employees.models import Employee
+from apps.stores.scoping import get_request_store_ids
+
+from .models import AuditEntry
+from .serializers import AuditEntrySerializer
+
+
+class AuditEntryFilter(filters.FilterSet):
+    """Filters served from the (entity, entity_id, ts) and (employee_id, ts) indexes."""
+
+    employee = filters.NumberFilter(field_name='employee_id')
+    since = filters.IsoDateTimeFilter(field_name='ts', lookup_expr='gte')
+    until = filters.IsoDateTimeFilter(field_name='ts', lookup_expr='lt')
+
+    class Meta:
+        model = AuditEntry
+        fields = ['entity', 'entity_id', 'action']
+
+
+class AuditEntryViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    ViewSet for reading the audit trail.
+
+    Provides:
+    - List: GET /api/audit/?employee={id}
+    - List: GET /api/audit/?entity=availability&entity_id={id}
+    - Retrieve: GET /api/audit/{id}/
+
+    Store-scoped callers see chain-wide entries (skills) and the entries of
+    employees currently in their stores.
+    """
+
+    queryset = AuditEntry.objects.all()
+    serializer_class = AuditEntrySerializer
+    filter_backends = [filters.DjangoFilterBackend, OrderingFilter]
+    filterset_class = AuditEntryFilter
+    ordering_fields = ['ts']
+    ordering = ['-ts', '-id']
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        store_ids = get_request_store_ids(self.request)
+        if store_ids is None:
+            return queryset
+        employees = Employee.objects.filter(store_id__in=store_ids).values('pk')
+        return queryset.filter(Q(employee_id__in=employees) | Q(employee_id__isnull=True, entity='skill'))
@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+from django.conf import settings
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.core'
+    verbose_name = 'Core'
+
+    def ready(self):
+        if not settings.DEBUG:
+            # Refuse a schema artifact built from different code.
+            from .schema import schema_cache
+
+            schema_cache.verify_artifact()
@@ -0,0 +1,175 @@
+"""
+Run several API requests in one round-trip (``POST /api/batch/``).
+
+Sub-requests are dispatched in order to the regular views, in-process and
+inside one transaction. Each is built from the batch request's headers,
+with its own method, path, query string and JSON body, and authenticated
+as the batch's caller. Throttles and store scoping apply to each one as
+usual. The first response with a status of 400 or more stops the batch
+and rolls everything back.
+
+Strings may refer to earlier responses: ``"$0.id"`` is the ``id`` of the
+first response's body, and ``"$1.results.0.id"`` walks into lists. A
+string that is exactly one reference takes the referenced value as is;
+references inside a longer string (e.g. ``"/api/employees/$0.id/"``) are
+replaced by its text.
+
+A batch holds at most ``BATCH_MAX_REQUESTS`` sub-requests and may run at
+most ``BATCH_MAX_QUERIES`` SQL statements in total.
+"""
+import io
+import json
+import re
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.urls import Resolver404, resolve
+
+MAX_REQUESTS = 20
+MAX_QUERIES = 500
+METHODS = {'GET', 'POST', 'PUT', 'PATCH', 'DELETE'}
+REFERENCE_RE = re.compile(r'\$(\d+)((?:\.[A-Za-z0-9_-]+)+)')
+# Request-specific headers that must not leak from the batch into its parts.
+DROPPED_META = {'CONTENT_TYPE', 'CONTENT_LENGTH', 'QUERY_STRING', 'HTTP_IF_NONE_MATCH', 'HTTP_IF_MATCH'}
+
+
+class BatchError(ValueError):
+    """The batch is malformed; ``index`` is the offending sub-request, if any."""
+
+    def __init__(self, message, index=None):
+        super().__init__(message)
+        self.index = index
+
+
+class QueryBudgetExceeded(Exception):
+    """The batch ran more SQL statements than it may."""
+
+
+class _Failed(Exception):
+    """Unwinds the transaction after a failed sub-request."""
+
+
+def _lookup(results, index, path, at):
+    if index >= len(results):
+        raise BatchError(f'${index} refers to a request that has not run yet.', at)
+    value = results[index]['body']
+    for key in path.split('.')[1:]:
+        try:
+            value = value[int(key)] if isinstance(value, list) else value[key]
+        except (KeyError, IndexError, TypeError, ValueError):
+            raise BatchError(f'${index}{path} is not in the response to request {index}.', at)
+    return value
+
+
+def substitute(value, results, at):
+    """Replace references to earlier ``results`` in ``value``, recursively."""
+    if isinstance(value, str):
+        whole = REFERENCE_RE.fullmatch(value)
+        if whole:
+            return _lookup(results, int(whole.group(1)), whole.group(2), at)
+        return REFERENCE_RE.sub(lambda match: str(_lookup(results, int(match.group(1)), match.group(2), at)), value)
+    if isinstance(value, list):
+        return [substitute(item, results, at) for item in value]
+    if isinstance(value, dict):
+        return {key: substitute(item, results, at) for key, item in value.items()}
+    return value
+
+
+def validate(operations):
+    """Check the shape of a batch before anything runs."""
+    max_requests = getattr(settings, 'BATCH_MAX_REQUESTS', MAX_REQUESTS)
+    if not isinstance(operations, list) or not operations:
+        raise BatchError('Send a non-empty list of requests.')
+    if len(operations) > max_requests:
+        raise BatchError(f'At most {max_requests} requests per batch.')
+    for index, operation in enumerate(operations):
+        if not isinstance(operation, dict):
+            raise BatchError('Expected an object with method and path.', index)
+        if str(operation.get('method', '')).upper() not in METHODS:
+            raise BatchError(f'method must be one of {", ".join(sorted(METHODS))}.', index)
+        path = operation.get('path')
+        if not isinstance(path, str) or not path.startswith('/api/'):
+            raise BatchError('path must start with /api/.', index)
+
+
+def _sub_request(request, method, path, body):
+    url = urlsplit(path)
+    meta = {key: value for key, value in request.META.items() if key not in DROPPED_META}
+    payload = b'' if body is None else json.dumps(body, cls=DjangoJSONEncoder).encode()
+    meta.update(
+        {
+            'REQUEST_METHOD': method,
+            'PATH_INFO': url.path,
+            'SCRIPT_NAME': '',
+            'QUERY_STRING': url.query,
+            'CONTENT_LENGTH': str(len(payload)),
+            'wsgi.input': io.BytesIO(payload),
+        }
+    )
+    if payload:
+        meta['CONTENT_TYPE'] = 'application/json'
+    sub = WSGIRequest(meta)
+    sub.user = request.user
+    sub.session = getattr(request, 'session', None)
+    # The batch was authenticated (and CSRF-checked) once; don't redo it.
+    sub._force_auth_user = request.user
+    sub._force_auth_token = getattr(request, 'auth', None)
+    return sub
+
+
+def _dispatch(request, method, path, body, index):
+    path_info = urlsplit(path).path
+    try:
+        match = resolve(path_info)
+    except Resolver404:
+        return 404, {'detail': 'Not found.'}
+    if not getattr(getattr(match.func, 'cls', None), 'batchable', True):
+        raise BatchError(f'{path_info} cannot be batched.', index)
+    sub = _sub_request(request, method, path, body)
+    sub.resolver_match = match
+    response = match.func(sub, *match.args, **match.kwargs)
+    data = getattr(response, 'data', None)
+    if data is None and not response.streaming and response.content:
+        try:
+            data = json.loads(response.content)
+        except ValueError:
+            data = response.content.decode(errors='replace')
+    return response.status_code, data
+
+
+def run(request, operations):
+    """
+    Run ``operations`` for ``request``; returns ``(results, failed index or None)``.
+
+    ``results`` holds ``{'status', 'body'}`` per sub-request run. Raises
+    ``BatchError`` for malformed batches and ``QueryBudgetExceeded``.
+    """
+    validate(operations)
+    budget = getattr(settings, 'BATCH_MAX_QUERIES', MAX_QUERIES)
+    queries = 0
+
+    def count(execute, sql, params, many, context):
+        nonlocal queries
+        queries += 1
+        if queries > budget:
+            raise QueryBudgetExceeded(f'The batch ran more than {budget} queries.')
+        return execute(sql, params, many, context)
+
+    results = []
+    failed = None
+    try:
+        with transaction.atomic(), connection.execute_wrapper(count):
+            for index, operation in enumerate(operations):
+                path = substitute(operation['path'], results, index)
+                body = substitute(operation.get('body'), results, index)
+                status, data = _dispatch(request, operation['method'].upper(), path, body, index)
+                results.append({'status': status, 'body': data})
+                if status >= 400:
+                    failed = index
+                    raise _Failed
+    except _Failed:
+        pass
+    return results, failed
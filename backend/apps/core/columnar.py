@@ -0,0 +1,147 @@
+"""
+Columnar JSON, a compact wire format for roster-sized responses.
+
+Selected with ``Accept: application/vnd.retailsync.columnar+json`` (or
+``?format=columnar``) and accepted as a request ``Content-Type`` by the
+views using ``ColumnarFormatMixin``. It is plain JSON with two changes:
+
+- a list of objects sharing the same keys becomes
+  ``{"$columns": [...], "$rows": [[...], ...]}``, so keys are sent once per
+  list instead of once per row (nested lists are packed the same way)
+- serializers using ``CompactTemporalsMixin`` write dates as days since
+  1970-01-01 and times as minutes since midnight; times with seconds keep
+  their ISO string
+
+``unpack`` reverses the first change; the temporal fields accept either
+spelling on input.
+"""
+from datetime import date, time
+
+from rest_framework import serializers
+
+MEDIA_TYPE = 'application/vnd.retailsync.columnar+json'
+COLUMNS = '$columns'
+ROWS = '$rows'
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def date_to_epoch_days(value):
+    return value.toordinal() - EPOCH_ORDINAL
+
+
+def epoch_days_to_date(days):
+    return date.fromordinal(days + EPOCH_ORDINAL)
+
+
+def time_to_minutes(value):
+    return value.hour * 60 + value.minute
+
+
+def minutes_to_time(minutes):
+    return time(*divmod(minutes, 60))
+
+
+def _packed(values):
+    # Only containers need a recursive call; rows are mostly scalars.
+    return [pack(value) if isinstance(value, (dict, list, tuple)) else value for value in values]
+
+
+def pack(data):
+    """Turn lists of same-keyed objects into column/row tables, recursively."""
+    if isinstance(data, dict):
+        return dict(zip(data, _packed(data.values())))
+    if isinstance(data, (list, tuple)):
+        if data and isinstance(data[0], dict):
+            columns = list(data[0])
+            if all(isinstance(row, dict) and list(row) == columns for row in data):
+                return {COLUMNS: columns, ROWS: [_packed(row.values()) for row in data]}
+        return _packed(data)
+    return data
+
+
+def _unpacked(values):
+    return [unpack(value) if isinstance(value, (dict, list)) else value for value in values]
+
+
+def unpack(data):
+    """Inverse of ``pack``."""
+    if isinstance(data, dict):
+        if data.keys() == {COLUMNS, ROWS}:
+            columns = data[COLUMNS]
+            return [dict(zip(columns, _unpacked(row))) for row in data[ROWS]]
+        return dict(zip(data, _unpacked(data.values())))
+    if isinstance(data, list):
+        return _unpacked(data)
+    return data
+
+
+def _is_integer(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+class EpochDayField(serializers.DateField):
+    """``DateField`` that can read and write days since the epoch."""
+
+    compact_input = compact_output = False
+
+    def to_internal_value(self, value):
+        if self.compact_input and _is_integer(value):
+            try:
+                return epoch_days_to_date(value)
+            except (OverflowError, ValueError):
+                self.fail('invalid', format='days since 1970-01-01')
+        return super().to_internal_value(value)
+
+    def to_representation(self, value):
+        if self.compact_output and isinstance(value, date):
+            return date_to_epoch_days(value)
+        return super().to_representation(value)
+
+
+class MinuteOfDayField(serializers.TimeField):
+    """``TimeField`` that can read and write minutes since midnight."""
+
+    compact_input = compact_output = False
+
+    def to_internal_value(self, value):
+        if self.compact_input and _is_integer(value):
+            if not 0 <= value < 24 * 60:
+                self.fail('invalid', format='minutes since midnight (0-1439)')
+            return minutes_to_time(value)
+        return super().to_internal_value(value)
+
+    def to_representation(self, value):
+        if self.compact_output and isinstance(value, time) and not (value.second or value.microsecond):
+            return time_to_minutes(value)
+        return super().to_representation(value)
+
+
+COMPACT_FIELDS = {
+    serializers.DateField: EpochDayField,
+    serializers.TimeField: MinuteOfDayField,
+}
+
+
+def wants_compact(request):
+    """Return ``(input, output)`` flags for the columnar format on ``request``."""
+    if request is None:
+        return False, False
+    content_type = (getattr(request, 'content_type', '') or '').split(';')[0].strip()
+    renderer = getattr(request, 'accepted_renderer', None)
+    return content_type == MEDIA_TYPE, getattr(renderer, 'media_type', None) == MEDIA_TYPE
+
+
+class CompactTemporalsMixin:
+    """Use epoch days and minutes of day when the request uses the columnar format."""
+
+    def get_fields(self):
+        fields = super().get_fields()
+        compact_input, compact_output = wants_compact(self.context.get('request'))
+        if not (compact_input or compact_output):
+            return fields
+        for name, field in fields.items():
+            compact_class = COMPACT_FIELDS.get(type(field))
+            if compact_class is not None:
+                field = fields[name] = compact_class(*field._args, **field._kwargs)
+                field.compact_input, field.compact_output = compact_input, compact_output
+        return fields
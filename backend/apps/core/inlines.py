@@ -0,0 +1,54 @@
+"""
+Admin inlines that edit one page of related rows at a time.
+"""
+from django.contrib import admin
+from django.forms.models import BaseInlineFormSet
+
+
+class PaginatedInlineFormSet(BaseInlineFormSet):
+    """Inline formset limited to ``per_page`` existing rows."""
+
+    per_page = 20
+    page = 1
+    page_param = 'page'
+
+    def get_queryset(self):
+        if not hasattr(self, '_queryset'):
+            queryset = super().get_queryset()
+            start = (self.page - 1) * self.per_page
+            # One extra row tells us whether there is a next page without a COUNT.
+            rows = list(queryset[start : start + self.per_page + 1])
+            self.has_next = len(rows) > self.per_page
+            self.has_previous = self.page > 1
+            # The formset only needs len(), iteration and indexing, so the
+            # fetched rows stand in for the queryset.
+            self._queryset = rows[: self.per_page]
+        return self._queryset
+
+
+class PaginatedTabularInline(admin.TabularInline):
+    """Tabular inline that pages through related rows (``?<model>_page=N``)."""
+
+    formset = PaginatedInlineFormSet
+    template = 'admin/edit_inline/paginated_tabular.html'
+    per_page = 20
+
+    def get_page_param(self):
+        return f'{self.opts.model_name}_page'
+
+    def get_formset(self, request, obj=None, **kwargs):
+        formset = super().get_formset(request, obj, **kwargs)
+        page_param = self.get_page_param()
+        try:
+            page = max(1, int(request.GET.get(page_param, 1)))
+        except ValueError:
+            page = 1
+        return type(
+            formset.__name__,
+            (formset,),
+            {
+                'per_page': self.per_page,
+                'page': page,
+                'page_param': page_param,
+            },
+        )
@@ -0,0 +1,28 @@
+"""
+URL includes whose module is imported on first use instead of at startup.
+
+``include('module')`` imports the module (and everything it imports) while
+the root URLconf loads. ``lazy_include`` keeps the dotted path and lets the
+resolver import it the first time a request reaches that prefix, or when
+``reverse()`` first populates the whole tree.
+"""
+from django.urls import URLResolver
+from django.urls.resolvers import RoutePattern
+
+
+class LazyURLResolver(URLResolver):
+    """A resolver for a URLconf module that hasn't been imported yet."""
+
+    @property
+    def is_loaded(self):
+        return 'urlconf_module' in self.__dict__
+
+
+def lazy_include(route, urlconf_module, namespace=None):
+    """Like ``path(route, include(urlconf_module))`` but without the import."""
+    return LazyURLResolver(
+        RoutePattern(route, is_endpoint=False),
+        urlconf_module,
+        app_name=namespace,
+        namespace=namespace,
+    )
@@ -0,0 +1,124 @@
+"""
+Adaptive load shedding for expensive endpoints.
+
+``LoadMonitorMiddleware`` records how long each request takes and how many
+are in flight in this worker. While the worker is overloaded, requests to
+the scopes in ``LOAD_SHED_SCOPES`` (see ``apps.core.throttling.get_scope``)
+get ``503`` with ``Retry-After`` from ``LoadShedThrottle``, and cheap
+requests keep being served. Overloaded means either:
+
+- the p95 latency of the last ``LOAD_SHED_WINDOW_SECONDS`` is above
+  ``LOAD_SHED_P95_MS`` (with at least ``LOAD_SHED_MIN_SAMPLES`` requests)
+- ``LOAD_SHED_MAX_IN_FLIGHT`` requests are already running. Each running
+  request holds a database connection, so this caps connection use.
+
+Shed requests are not recorded, so the p95 recovers as soon as the slow
+requests age out of the window.
+"""
+import math
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.throttling import BaseThrottle
+
+from .throttling import get_scope
+
+DEFAULT_WINDOW_SECONDS = 30
+DEFAULT_MIN_SAMPLES = 20
+DEFAULT_RETRY_AFTER = 5
+MAX_SAMPLES = 4096
+RECHECK_SECONDS = 1.0
+
+
+class Overloaded(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'The server is busy, please retry later.'
+    default_code = 'overloaded'
+
+    def __init__(self, wait, detail=None, code=None):
+        super().__init__(detail, code)
+        self.wait = wait
+
+
+class LoadMonitor:
+    """Recent request latencies and in-flight count for this process."""
+
+    def __init__(self):
+        self.samples = deque(maxlen=MAX_SAMPLES)
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self._p95 = None
+        self._p95_at = 0.0
+
+    def started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def finished(self, started_at, record=True):
+        now = time.monotonic()
+        with self._lock:
+            self.in_flight -= 1
+        if record:
+            self.samples.append((now, (now - started_at) * 1000))
+
+    def p95(self, now=None):
+        """p95 latency in ms over the window, or ``None`` with too few samples (cached for a second)."""
+        now = time.monotonic() if now is None else now
+        if now - self._p95_at < RECHECK_SECONDS:
+            return self._p95
+        window = getattr(settings, 'LOAD_SHED_WINDOW_SECONDS', DEFAULT_WINDOW_SECONDS)
+        durations = sorted(duration for at, duration in list(self.samples) if at >= now - window)
+        if len(durations) < getattr(settings, 'LOAD_SHED_MIN_SAMPLES', DEFAULT_MIN_SAMPLES):
+            self._p95 = None
+        else:
+            self._p95 = durations[math.ceil(len(durations) * 0.95) - 1]
+        self._p95_at = now
+        return self._p95
+
+    def overloaded(self):
+        max_in_flight = getattr(settings, 'LOAD_SHED_MAX_IN_FLIGHT', None)
+        # This request is in flight too.
+        if max_in_flight and self.in_flight > max_in_flight:
+            return True
+        limit = getattr(settings, 'LOAD_SHED_P95_MS', None)
+        p95 = self.p95() if limit else None
+        return p95 is not None and p95 > limit
+
+    def reset(self):
+        with self._lock:
+            self.samples.clear()
+            self._p95, self._p95_at = None, 0.0
+
+
+monitor = LoadMonitor()
+
+
+class LoadMonitorMiddleware:
+    """Feed every request's duration into ``monitor``."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started_at = time.monotonic()
+        monitor.started()
+        try:
+            return self.get_response(request)
+        finally:
+            monitor.finished(started_at, record=not getattr(request, 'load_shed', False))
+
+
+class LoadShedThrottle(BaseThrottle):
+    """Reject expensive requests with 503 while this worker is overloaded."""
+
+    def allow_request(self, request, view):
+        if get_scope(view) not in getattr(settings, 'LOAD_SHED_SCOPES', ()):
+            return True
+        if monitor.overloaded():
+            request._request.load_shed = True
+            raise Overloaded(wait=getattr(settings, 'LOAD_SHED_RETRY_AFTER', DEFAULT_RETRY_AFTER))
+        return True
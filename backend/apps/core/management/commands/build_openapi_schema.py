@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.schema import code_fingerprint, get_artifact_path, read_artifact, write_artifact
+
+
+class Command(BaseCommand):
+    help = 'Generate the OpenAPI schema artifact served by /api/schema/.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', default=None, help='Where to write the artifact (default: OPENAPI_SCHEMA_PATH).'
+        )
+        parser.add_argument(
+            '--check', action='store_true', help='Only verify that the existing artifact matches the current code.'
+        )
+
+    def handle(self, *args, **options):
+        path = options['output'] or get_artifact_path()
+
+        if options['check']:
+            artifact = read_artifact(path)
+            if artifact is None:
+                raise CommandError(f'No schema artifact at {path}.')
+            if artifact.get('fingerprint') != code_fingerprint():
+                raise CommandError(f'Schema artifact {path} is stale; rebuild it.')
+            self.stdout.write(self.style.SUCCESS(f'Schema artifact {path} is up to date'))
+            return
+
+        artifact = write_artifact(path)
+        paths = len(artifact['schema'].get('paths', {}))
+        self.stdout.write(self.style.SUCCESS(f'Wrote schema for {paths} paths to {path}'))
@@ -0,0 +1,44 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.queryplans import DEFAULT_MIN_ROWS, Explainer, format_report
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the SQL of every API read endpoint and propose missing indexes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--analyze',
+            action='store_true',
+            help='Run the statements too (EXPLAIN ANALYZE on PostgreSQL) and report rows and timings.',
+        )
+        parser.add_argument(
+            '--min-rows',
+            type=int,
+            default=DEFAULT_MIN_ROWS,
+            help=f'Only flag scans and sorts on tables with at least this many rows (default: {DEFAULT_MIN_ROWS}).',
+        )
+        parser.add_argument('--format', choices=['text', 'json'], default='text', help='Report format (default: text).')
+        parser.add_argument('--output', default=None, help='Write the report to this file instead of stdout.')
+        parser.add_argument('--check', action='store_true', help='Exit with an error if any index is proposed.')
+
+    def handle(self, *args, **options):
+        report = Explainer(analyze=options['analyze'], min_rows=options['min_rows']).run()
+        if options['format'] == 'json':
+            body = json.dumps(report, indent=2, default=str) + '\n'
+        else:
+            body = format_report(report)
+
+        if options['output']:
+            Path(options['output']).write_text(body)
+            self.stdout.write(
+                self.style.SUCCESS(f"Explained {len(report['endpoints'])} requests into {options['output']}")
+            )
+        else:
+            self.stdout.write(body, ending='')
+
+        if options['check'] and report['proposals']:
+            raise CommandError(f"{len(report['proposals'])} index(es) proposed; see the report.")
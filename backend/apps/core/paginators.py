@@ -0,0 +1,44 @@
+"""
+Paginators for tables too large to count exactly on every page view.
+"""
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+# Below this many rows an exact COUNT(*) is cheap enough to keep.
+EXACT_COUNT_THRESHOLD = 10000
+
+
+def estimate_count(queryset):
+    """
+    Return the planner's row estimate for an unfiltered ``queryset``.
+
+    Only Postgres keeps a cheap estimate (``pg_class.reltuples``); ``None``
+    means the caller should count exactly: another database, a filtered
+    queryset, or a table that has never been analyzed.
+    """
+    connection = connections[queryset.db]
+    query = queryset.query
+    if connection.vendor != 'postgresql' or query.where or query.distinct or query.combinator:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [queryset.model._meta.db_table]
+        )
+        row = cursor.fetchone()
+    if row is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+class ApproximateCountPaginator(Paginator):
+    """Use the table estimate instead of ``COUNT(*)`` for large unfiltered lists."""
+
+    exact_count_threshold = EXACT_COUNT_THRESHOLD
+
+    @cached_property
+    def count(self):
+        estimate = estimate_count(self.object_list)
+        if estimate is None or estimate < self.exact_count_threshold:
+            return super().count
+        return estimate
@@ -0,0 +1,52 @@
+"""
+Fast JSON parsing for DRF requests.
+
+``FastJSONParser`` parses UTF-8 bodies with ``orjson`` when it is installed.
+Bodies orjson rejects (malformed JSON, lone surrogates) or could read
+differently (numbers with 19+ digits, which orjson turns into floats) are
+handed to DRF's ``JSONParser``, so results and error messages are the same
+as before.
+"""
+import io
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+from . import columnar
+from .renderers import DIGITS_TO_ZERO
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+UTF8 = {'utf-8', 'utf8'}
+# Integers this long may not fit in 64 bits; runs inside strings only cost a fallback.
+_LONG_NUMBER = b'0' * 19
+
+
+class FastJSONParser(JSONParser):
+    """``JSONParser`` backed by orjson."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or not self.strict or encoding.lower() not in UTF8:
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        if _LONG_NUMBER in body.translate(DIGITS_TO_ZERO):
+            return super().parse(io.BytesIO(body), media_type, parser_context)
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(body), media_type, parser_context)
+
+
+class ColumnarJSONParser(FastJSONParser):
+    """Columnar JSON (see ``apps.core.columnar``)."""
+
+    media_type = columnar.MEDIA_TYPE
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return columnar.unpack(super().parse(stream, media_type, parser_context))
@@ -0,0 +1,205 @@
+"""
+On-demand request profiling.
+
+``ProfilingMiddleware`` profiles a request when any of these is true:
+
+- it carries a profiling token, in the ``X-Profile`` header or the
+  ``_profile`` query parameter. Tokens are minted by admins
+  (``POST /api/profiles/token/``), signed with ``SECRET_KEY``, valid for
+  ``PROFILE_TOKEN_MAX_AGE`` seconds, and limited to paths starting with the
+  prefix they were minted for.
+- it is picked by the ``PROFILE_SAMPLE_RATE`` random sample (0 disables it)
+
+A profiled request runs under ``cProfile``, and every SQL statement is
+recorded with its duration on all database connections. The artifacts are
+written to ``PROFILE_DIR`` and the response carries ``X-Profile-Id``:
+
+- ``<id>.json``: request, status, total and SQL time, the statements, and the
+  top functions by cumulative time
+- ``<id>.prof``: the raw ``pstats`` dump (``snakeviz``, ``python -m pstats``)
+
+Only the newest ``PROFILE_MAX_FILES`` profiles younger than
+``PROFILE_MAX_AGE_DAYS`` are kept. Unprofiled requests cost one header
+lookup, one substring test and, when sampling, one random number.
+"""
+import cProfile
+import io
+import json
+import pstats
+import random
+import re
+import time
+import uuid
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.core import signing
+from django.db import connections
+
+HEADER = 'HTTP_X_PROFILE'
+QUERY_PARAM = '_profile'
+TOKEN_SALT = 'apps.core.profiling'
+DEFAULT_TOKEN_MAX_AGE = 3600
+DEFAULT_MAX_FILES = 200
+DEFAULT_MAX_AGE_DAYS = 7
+TOP_FUNCTIONS = 40
+MAX_PARAMS_LENGTH = 500
+PROFILE_ID_RE = re.compile(r'^[0-9]{8}T[0-9]{6}-[0-9a-f]{8}$')
+
+
+def make_token(path_prefix='/'):
+    """A signed token that allows profiling requests under ``path_prefix``."""
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign(path_prefix)
+
+
+def token_allows(token, path):
+    """Whether ``token`` is valid, unexpired and covers ``path``."""
+    max_age = getattr(settings, 'PROFILE_TOKEN_MAX_AGE', DEFAULT_TOKEN_MAX_AGE)
+    try:
+        prefix = signing.TimestampSigner(salt=TOKEN_SALT).unsign(token, max_age=max_age)
+    except signing.BadSignature:
+        return False
+    return path.startswith(prefix)
+
+
+def profile_dir():
+    return Path(settings.PROFILE_DIR)
+
+
+def profile_path(profile_id, suffix):
+    """Path of one artifact; ``None`` for anything that isn't a profile id."""
+    if not PROFILE_ID_RE.match(profile_id):
+        return None
+    return profile_dir() / f'{profile_id}{suffix}'
+
+
+class QueryRecorder:
+    """``execute_wrapper`` that records every statement and its duration."""
+
+    def __init__(self, alias):
+        self.alias = alias
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(
+                {
+                    'db': self.alias,
+                    'sql': sql,
+                    'params': repr(params)[:MAX_PARAMS_LENGTH],
+                    'many': many,
+                    'duration_ms': round((time.perf_counter() - started) * 1000, 3),
+                }
+            )
+
+
+def _trigger(request):
+    token = request.META.get(HEADER)
+    if token is None and QUERY_PARAM in request.META.get('QUERY_STRING', ''):
+        token = request.GET.get(QUERY_PARAM)
+    if token is not None:
+        return 'token' if token_allows(token, request.path) else None
+    rate = getattr(settings, 'PROFILE_SAMPLE_RATE', 0)
+    if rate and random.random() < rate:
+        return 'sample'
+    return None
+
+
+class ProfilingMiddleware:
+    """Profile requests that ask for it (signed token) or are sampled."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        trigger = _trigger(request)
+        if trigger is None:
+            return self.get_response(request)
+        return self.profile(request, trigger)
+
+    def profile(self, request, trigger):
+        recorders = [QueryRecorder(connection.alias) for connection in connections.all()]
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection, recorder in zip(connections.all(), recorders):
+                stack.enter_context(connection.execute_wrapper(recorder))
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+        duration = time.perf_counter() - started
+
+        profile_id = f'{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}'
+        queries = [query for recorder in recorders for query in recorder.queries]
+        save_profile(
+            profile_id,
+            profiler,
+            {
+                'id': profile_id,
+                'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'trigger': trigger,
+                'method': request.method,
+                'path': request.get_full_path(),
+                'status': response.status_code,
+                'duration_ms': round(duration * 1000, 3),
+                'sql_count': len(queries),
+                'sql_ms': round(sum(query['duration_ms'] for query in queries), 3),
+                'queries': queries,
+            },
+        )
+        response['X-Profile-Id'] = profile_id
+        return response
+
+
+def save_profile(profile_id, profiler, meta):
+    """Write both artifacts for one profile, then apply the retention limits."""
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(directory / f'{profile_id}.prof')
+
+    summary = io.StringIO()
+    pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+    meta['top_functions'] = summary.getvalue()
+    (directory / f'{profile_id}.json').write_text(json.dumps(meta, indent=1, default=str))
+    prune()
+
+
+def list_profiles():
+    """Metadata of the stored profiles, newest first (without statements)."""
+    profiles = []
+    for path in sorted(profile_dir().glob('*.json'), reverse=True):
+        try:
+            meta = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        meta.pop('queries', None)
+        meta.pop('top_functions', None)
+        profiles.append(meta)
+    return profiles
+
+
+def prune(now=None):
+    """Delete profiles beyond ``PROFILE_MAX_FILES`` or older than ``PROFILE_MAX_AGE_DAYS``."""
+    directory = profile_dir()
+    if not directory.is_dir():
+        return
+    now = time.time() if now is None else now
+    max_files = getattr(settings, 'PROFILE_MAX_FILES', DEFAULT_MAX_FILES)
+    max_age = getattr(settings, 'PROFILE_MAX_AGE_DAYS', DEFAULT_MAX_AGE_DAYS) * 86400
+    profile_ids = sorted({path.stem for path in directory.iterdir() if PROFILE_ID_RE.match(path.stem)}, reverse=True)
+    for position, profile_id in enumerate(profile_ids):
+        paths = [directory / f'{profile_id}{suffix}' for suffix in ('.json', '.prof')]
+        try:
+            expired = any(now - path.stat().st_mtime > max_age for path in paths if path.exists())
+        except OSError:
+            continue
+        if position >= max_files or expired:
+            for path in paths:
+                path.unlink(missing_ok=True)
@@ -0,0 +1,430 @@
+"""
+Query plans for the API's read endpoints, and the indexes they are missing.
+
+``explain_endpoints`` calls every GET action of every registered viewset
+in-process (no throttling, as an unscoped admin) with representative query
+strings:
+
+- lists: no parameters, each filter on its own, ``?search=``, each entry of
+  ``ordering_fields``, and every filter combined with every ordering. Filter
+  values are sampled from the first row that has one.
+- detail actions: the first row's primary key
+- the viewset's ``explain_params`` (``{action: [params, ...]}``), for
+  method filters and actions whose required parameters can't be guessed
+
+Every SELECT those requests run is ``EXPLAIN``ed (SQLite and PostgreSQL are
+parsed; other backends get the raw plan). On tables with at least
+``min_rows`` rows, a full scan of a filtered table and a sort that needs a
+temporary structure are flagged. When the flagged table is the viewset's
+own, the request's filter columns followed by the ORDER BY columns become a
+``Meta.indexes`` proposal, unless an existing index already starts with
+them.
+
+Without ``analyze`` the report has no timings or row counts, so runs
+against the same data diff cleanly between releases.
+"""
+import json
+import re
+import time
+from collections import Counter
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.exceptions import FieldDoesNotExist, FieldError
+from django.db import connection, models
+from django.test.utils import override_settings
+from django.urls import URLResolver, get_resolver, reverse
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+DEFAULT_MIN_ROWS = 1000
+SQL_WIDTH = 160
+
+_ALIAS_RE = re.compile(r'"(\w+)"\s+(?:AS\s+)?"?([A-Z]\d+)"?')
+_COLUMN_RE = re.compile(r'(?:"(\w+)"|\b([A-Z]\d+))\."(\w+)"')
+_ORDER_BY_RE = re.compile(r'\bORDER BY (.+?)(?:\bLIMIT\b|\bOFFSET\b|$)')
+_SELECT_LIST_RE = re.compile(r'^SELECT (DISTINCT )?(.+?) FROM ')
+
+
+class StatementRecorder:
+    """``execute_wrapper`` that keeps every SELECT with its parameters."""
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if not many and sql.lstrip()[:6].upper() in ('SELECT', 'WITH'):
+            self.statements.append((sql, tuple(params or ())))
+        return execute(sql, params, many, context)
+
+
+def iter_get_routes(patterns=None, namespace='', seen=None):
+    """``(url name, view callback, detail)`` for every viewset route answering GET."""
+    seen = set() if seen is None else seen
+    for pattern in get_resolver().url_patterns if patterns is None else patterns:
+        if isinstance(pattern, URLResolver):
+            inner = f'{namespace}{pattern.namespace}:' if pattern.namespace else namespace
+            yield from iter_get_routes(pattern.url_patterns, inner, seen)
+            continue
+        actions = getattr(pattern.callback, 'actions', None) or {}
+        name = f'{namespace}{pattern.name}'
+        if 'get' in actions and name not in seen:
+            seen.add(name)
+            yield name, pattern.callback, bool(pattern.pattern.regex.groupindex)
+
+
+def _model(viewset):
+    queryset = getattr(viewset, 'queryset', None)
+    return None if queryset is None else queryset.model
+
+
+def _format_value(value):
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def _sample(model, field_name):
+    """A representative value of ``field_name``: the first row's, by primary key."""
+    try:
+        value = (
+            model._default_manager.exclude(**{f'{field_name}__isnull': True})
+            .order_by('pk')
+            .values_list(field_name, flat=True)
+            .first()
+        )
+    except (FieldError, ValueError):
+        return None
+    return None if value is None else _format_value(value)
+
+
+def _filters(viewset):
+    """``{parameter: filter}`` of the viewset's filterset, if it has one."""
+    backends = getattr(viewset, 'filter_backends', ())
+    if not any(issubclass(backend, DjangoFilterBackend) for backend in backends):
+        return {}
+    view = viewset(action='list', format_kwarg=None, request=None)
+    filterset_class = DjangoFilterBackend().get_filterset_class(view, viewset.queryset)
+    return dict(filterset_class.base_filters) if filterset_class else {}
+
+
+def list_cases(viewset):
+    """Representative query strings for ``viewset``'s list action."""
+    model = _model(viewset)
+    if model is None:
+        return [{}]
+    backends = getattr(viewset, 'filter_backends', ())
+    filter_params = []
+    for param, filter_ in _filters(viewset).items():
+        value = None if filter_.method else _sample(model, filter_.field_name)
+        if value is not None:
+            filter_params.append({param: value})
+
+    cases = [{}, *filter_params]
+    search_fields = getattr(viewset, 'search_fields', None)
+    if search_fields and any(issubclass(backend, SearchFilter) for backend in backends):
+        term = _sample(model, search_fields[0].lstrip('^=@$'))
+        if term:
+            cases.append({SearchFilter.search_param: term[:3]})
+    ordering_fields = getattr(viewset, 'ordering_fields', None)
+    if isinstance(ordering_fields, (list, tuple)) and any(issubclass(backend, OrderingFilter) for backend in backends):
+        orderings = [{OrderingFilter.ordering_param: field} for field in ordering_fields]
+        cases += orderings
+        cases += [{**params, **ordering} for params in filter_params for ordering in orderings]
+    return cases
+
+
+def cases_for(viewset, action):
+    """Every query string to try for one action, without duplicates."""
+    extra = [dict(params) for params in getattr(viewset, 'explain_params', {}).get(action, ())]
+    if action == 'list':
+        cases = list_cases(viewset) + extra
+    else:
+        cases = extra or [{}]
+    unique = {}
+    for params in cases:
+        unique.setdefault(tuple(sorted(params.items())), params)
+    return list(unique.values())
+
+
+class Explainer:
+    """Runs requests, explains their statements and collects index proposals."""
+
+    def __init__(self, analyze=False, min_rows=DEFAULT_MIN_ROWS):
+        self.analyze = analyze
+        self.min_rows = min_rows
+        self.vendor = connection.vendor
+        self.factory = APIRequestFactory()
+        self.user = User(username='explain-endpoints', is_staff=True, is_superuser=True)
+        self.tables = {model._meta.db_table: model for model in apps.get_models(include_auto_created=True)}
+        self.row_counts = {}
+        self.proposals = {}
+
+    def is_large(self, table):
+        if table not in self.row_counts:
+            with connection.cursor() as cursor:
+                cursor.execute(f'SELECT COUNT(*) FROM {connection.ops.quote_name(table)}')
+                self.row_counts[table] = cursor.fetchone()[0]
+        return self.row_counts[table] >= self.min_rows
+
+    # Requests
+
+    def run(self):
+        """Explain every route; return the report as a dict."""
+        endpoints = []
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            for name, callback, detail in iter_get_routes():
+                endpoints += self.run_route(name, callback, detail)
+        endpoints.sort(key=lambda endpoint: endpoint['request'])
+        return {
+            'vendor': self.vendor,
+            'analyze': self.analyze,
+            'min_rows': self.min_rows,
+            'large_tables': sorted(table for table, rows in self.row_counts.items() if rows >= self.min_rows),
+            'endpoints': endpoints,
+            'proposals': self.merged_proposals(),
+        }
+
+    def run_route(self, name, callback, detail):
+        """Explain each case of one route."""
+        viewset = callback.cls
+        action = callback.actions['get']
+        kwargs = {}
+        if detail:
+            model = _model(viewset)
+            pk = model and model._default_manager.order_by('pk').values_list('pk', flat=True).first()
+            if pk is None:
+                return []
+            kwargs[viewset.lookup_url_kwarg or viewset.lookup_field] = pk
+        view = viewset.as_view(callback.actions, **{**callback.initkwargs, 'throttle_classes': []})
+        path = reverse(name, kwargs=kwargs)
+        return [self.run_case(name, view, viewset, path, kwargs, params) for params in cases_for(viewset, action)]
+
+    def run_case(self, name, view, viewset, path, kwargs, params):
+        request = self.factory.get(path, params)
+        force_authenticate(request, user=self.user)
+        target = f'GET {request.get_full_path()}'
+        recorder = StatementRecorder()
+        endpoint = {'route': name, 'request': target, 'status': None, 'statements': []}
+        try:
+            with connection.execute_wrapper(recorder):
+                endpoint['status'] = view(request, **kwargs).status_code
+        except Exception as exc:
+            endpoint['error'] = f'{type(exc).__name__}: {exc}'
+        counts = Counter(recorder.statements)
+        for (sql, sql_params), count in counts.items():
+            statement = self.explain(sql, sql_params)
+            statement['count'] = count
+            endpoint['statements'].append(statement)
+            for finding in statement['findings']:
+                self.propose(viewset, params, finding, target)
+        return endpoint
+
+    # Plans
+
+    def explain(self, sql, params):
+        statement = {'sql': sql, 'plan': [], 'findings': []}
+        try:
+            if self.vendor == 'sqlite':
+                self._explain_sqlite(statement, sql, params)
+            elif self.vendor == 'postgresql':
+                self._explain_postgresql(statement, sql, params)
+            else:
+                with connection.cursor() as cursor:
+                    cursor.execute(f'EXPLAIN {sql}', params)
+                    statement['plan'] = [' '.join(str(column) for column in row) for row in cursor.fetchall()]
+            if self.analyze and self.vendor != 'postgresql':
+                started = time.perf_counter()
+                with connection.cursor() as cursor:
+                    cursor.execute(sql, params)
+                    rows = len(cursor.fetchall())
+                statement['plan'].append(f'(rows={rows}, {(time.perf_counter() - started) * 1000:.2f} ms)')
+        except Exception as exc:
+            statement['plan'] = [f'EXPLAIN failed: {type(exc).__name__}: {exc}']
+        statement['findings'] = [finding for finding in statement['findings'] if self.is_large(finding['table'])]
+        return statement
+
+    def _explain_sqlite(self, statement, sql, params):
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            rows = cursor.fetchall()
+        aliases = {alias: table for table, alias in _ALIAS_RE.findall(sql)}
+        depths = {0: -1}
+        for node, parent, _, detail in rows:
+            depths[node] = depths.get(parent, -1) + 1
+            statement['plan'].append('  ' * depths[node] + detail)
+            words = detail.split()
+            if words[0] == 'SCAN' and ' WHERE ' in sql:
+                table = aliases.get(words[1], words[1])
+                if table in self.tables:
+                    statement['findings'].append({'kind': 'seq-scan', 'table': table, 'columns': []})
+            elif detail.startswith('USE TEMP B-TREE FOR ORDER BY'):
+                self._sort_finding(statement, order_by_columns(sql, aliases))
+
+    def _explain_postgresql(self, statement, sql, params):
+        options = 'ANALYZE, FORMAT JSON' if self.analyze else 'FORMAT JSON'
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN ({options}) {sql}', params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        def walk(node, depth):
+            line = node['Node Type']
+            if 'Index Name' in node:
+                line += f" using {node['Index Name']}"
+            if 'Relation Name' in node:
+                line += f" on {node['Relation Name']}"
+            if 'Sort Key' in node:
+                line += f" by {', '.join(node['Sort Key'])}"
+            if self.analyze and 'Actual Rows' in node:
+                line += f" (rows={node['Actual Rows']}, {node['Actual Total Time']:.2f} ms)"
+            statement['plan'].append('  ' * depth + line)
+            if node['Node Type'] == 'Seq Scan' and 'Filter' in node:
+                statement['findings'].append({'kind': 'seq-scan', 'table': node['Relation Name'], 'columns': []})
+            elif node['Node Type'] in ('Sort', 'Incremental Sort'):
+                self._sort_finding(statement, order_by_columns(' ORDER BY ' + ', '.join(node['Sort Key']), {}))
+            for child in node.get('Plans', ()):
+                walk(child, depth + 1)
+
+        walk(plan[0]['Plan'], 0)
+
+    def _sort_finding(self, statement, columns):
+        if columns and columns[0][0] in self.tables:
+            table = columns[0][0]
+            statement['findings'].append(
+                {
+                    'kind': 'sort',
+                    'table': table,
+                    'columns': [column for column_table, column in columns if column_table == table],
+                }
+            )
+
+    # Proposals
+
+    def propose(self, viewset, params, finding, target):
+        """Turn a finding on the viewset's own table into an index proposal."""
+        model = _model(viewset)
+        if model is None or model._meta.db_table != finding['table']:
+            return
+        filters = _filters(viewset)
+        equality, ranges = [], []
+        for param in sorted(params):
+            filter_ = filters.get(param)
+            if filter_ is None or filter_.method:
+                continue
+            field = _concrete_field(model, filter_.field_name)
+            if field is not None:
+                (equality if filter_.lookup_expr == 'exact' else ranges).append(field.name)
+        ordering = []
+        for column in finding['columns']:
+            field = next((f for f in model._meta.concrete_fields if f.column == column), None)
+            if field is not None:
+                ordering.append(field.name)
+        fields = list(dict.fromkeys(equality + ranges + ordering))
+        if not fields or _is_covered(model, fields):
+            return
+        key = (model._meta.label, tuple(fields))
+        self.proposals.setdefault(key, set()).add(target)
+
+    def merged_proposals(self):
+        """Proposals per model; one that is a prefix of another is folded into it."""
+        requests = {key: set(targets) for key, targets in self.proposals.items()}
+        for label, fields in sorted(requests, key=lambda key: -len(key[1])):
+            longer = next(
+                (
+                    other
+                    for other_label, other in requests
+                    if other_label == label and len(other) > len(fields) and other[: len(fields)] == fields
+                ),
+                None,
+            )
+            if longer is not None:
+                requests[(label, longer)] |= requests.pop((label, fields))
+
+        merged = []
+        for label, fields in sorted(requests):
+            index = models.Index(fields=list(fields))
+            index.set_name_with_model(apps.get_model(label))
+            merged.append(
+                {
+                    'model': label,
+                    'fields': list(fields),
+                    'index': f'models.Index(fields={list(fields)!r}, name={index.name!r})',
+                    'requests': sorted(requests[(label, fields)]),
+                }
+            )
+        return merged
+
+
+def _concrete_field(model, name):
+    try:
+        field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+    return field if getattr(field, 'concrete', False) and not field.many_to_many else None
+
+
+def existing_indexes(model):
+    """Field-name lists of every index ``model`` already has."""
+    opts = model._meta
+    indexed = [[name.lstrip('-') for name in index.fields] for index in opts.indexes if index.fields]
+    indexed += [list(fields) for fields in opts.unique_together]
+    indexed += [list(constraint.fields) for constraint in opts.constraints if getattr(constraint, 'fields', None)]
+    indexed += [[field.name] for field in opts.concrete_fields if field.primary_key or field.unique or field.db_index]
+    return indexed
+
+
+def _is_covered(model, fields):
+    return any(existing[: len(fields)] == fields for existing in existing_indexes(model))
+
+
+def order_by_columns(sql, aliases):
+    """``(table, column)`` pairs of the last ORDER BY in ``sql``."""
+    matches = _ORDER_BY_RE.findall(sql)
+    if not matches:
+        return []
+    columns = []
+    for table, alias, column in _COLUMN_RE.findall(matches[-1]):
+        columns.append((table or aliases.get(alias, alias), column))
+    return columns
+
+
+def shorten(sql):
+    """``sql`` with a long select list elided, cut to ``SQL_WIDTH``."""
+    match = _SELECT_LIST_RE.match(sql)
+    if match and len(match.group(2)) > 40:
+        sql = f'SELECT {match.group(1) or ""}... FROM {sql[match.end():]}'
+    return sql if len(sql) <= SQL_WIDTH else sql[: SQL_WIDTH - 3] + '...'
+
+
+def format_report(report):
+    """Plain-text rendering of ``Explainer.run()``."""
+    lines = [
+        f"Query plans ({report['vendor']}{', analyze' if report['analyze'] else ''}); "
+        f"large tables (>= {report['min_rows']} rows): {', '.join(report['large_tables']) or 'none'}",
+        '',
+    ]
+    for endpoint in report['endpoints']:
+        status = endpoint.get('error') or endpoint['status']
+        lines.append(f"{endpoint['request']}  [{endpoint['route']}] {status}")
+        for statement in endpoint['statements']:
+            repeat = f"  (x{statement['count']})" if statement['count'] > 1 else ''
+            lines.append(f"  {shorten(statement['sql'])}{repeat}")
+            lines += [f'    {line}' for line in statement['plan']]
+            for finding in statement['findings']:
+                columns = f" ({', '.join(finding['columns'])})" if finding['columns'] else ''
+                lines.append(f"    ! {finding['kind']} on {finding['table']}{columns}")
+        lines.append('')
+
+    lines.append('Proposed indexes')
+    if not report['proposals']:
+        lines.append('  none')
+    for proposal in report['proposals']:
+        lines.append(f"  {proposal['model']}: {proposal['index']}")
+        lines += [f'    {request}' for request in proposal['requests']]
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,70 @@
+"""
+Fast JSON rendering for DRF responses.
+
+``FastJSONRenderer`` produces the same bytes as DRF's ``JSONRenderer`` with
+the project's settings (compact separators, unescaped unicode, ``\\u2028``
+and ``\\u2029`` escaped) but encodes with ``orjson`` when it is installed.
+Anything orjson would spell differently goes through DRF's own encoder:
+
+- ``datetime``/``date``/``time``, ``Decimal``, lazy strings and other
+  non-JSON types are converted by DRF's ``JSONEncoder.default``
+- floats that Python writes in exponent form (below 1e-4 or from 1e16) and
+  values orjson rejects (huge ints, non-string keys) re-render with the
+  stdlib encoder
+- indented output (``; indent=N``, the browsable API) uses the stdlib
+
+One deliberate difference: NaN and infinity render as ``null`` instead of
+raising. Without orjson the renderer is DRF's ``JSONRenderer`` unchanged.
+"""
+import re
+
+from rest_framework.renderers import JSONRenderer
+
+from . import columnar
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+# A float token orjson spells differently from ``repr(float)``: exponent
+# notation, or 0.0000x where Python would switch to 1e-05. Matches inside
+# strings only cost a fallback, never a wrong byte.
+_FLOAT_MISMATCH = re.compile(rb'(?:^|[\[:,])-?(?:\d+(?:\.\d+)?e|0\.0000)')
+# Scanning megabytes with the regex costs more than orjson saves, so it only
+# runs when a digit is followed by 'e' (found by folding digits to '0').
+DIGITS_TO_ZERO = bytes.maketrans(b'123456789', b'000000000')
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+
+class FastJSONRenderer(JSONRenderer):
+    """Byte-compatible ``JSONRenderer`` backed by orjson."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=_OPTIONS)
+        except orjson.JSONEncodeError:
+            # Let the stdlib path produce the value (or raise the same error as before).
+            return super().render(data, accepted_media_type, renderer_context)
+        if (b'0e' in ret.translate(DIGITS_TO_ZERO) or b'0.0000' in ret) and _FLOAT_MISMATCH.search(ret):
+            return super().render(data, accepted_media_type, renderer_context)
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class ColumnarJSONRenderer(FastJSONRenderer):
+    """Columnar JSON (see ``apps.core.columnar``)."""
+
+    media_type = columnar.MEDIA_TYPE
+    format = 'columnar'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return super().render(columnar.pack(data), accepted_media_type, renderer_context)
@@ -0,0 +1,130 @@
+"""
+Precomputed OpenAPI schema.
+
+Introspecting every viewset and serializer costs hundreds of milliseconds,
+so the schema is built once — ahead of time by ``build_openapi_schema``, or
+on the first request — and reused for the life of the process. Rendered
+bodies are memoized per format with a content-hash ETag.
+
+The artifact stores a fingerprint of the code it was generated from. At
+startup a stale artifact (the API changed since it was built) is ignored
+with a warning and the schema is generated on first request instead.
+"""
+import hashlib
+import json
+import logging
+import threading
+from pathlib import Path
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Source that shapes the schema; tests and migrations don't.
+FINGERPRINT_EXCLUDE = {'tests', 'migrations', 'management', '__pycache__'}
+
+
+def get_artifact_path():
+    return Path(getattr(settings, 'OPENAPI_SCHEMA_PATH', settings.BASE_DIR / 'openapi-schema.json'))
+
+
+def _source_files():
+    for package in ('apps', 'config'):
+        root = settings.BASE_DIR / package
+        for path in sorted(root.rglob('*.py')):
+            if not FINGERPRINT_EXCLUDE.intersection(path.relative_to(root).parts):
+                yield path
+
+
+def code_fingerprint():
+    """Hash of the API source, library versions and schema settings."""
+    import drf_spectacular
+    import rest_framework
+
+    digest = hashlib.sha256()
+    digest.update(f'{drf_spectacular.__version__}:{rest_framework.VERSION}'.encode())
+    digest.update(repr(sorted(getattr(settings, 'SPECTACULAR_SETTINGS', {}).items())).encode())
+    for path in _source_files():
+        digest.update(str(path.relative_to(settings.BASE_DIR)).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def generate_schema():
+    """Introspect the API and return the schema as a dict."""
+    from drf_spectacular.settings import spectacular_settings
+
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    return generator.get_schema(request=None, public=True)
+
+
+def write_artifact(path=None):
+    """Generate the schema and write it with the current code fingerprint."""
+    path = Path(path or get_artifact_path())
+    artifact = {'fingerprint': code_fingerprint(), 'schema': generate_schema()}
+    path.write_text(json.dumps(artifact, default=str))
+    return artifact
+
+
+def read_artifact(path=None):
+    """Return the stored artifact, or ``None`` if there is none."""
+    path = Path(path or get_artifact_path())
+    try:
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        return None
+
+
+class SchemaCache:
+    """Process-wide memo of the schema and its rendered bodies."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.schema = None
+        self.source = None
+        self._checked = False
+        self._verified_artifact = None
+        self._rendered = {}
+
+    def verify_artifact(self):
+        """Load the artifact if it matches the current code; warn and drop it otherwise."""
+        self._checked = True
+        artifact = read_artifact()
+        if artifact is None:
+            return False
+        if artifact.get('fingerprint') != code_fingerprint():
+            logger.warning(
+                'OpenAPI schema artifact %s is stale; it will be regenerated on first request. '
+                'Run "manage.py build_openapi_schema" as part of the build.',
+                get_artifact_path(),
+            )
+            return False
+        self._verified_artifact = artifact['schema']
+        return True
+
+    def get_schema(self):
+        if self.schema is None:
+            with self._lock:
+                if self.schema is None:
+                    if not self._checked:
+                        self.verify_artifact()
+                    if self._verified_artifact is not None:
+                        self.schema, self.source = self._verified_artifact, 'artifact'
+                    else:
+                        self.schema, self.source = generate_schema(), 'generated'
+        return self.schema
+
+    def render(self, renderer):
+        """Return ``(body, etag)`` for ``renderer``, rendering at most once per format."""
+        key = renderer.media_type
+        if key not in self._rendered:
+            body = renderer.render(self.get_schema(), renderer_context={})
+            etag = '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+            self._rendered[key] = (body, etag)
+        return self._rendered[key]
+
+
+schema_cache = SchemaCache()
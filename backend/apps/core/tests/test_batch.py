@@ -0,0 +1,130 @@
+import pytest
+from django.contrib.auth.models import User
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.employees.models import Availability, Employee, Skill
+from apps.stores.models import Store
+
+BATCH = '/api/batch/'
+
+
+@pytest.fixture
+def api_client():
+    """Pytest fixture for API client."""
+    return APIClient()
+
+
+def new_hire(email='jane.smith@example.com', **extra):
+    return {
+        'first_name': 'Jane',
+        'last_name': 'Smith',
+        'email': email,
+        'phone_number': '555-0101',
+        'hourly_rate': '16.00',
+        'hire_date': '2024-02-01',
+        'birth_date': '1998-03-15',
+        **extra,
+    }
+
+
+@pytest.mark.django_db
+class TestBatch:
+    """Tests for running several requests in one round-trip."""
+
+    def test_new_hire_in_one_request(self, api_client):
+        """Test that later requests can refer to earlier responses."""
+        response = api_client.post(
+            BATCH,
+            [
+                {'method': 'POST', 'path': '/api/skills/', 'body': {'name': 'Register'}},
+                {'method': 'POST', 'path': '/api/skills/', 'body': {'name': 'Stock'}},
+                {'method': 'POST', 'path': '/api/employees/', 'body': new_hire(skill_ids=['$0.id', '$1.id'])},
+                {
+                    'method': 'POST',
+                    'path': '/api/employees/$2.id/availability/',
+                    'body': [
+                        {'day_of_week': 0, 'start_time': '09:00:00', 'end_time': '17:00:00'},
+                        {'day_of_week': 1, 'start_time': '09:00:00', 'end_time': '17:00:00'},
+                    ],
+                },
+                {'method': 'GET', 'path': '/api/employees/$2.id/'},
+            ],
+            format='json',
+        )
+        assert response.status_code == status.HTTP_200_OK
+        results = response.data['responses']
+        assert [result['status'] for result in results] == [201, 201, 201, 201, 200]
+
+        employee = Employee.objects.get(email='jane.smith@example.com')
+        assert set(employee.skills.values_list('name', flat=True)) == {'Register', 'Stock'}
+        assert Availability.objects.filter(employee=employee).count() == 2
+        assert results[4]['body']['id'] == employee.pk
+
+    def test_failure_rolls_back_the_batch(self, api_client):
+        response = api_client.post(
+            BATCH,
+            {
+                'requests': [
+                    {'method': 'POST', 'path': '/api/skills/', 'body': {'name': 'Register'}},
+                    {'method': 'POST', 'path': '/api/employees/', 'body': new_hire(email='not-an-email')},
+                    {'method': 'POST', 'path': '/api/skills/', 'body': {'name': 'Stock'}},
+                ]
+            },
+            format='json',
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['failed'] == 1
+        assert len(response.data['responses']) == 2
+        assert 'email' in response.data['responses'][1]['body']
+        assert not Skill.objects.exists()
+
+        response = api_client.post(BATCH, [{'method': 'GET', 'path': '/api/nowhere/'}], format='json')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_malformed_batches(self, api_client, settings):
+        settings.BATCH_MAX_REQUESTS = 2
+        skill = {'method': 'POST', 'path': '/api/skills/', 'body': {'name': 'Register'}}
+        cases = [
+            ([], None),
+            ([skill] * 3, None),
+            ([skill, {'method': 'TRACE', 'path': '/api/skills/'}], 1),
+            ([{'method': 'GET', 'path': '/admin/'}], 0),
+            ([skill, {'method': 'GET', 'path': '/api/skills/$1.id/'}], 1),
+            ([skill, {'method': 'GET', 'path': '/api/skills/$0.missing/'}], 1),
+            ([{'method': 'POST', 'path': BATCH, 'body': [skill]}], 0),
+        ]
+        for operations, index in cases:
+            response = api_client.post(BATCH, operations, format='json')
+            assert response.status_code == status.HTTP_400_BAD_REQUEST, operations
+            assert response.data.get('index') == index, operations
+        assert not Skill.objects.exists()
+
+    def test_query_budget(self, api_client, settings):
+        settings.BATCH_MAX_QUERIES = 3
+        response = api_client.post(
+            BATCH,
+            [{'method': 'POST', 'path': '/api/skills/', 'body': {'name': f'Skill {n}'}} for n in range(5)],
+            format='json',
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['detail'] == 'The batch ran more than 3 queries.'
+        assert not Skill.objects.exists()
+
+    def test_requests_run_as_the_caller(self, api_client):
+        """Test that store scoping applies to every request in the batch."""
+        mine, other = Store.objects.create(name='Store #1'), Store.objects.create(name='Store #2')
+        manager = User.objects.create_user('manager4', password='pw')
+        mine.managers.add(manager)
+        api_client.force_authenticate(manager)
+
+        response = api_client.post(
+            BATCH,
+            [
+                {'method': 'POST', 'path': '/api/employees/', 'body': new_hire(store=mine.pk)},
+                {'method': 'POST', 'path': '/api/employees/', 'body': new_hire('ann@example.com', store=other.pk)},
+            ],
+            format='json',
+        )
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert response.data['failed'] == 1
+        assert not Employee.objects.exists()
@@ -0,0 +1,124 @@
+import io
+import uuid
+import pytest
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+from apps.core import parsers as fast_parsers
+from apps.core import renderers as fast_renderers
+from apps.core.parsers import FastJSONParser
+from apps.core.renderers import FastJSONRenderer
+from apps.employees.models import Employee, Skill
+
+PAYLOADS = [
+    {'hourly_rate': Decimal('15.50'), 'hire_date': date(2024, 1, 15)},
+    {'created_at': datetime(2024, 2, 3, 5, 0, 0, 123456, tzinfo=dt_timezone.utc)},
+    {'naive': datetime(2024, 2, 3, 5, 0), 'start': time(9, 30), 'gap': timedelta(hours=1)},
+    {'offset': datetime(2024, 2, 3, 5, 0, tzinfo=dt_timezone(timedelta(hours=-5)))},
+    ReturnList([ReturnDict({'b': 1, 'a': [True, None, 2.5]}, serializer=None)], serializer=None),
+    {'name': 'Zoë 👋 "quoted" \\ back\nslash\t\x01', 'sep': 'line para '},
+    {'id': uuid.UUID('12345678-1234-5678-1234-567812345678'), 'lazy': gettext_lazy('Monday')},
+    {'tiny': 1e-05, 'small': 0.00012, 'huge': 1e16, 'big': 1.2345678901234568e17, 'neg': -0.0},
+    {'near': [0.00010000000000000002, 9999999999999998.0, 0.00001234, 12e-7]},
+    {'rate': 0.1 + 0.2, 'whole': 3.0, 'ints': [0, -1, 2**63 - 1]},
+    {'bigint': 2**70},
+    {1: 'int key'},
+    ('tuple', 'value'),
+    [],
+    {},
+    'plain string',
+    42,
+]
+
+
+@pytest.mark.parametrize('data', PAYLOADS)
+def test_render_matches_drf(data):
+    """Test that the fast renderer is byte-identical to DRF's."""
+    assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+@pytest.mark.parametrize('media_type', ['application/json; indent=4', 'application/json; indent=2'])
+def test_indented_output_matches(media_type):
+    """Test that pretty-printed output is unchanged."""
+    data = {'a': [1, 2], 'b': {'c': None}}
+    assert FastJSONRenderer().render(data, media_type) == JSONRenderer().render(data, media_type)
+
+
+def test_none_renders_empty():
+    """Test that ``None`` still renders as an empty body."""
+    assert FastJSONRenderer().render(None) == b''
+
+
+def test_unserializable_raises_same_error():
+    """Test that unsupported objects still raise TypeError."""
+    with pytest.raises(TypeError):
+        FastJSONRenderer().render({'x': object()})
+
+
+def test_falls_back_without_orjson(monkeypatch):
+    """Test that the renderer and parser work when orjson isn't installed."""
+    monkeypatch.setattr(fast_renderers, 'orjson', None)
+    monkeypatch.setattr(fast_parsers, 'orjson', None)
+    data = {'hourly_rate': Decimal('15.50'), 'when': date(2024, 1, 1)}
+    assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+    assert FastJSONParser().parse(io.BytesIO(b'{"a": [1, 2.5]}')) == {'a': [1, 2.5]}
+
+
+@pytest.mark.parametrize(
+    'body',
+    [
+        b'{"a": 1, "b": [true, false, null], "c": "Zo\\u00eb", "d": 1.5e3}',
+        b'{"big": 123456789012345678901234567890}',
+        b'{"dup": 1, "dup": 2}',
+        '{"name": "Zoë"}'.encode(),
+    ],
+)
+def test_parse_matches_drf(body):
+    """Test that parsed values are identical to DRF's parser."""
+    assert FastJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(io.BytesIO(body))
+
+
+@pytest.mark.parametrize('body', [b'{"a": }', b'{"a": NaN}', b'\xff\xfe'])
+def test_parse_errors_match_drf(body):
+    """Test that invalid bodies raise the same ParseError."""
+    with pytest.raises(ParseError) as fast:
+        FastJSONParser().parse(io.BytesIO(body))
+    with pytest.raises(ParseError) as drf:
+        JSONParser().parse(io.BytesIO(body))
+    assert str(fast.value) == str(drf.value)
+
+
+@pytest.mark.django_db
+class TestAPIResponses:
+    """Tests that real API responses are unchanged."""
+
+    def test_employee_detail_bytes_match(self):
+        """Test an employee payload with decimals, dates and datetimes."""
+        skill = Skill.objects.create(name='Register')
+        employee = Employee.objects.create(
+            first_name='Zoë',
+            last_name='Doe',
+            email='zoe@example.com',
+            phone_number='555-0100',
+            hourly_rate=Decimal('15.50'),
+            hire_date=date(2024, 1, 15),
+            birth_date=date(2000, 5, 20),
+        )
+        employee.skills.add(skill)
+
+        response = APIClient().get(f'/api/employees/{employee.id}/', HTTP_ACCEPT='application/json')
+        assert response.content == JSONRenderer().render(response.data)
+        assert response.json()['hourly_rate'] == '15.50'
+
+    def test_json_request_is_parsed(self):
+        """Test that JSON request bodies go through the fast parser."""
+        response = APIClient().post(
+            '/api/skills/', '{"name": "Stock", "description": "Zoë"}'.encode(), content_type='application/json'
+        )
+        assert response.status_code == 201
+        assert Skill.objects.get().description == 'Zoë'
@@ -0,0 +1,137 @@
+import json
+import pstats
+import pytest
+from django.contrib.auth.models import User
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.core import profiling
+from apps.employees.models import Skill
+
+SKILLS = '/api/skills/'
+
+
+@pytest.fixture
+def api_client():
+    """Pytest fixture for API client."""
+    return APIClient()
+
+
+@pytest.fixture(autouse=True)
+def profile_dir(settings, tmp_path):
+    """Store profiles in a temporary directory."""
+    settings.PROFILE_DIR = str(tmp_path / 'profiles')
+    return tmp_path / 'profiles'
+
+
+@pytest.fixture
+def admin_client(api_client):
+    api_client.force_authenticate(User.objects.create_user('ops', password='pw', is_staff=True))
+    return api_client
+
+
+def stored(profile_dir):
+    return sorted(path.name for path in profile_dir.glob('*')) if profile_dir.exists() else []
+
+
+@pytest.mark.django_db
+class TestProfilingMiddleware:
+    """Tests for deciding which requests are profiled and what is stored."""
+
+    def test_plain_requests_are_not_profiled(self, api_client, profile_dir):
+        """Test that requests without a token leave no trace."""
+        response = api_client.get(SKILLS)
+        assert 'X-Profile-Id' not in response
+        assert stored(profile_dir) == []
+
+    def test_token_header(self, api_client, profile_dir):
+        """Test that a signed header stores the profile and the SQL statements."""
+        Skill.objects.create(name='Register')
+        response = api_client.get(SKILLS, HTTP_X_PROFILE=profiling.make_token('/api/'))
+        assert response.status_code == status.HTTP_200_OK
+        profile_id = response['X-Profile-Id']
+        assert stored(profile_dir) == [f'{profile_id}.json', f'{profile_id}.prof']
+
+        meta = json.loads((profile_dir / f'{profile_id}.json').read_text())
+        assert (meta['method'], meta['path'], meta['status'], meta['trigger']) == ('GET', SKILLS, 200, 'token')
+        assert meta['sql_count'] == len(meta['queries']) > 0
+        assert any('employees_skill' in query['sql'] for query in meta['queries'])
+        assert 'cumulative' in meta['top_functions']
+        assert pstats.Stats(str(profile_dir / f'{profile_id}.prof')).total_calls > 0
+
+    def test_token_query_parameter(self, api_client):
+        """Test that the token also works as ?_profile=."""
+        response = api_client.get(SKILLS, {'_profile': profiling.make_token()})
+        assert 'X-Profile-Id' in response
+
+    @pytest.mark.parametrize(
+        'token',
+        [
+            profiling.make_token('/api/employees/'),
+            profiling.make_token('/api/') + 'x',
+            'not-a-token',
+        ],
+    )
+    def test_invalid_tokens_are_ignored(self, api_client, profile_dir, token):
+        """Test tokens for another path, tampered tokens and garbage."""
+        response = api_client.get(SKILLS, HTTP_X_PROFILE=token)
+        assert response.status_code == status.HTTP_200_OK
+        assert 'X-Profile-Id' not in response
+        assert stored(profile_dir) == []
+
+    def test_expired_token(self, api_client, settings):
+        settings.PROFILE_TOKEN_MAX_AGE = -1
+        assert 'X-Profile-Id' not in api_client.get(SKILLS, HTTP_X_PROFILE=profiling.make_token())
+
+    def test_random_sample(self, api_client, settings):
+        """Test that sampled requests are profiled without a token."""
+        settings.PROFILE_SAMPLE_RATE = 1.0
+        meta = api_client.get(SKILLS)
+        assert json.loads((profiling.profile_dir() / f"{meta['X-Profile-Id']}.json").read_text())['trigger'] == 'sample'
+
+    def test_retention(self, api_client, profile_dir, settings):
+        """Test that only the newest PROFILE_MAX_FILES profiles are kept."""
+        settings.PROFILE_MAX_FILES = 2
+        token = profiling.make_token()
+        ids = [api_client.get(SKILLS, HTTP_X_PROFILE=token)['X-Profile-Id'] for _ in range(3)]
+        assert len(stored(profile_dir)) == 4
+        assert [meta['id'] for meta in profiling.list_profiles()] == sorted(ids, reverse=True)[:2]
+
+        profiling.prune(now=1e12)
+        assert stored(profile_dir) == []
+
+
+@pytest.mark.django_db
+class TestProfileAPI:
+    """Tests for the admin-only profile endpoints."""
+
+    def test_admin_only(self, api_client):
+        """Test that anonymous callers can neither list profiles nor mint tokens."""
+        assert api_client.get('/api/profiles/').status_code == status.HTTP_403_FORBIDDEN
+        assert api_client.post('/api/profiles/token/').status_code == status.HTTP_403_FORBIDDEN
+
+    def test_token_list_retrieve_download(self, admin_client):
+        """Test the whole flow: mint a token, profile a request, fetch the artifacts."""
+        response = admin_client.post('/api/profiles/token/', {'path_prefix': '/api/skills/'}, format='json')
+        assert response.data['path_prefix'] == '/api/skills/'
+        profile_id = admin_client.get(SKILLS, HTTP_X_PROFILE=response.data['token'])['X-Profile-Id']
+
+        listing = admin_client.get('/api/profiles/').data
+        assert [meta['id'] for meta in listing] == [profile_id]
+        assert 'queries' not in listing[0]
+
+        detail = admin_client.get(f'/api/profiles/{profile_id}/')
+        assert detail.data['path'] == SKILLS
+        assert 'queries' in detail.data
+
+        download = admin_client.get(f'/api/profiles/{profile_id}/download/')
+        assert download.status_code == status.HTTP_200_OK
+        assert download['Content-Disposition'] == f'attachment; filename="{profile_id}.prof"'
+        assert b''.join(download.streaming_content)
+
+    def test_unknown_profile(self, admin_client):
+        assert admin_client.get('/api/profiles/20260101T000000-deadbeef/').status_code == 404
+        assert admin_client.get('/api/profiles/../settings/').status_code == 404
+
+    def test_token_prefix_must_be_a_path(self, admin_client):
+        response = admin_client.post('/api/profiles/token/', {'path_prefix': 'api'}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
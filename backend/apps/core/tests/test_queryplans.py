@@ -0,0 +1,95 @@
+import json
+import pytest
+from datetime import date, time
+from decimal import Decimal
+from django.core.management import CommandError, call_command
+from apps.core.queryplans import order_by_columns
+from apps.employees import replacements, typeahead
+from apps.employees.models import Availability, Employee
+
+
+@pytest.fixture(autouse=True)
+def fresh_index(monkeypatch):
+    """Keep the replacement and autocomplete indexes built by the run out of other tests."""
+    monkeypatch.setattr(replacements, '_index', replacements.ReplacementIndex())
+    monkeypatch.setattr(typeahead, '_index', None)
+
+
+@pytest.fixture
+def staff():
+    for name in ('Ann', 'Bob'):
+        employee = Employee.objects.create(
+            first_name=name,
+            last_name='Shift',
+            email=f'{name.lower()}@example.com',
+            phone_number='555-0100',
+            hourly_rate=Decimal('16.00'),
+            hire_date=date(2024, 1, 1),
+            birth_date=date(1990, 1, 1),
+        )
+        Availability.objects.create(employee=employee, day_of_week=0, start_time=time(9), end_time=time(17))
+
+
+def explain(**options):
+    path = options.pop('path')
+    call_command('explain_endpoints', format='json', output=str(path), **options)
+    return json.loads(path.read_text())
+
+
+def test_order_by_columns_resolves_aliases():
+    sql = 'SELECT U0."id" FROM "employees_employee" U0 ORDER BY U0."hire_date" DESC, U0."id" ASC LIMIT 10'
+    assert order_by_columns(sql, {'U0': 'employees_employee'}) == [
+        ('employees_employee', 'hire_date'),
+        ('employees_employee', 'id'),
+    ]
+
+
+@pytest.mark.django_db
+class TestExplainEndpoints:
+    """Tests for the query-plan report and its index proposals."""
+
+    def test_flags_unindexed_ordering_and_filters(self, staff, tmp_path):
+        """Test that orderings and filters without an index are proposed, indexed ones aren't."""
+        report = explain(min_rows=0, path=tmp_path / 'plans.json')
+        requests = {endpoint['request']: endpoint for endpoint in report['endpoints']}
+        assert {endpoint['status'] for endpoint in report['endpoints']} == {200}
+        assert 'GET /api/employees/?ordering=hire_date' in requests
+        assert 'GET /api/employees/replacements/?day=2026-01-05&start=09%3A00&end=17%3A00&skills=1' in requests
+
+        findings = [
+            finding
+            for statement in requests['GET /api/employees/?ordering=hire_date']['statements']
+            for finding in statement['findings']
+        ]
+        assert {'kind': 'sort', 'table': 'employees_employee', 'columns': ['hire_date']} in findings
+
+        proposed = {(proposal['model'], tuple(proposal['fields'])) for proposal in report['proposals']}
+        assert ('employees.Employee', ('hire_date',)) in proposed
+        assert ('employees.Availability', ('day_of_week', 'start_time')) in proposed
+        assert not any(fields[0] == 'last_name' for _, fields in proposed)
+        hire_date = next(p for p in report['proposals'] if p['fields'] == ['hire_date'])
+        assert hire_date['index'].startswith("models.Index(fields=['hire_date'], name='employees_e_hire_da_")
+        assert hire_date['requests'] == ['GET /api/employees/?ordering=hire_date']
+
+    def test_small_tables_are_not_flagged(self, staff, tmp_path):
+        report = explain(path=tmp_path / 'plans.json')
+        assert report['proposals'] == []
+        assert not any(
+            statement['findings'] for endpoint in report['endpoints'] for statement in endpoint['statements']
+        )
+
+    def test_text_report_is_stable(self, staff, tmp_path, monkeypatch):
+        """Test that two runs (fresh processes) over the same data produce the same report."""
+        for name in ('first.txt', 'second.txt'):
+            monkeypatch.setattr(replacements, '_index', replacements.ReplacementIndex())
+            monkeypatch.setattr(typeahead, '_index', None)
+            call_command('explain_endpoints', min_rows=0, output=str(tmp_path / name))
+        first = (tmp_path / 'first.txt').read_text()
+        assert first == (tmp_path / 'second.txt').read_text()
+        assert 'GET /api/employees/?ordering=hire_date  [employee-list] 200' in first
+        assert '! sort on employees_employee (hire_date)' in first
+
+    def test_check_fails_on_proposals(self, staff, tmp_path):
+        with pytest.raises(CommandError, match='proposed'):
+            call_command('explain_endpoints', min_rows=0, check=True, output=str(tmp_path / 'plans.txt'))
+        call_command('explain_endpoints', check=True, output=str(tmp_path / 'plans.txt'))
@@ -0,0 +1,113 @@
+import json
+import pytest
+from django.core.management import CommandError, call_command
+from rest_framework.test import APIClient
+from apps.core import schema
+from apps.core.schema import schema_cache
+
+
+@pytest.fixture
+def api_client():
+    """Pytest fixture for API client."""
+    return APIClient()
+
+
+@pytest.fixture(autouse=True)
+def artifact_path(settings, tmp_path):
+    """Point the artifact at a temporary file and start with an empty cache."""
+    settings.OPENAPI_SCHEMA_PATH = str(tmp_path / 'openapi-schema.json')
+    schema_cache.reset()
+    yield tmp_path / 'openapi-schema.json'
+    schema_cache.reset()
+
+
+@pytest.fixture
+def generations(monkeypatch):
+    """Count live schema generations."""
+    calls = []
+    original = schema.generate_schema
+
+    def counting():
+        calls.append(1)
+        return original()
+
+    monkeypatch.setattr(schema, 'generate_schema', counting)
+    return calls
+
+
+@pytest.mark.django_db
+class TestSchemaArtifact:
+    """Tests for building and verifying the schema artifact."""
+
+    def test_build_and_check(self, artifact_path):
+        """Test that the command writes an artifact that then checks clean."""
+        call_command('build_openapi_schema')
+        artifact = json.loads(artifact_path.read_text())
+        assert '/api/employees/' in artifact['schema']['paths']
+        call_command('build_openapi_schema', check=True)
+
+    def test_check_detects_stale_artifact(self, artifact_path):
+        """Test that an artifact from different code fails the check."""
+        call_command('build_openapi_schema')
+        artifact = json.loads(artifact_path.read_text())
+        artifact['fingerprint'] = 'old'
+        artifact_path.write_text(json.dumps(artifact))
+
+        with pytest.raises(CommandError):
+            call_command('build_openapi_schema', check=True)
+        assert schema_cache.verify_artifact() is False
+
+    def test_served_from_artifact(self, api_client, generations):
+        """Test that a verified artifact is served without introspection."""
+        call_command('build_openapi_schema')
+        generations.clear()
+
+        response = api_client.get('/api/schema/')
+        assert response.status_code == 200
+        assert generations == []
+        assert schema_cache.source == 'artifact'
+
+    def test_stale_artifact_is_regenerated(self, api_client, artifact_path, generations):
+        """Test that a stale artifact is ignored in favour of live generation."""
+        artifact_path.write_text(json.dumps({'fingerprint': 'old', 'schema': {'paths': {}}}))
+
+        response = api_client.get('/api/schema/?format=json')
+        assert '/api/employees/' in response.json()['paths']
+        assert schema_cache.source == 'generated'
+
+
+@pytest.mark.django_db
+class TestSchemaServing:
+    """Tests for GET /api/schema/."""
+
+    def test_generated_once_and_cached(self, api_client, generations):
+        """Test that the schema is generated at most once per process."""
+        first = api_client.get('/api/schema/')
+        second = api_client.get('/api/schema/')
+        assert generations == [1]
+        assert first.content == second.content
+        assert first['ETag'] == second['ETag']
+        assert first['Cache-Control'] == 'public, max-age=86400'
+
+    def test_conditional_request(self, api_client):
+        """Test that a matching If-None-Match returns 304."""
+        etag = api_client.get('/api/schema/')['ETag']
+        response = api_client.get('/api/schema/', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert response['ETag'] == etag
+
+    def test_formats_have_own_etags(self, api_client):
+        """Test that YAML and JSON bodies are cached separately."""
+        yaml_response = api_client.get('/api/schema/')
+        json_response = api_client.get('/api/schema/', HTTP_ACCEPT='application/vnd.oai.openapi+json')
+        assert json_response['Content-Type'].startswith('application/vnd.oai.openapi+json')
+        assert yaml_response['ETag'] != json_response['ETag']
+        assert json.loads(json_response.content)['info']['title'] == 'RetailSync Pro API'
+
+    def test_matches_live_output(self, api_client, settings):
+        """Test that the cached body is identical to live generation."""
+        cached = api_client.get('/api/schema/').content
+        settings.DEBUG = True
+        live = api_client.get('/api/schema/')
+        assert 'ETag' not in live
+        assert live.content == cached
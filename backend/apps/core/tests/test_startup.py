@@ -0,0 +1,62 @@
+import importlib
+import pytest
+from django.urls import Resolver404, reverse
+from apps.core.lazy_urls import lazy_include
+from apps.core.warmup import warm_up
+
+
+class TestLazyURLs:
+    """Tests for lazily included URLconfs."""
+
+    def test_module_imported_on_first_match(self):
+        """Test that a lazy include doesn't import its module until a path under it resolves."""
+        resolver = lazy_include('api/', 'config.urls_docs')
+        assert not resolver.is_loaded
+
+        with pytest.raises(Resolver404):
+            resolver.resolve('admin/')
+        assert not resolver.is_loaded
+
+        match = resolver.resolve('api/schema/')
+        assert match.url_name == 'schema'
+        assert resolver.is_loaded
+
+    def test_reverse_reaches_lazy_urls(self):
+        """Test that reversing admin and docs names still works."""
+        assert reverse('admin:index') == '/admin/'
+        assert reverse('schema') == '/api/schema/'
+
+
+@pytest.mark.django_db
+class TestAdminStillServed:
+    """Tests for the admin behind a lazy include."""
+
+    def test_admin_index(self, admin_client):
+        """Test that the lazily included admin serves pages."""
+        assert admin_client.get('/admin/').status_code == 200
+
+
+class TestWarmUp:
+    """Tests for the startup warm-up hook."""
+
+    def test_prepares_api_serializers(self):
+        """Test that warm-up walks the API URLs and builds serializer fields."""
+        report = warm_up()
+        assert report['url_patterns'] > 0
+        assert report['serializers'] >= 5
+
+
+class TestProductionProfile:
+    """Tests for config.settings_production."""
+
+    def test_trims_startup_work(self, monkeypatch):
+        """Test that the production profile skips admin autodiscovery and the browsable API."""
+        monkeypatch.setenv('SECRET_KEY', 'test-only')
+        production = importlib.import_module('config.settings_production')
+
+        assert production.DEBUG is False
+        assert 'django.contrib.admin.apps.SimpleAdminConfig' in production.INSTALLED_APPS
+        assert 'django.contrib.admin' not in production.INSTALLED_APPS
+        assert production.REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] == ['apps.core.renderers.FastJSONRenderer']
+        assert production.DATABASES['default']['CONN_MAX_AGE'] == 600
+        assert production.WARMUP_ON_STARTUP is True
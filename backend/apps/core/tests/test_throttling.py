@@ -0,0 +1,179 @@
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.core import loadshed
+from apps.core.throttling import TokenBucketStore, parse_rate
+
+EMPLOYEES = '/api/employees/'
+SKILLS = '/api/skills/'
+SYNC = '/api/sync/'
+
+
+@pytest.fixture
+def api_client():
+    """Pytest fixture for API client."""
+    return APIClient()
+
+
+@pytest.fixture(autouse=True)
+def throttle_store(settings, tmp_path):
+    """A fresh bucket store and an idle load monitor for every test."""
+    settings.THROTTLE_STORE_PATH = str(tmp_path / 'throttle.sqlite3')
+    loadshed.monitor.reset()
+    yield
+    loadshed.monitor.reset()
+
+
+@pytest.mark.parametrize(
+    'rate, expected',
+    [
+        ('10/s', (10, 10.0)),
+        ('120/min burst 20', (20, 2.0)),
+        ('36 / h', (36, 0.01)),
+        (None, None),
+    ],
+)
+def test_parse_rate(rate, expected):
+    assert parse_rate(rate) == expected
+
+
+@pytest.mark.parametrize('rate', ['10', '10/week', 'fast'])
+def test_parse_rate_rejects(rate):
+    with pytest.raises(ValueError):
+        parse_rate(rate)
+
+
+class TestTokenBucketStore:
+    """Tests for the SQLite-backed buckets."""
+
+    def test_burst_then_refill(self, tmp_path):
+        """Test that a bucket empties, reports the wait and refills at the rate."""
+        store = TokenBucketStore(tmp_path / 'buckets.sqlite3')
+        assert [store.take('k', 3, 1.0, now=100)[0] for _ in range(4)] == [True, True, True, False]
+        assert store.take('k', 3, 1.0, now=100) == (False, 1.0)
+        assert store.take('k', 3, 1.0, now=101.5)[0] is True
+        assert store.take('k', 3, 1.0, now=101.5)[0] is False
+
+    def test_shared_between_stores(self, tmp_path):
+        """Test that two stores on one file (two workers) share a bucket."""
+        path = tmp_path / 'buckets.sqlite3'
+        first, second = TokenBucketStore(path), TokenBucketStore(path)
+        assert first.take('k', 2, 0.1, now=0)[0]
+        assert second.take('k', 2, 0.1, now=0)[0]
+        assert not first.take('k', 2, 0.1, now=0)[0]
+        assert second.take('other', 2, 0.1, now=0)[0]
+
+    def test_prune_drops_full_buckets(self, tmp_path):
+        """Test that refilled buckets are deleted and drained ones kept."""
+        store = TokenBucketStore(tmp_path / 'buckets.sqlite3')
+        store.take('quick', 1, 10.0, now=0)
+        store.take('slow', 1, 0.01, now=0)
+        store.prune(now=1)
+        keys = [row[0] for row in store._connection().execute('SELECT key FROM buckets')]
+        assert keys == ['slow']
+
+
+@pytest.mark.django_db
+class TestThrottling:
+    """Tests for per-scope and per-client API limits."""
+
+    def test_scope_limit_returns_429(self, api_client, settings):
+        """Test that the employee search scope runs out independently of others."""
+        settings.THROTTLE_RATES = {'default': '100/s', 'employee-search': '2/min'}
+        assert api_client.get(EMPLOYEES, {'search': 'a'}).status_code == status.HTTP_200_OK
+        assert api_client.get(EMPLOYEES, {'search': 'b'}).status_code == status.HTTP_200_OK
+
+        response = api_client.get(EMPLOYEES, {'search': 'c'})
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert response['Retry-After'] == '30'
+        assert api_client.get(SKILLS).status_code == status.HTTP_200_OK
+
+    def test_roster_pages_and_sync_have_their_own_scopes(self, api_client, settings):
+        """Test that paging the roster doesn't use up the search budget, and sync is limited as sync."""
+        settings.THROTTLE_RATES = {'default': '100/s', 'employee-search': '1/min', 'sync': '1/min'}
+        for page in (1, 2, 3):
+            assert api_client.get(EMPLOYEES, {'page': page}).status_code != 429
+        assert api_client.get(EMPLOYEES, {'search': 'a'}).status_code == status.HTTP_200_OK
+        assert api_client.get(EMPLOYEES, {'search': 'b'}).status_code == 429
+
+        assert api_client.get(SYNC).status_code == status.HTTP_200_OK
+        assert api_client.get(SYNC).status_code == 429
+
+    def test_clients_have_their_own_buckets(self, api_client, settings):
+        """Test that one client's burst does not throttle another."""
+        settings.THROTTLE_RATES = {'default': '1/min'}
+        assert api_client.get(SKILLS, REMOTE_ADDR='10.0.0.1').status_code == status.HTTP_200_OK
+        assert api_client.get(SKILLS, REMOTE_ADDR='10.0.0.1').status_code == 429
+        assert api_client.get(SKILLS, REMOTE_ADDR='10.0.0.2').status_code == status.HTTP_200_OK
+
+    def test_spoofed_forwarded_for_does_not_reset_the_bucket(self, api_client, settings):
+        """Test that X-Forwarded-For is ignored unless the app is configured to sit behind proxies."""
+        settings.THROTTLE_RATES = {'default': '1/min'}
+        assert api_client.get(SKILLS, REMOTE_ADDR='10.0.0.1').status_code == status.HTTP_200_OK
+        for spoofed in ('10.9.0.1', '10.9.0.2'):
+            response = api_client.get(SKILLS, REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR=spoofed)
+            assert response.status_code == 429
+
+        settings.REST_FRAMEWORK = {**settings.REST_FRAMEWORK, 'NUM_PROXIES': 1}
+        forwarded = {'REMOTE_ADDR': '10.0.0.1', 'HTTP_X_FORWARDED_FOR': '10.9.0.9, 10.9.0.1'}
+        assert api_client.get(SKILLS, **forwarded).status_code == status.HTTP_200_OK
+        assert api_client.get(SKILLS, **forwarded).status_code == 429
+
+    def test_client_overrides(self, api_client, settings):
+        """Test tightening one client and exempting another."""
+        settings.THROTTLE_RATES = {'default': '100/s'}
+        settings.THROTTLE_CLIENT_RATES = {
+            'ip:10.0.4.21': {'employee-search': '1/h'},
+            'ip:10.0.4.22': {'default': None},
+        }
+        assert api_client.get(EMPLOYEES, {'search': 'a'}, REMOTE_ADDR='10.0.4.21').status_code == status.HTTP_200_OK
+        assert api_client.get(EMPLOYEES, {'search': 'b'}, REMOTE_ADDR='10.0.4.21').status_code == 429
+        assert api_client.get(SKILLS, REMOTE_ADDR='10.0.4.21').status_code == status.HTTP_200_OK
+
+        settings.THROTTLE_RATES = {'default': '1/h'}
+        for _ in range(3):
+            assert api_client.get(SKILLS, REMOTE_ADDR='10.0.4.22').status_code == status.HTTP_200_OK
+
+    def test_unavailable_store_fails_open(self, api_client, settings, tmp_path):
+        """Test that requests go through when the store cannot be opened."""
+        settings.THROTTLE_STORE_PATH = str(tmp_path / 'missing' / 'throttle.sqlite3')
+        settings.THROTTLE_RATES = {'default': '1/h'}
+        for _ in range(2):
+            assert api_client.get(SKILLS).status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+class TestLoadShedding:
+    """Tests for 503s on expensive endpoints under load."""
+
+    def test_slow_p95_sheds_expensive_scopes(self, api_client, settings):
+        """Test that a high p95 sheds employee search but not cheap endpoints."""
+        settings.LOAD_SHED_P95_MS = 500
+        for _ in range(settings.LOAD_SHED_MIN_SAMPLES):
+            loadshed.monitor.started()
+            loadshed.monitor.finished(started_at=loadshed.time.monotonic() - 2)
+
+        response = api_client.get(EMPLOYEES, {'search': 'a'})
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response['Retry-After'] == str(settings.LOAD_SHED_RETRY_AFTER)
+        assert api_client.get(SKILLS).status_code == status.HTTP_200_OK
+        assert len(loadshed.monitor.samples) == settings.LOAD_SHED_MIN_SAMPLES + 1
+
+    def test_too_few_samples_do_not_shed(self, api_client, settings):
+        """Test that a handful of slow requests is not enough to shed."""
+        settings.LOAD_SHED_P95_MS = 500
+        loadshed.monitor.started()
+        loadshed.monitor.finished(started_at=loadshed.time.monotonic() - 2)
+        assert api_client.get(EMPLOYEES).status_code == status.HTTP_200_OK
+
+    def test_in_flight_limit(self, api_client, settings):
+        """Test shedding once the worker has too many requests running."""
+        settings.LOAD_SHED_MAX_IN_FLIGHT = 1
+        assert api_client.get(EMPLOYEES, {'search': 'a'}).status_code == status.HTTP_200_OK
+
+        loadshed.monitor.started()
+        try:
+            assert api_client.get(EMPLOYEES, {'search': 'a'}).status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        finally:
+            loadshed.monitor.finished(loadshed.time.monotonic(), record=False)
+        assert api_client.get(EMPLOYEES, {'search': 'a'}).status_code == status.HTTP_200_OK
@@ -0,0 +1,169 @@
+"""
+Token-bucket throttling shared by every worker process on a host.
+
+Buckets live in a small SQLite file (``THROTTLE_STORE_PATH``, WAL mode,
+autocommit) rather than in worker memory, so a client gets one budget no
+matter which worker serves it, and no external service is needed. Taking a
+token is one ``BEGIN IMMEDIATE`` transaction; if the store is locked or
+unavailable the request is let through rather than failed.
+
+Rates are ``'<tokens>/<s|min|h|day>'`` with an optional ``' burst <n>'``:
+``'10/s burst 30'`` refills ten tokens a second into a bucket holding 30.
+Without ``burst`` the bucket holds ``<tokens>``. ``None`` disables the limit.
+
+A request's scope is ``view.get_throttle_scope()`` when the view defines it
+and it returns one (for scopes that depend on the query string), else
+``view.throttle_scopes[view.action]``, else ``view.throttle_scope``, else
+``'default'``; its client is
+``user:<username>`` for authenticated callers and ``ip:<address>``
+otherwise. The address is ``REMOTE_ADDR``; ``X-Forwarded-For`` is only
+trusted when ``REST_FRAMEWORK['NUM_PROXIES']`` says how many proxies set it,
+so a client cannot get a fresh bucket by sending its own. ``THROTTLE_RATES`` gives the rate per scope and
+``THROTTLE_CLIENT_RATES`` overrides it per client.
+"""
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+from rest_framework.throttling import BaseThrottle
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCOPE = 'default'
+PRUNE_EVERY = 1000
+PERIODS = {'s': 1, 'sec': 1, 'min': 60, 'm': 60, 'h': 3600, 'hour': 3600, 'd': 86400, 'day': 86400}
+RATE_RE = re.compile(r'^\s*(\d+)\s*/\s*([a-z]+)\s*(?:burst\s+(\d+))?\s*$')
+
+
+def parse_rate(rate):
+    """Return ``(capacity, tokens per second)`` for a rate string, or ``None``."""
+    if rate is None:
+        return None
+    match = RATE_RE.match(rate)
+    if match is None or match.group(2) not in PERIODS:
+        raise ValueError(f'Invalid throttle rate {rate!r}')
+    tokens, period, burst = match.groups()
+    return int(burst or tokens), int(tokens) / PERIODS[period]
+
+
+class TokenBucketStore:
+    """Token buckets in a SQLite file, safe to share between processes."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._local = threading.local()
+        self._calls = 0
+
+    def _connection(self):
+        # One connection per thread, reopened after a fork.
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=0.1, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=OFF')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS buckets ('
+                'key TEXT PRIMARY KEY, tokens REAL NOT NULL, stamp REAL NOT NULL, full_at REAL NOT NULL)'
+            )
+            self._local.connection, self._local.pid = connection, os.getpid()
+        return connection
+
+    def take(self, key, capacity, rate, cost=1, now=None):
+        """
+        Take ``cost`` tokens from ``key``'s bucket.
+
+        Returns ``(allowed, seconds until enough tokens)``.
+        """
+        now = time.time() if now is None else now
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            row = connection.execute('SELECT tokens, stamp FROM buckets WHERE key = ?', (key,)).fetchone()
+            tokens = capacity if row is None else min(capacity, row[0] + max(0.0, now - row[1]) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            connection.execute(
+                'INSERT OR REPLACE INTO buckets (key, tokens, stamp, full_at) VALUES (?, ?, ?, ?)',
+                (key, tokens, now, now + (capacity - tokens) / rate),
+            )
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        self._calls += 1
+        if self._calls % PRUNE_EVERY == 0:
+            self.prune(now)
+        return allowed, 0.0 if allowed else (cost - tokens) / rate
+
+    def prune(self, now=None):
+        """Drop buckets that have refilled completely (a missing bucket is a full one)."""
+        now = time.time() if now is None else now
+        self._connection().execute('DELETE FROM buckets WHERE full_at <= ?', (now,))
+
+    def reset(self):
+        """Forget every bucket."""
+        self._connection().execute('DELETE FROM buckets')
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store():
+    """The ``TokenBucketStore`` for ``THROTTLE_STORE_PATH``."""
+    path = settings.THROTTLE_STORE_PATH
+    store = _stores.get(path)
+    if store is None:
+        with _stores_lock:
+            store = _stores.setdefault(path, TokenBucketStore(path))
+    return store
+
+
+def get_scope(view):
+    """Throttle scope of ``view`` for its current action."""
+    hook = getattr(view, 'get_throttle_scope', None)
+    scope = hook() if hook is not None else None
+    if scope:
+        return scope
+    scopes = getattr(view, 'throttle_scopes', None) or {}
+    return scopes.get(getattr(view, 'action', None)) or getattr(view, 'throttle_scope', None) or DEFAULT_SCOPE
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Limit each client per scope; excess requests get 429 with ``Retry-After``."""
+
+    def get_client(self, request):
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            return f'user:{user.get_username()}'
+        return f'ip:{self.get_ident(request)}'
+
+    def get_rate(self, scope, client):
+        overrides = getattr(settings, 'THROTTLE_CLIENT_RATES', {}).get(client, {})
+        if scope in overrides:
+            return overrides[scope]
+        rates = getattr(settings, 'THROTTLE_RATES', {})
+        return rates.get(scope, rates.get(DEFAULT_SCOPE))
+
+    def allow_request(self, request, view):
+        self.retry_after = None
+        scope = get_scope(view)
+        client = self.get_client(request)
+        limit = parse_rate(self.get_rate(scope, client))
+        if limit is None:
+            return True
+        capacity, rate = limit
+        try:
+            allowed, self.retry_after = get_store().take(f'{scope}|{client}', capacity, rate)
+        except sqlite3.Error:
+            logger.warning('Throttle store unavailable, letting %s through', client, exc_info=True)
+            return True
+        return allowed
+
+    def wait(self):
+        return self.retry_after
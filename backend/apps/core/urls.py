@@ -0,0 +1,11 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import BatchView, ProfileViewSet
+
+router = DefaultRouter()
+router.register(r'profiles', ProfileViewSet, basename='profile')
+
+urlpatterns = [
+    path('batch/', BatchView.as_view(), name='batch'),
+    path('', include(router.urls)),
+]
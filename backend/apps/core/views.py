@@ -0,0 +1,160 @@
+import json
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import SpectacularAPIView
+from rest_framework import serializers, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+
+from . import batch, profiling
+from .parsers import ColumnarJSONParser
+from .renderers import ColumnarJSONRenderer
+from .schema import schema_cache
+
+DEFAULT_SCHEMA_MAX_AGE = 86400
+
+
+class ColumnarFormatMixin:
+    """Offer the columnar JSON format (``apps.core.columnar``) next to the defaults."""
+
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, ColumnarJSONRenderer]
+    parser_classes = [*api_settings.DEFAULT_PARSER_CLASSES, ColumnarJSONParser]
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    """
+    Serve the precomputed OpenAPI schema (see ``apps.core.schema``).
+
+    Responses carry a content-hash ETag and long-lived cache headers, and a
+    matching ``If-None-Match`` gets 304. In DEBUG, and for per-request
+    variants (``?lang=``, ``?version=``), the schema is generated live.
+    """
+
+    def _get_schema_response(self, request):
+        if settings.DEBUG or request.GET.get('lang') or request.GET.get('version'):
+            return super()._get_schema_response(request)
+
+        renderer = request.accepted_renderer
+        body, etag = schema_cache.render(renderer)
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = HttpResponseNotModified()
+        else:
+            content_type = renderer.media_type
+            if renderer.charset:
+                content_type = f'{content_type}; charset={renderer.charset}'
+            response = HttpResponse(body, content_type=content_type)
+            response['Content-Disposition'] = f'inline; filename="{self._get_filename(request, None)}"'
+
+        max_age = getattr(settings, 'OPENAPI_SCHEMA_MAX_AGE', DEFAULT_SCHEMA_MAX_AGE)
+        response['ETag'] = etag
+        response['Cache-Control'] = f'public, max-age={max_age}'
+        response['Vary'] = 'Accept'
+        return response
+
+
+class ProfileTokenSerializer(serializers.Serializer):
+    path_prefix = serializers.RegexField(r'^/', required=False, default='/api/')
+
+
+@extend_schema(exclude=True)
+class ProfileViewSet(viewsets.ViewSet):
+    """
+    Stored request profiles (see ``apps.core.profiling``). Admin only.
+
+    - List: GET /api/profiles/
+    - Retrieve: GET /api/profiles/{id}/ (with the SQL statements)
+    - Download: GET /api/profiles/{id}/download/ (``pstats`` dump)
+    - Token: POST /api/profiles/token/ ``{"path_prefix": "/api/employees/"}``
+    """
+
+    permission_classes = [IsAdminUser]
+    lookup_value_regex = r'[0-9]{8}T[0-9]{6}-[0-9a-f]{8}'
+
+    def list(self, request):
+        return Response(profiling.list_profiles())
+
+    def _artifact(self, pk, suffix):
+        path = profiling.profile_path(pk, suffix)
+        if path is None or not path.is_file():
+            raise Http404
+        return path
+
+    def retrieve(self, request, pk=None):
+        return Response(json.loads(self._artifact(pk, '.json').read_text()))
+
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        path = self._artifact(pk, '.prof')
+        return FileResponse(path.open('rb'), as_attachment=True, filename=path.name)
+
+    @action(detail=False, methods=['post'])
+    def token(self, request):
+        params = ProfileTokenSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+        prefix = params.validated_data['path_prefix']
+        return Response(
+            {
+                'token': profiling.make_token(prefix),
+                'path_prefix': prefix,
+                'expires_in': getattr(settings, 'PROFILE_TOKEN_MAX_AGE', profiling.DEFAULT_TOKEN_MAX_AGE),
+            }
+        )
+
+
+class BatchOperationSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(choices=sorted(batch.METHODS))
+    path = serializers.CharField(help_text='e.g. /api/employees/$0.id/availability/')
+    body = serializers.JSONField(required=False)
+
+
+class BatchResultSerializer(serializers.Serializer):
+    status = serializers.IntegerField()
+    body = serializers.JSONField(allow_null=True)
+
+
+class BatchResponseSerializer(serializers.Serializer):
+    responses = BatchResultSerializer(many=True)
+    failed = serializers.IntegerField(required=False, help_text='Index of the request that failed.')
+    detail = serializers.CharField(required=False)
+
+
+class BatchView(APIView):
+    """
+    Run several API requests in order, in one transaction (see ``apps.core.batch``).
+
+    - POST /api/batch/ with a list of ``{"method", "path", "body"}``, or
+      ``{"requests": [...]}``
+
+    Returns 200 with every response when all succeeded. Otherwise nothing is
+    saved and the status is that of the request that failed.
+    """
+
+    throttle_scope = 'batch'
+    batchable = False
+
+    @extend_schema(request=BatchOperationSerializer(many=True), responses={200: BatchResponseSerializer})
+    def post(self, request):
+        operations = request.data
+        if isinstance(operations, dict):
+            operations = operations.get('requests')
+        try:
+            results, failed = batch.run(request, operations)
+        except batch.BatchError as exc:
+            detail = {'detail': str(exc)}
+            if exc.index is not None:
+                detail['index'] = exc.index
+            return Response(detail, status=status.HTTP_400_BAD_REQUEST)
+        except batch.QueryBudgetExceeded as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        if failed is None:
+            return Response({'responses': results})
+        return Response(
+            {'detail': f'Request {failed} failed; nothing was saved.', 'failed': failed, 'responses': results},
+            status=results[failed]['status'],
+        )
@@ -0,0 +1,71 @@
+"""
+Optional warm-up before a worker accepts traffic (``WARMUP_ON_STARTUP``).
+
+Compiles the URL patterns of every eagerly included URLconf and builds the
+fields of each API view's serializers (which imports and caches everything
+DRF's model introspection needs), so the first real request doesn't pay for
+it. Lazily included URLconfs (admin, docs) are left alone. No database
+connection is opened, so this is safe in a server that preloads the app
+before forking.
+"""
+import logging
+import time
+
+from django.urls import URLPattern, URLResolver, get_resolver
+
+from .lazy_urls import LazyURLResolver
+
+logger = logging.getLogger(__name__)
+
+
+def _walk(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, LazyURLResolver):
+            continue
+        pattern.pattern.regex  # compiled and cached on first access
+        if isinstance(pattern, URLResolver):
+            yield from _walk(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern):
+            yield pattern
+
+
+def _serializer_classes(callback):
+    view_class = getattr(callback, 'cls', None)
+    if view_class is None or not hasattr(view_class, 'get_serializer_class'):
+        return set()
+    actions = getattr(callback, 'actions', None) or {}
+    classes = set()
+    for action in set(actions.values()) or {None}:
+        view = view_class(**getattr(callback, 'initkwargs', {}))
+        view.action = action
+        view.request = None
+        view.format_kwarg = None
+        try:
+            classes.add(view.get_serializer_class())
+        except Exception:
+            logger.debug('Skipping serializer warm-up for %s.%s', view_class.__name__, action)
+    return classes
+
+
+def warm_up():
+    """Prepare this process for its first request. Returns a small report."""
+    started = time.perf_counter()
+    views = 0
+    serializers = set()
+    for pattern in _walk(get_resolver().url_patterns):
+        views += 1
+        serializers |= _serializer_classes(pattern.callback)
+
+    for serializer_class in serializers:
+        try:
+            serializer_class().fields
+        except Exception:
+            logger.debug('Skipping serializer warm-up for %s', serializer_class.__name__)
+
+    report = {
+        'url_patterns': views,
+        'serializers': len(serializers),
+        'seconds': round(time.perf_counter() - started, 3),
+    }
+    logger.info('Warm-up finished: %s', report)
+    return report
@@ -0,0 +1,24 @@
+from django.contrib import admin
+from apps.stores.scoping import StoreScopedAdminMixin
+from .models import DemandImport, DemandWeek
+
+
+@admin.register(DemandImport)
+class DemandImportAdmin(admin.ModelAdmin):
+    """Admin interface for ingested POS exports."""
+
+    list_display = ['source', 'format', 'rows', 'skipped', 'weeks', 'updated_at']
+    list_filter = ['format']
+    search_fields = ['source']
+    readonly_fields = ['source', 'checksum', 'format', 'rows', 'skipped', 'errors', 'weeks', 'created_at', 'updated_at']
+
+
+@admin.register(DemandWeek)
+class DemandWeekAdmin(StoreScopedAdminMixin, admin.ModelAdmin):
+    """Admin interface for store-week demand arrays."""
+
+    list_display = ['store', 'week_start', 'skill', 'updated_at']
+    list_filter = ['store', 'skill']
+    date_hierarchy = 'week_start'
+    exclude = ['transactions', 'sales']
+    readonly_fields = ['store', 'skill', 'week_start', 'updated_at']
@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class DemandConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.demand'
+    verbose_name = 'Demand'
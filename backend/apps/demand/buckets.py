@@ -0,0 +1,48 @@
+"""
+Fixed-size demand arrays: one value per 15-minute bucket of a store week.
+
+A week starts on Monday at 00:00 store-local time, so bucket ``n`` is day
+``n // 96`` at minute ``(n % 96) * 15``. Transaction counts are stored as
+little-endian int32 and sales as little-endian float64, 2.6 KB and 5.3 KB
+per week.
+"""
+import sys
+from array import array
+
+BUCKET_MINUTES = 15
+BUCKETS_PER_DAY = 24 * 60 // BUCKET_MINUTES
+BUCKETS_PER_WEEK = 7 * BUCKETS_PER_DAY
+WEEK_MINUTES = 7 * 24 * 60
+
+COUNT_TYPE = 'i'
+AMOUNT_TYPE = 'd'
+
+
+def zeros(typecode):
+    return array(typecode, bytes(array(typecode).itemsize * BUCKETS_PER_WEEK))
+
+
+def pack(values):
+    """Little-endian bytes of an ``array``."""
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def unpack(typecode, data):
+    """The ``array`` stored by ``pack``; empty data is a week of zeros."""
+    if not data:
+        return zeros(typecode)
+    values = array(typecode)
+    values.frombytes(bytes(data))
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def add_into(target, values):
+    """``target[i] += values[i]`` for every bucket."""
+    for index, value in enumerate(values):
+        if value:
+            target[index] += value
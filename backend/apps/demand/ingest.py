@@ -0,0 +1,353 @@
+"""
+POS export ingestion into 15-minute demand buckets.
+
+An export is CSV (with a header row) or NDJSON, one record per transaction
+or per pre-aggregated interval:
+
+- ``store``: store id or name
+- ``timestamp``: ISO 8601; naive values are store-local, aware ones are
+  converted to the store's timezone
+- ``skill`` (optional): skill id or name the demand is for
+- ``transactions`` (optional, default 1) and ``sales`` (optional, default 0)
+
+``aggregate()`` reads the stream once, in chunks, hashing it as it goes.
+Records are grouped in memory into one pair of arrays per (store, skill,
+week): timestamps are parsed once per distinct hour, so each record costs a
+few dict lookups and two array additions. Bad records are counted and the
+first ``MAX_ERRORS`` kept; they don't stop the import.
+
+``apply()`` then writes in one transaction. An import is keyed by its
+``source``: the same bytes again change nothing, a new version replaces the
+previous version's contributions, and every touched ``DemandWeek`` is
+recomputed as the sum of its contributions, so re-ingesting can never
+double count.
+"""
+import csv
+import hashlib
+import json
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.employees.models import Skill
+from apps.stores.models import Store
+
+from . import buckets
+from .models import DemandContribution, DemandImport, DemandWeek
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+CHUNK_SIZE = 1 << 20
+MAX_ERRORS = 20
+CONTENT_TYPES = {
+    'text/csv': DemandImport.FORMAT_CSV,
+    'application/x-ndjson': DemandImport.FORMAT_NDJSON,
+    'application/ndjson': DemandImport.FORMAT_NDJSON,
+    'application/jsonl': DemandImport.FORMAT_NDJSON,
+}
+EXTENSIONS = {
+    '.csv': DemandImport.FORMAT_CSV,
+    '.ndjson': DemandImport.FORMAT_NDJSON,
+    '.jsonl': DemandImport.FORMAT_NDJSON,
+}
+
+CREATED = 'created'
+REPLACED = 'replaced'
+UNCHANGED = 'unchanged'
+
+
+def format_for_name(name):
+    """Format implied by a file name (``.gz`` is looked through), or ``None``."""
+    name = name.lower().removesuffix('.gz')
+    return next((fmt for suffix, fmt in EXTENSIONS.items() if name.endswith(suffix)), None)
+
+
+def read_lines(stream, digest, chunk_size=CHUNK_SIZE):
+    """Decoded lines of a binary ``stream``, feeding every byte to ``digest``."""
+    pending = b''
+    first = True
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        digest.update(chunk)
+        data = pending + chunk
+        cut = data.rfind(b'\n') + 1
+        pending = data[cut:]
+        if cut:
+            text = data[: cut - 1].decode('utf-8')
+            if first:
+                text, first = text.removeprefix('\ufeff'), False
+            yield from text.split('\n')
+    if pending:
+        text = pending.decode('utf-8')
+        yield text.removeprefix('\ufeff') if first else text
+
+
+def _csv_records(lines):
+    reader = csv.reader(lines)
+    header = [name.strip().lower() for name in next(reader, [])]
+    missing = {'store', 'timestamp'} - set(header)
+    if missing:
+        raise ValueError(f'CSV header must have {", ".join(sorted(missing))}.')
+    store, stamp = header.index('store'), header.index('timestamp')
+    optional = [header.index(name) if name in header else None for name in ('skill', 'transactions', 'sales')]
+    skill, count, amount = optional
+    for line, row in enumerate(reader, start=2):
+        if not row:
+            continue
+        try:
+            yield (
+                line,
+                row[store],
+                row[stamp],
+                row[skill] if skill is not None else None,
+                row[count] or None if count is not None else None,
+                row[amount] or None if amount is not None else None,
+            )
+        except IndexError:
+            yield line, None, None, None, None, None
+
+
+def _ndjson_records(lines):
+    loads = orjson.loads if orjson is not None else json.loads
+    for line, text in enumerate(lines, start=1):
+        if not text.strip():
+            continue
+        try:
+            record = loads(text)
+            yield (
+                line,
+                record.get('store'),
+                record.get('timestamp'),
+                record.get('skill'),
+                record.get('transactions'),
+                record.get('sales'),
+            )
+        except (ValueError, AttributeError):
+            yield line, None, None, None, None, None
+
+
+def _locate_hour(hour, tail, tz):
+    """``(week_start, minutes since week start)`` of the hour starting at ``hour``."""
+    moment = datetime.fromisoformat(f'{hour}:00{tail}')
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(tz)
+    day = moment.date()
+    return day - timedelta(days=day.weekday()), (day.weekday() * 24 + moment.hour) * 60 + moment.minute
+
+
+class Lookup(dict):
+    """Ids by id, id string, name or lower-cased name."""
+
+    def __init__(self, kind, rows):
+        super().__init__()
+        self.kind = kind
+        for pk, name, *extra in rows:
+            value = (pk, *extra) if extra else pk
+            self.update({pk: value, str(pk): value, name: value, name.lower(): value})
+
+    def __missing__(self, key):
+        normalized = str(key).strip().lower()
+        if normalized != key and normalized in self:
+            self[key] = self[normalized]
+            return self[key]
+        raise ValueError(f'Unknown {self.kind} {key!r}.')
+
+
+class Aggregation:
+    """Demand arrays of one export, grouped by (store id, skill id, week start)."""
+
+    def __init__(self, fmt):
+        self.format = fmt
+        self.weeks = {}
+        self.rows = 0
+        self.skipped = 0
+        self.errors = []
+        self.checksum = None
+        self._digest = hashlib.sha256()
+        self._hours = {}
+        self._stores = Lookup(
+            'store',
+            ((store.pk, store.name, ZoneInfo(store.timezone)) for store in Store.objects.only('name', 'timezone')),
+        )
+        self._skills = Lookup('skill', Skill.objects.values_list('pk', 'name'))
+
+    @property
+    def store_ids(self):
+        return {store for store, _, _ in self.weeks}
+
+    def read(self, stream):
+        """Consume a binary stream in this aggregation's format."""
+        lines = read_lines(stream, self._digest)
+        if self.format == DemandImport.FORMAT_CSV:
+            self.feed(_csv_records(lines))
+        else:
+            self.feed(_ndjson_records(lines))
+        self.checksum = self._digest.hexdigest()
+        return self
+
+    def feed(self, records):
+        stores, skills, hours, weeks = self._stores, self._skills, self._hours, self.weeks
+        zeros = buckets.zeros
+        for line, store, stamp, skill, count, amount in records:
+            try:
+                store, tz = stores[store]
+                skill = skills[skill] if skill not in (None, '') else None
+                tail = stamp[16:]
+                if tail[:1] == ':':
+                    tail = tail[3:].lstrip('.0123456789')
+                key = (tz, stamp[:13], tail)
+                hour = hours.get(key)
+                if hour is None:
+                    if stamp[13:14] != ':':
+                        raise ValueError(f'Invalid timestamp {stamp!r}.')
+                    hour = hours[key] = _locate_hour(stamp[:13], tail, tz)
+                week, offset = hour
+                minute = int(stamp[14:16])
+                if minute > 59:
+                    raise ValueError(f'Invalid timestamp {stamp!r}.')
+                offset += minute
+                if offset >= buckets.WEEK_MINUTES:
+                    # Only with offsets that aren't whole hours: the hour started last week.
+                    week, offset = week + timedelta(days=7), offset - buckets.WEEK_MINUTES
+                arrays = weeks.get((store, skill, week))
+                if arrays is None:
+                    arrays = weeks[(store, skill, week)] = (zeros(buckets.COUNT_TYPE), zeros(buckets.AMOUNT_TYPE))
+                bucket = offset // buckets.BUCKET_MINUTES
+                arrays[0][bucket] += 1 if count is None else int(count)
+                if amount is not None:
+                    arrays[1][bucket] += float(amount)
+            except (ValueError, TypeError, OverflowError) as exc:
+                self.skip(line, exc)
+            else:
+                self.rows += 1
+
+    def skip(self, line, exc):
+        self.skipped += 1
+        if len(self.errors) < MAX_ERRORS:
+            message = str(exc) if isinstance(exc, ValueError) and str(exc) else 'Missing or invalid fields.'
+            self.errors.append({'line': line, 'error': message})
+
+
+def aggregate(stream, fmt):
+    """Read one export; nothing is written yet."""
+    return Aggregation(fmt).read(stream)
+
+
+class ForeignSource(Exception):
+    """The source was last imported with rows for stores outside the caller's scope."""
+
+
+def apply(aggregation, source, store_ids=None):
+    """
+    Store ``aggregation`` as the current version of ``source``.
+
+    With ``store_ids``, the previous version may only have contributed to
+    those stores (replacing it deletes those contributions); otherwise
+    ``ForeignSource`` is raised. Returns ``(DemandImport, status)`` with
+    status ``created``, ``replaced`` or ``unchanged``.
+    """
+    with transaction.atomic():
+        previous = DemandImport.objects.select_for_update().filter(source=source).first()
+        if previous is not None and store_ids is not None:
+            if previous.contributions.exclude(store_id__in=store_ids).exists():
+                raise ForeignSource(source)
+        if previous is not None and previous.checksum == aggregation.checksum:
+            return previous, UNCHANGED
+
+        affected = set(aggregation.weeks)
+        demand_import = previous or DemandImport(source=source)
+        if previous is not None:
+            affected.update(previous.contributions.values_list('store_id', 'skill_id', 'week_start'))
+            previous.contributions.all().delete()
+        demand_import.checksum = aggregation.checksum
+        demand_import.format = aggregation.format
+        demand_import.rows = aggregation.rows
+        demand_import.skipped = aggregation.skipped
+        demand_import.errors = aggregation.errors
+        demand_import.weeks = len({(store, week) for store, _, week in aggregation.weeks})
+        demand_import.save()
+
+        DemandContribution.objects.bulk_create(
+            (
+                DemandContribution(
+                    demand_import=demand_import,
+                    store_id=store,
+                    skill_id=skill,
+                    week_start=week,
+                    transactions=buckets.pack(counts),
+                    sales=buckets.pack(amounts),
+                )
+                for (store, skill, week), (counts, amounts) in aggregation.weeks.items()
+            ),
+            batch_size=500,
+        )
+        rebuild_weeks(affected)
+    return demand_import, REPLACED if previous is not None else CREATED
+
+
+def rebuild_weeks(keys):
+    """Recompute the ``DemandWeek`` rows for ``(store id, skill id, week start)`` keys."""
+    if not keys:
+        return
+    stores = {store for store, _, _ in keys}
+    weeks = [week for _, _, week in keys]
+    window = {'store_id__in': stores, 'week_start__range': (min(weeks), max(weeks))}
+
+    totals = {}
+    rows = DemandContribution.objects.filter(**window).values_list(
+        'store_id', 'skill_id', 'week_start', 'transactions', 'sales'
+    )
+    for store, skill, week, counts, amounts in rows.iterator(chunk_size=500):
+        key = (store, skill, week)
+        if key not in keys:
+            continue
+        if key not in totals:
+            totals[key] = (bytes(counts), bytes(amounts))
+            continue
+        summed = totals[key]
+        if isinstance(summed[0], bytes):
+            summed = totals[key] = (
+                buckets.unpack(buckets.COUNT_TYPE, summed[0]),
+                buckets.unpack(buckets.AMOUNT_TYPE, summed[1]),
+            )
+        buckets.add_into(summed[0], buckets.unpack(buckets.COUNT_TYPE, counts))
+        buckets.add_into(summed[1], buckets.unpack(buckets.AMOUNT_TYPE, amounts))
+
+    now = timezone.now()
+    existing = {}
+    for week in DemandWeek.objects.filter(**window).defer('transactions', 'sales'):
+        key = (week.store_id, week.skill_id, week.week_start)
+        if key in keys:
+            existing[key] = week
+    stale = [week.pk for key, week in existing.items() if key not in totals]
+    if stale:
+        DemandWeek.objects.filter(pk__in=stale).delete()
+
+    changed, created = [], []
+    for key, (counts, amounts) in totals.items():
+        counts = counts if isinstance(counts, bytes) else buckets.pack(counts)
+        amounts = amounts if isinstance(amounts, bytes) else buckets.pack(amounts)
+        week = existing.get(key)
+        if week is None:
+            store, skill, week_start = key
+            created.append(
+                DemandWeek(
+                    store_id=store,
+                    skill_id=skill,
+                    week_start=week_start,
+                    transactions=counts,
+                    sales=amounts,
+                )
+            )
+        else:
+            week.transactions, week.sales, week.updated_at = counts, amounts, now
+            changed.append(week)
+    DemandWeek.objects.bulk_update(changed, ['transactions', 'sales', 'updated_at'], batch_size=500)
+    DemandWeek.objects.bulk_create(created, batch_size=500)
@@ -0,0 +1,65 @@
+import gzip
+import sys
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.demand import ingest
+from apps.demand.models import DemandImport
+
+
+class Command(BaseCommand):
+    help = 'Ingest POS transaction exports (CSV or NDJSON, optionally gzipped) into demand buckets.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help="Export files, or '-' for stdin.")
+        parser.add_argument(
+            '--source', default=None, help='Import name (default: the file name). Only with a single path.'
+        )
+        parser.add_argument(
+            '--format',
+            choices=[DemandImport.FORMAT_CSV, DemandImport.FORMAT_NDJSON],
+            default=None,
+            help='Export format (default: from the file extension).',
+        )
+
+    def handle(self, *args, **options):
+        paths = options['paths']
+        if options['source'] and len(paths) > 1:
+            raise CommandError('--source needs exactly one path.')
+
+        for path in paths:
+            source = options['source'] or ('stdin' if path == '-' else Path(path).name)
+            fmt = options['format'] or ingest.format_for_name(path)
+            if fmt is None:
+                raise CommandError(f'Cannot tell the format of {path}; pass --format.')
+
+            started = time.perf_counter()
+            try:
+                with self._open(path) as stream:
+                    aggregation = ingest.aggregate(stream, fmt)
+            except OSError as exc:
+                raise CommandError(f'{path}: {exc}')
+            except (ValueError, UnicodeDecodeError) as exc:
+                raise CommandError(f'{path}: {exc}')
+            demand_import, outcome = ingest.apply(aggregation, source)
+
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'{source}: {outcome}, {aggregation.rows} rows into {demand_import.weeks} store weeks '
+                    f'in {time.perf_counter() - started:.1f}s'
+                )
+            )
+            for error in aggregation.errors:
+                self.stderr.write(f"  line {error['line']}: {error['error']}")
+            if aggregation.skipped > len(aggregation.errors):
+                self.stderr.write(f'  ... {aggregation.skipped} rows skipped in total')
+
+    @staticmethod
+    def _open(path):
+        if path == '-':
+            return open(sys.stdin.fileno(), 'rb', closefd=False)
+        if path.endswith('.gz'):
+            return gzip.open(path, 'rb')
+        return open(path, 'rb')
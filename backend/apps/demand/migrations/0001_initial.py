@@ -0,0 +1,160 @@
+# Generated by Django 5.0.1 on 2026-10-19 04:33
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        ("employees", "0005_availability_exceptions"),
+        ("stores", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DemandImport",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("source", models.CharField(max_length=255, unique=True)),
+                (
+                    "checksum",
+                    models.CharField(help_text="SHA-256 of the ingested bytes", max_length=64),
+                ),
+                (
+                    "format",
+                    models.CharField(choices=[("csv", "CSV"), ("ndjson", "NDJSON")], max_length=10),
+                ),
+                ("rows", models.PositiveIntegerField(default=0)),
+                (
+                    "skipped",
+                    models.PositiveIntegerField(default=0, help_text="Rows that could not be parsed"),
+                ),
+                (
+                    "errors",
+                    models.JSONField(
+                        blank=True,
+                        default=list,
+                        encoder=django.core.serializers.json.DjangoJSONEncoder,
+                    ),
+                ),
+                (
+                    "weeks",
+                    models.PositiveIntegerField(default=0, help_text="Store weeks touched"),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "ordering": ["-updated_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="DemandWeek",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("week_start", models.DateField(help_text="Monday, store-local")),
+                ("transactions", models.BinaryField()),
+                ("sales", models.BinaryField()),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "skill",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Department the demand is for; empty for transactions without one",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="employees.skill",
+                    ),
+                ),
+                (
+                    "store",
+                    models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="stores.store"),
+                ),
+            ],
+            options={
+                "ordering": ["store", "week_start", "skill"],
+            },
+        ),
+        migrations.CreateModel(
+            name="DemandContribution",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("week_start", models.DateField(help_text="Monday, store-local")),
+                ("transactions", models.BinaryField()),
+                ("sales", models.BinaryField()),
+                (
+                    "skill",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Department the demand is for; empty for transactions without one",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="employees.skill",
+                    ),
+                ),
+                (
+                    "store",
+                    models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="stores.store"),
+                ),
+                (
+                    "demand_import",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="contributions",
+                        to="demand.demandimport",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["store", "week_start"],
+                        name="demand_dema_store_i_4dd23b_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="demandweek",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("skill__isnull", False)),
+                fields=("store", "week_start", "skill"),
+                name="demand_week_unique_skill",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="demandweek",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("skill__isnull", True)),
+                fields=("store", "week_start"),
+                name="demand_week_unique_total",
+            ),
+        ),
+    ]
@@ -0,0 +1,97 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+from . import buckets
+
+
+class DemandImport(models.Model):
+    """
+    One ingested POS export, identified by ``source`` (usually its file name).
+
+    Re-ingesting the same bytes is a no-op; a new version of the same source
+    replaces what the previous one contributed.
+    """
+
+    FORMAT_CSV = 'csv'
+    FORMAT_NDJSON = 'ndjson'
+    FORMAT_CHOICES = [
+        (FORMAT_CSV, 'CSV'),
+        (FORMAT_NDJSON, 'NDJSON'),
+    ]
+
+    source = models.CharField(max_length=255, unique=True)
+    checksum = models.CharField(max_length=64, help_text="SHA-256 of the ingested bytes")
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    rows = models.PositiveIntegerField(default=0)
+    skipped = models.PositiveIntegerField(default=0, help_text="Rows that could not be parsed")
+    errors = models.JSONField(default=list, blank=True, encoder=DjangoJSONEncoder)
+    weeks = models.PositiveIntegerField(default=0, help_text="Store weeks touched")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-updated_at']
+
+    def __str__(self):
+        return self.source
+
+
+class DemandArrays(models.Model):
+    """Transactions and sales per 15-minute bucket of one store week (see ``buckets``)."""
+
+    store = models.ForeignKey('stores.Store', on_delete=models.CASCADE)
+    skill = models.ForeignKey(
+        'employees.Skill',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        help_text="Department the demand is for; empty for transactions without one",
+    )
+    week_start = models.DateField(help_text="Monday, store-local")
+    transactions = models.BinaryField()
+    sales = models.BinaryField()
+
+    class Meta:
+        abstract = True
+
+    def transaction_counts(self):
+        return buckets.unpack(buckets.COUNT_TYPE, self.transactions)
+
+    def sales_amounts(self):
+        return buckets.unpack(buckets.AMOUNT_TYPE, self.sales)
+
+
+class DemandContribution(DemandArrays):
+    """What one import added to one store week; kept so a re-import can replace it."""
+
+    demand_import = models.ForeignKey(DemandImport, on_delete=models.CASCADE, related_name='contributions')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['store', 'week_start']),
+        ]
+
+
+class DemandWeek(DemandArrays):
+    """Demand of one store week and skill: the sum of every import's contribution."""
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['store', 'week_start', 'skill']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['store', 'week_start', 'skill'],
+                condition=models.Q(skill__isnull=False),
+                name='demand_week_unique_skill',
+            ),
+            models.UniqueConstraint(
+                fields=['store', 'week_start'],
+                condition=models.Q(skill__isnull=True),
+                name='demand_week_unique_total',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.store} {self.week_start} {self.skill or 'all'}"
@@ -0,0 +1,49 @@
+from drf_spectacular.utils import extend_schema_field
+from rest_framework import serializers
+
+from . import buckets
+from .models import DemandImport, DemandWeek
+
+
+class DemandImportSerializer(serializers.ModelSerializer):
+    """Serializer for ingested POS exports."""
+
+    class Meta:
+        model = DemandImport
+        fields = [
+            'id',
+            'source',
+            'checksum',
+            'format',
+            'rows',
+            'skipped',
+            'errors',
+            'weeks',
+            'created_at',
+            'updated_at',
+        ]
+        read_only_fields = fields
+
+
+class DemandWeekSerializer(serializers.ModelSerializer):
+    """One store week of demand, one value per 15-minute bucket starting Monday 00:00."""
+
+    bucket_minutes = serializers.SerializerMethodField()
+    transactions = serializers.SerializerMethodField()
+    sales = serializers.SerializerMethodField()
+
+    class Meta:
+        model = DemandWeek
+        fields = ['id', 'store', 'skill', 'week_start', 'bucket_minutes', 'transactions', 'sales', 'updated_at']
+        read_only_fields = fields
+
+    def get_bucket_minutes(self, obj) -> int:
+        return buckets.BUCKET_MINUTES
+
+    @extend_schema_field(serializers.ListField(child=serializers.IntegerField()))
+    def get_transactions(self, obj):
+        return obj.transaction_counts().tolist()
+
+    @extend_schema_field(serializers.ListField(child=serializers.FloatField()))
+    def get_sales(self, obj):
+        return [round(amount, 2) for amount in obj.sales_amounts()]
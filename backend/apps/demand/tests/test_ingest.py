@@ -0,0 +1,202 @@
+import gzip
+import json
+import pytest
+from datetime import date
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.demand import buckets
+from apps.demand.models import DemandContribution, DemandImport, DemandWeek
+from apps.employees.models import Skill
+from apps.stores.models import Store
+
+IMPORTS = '/api/demand/imports/'
+WEEK = date(2026, 1, 5)
+
+EXPORT = '\n'.join(
+    [
+        'transaction_id,store,timestamp,skill,sales',
+        't1,Store #1,2026-01-05T09:07:00,,12.50',
+        't2,Store #1,2026-01-05 09:14:59,,7.50',
+        't3,store #1,2026-01-05T09:15:00,Pharmacy,20.00',
+        't4,1,2026-01-11T23:59:00,,1.00',
+    ]
+)
+
+
+@pytest.fixture
+def api_client():
+    """Pytest fixture for API client."""
+    return APIClient()
+
+
+@pytest.fixture
+def stores():
+    Skill.objects.create(name='Pharmacy')
+    return [
+        Store.objects.create(pk=1, name='Store #1', timezone='America/New_York'),
+        Store.objects.create(pk=2, name='Store #2', timezone='America/Los_Angeles'),
+    ]
+
+
+def upload(client, body, source='pos-week1.csv', content_type='text/csv'):
+    return client.post(f'{IMPORTS}?source={source}', body, content_type=content_type)
+
+
+def week(store=1, skill=None, week_start=WEEK):
+    rows = DemandWeek.objects.filter(store_id=store, week_start=week_start)
+    row = rows.get(skill__name=skill) if skill else rows.get(skill__isnull=True)
+    return row.transaction_counts(), row.sales_amounts()
+
+
+def nonzero(values):
+    return {index: value for index, value in enumerate(values) if value}
+
+
+@pytest.mark.django_db
+class TestDemandIngest:
+    """Tests for aggregating POS exports into 15-minute store-week buckets."""
+
+    def test_csv_upload(self, api_client, stores):
+        """Test that transactions land in their store-local 15-minute bucket, per skill."""
+        response = upload(api_client, EXPORT)
+        assert response.status_code == status.HTTP_201_CREATED
+        assert (response.data['status'], response.data['rows'], response.data['weeks']) == ('created', 4, 1)
+
+        counts, sales = week()
+        assert len(counts) == buckets.BUCKETS_PER_WEEK
+        assert nonzero(counts) == {36: 2, 671: 1}
+        assert nonzero(sales) == {36: 20.0, 671: 1.0}
+        assert nonzero(week(skill='Pharmacy')[0]) == {37: 1}
+
+    def test_aware_timestamps_use_the_store_timezone(self, api_client, stores):
+        """Test UTC and offset timestamps, including one that falls in the previous local week."""
+        body = '\n'.join(
+            [
+                'store,timestamp,transactions',
+                '1,2026-01-05T14:07:00Z,3',
+                '2,2026-01-05T17:30:00.250+00:00,1',
+                '1,2026-01-12T04:45:00+00:00,1',
+                '1,2026-01-05T19:40:00+05:30,1',
+            ]
+        )
+        assert upload(api_client, body).status_code == status.HTTP_201_CREATED
+        assert nonzero(week(store=1)[0]) == {36: 4, 671: 1}
+        assert nonzero(week(store=2)[0]) == {38: 1}
+
+    def test_reingesting_is_idempotent(self, api_client, stores):
+        """Test that the same file changes nothing and a new version replaces the old one."""
+        upload(api_client, EXPORT)
+        response = upload(api_client, EXPORT)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['status'] == 'unchanged'
+        assert nonzero(week()[0]) == {36: 2, 671: 1}
+
+        corrected = EXPORT.replace('t2,Store #1,2026-01-05 09:14:59', 't2,Store #1,2026-01-05 10:00:00')
+        response = upload(api_client, corrected)
+        assert (response.status_code, response.data['status']) == (status.HTTP_201_CREATED, 'replaced')
+        assert nonzero(week()[0]) == {36: 1, 40: 1, 671: 1}
+        assert DemandImport.objects.count() == 1
+        assert DemandContribution.objects.count() == 2
+
+    def test_sources_add_up_and_retracted_weeks_disappear(self, api_client, stores):
+        upload(api_client, EXPORT)
+        upload(api_client, 'store,timestamp\n1,2026-01-05T09:00:00\n1,2026-01-19T09:00:00', source='late.csv')
+        assert nonzero(week()[0]) == {36: 3, 671: 1}
+
+        upload(api_client, 'store,timestamp\n1,2026-01-06T09:00:00', source='late.csv')
+        assert nonzero(week()[0]) == {36: 2, 671: 1, 132: 1}
+        assert not DemandWeek.objects.filter(week_start=date(2026, 1, 19)).exists()
+
+    def test_ndjson_upload(self, api_client, stores):
+        body = '\n'.join(
+            json.dumps(record)
+            for record in [
+                {'store': 1, 'timestamp': '2026-01-05T09:07:00', 'skill': 'pharmacy', 'sales': 3.5},
+                {'store': 'Store #1', 'timestamp': '2026-01-05T09:08:00', 'transactions': 0},
+            ]
+        )
+        response = upload(api_client, body, source='pos.ndjson', content_type='application/x-ndjson')
+        assert response.data['format'] == 'ndjson'
+        assert nonzero(week(skill='Pharmacy')[1]) == {36: 3.5}
+        assert nonzero(week()[0]) == {}
+
+    def test_bad_rows_are_skipped(self, api_client, stores):
+        """Test that unparseable rows are reported without failing the import."""
+        body = '\n'.join(
+            [
+                'store,timestamp,skill',
+                '1,2026-01-05T09:07:00,',
+                '9,2026-01-05T09:07:00,',
+                '1,yesterday,',
+                '1,2026-01-05T09:07:00,Bakery',
+                '1',
+            ]
+        )
+        response = upload(api_client, body)
+        assert (response.data['rows'], response.data['skipped']) == (1, 4)
+        assert [error['line'] for error in response.data['errors']] == [3, 4, 5, 6]
+        assert response.data['errors'][0]['error'] == "Unknown store '9'."
+
+    @pytest.mark.parametrize(
+        'body, source, content_type, expected',
+        [
+            (EXPORT, '', 'text/csv', status.HTTP_400_BAD_REQUEST),
+            ('store,when\n1,2026-01-05T09:00:00', 'x.csv', 'text/csv', status.HTTP_400_BAD_REQUEST),
+            (EXPORT, 'x.csv', 'application/xml', status.HTTP_415_UNSUPPORTED_MEDIA_TYPE),
+        ],
+    )
+    def test_rejected_uploads(self, api_client, stores, body, source, content_type, expected):
+        assert upload(api_client, body, source=source, content_type=content_type).status_code == expected
+        assert not DemandImport.objects.exists()
+
+    def test_managers_only_upload_for_their_stores(self, api_client, stores):
+        manager = User.objects.create_user('manager1', password='pw')
+        stores[0].managers.add(manager)
+        api_client.force_authenticate(manager)
+
+        assert upload(api_client, 'store,timestamp\n2,2026-01-05T09:00:00').status_code == status.HTTP_403_FORBIDDEN
+        assert upload(api_client, EXPORT).status_code == status.HTTP_201_CREATED
+        assert api_client.get(IMPORTS).data['count'] == 1
+        assert {row['store'] for row in api_client.get('/api/demand/weeks/').data['results']} == {1}
+
+    def test_managers_cannot_replace_other_stores_sources(self, api_client, stores):
+        """Test that re-using another store's source name does not wipe its demand."""
+        theirs = 'store,timestamp\n2,2026-01-05T09:00:00'
+        assert upload(APIClient(), theirs, source='store2.csv').status_code == status.HTTP_201_CREATED
+        manager = User.objects.create_user('manager1', password='pw')
+        stores[0].managers.add(manager)
+        api_client.force_authenticate(manager)
+
+        response = upload(api_client, EXPORT, source='store2.csv')
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert nonzero(week(store=2)[0]) == {36: 1}
+        assert not DemandWeek.objects.filter(store_id=1).exists()
+
+    def test_read_weeks(self, api_client, stores):
+        upload(api_client, EXPORT)
+        response = api_client.get(
+            '/api/demand/weeks/', {'store': 1, 'week_start': '2026-01-05', 'skill__isnull': 'true'}
+        )
+        assert response.data['count'] == 1
+        result = response.data['results'][0]
+        assert result['bucket_minutes'] == 15
+        assert len(result['transactions']) == len(result['sales']) == 672
+        assert result['transactions'][36] == 2 and result['sales'][36] == 20.0
+
+
+@pytest.mark.django_db
+class TestIngestCommand:
+    """Tests for the ingest_demand management command."""
+
+    def test_gzipped_file(self, stores, tmp_path, capsys):
+        path = tmp_path / 'pos-week1.csv.gz'
+        path.write_bytes(gzip.compress(EXPORT.encode()))
+        call_command('ingest_demand', str(path))
+        call_command('ingest_demand', str(path))
+
+        output = capsys.readouterr().out
+        assert 'pos-week1.csv.gz: created, 4 rows into 1 store weeks' in output
+        assert 'pos-week1.csv.gz: unchanged' in output
+        assert nonzero(week()[0]) == {36: 2, 671: 1}
@@ -0,0 +1,11 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import DemandImportViewSet, DemandWeekViewSet
+
+router = DefaultRouter()
+router.register(r'demand/imports', DemandImportViewSet, basename='demand-import')
+router.register(r'demand/weeks', DemandWeekViewSet, basename='demand-week')
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
@@ -0,0 +1,103 @@
+import io
+
+from django_filters import rest_framework as filters
+from django_filters.rest_framework import DjangoFilterBackend
+from drf_spectacular.utils import OpenApiParameter, OpenApiTypes, extend_schema
+from rest_framework import mixins, status, viewsets
+from rest_framework.exceptions import PermissionDenied, UnsupportedMediaType, ValidationError
+from rest_framework.filters import OrderingFilter
+from rest_framework.response import Response
+
+from apps.stores.scoping import StoreScopedMixin, get_request_store_ids, scope_queryset
+
+from . import ingest
+from .models import DemandImport, DemandWeek
+from .serializers import DemandImportSerializer, DemandWeekSerializer
+
+
+class DemandImportViewSet(mixins.CreateModelMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    POS exports ingested into demand buckets (see ``apps.demand.ingest``).
+
+    - List: GET /api/demand/imports/
+    - Retrieve: GET /api/demand/imports/{id}/
+    - Ingest: POST /api/demand/imports/?source=pos-2026-01.csv with a
+      ``text/csv`` or ``application/x-ndjson`` body, read as a stream
+    """
+
+    queryset = DemandImport.objects.all()
+    serializer_class = DemandImportSerializer
+    filter_backends = [OrderingFilter]
+    ordering_fields = ['updated_at', 'source']
+    ordering = ['-updated_at']
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if get_request_store_ids(self.request) is None:
+            return queryset
+        return scope_queryset(queryset, self.request, 'contributions__store').distinct()
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                'source',
+                OpenApiTypes.STR,
+                required=True,
+                description='Export name; re-sending it replaces the previous version.',
+            )
+        ],
+        request={'text/csv': OpenApiTypes.STR, 'application/x-ndjson': OpenApiTypes.STR},
+        responses={200: DemandImportSerializer, 201: DemandImportSerializer},
+    )
+    def create(self, request, *args, **kwargs):
+        """Aggregate the uploaded export and store it; re-sending the same bytes is a no-op."""
+        source = request.query_params.get('source', '').strip()
+        if not source:
+            raise ValidationError({'source': 'Name the export, e.g. ?source=pos-2026-01.csv.'})
+        content_type = request.content_type.split(';')[0].strip().lower()
+        fmt = ingest.CONTENT_TYPES.get(content_type)
+        if fmt is None:
+            raise UnsupportedMediaType(content_type)
+
+        try:
+            aggregation = ingest.aggregate(request.stream or io.BytesIO(), fmt)
+        except (ValueError, UnicodeDecodeError) as exc:
+            raise ValidationError({'detail': str(exc)})
+        store_ids = get_request_store_ids(request)
+        if store_ids is not None and not aggregation.store_ids <= set(store_ids):
+            raise PermissionDenied('The export has rows for stores you do not have access to.')
+
+        try:
+            demand_import, outcome = ingest.apply(aggregation, source, store_ids)
+        except ingest.ForeignSource:
+            raise PermissionDenied(f'{source!r} was imported with rows for stores you do not have access to.')
+        data = {**self.get_serializer(demand_import).data, 'status': outcome}
+        return Response(data, status=status.HTTP_200_OK if outcome == ingest.UNCHANGED else status.HTTP_201_CREATED)
+
+
+class DemandWeekFilter(filters.FilterSet):
+    """Filter demand by store, skill and week."""
+
+    week_from = filters.DateFilter(field_name='week_start', lookup_expr='gte')
+    week_to = filters.DateFilter(field_name='week_start', lookup_expr='lte')
+
+    class Meta:
+        model = DemandWeek
+        fields = {'store': ['exact'], 'skill': ['exact', 'isnull'], 'week_start': ['exact']}
+
+
+class DemandWeekViewSet(StoreScopedMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Demand per store week: transactions and sales per 15-minute bucket.
+
+    - List: GET /api/demand/weeks/?store=&week_start=&skill=
+      (``?skill__isnull=true`` for demand without a skill)
+    - Retrieve: GET /api/demand/weeks/{id}/
+    """
+
+    queryset = DemandWeek.objects.all()
+    serializer_class = DemandWeekSerializer
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_class = DemandWeekFilter
+    ordering_fields = ['week_start']
+    ordering = ['store', 'week_start', 'skill']
@@ -1,5 +1,9 @@
 from django.contrib import admin
-from .models import Employee, Skill, Availability
+from django.db.models import Exists, OuterRef
+from apps.core.inlines import PaginatedTabularInline
+from apps.core.paginators import ApproximateCountPaginator
+from apps.stores.scoping import StoreScopedAdminMixin
+from .models import Employee, Skill, Availability, AvailabilityException
 
 
 @admin.register(Skill)
@@ -10,35 +14,59 @@ class SkillAdmin(admin.ModelAdmin):
     ordering = ['name']
 
 
-class AvailabilityInline(admin.TabularInline):
-    """Inline admin for employee availability."""
+class SkillListFilter(admin.SimpleListFilter):
+    """Filter employees by skill with EXISTS instead of a join plus DISTINCT."""
+    title = 'skill'
+    parameter_name = 'skill'
+
+    def lookups(self, request, model_admin):
+        return Skill.objects.values_list('id', 'name')
+
+    def queryset(self, request, queryset):
+        if self.value() is None:
+            return queryset
+        links = Employee.skills.through.objects.filter(
+            employee_id=OuterRef('pk'), skill_id=self.value()
+        )
+        return queryset.filter(Exists(links))
+
+
+class AvailabilityInline(PaginatedTabularInline):
+    """Inline admin for employee availability, one page of slots at a time."""
     model = Availability
     extra = 1
+    per_page = 28
     fields = ['day_of_week', 'start_time', 'end_time', 'is_available']
+    # Avoid the default ordering's join back to the employee.
+    ordering = ['day_of_week', 'start_time']
 
 
 @admin.register(Employee)
-class EmployeeAdmin(admin.ModelAdmin):
+class EmployeeAdmin(StoreScopedAdminMixin, admin.ModelAdmin):
     """Admin interface for Employee model."""
     list_display = [
         'full_name',
         'email',
         'hourly_rate',
         'hire_date',
+        'store',
         'is_active',
         'is_minor'
     ]
-    list_filter = ['is_active', 'hire_date', 'skills']
+    list_filter = ['is_active', 'store', 'hire_date', SkillListFilter]
+    list_select_related = ['store']
     search_fields = ['first_name', 'last_name', 'email']
-    filter_horizontal = ['skills']
+    autocomplete_fields = ['store', 'skills']
     inlines = [AvailabilityInline]
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
     
     fieldsets = (
         ('Basic Information', {
             'fields': ('first_name', 'last_name', 'email', 'phone_number')
         }),
         ('Employment Details', {
-            'fields': ('hourly_rate', 'hire_date', 'birth_date', 'skills')
+            'fields': ('store', 'hourly_rate', 'hire_date', 'birth_date', 'skills')
         }),
         ('Status', {
             'fields': ('is_active',)
@@ -46,17 +74,20 @@ class EmployeeAdmin(admin.ModelAdmin):
     )
     
     readonly_fields = ['created_at', 'updated_at']
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_is_minor()
     
+    @admin.display(boolean=True, description='Minor (<18)', ordering='is_under_18')
     def is_minor(self, obj):
         """Display if employee is a minor."""
-        return obj.is_minor()
-    is_minor.boolean = True
-    is_minor.short_description = 'Minor (<18)'
+        return obj.is_under_18
 
 
 @admin.register(Availability)
-class AvailabilityAdmin(admin.ModelAdmin):
+class AvailabilityAdmin(StoreScopedAdminMixin, admin.ModelAdmin):
     """Admin interface for Availability model."""
+    store_field = 'employee__store'
     list_display = [
         'employee',
         'day_of_week',
@@ -65,5 +96,31 @@ class AvailabilityAdmin(admin.ModelAdmin):
         'is_available'
     ]
     list_filter = ['day_of_week', 'is_available']
+    list_select_related = ['employee']
     search_fields = ['employee__first_name', 'employee__last_name']
+    autocomplete_fields = ['employee']
     ordering = ['employee', 'day_of_week', 'start_time']
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(AvailabilityException)
+class AvailabilityExceptionAdmin(StoreScopedAdminMixin, admin.ModelAdmin):
+    """Admin interface for AvailabilityException model."""
+    store_field = 'employee__store'
+    list_display = [
+        'employee',
+        'start_date',
+        'end_date',
+        'start_time',
+        'end_time',
+        'is_available',
+        'reason'
+    ]
+    list_filter = ['is_available']
+    list_select_related = ['employee']
+    search_fields = ['employee__first_name', 'employee__last_name', 'reason']
+    autocomplete_fields = ['employee']
+    ordering = ['-start_date']
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
@@ -0,0 +1,122 @@
+"""
+Set-based bulk updates for employees.
+
+Each operation runs as a handful of ``UPDATE``/through-table statements over
+the target queryset instead of fetching, validating and saving one row at a
+time. Bulk statements skip ``save()`` and ``m2m_changed``, so ``updated_at``
+and the skill masks are updated explicitly to keep ``/api/sync/`` and the
+skill filters consistent.
+"""
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F, Max, Min
+from django.db.models.functions import Round
+from django.utils import timezone
+
+from . import skillmask
+from .models import Employee
+from .signals import bulk_updated
+
+MAX_HOURLY_RATE = Decimal('9999.99')  # max_digits=6, decimal_places=2
+
+
+class BulkUpdateError(ValueError):
+    """Raised when an operation would leave rows in an invalid state."""
+
+
+def _rate_range(queryset, expression=F('hourly_rate')):
+    """Return ``(min, max)`` of ``expression`` across ``queryset``."""
+    bounds = queryset.annotate(_rate=expression).aggregate(low=Min('_rate'), high=Max('_rate'))
+    return bounds['low'], bounds['high']
+
+
+def _format_rate(value):
+    if value is None:
+        return None
+    return str(Decimal(str(value)).quantize(Decimal('0.01')))
+
+
+def _format_range(low, high):
+    return {'min': _format_rate(low), 'max': _format_rate(high)}
+
+
+def _update_rate(queryset, expression, now):
+    before = _rate_range(queryset)
+    low, high = _rate_range(queryset, expression)
+    if low is not None and (low <= 0 or high > MAX_HOURLY_RATE):
+        raise BulkUpdateError(f'Resulting hourly rates must be between 0.01 and {MAX_HOURLY_RATE}.')
+    employee_ids = list(queryset.values_list('pk', flat=True))
+    queryset.update(hourly_rate=expression, updated_at=now)
+    return employee_ids, {'hourly_rate': {'from': _format_range(*before), 'to': _format_range(low, high)}}
+
+
+def _set_field(queryset, data, now):
+    field, value = data['field'], data['value']
+    queryset = queryset.exclude(**{field: value})
+    employee_ids = list(queryset.values_list('pk', flat=True))
+    queryset.update(**{field: value, 'updated_at': now})
+    return employee_ids, {field: {'to': str(value) if isinstance(value, Decimal) else value}}
+
+
+def _add_skill(queryset, data, now):
+    skill = data['skill']
+    through = Employee.skills.through
+    missing = list(queryset.exclude(skills=skill).values_list('pk', flat=True))
+    through.objects.bulk_create(
+        [through(employee_id=pk, skill_id=skill.pk) for pk in missing],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+    Employee.objects.filter(pk__in=missing).update(updated_at=now, **skillmask.add_expressions([skill.pk]))
+    return missing, {'skills': {'added': skill.pk}}
+
+
+def _remove_skill(queryset, data, now):
+    skill = data['skill']
+    through = Employee.skills.through
+    affected = list(queryset.filter(skills=skill).values_list('pk', flat=True))
+    through.objects.filter(skill_id=skill.pk, employee_id__in=affected).delete()
+    Employee.objects.filter(pk__in=affected).update(updated_at=now, **skillmask.remove_expressions([skill.pk]))
+    return affected, {'skills': {'removed': skill.pk}}
+
+
+def apply_bulk_update(queryset, data):
+    """
+    Apply one validated bulk operation to every employee in ``queryset``.
+
+    ``data`` is the ``validated_data`` of ``EmployeeBulkUpdateSerializer``.
+    Returns ``{'matched', 'updated', 'operation', 'changes'}``.
+    """
+    # Re-target by primary key so joins/ordering from filters never reach UPDATE.
+    target = Employee.objects.filter(pk__in=queryset.values('pk'))
+    operation = data['operation']
+    now = timezone.now()
+
+    with transaction.atomic():
+        matched = target.count()
+        if operation == 'set':
+            employee_ids, changes = _set_field(target, data, now)
+        elif operation == 'rate_percent':
+            factor = 1 + data['value'] / Decimal(100)
+            employee_ids, changes = _update_rate(target, Round(F('hourly_rate') * factor, 2), now)
+        elif operation == 'rate_delta':
+            employee_ids, changes = _update_rate(target, Round(F('hourly_rate') + data['value'], 2), now)
+        elif operation == 'add_skill':
+            employee_ids, changes = _add_skill(target, data, now)
+        elif operation == 'remove_skill':
+            employee_ids, changes = _remove_skill(target, data, now)
+        else:  # deactivate
+            target = target.filter(is_active=True)
+            employee_ids = list(target.values_list('pk', flat=True))
+            target.update(is_active=False, updated_at=now)
+            changes = {'is_active': {'to': False}}
+
+        bulk_updated.send(sender=Employee, employee_ids=employee_ids, operation=operation, changes=changes)
+
+    return {
+        'operation': operation,
+        'matched': matched,
+        'updated': len(employee_ids),
+        'changes': changes,
+    }
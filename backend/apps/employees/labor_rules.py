@@ -0,0 +1,76 @@
+"""
+Working-hour limits for minors (NY Labor Law § 142).
+
+Follows the tables in ``docs/compliance/ny-labor-laws.md``. Monday to Friday
+count as school days, so Sunday to Thursday are school nights, and minors
+may not work during ``SCHOOL_HOURS`` on a school day. 14- and 15-year-olds
+may work until 21:00 on non-school days only from June 1 to Labor Day; the
+rest of the year their day ends at 19:00. The school calendar (holidays,
+summer break) is not modelled: every weekday is treated as a school day,
+which only ever makes the limits stricter than the law.
+"""
+from datetime import date, timedelta
+
+EARLIEST_START = 7 * 60
+SCHOOL_DAYS = {0, 1, 2, 3, 4}
+SCHOOL_NIGHTS = {6, 0, 1, 2, 3}
+SCHOOL_HOURS = (8 * 60, 15 * 60)
+
+# age: (max minutes on a school day, max minutes otherwise,
+#       latest end on a school day, latest end otherwise,
+#       whether the stricter end time follows school nights instead of days,
+#       latest end on non-school days from June 1 to Labor Day)
+MINOR_LIMITS = {
+    14: (3 * 60, 8 * 60, 19 * 60, 19 * 60, False, 21 * 60),
+    15: (3 * 60, 8 * 60, 19 * 60, 19 * 60, False, 21 * 60),
+    16: (4 * 60, 8 * 60, 22 * 60, 24 * 60, True, 24 * 60),
+    17: (4 * 60, 8 * 60, 22 * 60, 24 * 60, True, 24 * 60),
+}
+
+
+def age_on(birth_date, day):
+    """Age in whole years on ``day``."""
+    return day.year - birth_date.year - ((day.month, day.day) < (birth_date.month, birth_date.day))
+
+
+def adult_on(birth_date):
+    """The 18th birthday (Feb 28 for Feb 29 births in non-leap years)."""
+    try:
+        return birth_date.replace(year=birth_date.year + 18)
+    except ValueError:
+        return date(birth_date.year + 18, 2, 28)
+
+
+def labor_day(year):
+    """The first Monday in September."""
+    first = date(year, 9, 1)
+    return first + timedelta(days=-first.weekday() % 7)
+
+
+def is_summer(day):
+    """Whether ``day`` falls between June 1 and Labor Day, inclusive."""
+    return date(day.year, 6, 1) <= day <= labor_day(day.year)
+
+
+def minor_may_work(age, day, start, end):
+    """
+    Whether a minor of ``age`` may work ``start``-``end`` (minutes) on ``day``.
+
+    Adults (18+) are always allowed; under-14s never are.
+    """
+    if age >= 18:
+        return True
+    limits = MINOR_LIMITS.get(age)
+    if limits is None:
+        return False
+    school_max, other_max, school_end, other_end, by_night, summer_end = limits
+    weekday = day.weekday()
+    school_day = weekday in SCHOOL_DAYS
+    if school_day and start < SCHOOL_HOURS[1] and end > SCHOOL_HOURS[0]:
+        return False
+    max_minutes = school_max if school_day else other_max
+    if weekday in (SCHOOL_NIGHTS if by_night else SCHOOL_DAYS):
+        latest_end = school_end
+    else:
+        latest_end = summer_end if is_summer(day) else other_end
+    return start >= EARLIEST_START and end <= latest_end and end - start <= max_minutes
@@ -0,0 +1,54 @@
+# Generated by Django 5.0.1 on 2026-10-19 03:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("employees", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Tombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "entity",
+                    models.CharField(
+                        choices=[("skill", "Skill"), ("availability", "Availability")],
+                        max_length=20,
+                    ),
+                ),
+                ("entity_id", models.BigIntegerField()),
+                ("deleted_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ["deleted_at", "id"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="availability",
+            index=models.Index(fields=["updated_at", "id"], name="employees_a_updated_96eee9_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="employee",
+            index=models.Index(fields=["updated_at", "id"], name="employees_e_updated_bf1262_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="skill",
+            index=models.Index(fields=["updated_at", "id"], name="employees_s_updated_d6887b_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="tombstone",
+            index=models.Index(fields=["deleted_at", "id"], name="employees_t_deleted_cda9ca_idx"),
+        ),
+    ]
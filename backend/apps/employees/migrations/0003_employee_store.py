@@ -0,0 +1,47 @@
+# Generated by Django 5.0.1 on 2026-10-19 03:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def assign_default_store(apps, schema_editor):
+    """Put every existing employee in one default store."""
+    Employee = apps.get_model("employees", "Employee")
+    Store = apps.get_model("stores", "Store")
+    if not Employee.objects.filter(store__isnull=True).exists():
+        return
+    store, _ = Store.objects.get_or_create(name="Main Store")
+    Employee.objects.filter(store__isnull=True).update(store=store)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("employees", "0002_sync_indexes_and_tombstones"),
+        ("stores", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="employee",
+            name="store",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="employees",
+                to="stores.store",
+            ),
+        ),
+        migrations.RunPython(assign_default_store, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="employee",
+            index=models.Index(
+                fields=["store", "is_active", "last_name", "first_name"],
+                name="employees_e_store_i_11e67a_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="employee",
+            index=models.Index(fields=["store", "email"], name="employees_e_store_i_8b6b00_idx"),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.0.1 on 2026-10-19 03:26
+
+from itertools import groupby
+
+from django.db import migrations, models
+
+MASK_FIELDS = ["skill_mask_0", "skill_mask_1", "skill_mask_2", "skill_mask_3"]
+
+
+def _to_signed(value):
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def backfill_skill_masks(apps, schema_editor):
+    """Set each employee's skill masks from their current skill links."""
+    Employee = apps.get_model("employees", "Employee")
+    links = (
+        Employee.skills.through.objects.order_by("employee_id")
+        .values_list("employee_id", "skill_id")
+        .iterator(chunk_size=2000)
+    )
+    batch = []
+    for employee_id, rows in groupby(links, key=lambda row: row[0]):
+        words = [0] * len(MASK_FIELDS)
+        for _, skill_id in rows:
+            bit = skill_id - 1
+            if 0 <= bit < 64 * len(MASK_FIELDS):
+                words[bit // 64] |= 1 << (bit % 64)
+        employee = Employee(pk=employee_id)
+        for field, word in zip(MASK_FIELDS, words):
+            setattr(employee, field, _to_signed(word))
+        batch.append(employee)
+        if len(batch) >= 1000:
+            Employee.objects.bulk_update(batch, MASK_FIELDS)
+            batch = []
+    if batch:
+        Employee.objects.bulk_update(batch, MASK_FIELDS)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("employees", "0003_employee_store"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="employee",
+            name="skill_mask_0",
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="employee",
+            name="skill_mask_1",
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="employee",
+            name="skill_mask_2",
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="employee",
+            name="skill_mask_3",
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_skill_masks, migrations.RunPython.noop),
+    ]
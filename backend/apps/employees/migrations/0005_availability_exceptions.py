@@ -0,0 +1,56 @@
+# Generated by Django 5.0.1 on 2026-10-19 03:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("employees", "0004_skill_masks"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AvailabilityException",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("start_date", models.DateField()),
+                ("end_date", models.DateField()),
+                ("start_time", models.TimeField(blank=True, null=True)),
+                ("end_time", models.TimeField(blank=True, null=True)),
+                ("is_available", models.BooleanField(default=False)),
+                ("reason", models.CharField(blank=True, max_length=200)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "employee",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="availability_exceptions",
+                        to="employees.employee",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["employee", "start_date", "start_time"],
+                "indexes": [
+                    models.Index(
+                        fields=["employee", "start_date"],
+                        name="employees_a_employe_18bc91_idx",
+                    ),
+                    models.Index(
+                        fields=["start_date", "end_date"],
+                        name="employees_a_start_d_a2bf58_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.1 on 2026-10-19 05:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("employees", "0005_availability_exceptions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tombstone",
+            name="store_id",
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="tombstone",
+            name="entity",
+            field=models.CharField(
+                choices=[
+                    ("skill", "Skill"),
+                    ("availability", "Availability"),
+                    ("employee", "Employee"),
+                ],
+                max_length=20,
+            ),
+        ),
+    ]
@@ -1,5 +1,8 @@
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import ExpressionWrapper, Q
 from django.core.validators import MinValueValidator, MaxValueValidator
+from datetime import date
 from decimal import Decimal
 
 
@@ -12,11 +15,41 @@ class Skill(models.Model):
 
     class Meta:
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['updated_at', 'id']),
+        ]
 
     def __str__(self):
         return self.name
 
 
+# Denormalized skill bitmask, 64 skills per word (see ``apps.employees.skillmask``).
+SKILL_MASK_FIELDS = ['skill_mask_0', 'skill_mask_1', 'skill_mask_2', 'skill_mask_3']
+
+
+def minor_birth_date_cutoff(today=None):
+    """Birth dates after this day belong to employees who are under 18 today."""
+    today = today or date.today()
+    try:
+        return today.replace(year=today.year - 18)
+    except ValueError:
+        # Feb 29: the 18th birthday falls on Feb 28 in non-leap years.
+        return today.replace(year=today.year - 18, day=28)
+
+
+class EmployeeQuerySet(models.QuerySet):
+    """Query helpers for employees."""
+
+    def with_is_minor(self):
+        """Annotate ``is_under_18`` in SQL so lists don't compute ages row by row."""
+        return self.annotate(
+            is_under_18=ExpressionWrapper(
+                Q(birth_date__gt=minor_birth_date_cutoff()),
+                output_field=models.BooleanField()
+            )
+        )
+
+
 class Employee(models.Model):
     """Core employee model with all necessary information."""
     # Basic Information
@@ -34,8 +67,23 @@ class Employee(models.Model):
     hire_date = models.DateField()
     birth_date = models.DateField(help_text="Required for minor labor law restrictions")
     
+    # Store the employee works at (API and admin access is scoped by it)
+    store = models.ForeignKey(
+        'stores.Store',
+        on_delete=models.PROTECT,
+        related_name='employees',
+        null=True,
+        blank=True
+    )
+
     # Skills - Many-to-Many relationship
     skills = models.ManyToManyField(Skill, related_name='employees', blank=True)
+
+    # Bitmask of ``skills`` kept in step by the m2m_changed signal; never set directly.
+    skill_mask_0 = models.BigIntegerField(default=0, editable=False)
+    skill_mask_1 = models.BigIntegerField(default=0, editable=False)
+    skill_mask_2 = models.BigIntegerField(default=0, editable=False)
+    skill_mask_3 = models.BigIntegerField(default=0, editable=False)
     
     # Status
     is_active = models.BooleanField(default=True)
@@ -44,23 +92,41 @@ class Employee(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = EmployeeQuerySet.as_manager()
+
     class Meta:
         ordering = ['last_name', 'first_name']
         indexes = [
             models.Index(fields=['last_name', 'first_name']),
             models.Index(fields=['is_active']),
+            models.Index(fields=['updated_at', 'id']),
+            # Store-scoped lookups lead with store so per-store cost stays flat
+            models.Index(fields=['store', 'is_active', 'last_name', 'first_name']),
+            models.Index(fields=['store', 'email']),
         ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
 
+    def save(self, *args, **kwargs):
+        # The skill masks are updated in SQL when skill links change, so a
+        # stale in-memory copy must never be written back over them.
+        if not self._state.adding and not kwargs.get('force_insert') and kwargs.get('update_fields') is None:
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in SKILL_MASK_FIELDS
+                and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
     @property
     def full_name(self):
         return f"{self.first_name} {self.last_name}"
 
     def get_age(self):
         """Calculate employee age for minor restrictions."""
-        from datetime import date
         today = date.today()
         return today.year - self.birth_date.year - (
             (today.month, today.day) < (self.birth_date.month, self.birth_date.day)
@@ -100,7 +166,92 @@ class Availability(models.Model):
         ordering = ['employee', 'day_of_week', 'start_time']
         unique_together = ['employee', 'day_of_week', 'start_time']
         verbose_name_plural = 'Availabilities'
+        indexes = [
+            models.Index(fields=['updated_at', 'id']),
+        ]
 
     def __str__(self):
         day_name = dict(self.DAYS_OF_WEEK)[self.day_of_week]
         return f"{self.employee.full_name} - {day_name} {self.start_time}-{self.end_time}"
+
+
+class AvailabilityException(models.Model):
+    """
+    Date-specific override of the weekly availability pattern.
+
+    Covers ``start_date`` through ``end_date`` inclusive. Without a time
+    window it applies to whole days; with one, to that window on each day.
+    ``is_available=False`` is time off, ``True`` is extra availability.
+    See ``apps.employees.resolver`` for how they combine.
+    """
+    employee = models.ForeignKey(
+        Employee,
+        on_delete=models.CASCADE,
+        related_name='availability_exceptions'
+    )
+    start_date = models.DateField()
+    end_date = models.DateField()
+    start_time = models.TimeField(null=True, blank=True)
+    end_time = models.TimeField(null=True, blank=True)
+    is_available = models.BooleanField(default=False)
+    reason = models.CharField(max_length=200, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['employee', 'start_date', 'start_time']
+        indexes = [
+            models.Index(fields=['employee', 'start_date']),
+            models.Index(fields=['start_date', 'end_date']),
+        ]
+
+    def __str__(self):
+        kind = 'Available' if self.is_available else 'Unavailable'
+        window = f" {self.start_time}-{self.end_time}" if self.start_time else ''
+        return f"{self.employee.full_name} - {kind} {self.start_date}..{self.end_date}{window}"
+
+    def clean(self):
+        """Check the date range and time window."""
+        errors = {}
+        if self.start_date and self.end_date and self.end_date < self.start_date:
+            errors['end_date'] = 'End date must not be before start date.'
+        if (self.start_time is None) != (self.end_time is None):
+            errors['end_time'] = 'Give both start and end time, or neither for whole days.'
+        elif self.start_time is not None and self.end_time <= self.start_time:
+            errors['end_time'] = 'End time must be after start time.'
+        if errors:
+            raise ValidationError(errors)
+
+
+class Tombstone(models.Model):
+    """
+    Record of a hard-deleted row so offline clients can drop it on sync.
+
+    ``store_id`` is the store the row belonged to (``None`` for chain-wide
+    rows such as skills), so store-scoped syncs only get their own. An
+    employee moving to another store leaves an ``employee`` tombstone for
+    the store they left, as does a hard-deleted employee.
+    """
+    ENTITY_SKILL = 'skill'
+    ENTITY_AVAILABILITY = 'availability'
+    ENTITY_EMPLOYEE = 'employee'
+    ENTITY_CHOICES = [
+        (ENTITY_SKILL, 'Skill'),
+        (ENTITY_AVAILABILITY, 'Availability'),
+        (ENTITY_EMPLOYEE, 'Employee'),
+    ]
+
+    entity = models.CharField(max_length=20, choices=ENTITY_CHOICES)
+    entity_id = models.BigIntegerField()
+    store_id = models.BigIntegerField(null=True, blank=True)
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['deleted_at', 'id']
+        indexes = [
+            models.Index(fields=['deleted_at', 'id']),
+        ]
+
+    def __str__(self):
+        return f"{self.entity} #{self.entity_id} deleted {self.deleted_at}"
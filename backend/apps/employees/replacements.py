@@ -0,0 +1,416 @@
+"""
+Ranked replacement candidates for a call-out.
+
+``ReplacementIndex`` keeps, for every active employee, one bitmask of
+15-minute slots per weekday (built from ``Availability``), the skill mask
+as one integer, hourly rate, store and birth date, in parallel lists. A
+query is a pass of integer ANDs over those lists, so ranking 10k employees
+takes a few milliseconds and touches the database only for:
+
+- the refresh, at most every ``REPLACEMENT_REFRESH_SECONDS``. Like the
+  typeahead index, it reads the employees and availability rows whose
+  ``updated_at`` is at or after the newest one already seen (less
+  ``REPLACEMENT_SETTLE_SECONDS``), and the tombstones written since. Only
+  those employees are re-read and patched in. A deleted availability row
+  re-reads its store's employees, and a deleted skill rebuilds the index.
+  These are the same change markers delta sync relies on, so a write made
+  by any process reaches every other process within that interval.
+- the exceptions' newest ``updated_at`` and row count, checked on the same
+  refresh. The day's ``AvailabilityException`` rows are patched onto the
+  affected employees' masks (see ``apps.employees.resolver`` for the rules)
+  and the result is kept per day until the exceptions change, which does
+  not touch the weekly masks.
+
+Availability counts for a slot only if it covers all of it; the requested
+window needs every slot it touches. Minors are dropped when the shift
+breaks ``apps.employees.labor_rules``.
+
+Scores are pluggable: register a function with ``@register_score(name)``.
+It gets a ``Candidate`` and returns a sort key (lowest ranks first).
+Hours already worked this week come from the function named by
+``REPLACEMENT_HOURS_SOURCE``, ``(employee_ids, week_start, week_end) ->
+{employee_id: hours}``. Without one every candidate has 0 hours.
+"""
+import heapq
+import threading
+import time
+from collections import defaultdict, namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count, Max, Q
+from django.utils.module_loading import import_string
+
+from . import skillmask
+from .labor_rules import adult_on, age_on, minor_may_work
+from .models import SKILL_MASK_FIELDS, Availability, AvailabilityException, Employee, Tombstone
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+FULL_DAY_MASK = (1 << SLOTS_PER_DAY) - 1
+WORD_MASK = (1 << skillmask.WORD_BITS) - 1
+OVERRIDE_DAYS = 62
+REFRESH_SECONDS = 1.0
+SETTLE_SECONDS = 2
+FIELDS = ('pk', 'first_name', 'last_name', 'store_id', 'hourly_rate', 'birth_date', *SKILL_MASK_FIELDS)
+SLOT_FIELDS = ('employee_id', 'day_of_week', 'start_time', 'end_time', 'is_available')
+NO_MASKS = (0,) * 7
+
+Candidate = namedtuple('Candidate', 'employee_id full_name store_id hourly_rate hours_this_week')
+
+_scores = {}
+
+
+def register_score(name):
+    """Decorator registering a ranking function under ``name``."""
+
+    def decorator(func):
+        _scores[name] = func
+        return func
+
+    return decorator
+
+
+def get_score(name):
+    """Return the ranking function registered as ``name``."""
+    try:
+        return _scores[name]
+    except KeyError:
+        raise KeyError(f'Unknown replacement score {name!r}') from None
+
+
+def score_names():
+    return sorted(_scores)
+
+
+@register_score('cost')
+def cheapest_first(candidate):
+    """Lowest hourly rate, then fewest hours this week."""
+    return candidate.hourly_rate, candidate.hours_this_week
+
+
+@register_score('hours')
+def fewest_hours_first(candidate):
+    """Fewest hours this week, then lowest hourly rate."""
+    return candidate.hours_this_week, candidate.hourly_rate
+
+
+def slots_within(start, end):
+    """Mask of the slots lying entirely inside ``start``-``end`` (minutes)."""
+    first = -(-start // SLOT_MINUTES)
+    last = end // SLOT_MINUTES
+    return ((1 << (last - first)) - 1) << first if last > first else 0
+
+
+def slots_touching(start, end):
+    """Mask of every slot that overlaps ``start``-``end`` (minutes)."""
+    first = start // SLOT_MINUTES
+    last = -(-end // SLOT_MINUTES)
+    return ((1 << (last - first)) - 1) << first if last > first else 0
+
+
+def _minutes(value):
+    return value.hour * 60 + value.minute
+
+
+def _skill_bits(words):
+    bits = 0
+    for position, word in enumerate(words):
+        bits |= (word & WORD_MASK) << (skillmask.WORD_BITS * position)
+    return bits
+
+
+def watermarks():
+    """The newest employee and availability ``updated_at`` and tombstone ``deleted_at``."""
+    # One aggregate per query: SQLite only answers MAX() from an index alone.
+    return [
+        Employee.objects.aggregate(last=Max('updated_at'))['last'],
+        Availability.objects.aggregate(last=Max('updated_at'))['last'],
+        Tombstone.objects.aggregate(last=Max('deleted_at'))['last'],
+    ]
+
+
+def weekly_masks(slots):
+    """``{employee_id: [mask per weekday]}`` from ``SLOT_FIELDS`` rows."""
+    opened = defaultdict(lambda: [0] * 7)
+    closed = defaultdict(lambda: [0] * 7)
+    for employee_id, day_of_week, start, end, available in slots:
+        if available:
+            opened[employee_id][day_of_week] |= slots_within(_minutes(start), _minutes(end))
+        else:
+            closed[employee_id][day_of_week] |= slots_touching(_minutes(start), _minutes(end))
+    return {
+        employee_id: [mask & ~closed_mask for mask, closed_mask in zip(masks, closed[employee_id])]
+        for employee_id, masks in opened.items()
+    }
+
+
+def _entry(row):
+    """Index values of one ``FIELDS`` row, in ``ReplacementIndex.columns()`` order."""
+    pk, first_name, last_name, store_id, rate, birth_date, *words = row
+    return pk, f'{first_name} {last_name}', store_id, rate, birth_date, adult_on(birth_date), _skill_bits(words)
+
+
+def exceptions_key():
+    """Change markers for ``AvailabilityException`` rows."""
+    return (
+        AvailabilityException.objects.aggregate(last=Max('updated_at'))['last'],
+        AvailabilityException.objects.count(),
+    )
+
+
+class ReplacementIndex:
+    """Per-employee slot and skill masks for active employees."""
+
+    def __init__(self):
+        self.ids = []
+        self.positions = {}
+        self.names = []
+        self.store_ids = []
+        self.rates = []
+        self.birth_dates = []
+        self.adult_dates = []
+        self.skills = []
+        self.day_masks = [[] for _ in range(7)]
+        self.watermarks = None
+        self.checked = None
+        self.exceptions_key = None
+        self.overrides = {}
+
+    def columns(self):
+        """The parallel lists, one entry per position."""
+        return [
+            self.ids,
+            self.names,
+            self.store_ids,
+            self.rates,
+            self.birth_dates,
+            self.adult_dates,
+            self.skills,
+            *self.day_masks,
+        ]
+
+    def build(self):
+        """Load every active employee and their weekly availability."""
+        self.watermarks = watermarks()
+        rows = Employee.objects.filter(is_active=True).order_by('pk').values_list(*FIELDS)
+        self.ids, self.names, self.store_ids, self.rates = [], [], [], []
+        self.birth_dates, self.adult_dates, self.skills = [], [], []
+        columns = self.columns()
+        for row in rows:
+            for column, value in zip(columns, _entry(row)):
+                column.append(value)
+        self.positions = {pk: position for position, pk in enumerate(self.ids)}
+
+        masks = weekly_masks(Availability.objects.filter(employee__is_active=True).values_list(*SLOT_FIELDS))
+        self.day_masks = [[masks.get(pk, NO_MASKS)[day] for pk in self.ids] for day in range(7)]
+        self.exceptions_key, self.overrides = exceptions_key(), {}
+        self.checked = time.monotonic()
+        return self
+
+    def refresh(self):
+        """Patch in employees whose row, availability or store changed since the last build or refresh."""
+        settle = timedelta(seconds=getattr(settings, 'REPLACEMENT_SETTLE_SECONDS', SETTLE_SECONDS))
+        since = [None if mark is None else mark - settle for mark in self.watermarks]
+        employees = Employee.objects.values_list('pk', 'updated_at')
+        availability = Availability.objects.values_list('employee_id', 'updated_at')
+        tombstones = Tombstone.objects.values_list('entity', 'store_id', 'deleted_at')
+        if since[0] is not None:
+            employees = employees.filter(updated_at__gte=since[0])
+        if since[1] is not None:
+            availability = availability.filter(updated_at__gte=since[1])
+        if since[2] is not None:
+            tombstones = tombstones.filter(deleted_at__gte=since[2])
+
+        changed, stores = set(), set()
+        for column, rows in enumerate((employees, availability)):
+            for pk, updated_at in rows:
+                changed.add(pk)
+                self.watermarks[column] = max(self.watermarks[column] or updated_at, updated_at)
+        for entity, store_id, deleted_at in tombstones:
+            if entity == Tombstone.ENTITY_SKILL:
+                # Deleting a skill clears its bit without touching the employees.
+                return self.build()
+            if entity == Tombstone.ENTITY_AVAILABILITY:
+                stores.add(store_id)
+            self.watermarks[2] = max(self.watermarks[2] or deleted_at, deleted_at)
+
+        if changed or stores:
+            self._reload(changed, stores)
+            self.overrides = {}
+        key = exceptions_key()
+        if key != self.exceptions_key:
+            self.exceptions_key, self.overrides = key, {}
+        self.checked = time.monotonic()
+        return self
+
+    def _reload(self, employee_ids, store_ids):
+        """Re-read ``employee_ids`` and every employee of ``store_ids``; drop those no longer active."""
+        query = Q(pk__in=employee_ids)
+        if store_ids:
+            # The tombstone of a deleted availability row names its store, not its employee.
+            query |= Q(store_id__in=[pk for pk in store_ids if pk is not None])
+            if None in store_ids:
+                query |= Q(store__isnull=True)
+            employee_ids = employee_ids | {
+                pk for pk, store_id in zip(self.ids, self.store_ids) if store_id in store_ids
+            }
+        rows = {row[0]: row for row in Employee.objects.filter(query, is_active=True).values_list(*FIELDS)}
+        masks = weekly_masks(Availability.objects.filter(employee_id__in=rows).values_list(*SLOT_FIELDS))
+        for pk in employee_ids - rows.keys():
+            self._drop(pk)
+        for pk, row in rows.items():
+            self._put(_entry(row), masks.get(pk, NO_MASKS))
+
+    def _put(self, entry, masks):
+        position = self.positions.get(entry[0])
+        if position is None:
+            position = self.positions[entry[0]] = len(self.ids)
+            for column in self.columns():
+                column.append(None)
+        for column, value in zip(self.columns(), (*entry, *masks)):
+            column[position] = value
+
+    def _drop(self, pk):
+        position = self.positions.pop(pk, None)
+        if position is None:
+            return
+        # Move the last employee into the gap so the lists stay dense.
+        last = len(self.ids) - 1
+        for column in self.columns():
+            column[position] = column[last]
+            column.pop()
+        if position != last:
+            self.positions[self.ids[position]] = position
+
+    def day_overrides(self, day):
+        """``{position: mask}`` for employees with an exception on ``day``, cached per day."""
+        overrides = self.overrides.get(day)
+        if overrides is None:
+            if len(self.overrides) >= OVERRIDE_DAYS:
+                self.overrides.clear()
+            overrides = self.overrides[day] = self._load_overrides(day)
+        return overrides
+
+    def _load_overrides(self, day):
+        # Inactive employees have no position, so no join is needed.
+        exceptions = AvailabilityException.objects.filter(start_date__lte=day, end_date__gte=day).values_list(
+            'employee_id', 'start_time', 'end_time', 'is_available'
+        )
+        added, removed = {}, {}
+        for employee_id, start, end, available in exceptions:
+            position = self.positions.get(employee_id)
+            if position is None:
+                continue
+            if available:
+                mask = FULL_DAY_MASK if start is None else slots_within(_minutes(start), _minutes(end))
+                added[position] = added.get(position, 0) | mask
+            else:
+                mask = FULL_DAY_MASK if start is None else slots_touching(_minutes(start), _minutes(end))
+                removed[position] = removed.get(position, 0) | mask
+        weekly = self.day_masks[day.weekday()]
+        return {
+            position: (weekly[position] | added.get(position, 0)) & ~removed.get(position, 0)
+            for position in added.keys() | removed.keys()
+        }
+
+    def matches(self, day, start, end, skill_ids=(), store_ids=None, exclude=()):
+        """Positions of employees free for ``start``-``end`` (minutes) on ``day``."""
+        window = slots_touching(start, end)
+        need, overflow = self._required_skills(skill_ids)
+        masks = self.day_masks[day.weekday()]
+        overrides = self.day_overrides(day)
+
+        positions = [
+            position
+            for position, (mask, skills) in enumerate(zip(masks, self.skills))
+            if mask & window == window and skills & need == need
+        ]
+        if overrides:
+            keep = set(positions)
+            for position, mask in overrides.items():
+                if mask & window == window and self.skills[position] & need == need:
+                    keep.add(position)
+                else:
+                    keep.discard(position)
+            positions = sorted(keep)
+
+        if overflow is not None:
+            positions = [position for position in positions if self.ids[position] in overflow]
+        if store_ids is not None:
+            store_ids = set(store_ids)
+            positions = [position for position in positions if self.store_ids[position] in store_ids]
+        if exclude:
+            exclude = set(exclude)
+            positions = [position for position in positions if self.ids[position] not in exclude]
+        return [
+            position
+            for position in positions
+            if self.adult_dates[position] <= day
+            or minor_may_work(age_on(self.birth_dates[position], day), day, start, end)
+        ]
+
+    def _required_skills(self, skill_ids):
+        words, overflow = skillmask.split_skill_ids(skill_ids)
+        need = _skill_bits(words.get(field, 0) for field in SKILL_MASK_FIELDS)
+        if not overflow:
+            return need, None
+        through = Employee.skills.through
+        holders = (
+            through.objects.filter(skill_id__in=overflow)
+            .values('employee_id')
+            .annotate(n=Count('skill_id', distinct=True))
+            .filter(n=len(overflow))
+            .values_list('employee_id', flat=True)
+        )
+        return need, set(holders)
+
+
+_index = ReplacementIndex()
+_index_lock = threading.Lock()
+
+
+def _fresh_index():
+    global _index
+    interval = getattr(settings, 'REPLACEMENT_REFRESH_SECONDS', REFRESH_SECONDS)
+    if _index.checked is None:
+        _index = _index.build()
+    elif time.monotonic() - _index.checked >= interval:
+        _index = _index.refresh()
+    return _index
+
+
+def get_index():
+    """Return the process-wide index, built on first use and refreshed when it is due."""
+    with _index_lock:
+        return _fresh_index()
+
+
+def hours_this_week(employee_ids, day):
+    """Hours already worked in ``day``'s week (Monday to Sunday) per employee."""
+    source = getattr(settings, 'REPLACEMENT_HOURS_SOURCE', None)
+    if not source or not employee_ids:
+        return {}
+    week_start = day - timedelta(days=day.weekday())
+    return import_string(source)(employee_ids, week_start, week_start + timedelta(days=6))
+
+
+def find_replacements(day, start_time, end_time, skill_ids=(), store_ids=None, exclude=(), score='cost', limit=10):
+    """
+    Rank employees who could cover ``start_time``-``end_time`` on ``day``.
+
+    Returns ``(number of eligible employees, top `limit` Candidates)``.
+    """
+    rank = get_score(score)
+    start, end = _minutes(start_time), _minutes(end_time) or 24 * 60
+    # A refresh patches the index in place, so it is read under the lock.
+    with _index_lock:
+        index = _fresh_index()
+        rows = [
+            (index.ids[position], index.names[position], index.store_ids[position], index.rates[position])
+            for position in index.matches(day, start, end, skill_ids, store_ids, exclude)
+        ]
+
+    hours = hours_this_week([row[0] for row in rows], day)
+    candidates = [Candidate(*row, hours_this_week=hours.get(row[0], 0)) for row in rows]
+    return len(candidates), heapq.nsmallest(limit, candidates, key=lambda c: (rank(c), c.employee_id))
@@ -0,0 +1,194 @@
+"""
+Resolve actual availability from weekly patterns plus date exceptions.
+
+Weekly ``Availability`` rows give each employee open intervals per weekday
+(rows with ``is_available=False`` are cut out of them). An
+``AvailabilityException`` then overrides the days it covers:
+
+1. Available exceptions add their window, or the whole day without one.
+2. Unavailable exceptions are applied last and win: they remove their
+   window, or close the whole day without one.
+
+Intervals are ``(start, end)`` minutes since midnight, sorted and merged;
+a whole day is ``(0, 1440)``.
+
+``resolve_availability`` loads weekly rows and the overlapping exceptions
+for any number of employees with one query each. The exceptions are sorted by
+start date and swept day by day with a heap keyed on end date, so a day
+only does work for the employees with an exception on it; everyone else
+shares their weekly intervals.
+"""
+import heapq
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db.models import QuerySet
+
+from .models import Availability, AvailabilityException
+
+DAY_MINUTES = 24 * 60
+WHOLE_DAY = (0, DAY_MINUTES)
+ONE_DAY = timedelta(days=1)
+
+
+def to_minutes(value):
+    """Minutes since midnight for a ``time`` (seconds are dropped)."""
+    return value.hour * 60 + value.minute
+
+
+def merge(intervals):
+    """Sort ``intervals`` and merge the ones that overlap or touch."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract(intervals, start, end):
+    """Remove ``[start, end)`` from merged ``intervals``."""
+    result = []
+    for a, b in intervals:
+        if b <= start or a >= end:
+            result.append((a, b))
+            continue
+        if a < start:
+            result.append((a, start))
+        if b > end:
+            result.append((end, b))
+    return result
+
+
+def covers(intervals, start, end):
+    """Whether one of the merged ``intervals`` contains all of ``[start, end)``."""
+    index = bisect_right(intervals, (start, DAY_MINUTES + 1)) - 1
+    return index >= 0 and intervals[index][1] >= end
+
+
+def _window(start_time, end_time):
+    if start_time is None:
+        return WHOLE_DAY
+    return to_minutes(start_time), to_minutes(end_time)
+
+
+def apply_exceptions(base, exceptions):
+    """Combine one day's weekly ``base`` intervals with that day's exceptions."""
+    added = [_window(start, end) for start, end, available in exceptions if available]
+    intervals = merge(base + added) if added else base
+    for start, end, available in exceptions:
+        if available:
+            continue
+        if start is None:
+            return []
+        intervals = subtract(intervals, *_window(start, end))
+    return intervals
+
+
+class AvailabilityCalendar:
+    """Resolved availability for a set of employees from ``start_date`` to ``end_date``."""
+
+    def __init__(self, employee_ids, start_date, end_date, weekly, overrides):
+        self.employee_ids = employee_ids
+        self.start_date = start_date
+        self.end_date = end_date
+        self._weekly = weekly
+        self._overrides = overrides
+
+    def days(self):
+        """Each date in the range, in order."""
+        day = self.start_date
+        while day <= self.end_date:
+            yield day
+            day += ONE_DAY
+
+    def intervals(self, employee_id, day):
+        """Open intervals for ``employee_id`` on ``day``."""
+        if not self.start_date <= day <= self.end_date:
+            raise ValueError(f'{day} is outside {self.start_date}..{self.end_date}')
+        overrides = self._overrides.get(day)
+        if overrides is not None and employee_id in overrides:
+            return overrides[employee_id]
+        weekly = self._weekly.get(employee_id)
+        return weekly[day.weekday()] if weekly else []
+
+    def for_employee(self, employee_id):
+        """``{date: intervals}`` for every day in the range."""
+        return {day: self.intervals(employee_id, day) for day in self.days()}
+
+    def available(self, day, start_time, end_time):
+        """Ids of employees free for the whole of ``start_time``-``end_time`` on ``day``."""
+        start, end = _window(start_time, end_time)
+        return [
+            employee_id for employee_id in self.employee_ids if covers(self.intervals(employee_id, day), start, end)
+        ]
+
+
+def resolve_availability(employees, start_date, end_date):
+    """
+    Resolve availability for ``employees`` (a queryset or ids) over a date range.
+
+    Returns an ``AvailabilityCalendar``.
+    """
+    if isinstance(employees, QuerySet):
+        employee_ids = list(employees.values_list('pk', flat=True))
+        lookup = {'employee__in': employees.values('pk')}
+    else:
+        employee_ids = [getattr(employee, 'pk', employee) for employee in employees]
+        lookup = {'employee_id__in': employee_ids}
+
+    open_slots = defaultdict(lambda: [[] for _ in range(7)])
+    closed_slots = []
+    rows = Availability.objects.filter(**lookup)
+    if (end_date - start_date).days < 6:
+        # Less than a week: only load the weekdays in range.
+        weekdays = {(start_date + timedelta(days=n)).weekday() for n in range((end_date - start_date).days + 1)}
+        rows = rows.filter(day_of_week__in=sorted(weekdays))
+    rows = rows.values_list('employee_id', 'day_of_week', 'start_time', 'end_time', 'is_available')
+    for employee_id, day_of_week, start, end, available in rows:
+        if available:
+            open_slots[employee_id][day_of_week].append((to_minutes(start), to_minutes(end)))
+        else:
+            closed_slots.append((employee_id, day_of_week, to_minutes(start), to_minutes(end)))
+
+    weekly = {}
+    for employee_id, days in open_slots.items():
+        weekly[employee_id] = [merge(intervals) for intervals in days]
+    for employee_id, day_of_week, start, end in closed_slots:
+        if employee_id in weekly:
+            weekly[employee_id][day_of_week] = subtract(weekly[employee_id][day_of_week], start, end)
+
+    exceptions = list(
+        AvailabilityException.objects.filter(start_date__lte=end_date, end_date__gte=start_date, **lookup)
+        .order_by('start_date')
+        .values_list('employee_id', 'start_date', 'end_date', 'start_time', 'end_time', 'is_available')
+    )
+
+    overrides = {}
+    active = []
+    next_index = 0
+    day = start_date
+    while day <= end_date:
+        while next_index < len(exceptions) and exceptions[next_index][1] <= day:
+            heapq.heappush(active, (exceptions[next_index][2], next_index))
+            next_index += 1
+        while active and active[0][0] < day:
+            heapq.heappop(active)
+        if active:
+            by_employee = defaultdict(list)
+            for _, index in active:
+                employee_id, _, _, start, end, available = exceptions[index]
+                by_employee[employee_id].append((start, end, available))
+            weekday = day.weekday()
+            overrides[day] = {
+                employee_id: apply_exceptions(
+                    weekly[employee_id][weekday] if employee_id in weekly else [], day_exceptions
+                )
+                for employee_id, day_exceptions in by_employee.items()
+            }
+        day += ONE_DAY
+
+    return AvailabilityCalendar(employee_ids, start_date, end_date, weekly, overrides)
@@ -1,5 +1,10 @@
+from datetime import time
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
-from .models import Employee, Skill, Availability
+from apps.core.columnar import CompactTemporalsMixin
+from . import skillmask
+from .models import SKILL_MASK_FIELDS, Employee, Skill, Availability, AvailabilityException
+from .skillcatalog import get_catalog, mask_skill_ids
 
 
 class SkillSerializer(serializers.ModelSerializer):
@@ -11,7 +16,54 @@ class SkillSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
 
 
-class AvailabilitySerializer(serializers.ModelSerializer):
+def context_catalog(field):
+    """The skill catalog, fetched once per top-level serializer."""
+    context = field.context
+    catalog = context.get('_skill_catalog')
+    if catalog is None:
+        catalog = get_catalog()
+        if isinstance(context, dict):
+            context['_skill_catalog'] = catalog
+    return catalog
+
+
+class SkillIdsField(serializers.ManyRelatedField):
+    """Writable list of skill ids, validated against the skill catalog instead of one query per id."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('child_relation', serializers.PrimaryKeyRelatedField(queryset=Skill.objects.all()))
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        try:
+            return context_catalog(self).resolve([int(pk) for pk in data])
+        except (KeyError, TypeError, ValueError):
+            # Let the child report the first bad id the way DRF would.
+            return super().to_internal_value(data)
+
+
+@extend_schema_field(SkillSerializer(many=True))
+class CatalogSkillsField(serializers.Field):
+    """An employee's skills read from their skill masks and serialized from the catalog."""
+
+    def __init__(self, **kwargs):
+        kwargs.update(source='*', read_only=True)
+        super().__init__(**kwargs)
+
+    def to_representation(self, employee):
+        catalog = context_catalog(self)
+        if catalog.has_overflow or not employee.get_deferred_fields().isdisjoint(SKILL_MASK_FIELDS):
+            skill_ids = [skill.pk for skill in employee.skills.all()]
+        else:
+            skill_ids = mask_skill_ids(employee)
+        return catalog.represent(skill_ids)
+
+
+class AvailabilitySerializer(CompactTemporalsMixin, serializers.ModelSerializer):
     """Serializer for Availability model."""
     day_of_week_display = serializers.CharField(source='get_day_of_week_display', read_only=True)
     
@@ -40,19 +92,137 @@ class AvailabilitySerializer(serializers.ModelSerializer):
         return data
 
 
-class EmployeeSerializer(serializers.ModelSerializer):
+class AvailabilityExceptionSerializer(CompactTemporalsMixin, serializers.ModelSerializer):
+    """Serializer for AvailabilityException model."""
+
+    class Meta:
+        model = AvailabilityException
+        fields = [
+            'id',
+            'employee',
+            'start_date',
+            'end_date',
+            'start_time',
+            'end_time',
+            'is_available',
+            'reason',
+            'created_at',
+            'updated_at'
+        ]
+        read_only_fields = ['created_at', 'updated_at']
+
+    def validate(self, data):
+        """Check the date range and that the time window is complete."""
+        def current(name):
+            if name in data:
+                return data[name]
+            return getattr(self.instance, name, None)
+
+        start_date, end_date = current('start_date'), current('end_date')
+        start_time, end_time = current('start_time'), current('end_time')
+        if start_date and end_date and end_date < start_date:
+            raise serializers.ValidationError({'end_date': 'End date must not be before start date.'})
+        if (start_time is None) != (end_time is None):
+            raise serializers.ValidationError({
+                'end_time': 'Give both start and end time, or neither for whole days.'
+            })
+        if start_time is not None and end_time <= start_time:
+            raise serializers.ValidationError({'end_time': 'End time must be after start time.'})
+        return data
+
+
+class AvailabilityCalendarQuerySerializer(serializers.Serializer):
+    """Query parameters for the availability calendar."""
+    start = serializers.DateField()
+    end = serializers.DateField()
+
+    def validate(self, data):
+        """Limit the range so one page stays cheap to resolve."""
+        max_days = self.context.get('max_days', 62)
+        if data['end'] < data['start']:
+            raise serializers.ValidationError({'end': 'End must not be before start.'})
+        if (data['end'] - data['start']).days >= max_days:
+            raise serializers.ValidationError({'end': f'Ask for at most {max_days} days at a time.'})
+        return data
+
+
+class AvailableQuerySerializer(serializers.Serializer):
+    """Query parameters for finding employees free during a window."""
+    date = serializers.DateField()
+    start_time = serializers.TimeField(required=False)
+    end_time = serializers.TimeField(required=False)
+
+    def validate(self, data):
+        """A window needs both ends; without one the whole day must be free."""
+        if ('start_time' in data) != ('end_time' in data):
+            raise serializers.ValidationError({'end_time': 'Give both start_time and end_time.'})
+        if 'start_time' in data and data['end_time'] <= data['start_time']:
+            raise serializers.ValidationError({'end_time': 'End time must be after start time.'})
+        return data
+
+
+class ReplacementQuerySerializer(serializers.Serializer):
+    """Query parameters for the replacement finder."""
+    day = serializers.DateField()
+    start = serializers.TimeField()
+    end = serializers.TimeField()
+    skills = serializers.CharField(required=False, help_text='Comma-separated skill ids (all required).')
+    exclude = serializers.IntegerField(required=False, help_text='Employee who called out.')
+    score = serializers.CharField(required=False, default='cost')
+    limit = serializers.IntegerField(required=False, default=10, min_value=1, max_value=100)
+
+    def validate_skills(self, value):
+        """Parse the comma-separated ids."""
+        try:
+            return [int(part) for part in value.split(',') if part.strip()]
+        except ValueError:
+            raise serializers.ValidationError('Give skill ids separated by commas.')
+
+    def validate_score(self, value):
+        """Only registered scores can be used."""
+        from .replacements import score_names
+
+        if value not in score_names():
+            raise serializers.ValidationError(f'Choose one of: {", ".join(score_names())}.')
+        return value
+
+    def validate(self, data):
+        """The shift must not end before it starts (an end of 00:00 means midnight)."""
+        if data['end'] != time(0) and data['end'] <= data['start']:
+            raise serializers.ValidationError({'end': 'End must be after start.'})
+        return data
+
+
+class ReplacementSerializer(serializers.Serializer):
+    """One ranked replacement candidate."""
+    employee = serializers.IntegerField(source='employee_id')
+    full_name = serializers.CharField()
+    store = serializers.IntegerField(source='store_id', allow_null=True)
+    hourly_rate = serializers.DecimalField(max_digits=8, decimal_places=2)
+    hours_this_week = serializers.FloatField()
+
+
+class AutocompleteQuerySerializer(serializers.Serializer):
+    """Query parameters for employee name autocomplete."""
+    q = serializers.CharField(max_length=100, trim_whitespace=True)
+    limit = serializers.IntegerField(required=False, default=10, min_value=1, max_value=50)
+
+
+class AutocompleteSerializer(serializers.Serializer):
+    """One autocomplete match (an ``apps.employees.typeahead.Record``)."""
+    id = serializers.IntegerField()
+    full_name = serializers.CharField()
+    email = serializers.EmailField()
+    store = serializers.IntegerField(source='store_id', allow_null=True)
+
+
+class EmployeeSerializer(CompactTemporalsMixin, serializers.ModelSerializer):
     """Serializer for Employee model with full details."""
     full_name = serializers.CharField(read_only=True)
     age = serializers.IntegerField(source='get_age', read_only=True)
     is_minor = serializers.BooleanField(read_only=True)
-    skills = SkillSerializer(many=True, read_only=True)
-    skill_ids = serializers.PrimaryKeyRelatedField(
-        many=True,
-        write_only=True,
-        queryset=Skill.objects.all(),
-        source='skills',
-        required=False
-    )
+    skills = CatalogSkillsField()
+    skill_ids = SkillIdsField(write_only=True, source='skills', required=False)
     availability = AvailabilitySerializer(many=True, read_only=True)
     
     class Meta:
@@ -72,6 +242,7 @@ class EmployeeSerializer(serializers.ModelSerializer):
             'skills',
             'skill_ids',
             'availability',
+            'store',
             'is_active',
             'created_at',
             'updated_at'
@@ -99,11 +270,41 @@ class EmployeeSerializer(serializers.ModelSerializer):
         
         return value
 
+    def create(self, validated_data):
+        skills = validated_data.pop('skills', None)
+        return self._set_skills(super().create(validated_data), skills)
+
+    def update(self, instance, validated_data):
+        skills = validated_data.pop('skills', None)
+        return self._set_skills(super().update(instance, validated_data), skills)
+
+    def _set_skills(self, instance, skills):
+        """
+        Apply ``skill_ids`` through the through table only.
+
+        ``instance.skills.set()`` re-reads the linked skills with a join. The
+        m2m_changed handler updates the masks in SQL; they are mirrored here
+        so the response shows the new skills without reloading the row.
+        """
+        if skills is None:
+            return instance
+        wanted = {skill.pk: skill for skill in skills}
+        current = set(
+            Employee.skills.through.objects.filter(employee_id=instance.pk).values_list('skill_id', flat=True)
+        )
+        if current - wanted.keys():
+            instance.skills.remove(*(current - wanted.keys()))
+        if wanted.keys() - current:
+            instance.skills.add(*(skill for pk, skill in wanted.items() if pk not in current))
+        for field, value in skillmask.compute_masks(wanted).items():
+            setattr(instance, field, value)
+        return instance
+
 
 class EmployeeListSerializer(serializers.ModelSerializer):
     """Lightweight serializer for employee lists."""
     full_name = serializers.CharField(read_only=True)
-    skills = SkillSerializer(many=True, read_only=True)
+    skills = CatalogSkillsField()
     
     class Meta:
         model = Employee
@@ -115,5 +316,82 @@ class EmployeeListSerializer(serializers.ModelSerializer):
             'email',
             'hourly_rate',
             'skills',
+            'store',
             'is_active'
         ]
+
+
+class EmployeeSyncSerializer(serializers.ModelSerializer):
+    """Compact employee representation for delta sync (skills as ids)."""
+    skill_ids = serializers.PrimaryKeyRelatedField(source='skills', many=True, read_only=True)
+
+    class Meta:
+        model = Employee
+        fields = [
+            'id',
+            'first_name',
+            'last_name',
+            'email',
+            'phone_number',
+            'hourly_rate',
+            'hire_date',
+            'birth_date',
+            'skill_ids',
+            'store',
+            'is_active',
+            'updated_at'
+        ]
+
+
+class TombstoneSerializer(serializers.Serializer):
+    """A deleted or deactivated row that clients should drop."""
+    entity = serializers.CharField()
+    id = serializers.IntegerField()
+    deleted_at = serializers.DateTimeField()
+
+
+class EmployeeBulkUpdateSerializer(serializers.Serializer):
+    """Validates a set-based bulk update request."""
+    OPERATIONS = ['set', 'rate_percent', 'rate_delta', 'add_skill', 'remove_skill', 'deactivate']
+    SETTABLE_FIELDS = ['hourly_rate', 'hire_date', 'phone_number', 'is_active']
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        allow_empty=False
+    )
+    operation = serializers.ChoiceField(choices=OPERATIONS)
+    field = serializers.ChoiceField(choices=SETTABLE_FIELDS, required=False)
+    value = serializers.JSONField(required=False)
+    skill_id = serializers.PrimaryKeyRelatedField(
+        queryset=Skill.objects.all(),
+        source='skill',
+        required=False
+    )
+
+    def validate(self, data):
+        """Check that each operation carries the arguments it needs."""
+        operation = data['operation']
+
+        if operation == 'set':
+            if 'field' not in data or 'value' not in data:
+                raise serializers.ValidationError('"set" requires "field" and "value".')
+            # Reuse the single-row field validation for the new value.
+            field = EmployeeSerializer().fields[data['field']]
+            try:
+                data['value'] = field.run_validation(data['value'])
+            except serializers.ValidationError as exc:
+                raise serializers.ValidationError({'value': exc.detail})
+
+        elif operation in ('rate_percent', 'rate_delta'):
+            if 'value' not in data:
+                raise serializers.ValidationError({'value': f'"{operation}" requires a value.'})
+            data['value'] = serializers.DecimalField(
+                max_digits=8, decimal_places=2
+            ).run_validation(data['value'])
+
+        elif operation in ('add_skill', 'remove_skill'):
+            if 'skill' not in data:
+                raise serializers.ValidationError({'skill_id': f'"{operation}" requires a skill_id.'})
+
+        return data
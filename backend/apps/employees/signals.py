@@ -0,0 +1,109 @@
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save, pre_delete
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from . import skillcatalog, skillmask
+from .models import Employee, Skill, Availability, Tombstone
+
+# Sent by ``apps.employees.bulk`` after a set-based update, because those
+# statements bypass the model signals. Keyword arguments: ``employee_ids``,
+# ``operation`` and ``changes``.
+bulk_updated = Signal()
+
+
+@receiver(post_delete, sender=Availability)
+def record_availability_tombstone(sender, instance, **kwargs):
+    """Remember deleted availability rows, and their store, for delta sync."""
+    employee = Availability.employee.field.get_cached_value(instance, None)
+    if employee is not None:
+        store_id = employee.store_id
+    else:
+        store_id = Employee.objects.filter(pk=instance.employee_id).values_list('store_id', flat=True).first()
+    Tombstone.objects.create(entity=Tombstone.ENTITY_AVAILABILITY, entity_id=instance.pk, store_id=store_id)
+
+
+@receiver(post_init, sender=Employee, dispatch_uid='sync_track_store')
+def track_store(sender, instance, **kwargs):
+    # Only what is already loaded, so deferred fields never hit the DB.
+    instance._sync_store_id = instance.__dict__.get('store_id')
+
+
+@receiver(post_save, sender=Employee, dispatch_uid='sync_record_store_move')
+def record_store_move(sender, instance, created, raw=False, **kwargs):
+    """
+    When an employee changes store, tell the old store's syncs to drop them.
+
+    Their availability is touched so the new store's syncs pick it up too.
+    """
+    old = instance._sync_store_id
+    new = instance.__dict__.get('store_id', old)
+    instance._sync_store_id = new
+    if raw or created or old == new:
+        return
+    if old is not None:
+        Tombstone.objects.create(entity=Tombstone.ENTITY_EMPLOYEE, entity_id=instance.pk, store_id=old)
+    Availability.objects.filter(employee_id=instance.pk).update(updated_at=timezone.now())
+
+
+@receiver(post_delete, sender=Employee)
+def record_employee_tombstone(sender, instance, **kwargs):
+    """Remember hard-deleted employees for delta sync and the autocomplete index."""
+    Tombstone.objects.create(entity=Tombstone.ENTITY_EMPLOYEE, entity_id=instance.pk, store_id=instance.store_id)
+
+
+@receiver(post_delete, sender=Skill)
+def record_skill_tombstone(sender, instance, **kwargs):
+    """Remember deleted skills for delta sync."""
+    Tombstone.objects.create(entity=Tombstone.ENTITY_SKILL, entity_id=instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Skill)
+def invalidate_skill_catalog(sender, **kwargs):
+    """Make every worker reload its skill catalog once the change commits."""
+    skillcatalog.on_skill_change()
+
+
+@receiver(pre_delete, sender=Skill)
+def clear_deleted_skill_bits(sender, instance, **kwargs):
+    """Clear a deleted skill's bit; the cascade on the through table sends no m2m_changed."""
+    fields = skillmask.remove_expressions([instance.pk])
+    if fields:
+        holders = Employee.skills.through.objects.filter(skill_id=instance.pk).values('employee_id')
+        Employee.objects.filter(pk__in=holders).update(**fields)
+
+
+@receiver(m2m_changed, sender=Employee.skills.through)
+def touch_employees_on_skill_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Bump ``Employee.updated_at`` and the skill masks when skill links change.
+
+    M2M writes never call ``Employee.save()``, so without this a skill
+    assignment would be invisible to ``/api/sync/`` and the skill filters.
+    """
+    if action == 'pre_clear':
+        if reverse:
+            # Capture the affected employees before the links disappear.
+            instance._cleared_employee_ids = list(instance.employees.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        employee_ids = [instance.pk]
+        skill_ids = pk_set or []
+    elif action == 'post_clear':
+        employee_ids = getattr(instance, '_cleared_employee_ids', [])
+        skill_ids = [instance.pk]
+    else:
+        employee_ids = pk_set or []
+        skill_ids = [instance.pk]
+
+    if action == 'post_add':
+        masks = skillmask.add_expressions(skill_ids)
+    elif action == 'post_clear' and not reverse:
+        masks = skillmask.clear_values()
+    else:
+        masks = skillmask.remove_expressions(skill_ids)
+
+    if employee_ids:
+        Employee.objects.filter(pk__in=employee_ids).update(updated_at=timezone.now(), **masks)
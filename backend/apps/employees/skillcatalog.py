@@ -0,0 +1,116 @@
+"""
+Process-local catalog of skills for the employee write and read paths.
+
+Skills are a small table that nearly every employee request touches.
+``get_catalog()`` keeps all of them in worker memory, along with their
+``SkillSerializer`` representation. The catalog is tagged with a version
+read from the ``SKILL_CATALOG_CACHE`` cache, which every worker shares.
+Saving or deleting a ``Skill`` writes a new version once the transaction
+commits, and each worker reloads the next time it sees a version that is
+not its own. ``queryset.update()`` on skills sends no signals; call
+``invalidate()`` after one.
+
+Inside an atomic block the catalog is loaded fresh and never cached: it
+may see uncommitted skills, and the shared version only moves on commit.
+
+Employee serializers use it through ``SkillIdsField`` (validates
+``skill_ids`` with dict lookups instead of a query per id) and
+``CatalogSkillsField`` (renders nested skills from the employee's skill
+masks; only skills beyond the mask width need the through table), so
+steady-state employee writes run no skill queries.
+"""
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+
+from . import skillmask
+from .models import SKILL_MASK_FIELDS, Skill
+
+VERSION_KEY = 'employees:skill-catalog-version'
+DEFAULT_CACHE = 'default'
+
+
+def _shared_cache():
+    return caches[getattr(settings, 'SKILL_CATALOG_CACHE', DEFAULT_CACHE)]
+
+
+def current_version():
+    """The shared catalog version, creating one if the cache has none."""
+    cache = _shared_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def invalidate():
+    """Make every worker reload its catalog."""
+    _shared_cache().set(VERSION_KEY, uuid.uuid4().hex, None)
+
+
+class SkillCatalog:
+    """Every skill by id, in ``Skill.Meta.ordering`` order, with its serialized form."""
+
+    def __init__(self, version=None, skills=(), data=()):
+        self.version = version
+        self.skills = {skill.pk: skill for skill in skills}
+        self.data = {item['id']: item for item in data}
+        self.positions = {skill.pk: position for position, skill in enumerate(skills)}
+        self.has_overflow = any(pk > skillmask.MASK_WIDTH for pk in self.skills)
+
+    @classmethod
+    def load(cls, version=None):
+        from .serializers import SkillSerializer
+
+        skills = list(Skill.objects.all())
+        return cls(version, skills, [dict(item) for item in SkillSerializer(skills, many=True).data])
+
+    def resolve(self, skill_ids):
+        """``Skill`` instances for ``skill_ids``; raises ``KeyError`` for an unknown id."""
+        skills = self.skills
+        return [skills[pk] for pk in skill_ids]
+
+    def represent(self, skill_ids):
+        """Serialized skills for ``skill_ids``, in catalog order, skipping unknown ids."""
+        positions = self.positions
+        known = sorted((pk for pk in skill_ids if pk in positions), key=positions.__getitem__)
+        return [self.data[pk] for pk in known]
+
+
+_catalog = SkillCatalog()
+_catalog_lock = threading.Lock()
+
+
+def get_catalog():
+    """Return this process's catalog, reloaded if another worker changed a skill."""
+    global _catalog
+    if connection.in_atomic_block:
+        return SkillCatalog.load()
+    version = current_version()
+    if _catalog.version != version:
+        with _catalog_lock:
+            if _catalog.version != version:
+                _catalog = SkillCatalog.load(version)
+    return _catalog
+
+
+def on_skill_change():
+    """Bump the shared version once the current transaction commits."""
+    transaction.on_commit(invalidate)
+
+
+def mask_skill_ids(employee):
+    """Skill ids encoded in ``employee``'s skill masks."""
+    skill_ids = []
+    for position, field in enumerate(SKILL_MASK_FIELDS):
+        word = getattr(employee, field) % (1 << skillmask.WORD_BITS)
+        base = position * skillmask.WORD_BITS + 1
+        while word:
+            low = word & -word
+            skill_ids.append(base + low.bit_length() - 1)
+            word ^= low
+    return skill_ids
@@ -0,0 +1,106 @@
+"""
+Skill bitmasks for multi-skill filtering.
+
+Every employee carries ``SKILL_MASK_FIELDS`` (four signed 64-bit words), and
+skill ``n`` sets bit ``n - 1``. "Has all of", "has any of" and "has none of"
+then become bitwise tests on the employee row instead of one M2M join per
+skill. Skills whose id is beyond the mask width fall back to a
+``GROUP BY ... HAVING`` over the through table.
+
+The masks are maintained set-based (``UPDATE ... SET mask = mask | bits``)
+by the ``m2m_changed`` handler and by bulk skill operations.
+"""
+from django.db.models import Count, F, Q
+from django.db.models.lookups import Exact
+
+from .models import SKILL_MASK_FIELDS, Employee
+
+WORD_BITS = 64
+MASK_WIDTH = WORD_BITS * len(SKILL_MASK_FIELDS)
+
+
+def _to_signed(value):
+    # Database integers are signed; bit 63 is the sign bit.
+    return value - (1 << WORD_BITS) if value >= 1 << (WORD_BITS - 1) else value
+
+
+def split_skill_ids(skill_ids):
+    """Return ``({mask field: bits}, [skill ids beyond the mask width])``."""
+    words = {}
+    overflow = []
+    for skill_id in set(skill_ids):
+        bit = skill_id - 1
+        if 0 <= bit < MASK_WIDTH:
+            field = SKILL_MASK_FIELDS[bit // WORD_BITS]
+            words[field] = words.get(field, 0) | (1 << (bit % WORD_BITS))
+        else:
+            overflow.append(skill_id)
+    return {field: _to_signed(bits) for field, bits in words.items()}, sorted(overflow)
+
+
+def compute_masks(skill_ids):
+    """Full set of mask values for an employee holding ``skill_ids``."""
+    words, _ = split_skill_ids(skill_ids)
+    return {field: words.get(field, 0) for field in SKILL_MASK_FIELDS}
+
+
+def add_expressions(skill_ids):
+    """``update()`` kwargs that set the bits for ``skill_ids``."""
+    words, _ = split_skill_ids(skill_ids)
+    return {field: F(field).bitor(bits) for field, bits in words.items()}
+
+
+def remove_expressions(skill_ids):
+    """``update()`` kwargs that clear the bits for ``skill_ids``."""
+    words, _ = split_skill_ids(skill_ids)
+    return {field: F(field).bitand(~bits) for field, bits in words.items()}
+
+
+def clear_values():
+    """``update()`` kwargs that clear every bit."""
+    return {field: 0 for field in SKILL_MASK_FIELDS}
+
+
+def filter_by_skills(queryset, all_of=(), any_of=(), none_of=(), prefix=''):
+    """
+    Filter ``queryset`` to employees with all of / any of / none of the skills.
+
+    ``prefix`` is the path to the employee, e.g. ``'employee__'`` for
+    availability rows.
+    """
+    through = Employee.skills.through
+    employee_in = f'{prefix}pk__in' if prefix else 'pk__in'
+
+    if all_of:
+        words, overflow = split_skill_ids(all_of)
+        for field, bits in words.items():
+            queryset = queryset.filter(Exact(F(prefix + field).bitand(bits), bits))
+        if overflow:
+            holders = (
+                through.objects.filter(skill_id__in=overflow)
+                .values('employee_id')
+                .annotate(matched=Count('skill_id'))
+                .filter(matched=len(overflow))
+                .values('employee_id')
+            )
+            queryset = queryset.filter(**{employee_in: holders})
+
+    if any_of:
+        words, overflow = split_skill_ids(any_of)
+        condition = Q()
+        for field, bits in words.items():
+            condition |= ~Q(Exact(F(prefix + field).bitand(bits), 0))
+        if overflow:
+            holders = through.objects.filter(skill_id__in=overflow).values('employee_id')
+            condition |= Q(**{employee_in: holders})
+        queryset = queryset.filter(condition)
+
+    if none_of:
+        words, overflow = split_skill_ids(none_of)
+        for field, bits in words.items():
+            queryset = queryset.filter(Exact(F(prefix + field).bitand(bits), 0))
+        if overflow:
+            holders = through.objects.filter(skill_id__in=overflow).values('employee_id')
+            queryset = queryset.exclude(**{employee_in: holders})
+
+    return queryset
@@ -0,0 +1,131 @@
+"""
+Delta sync for offline clients (store tablets).
+
+Every change stream is read in ``(timestamp, id)`` order from the
+``updated_at``/``deleted_at`` indexes. The sync cursor is an opaque token
+that records the last position reached in each stream, so a client can
+resume mid-stream and a steady-state sync only reads the rows that changed.
+"""
+import base64
+import binascii
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Prefetch, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Employee, Skill, Availability, Tombstone
+
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 1000
+DEFAULT_SETTLE_SECONDS = 2
+
+STREAMS = ('employees', 'skills', 'availability', 'tombstones')
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client sends a cursor we did not issue."""
+
+
+def encode_cursor(positions):
+    """Encode ``{stream: (timestamp, id)}`` as a URL-safe token."""
+    payload = {name: [timestamp.isoformat(), pk] for name, (timestamp, pk) in positions.items()}
+    raw = json.dumps(payload, separators=(',', ':'), sort_keys=True).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Decode a token produced by ``encode_cursor``."""
+    if not token:
+        return {}
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        positions = {}
+        for name, (timestamp, pk) in payload.items():
+            when = parse_datetime(timestamp)
+            if name not in STREAMS or when is None:
+                raise InvalidCursor(token)
+            positions[name] = (when, int(pk))
+        return positions
+    except (ValueError, TypeError, AttributeError, binascii.Error) as exc:
+        raise InvalidCursor(token) from exc
+
+
+def _stream_querysets(store_ids=None):
+    """Querysets and timestamp field for each change stream, limited to ``store_ids`` if given."""
+    employees = Employee.objects.prefetch_related(Prefetch('skills', queryset=Skill.objects.only('id')))
+    availability = Availability.objects.all()
+    tombstones = Tombstone.objects.all()
+    if store_ids is not None:
+        employees = employees.filter(store_id__in=store_ids)
+        availability = availability.filter(employee__store_id__in=store_ids)
+        # Skills are chain-wide, and so are their tombstones (no store).
+        tombstones = tombstones.filter(Q(store_id__in=store_ids) | Q(store_id__isnull=True))
+    return {
+        'employees': (employees, 'updated_at'),
+        'skills': (Skill.objects.all(), 'updated_at'),
+        'availability': (availability, 'updated_at'),
+        'tombstones': (tombstones, 'deleted_at'),
+    }
+
+
+def _read_stream(queryset, field, position, until, limit):
+    """Return up to ``limit`` rows after ``position`` and whether more exist."""
+    queryset = queryset.filter(**{f'{field}__lte': until})
+    if position:
+        timestamp, pk = position
+        queryset = queryset.filter(Q(**{f'{field}__gt': timestamp}) | Q(**{field: timestamp, 'pk__gt': pk}))
+    rows = list(queryset.order_by(field, 'pk')[: limit + 1])
+    return rows[:limit], len(rows) > limit
+
+
+def get_page_size(requested=None):
+    """Clamp a client-requested page size to the configured bounds."""
+    default = getattr(settings, 'SYNC_PAGE_SIZE', DEFAULT_PAGE_SIZE)
+    maximum = getattr(settings, 'SYNC_MAX_PAGE_SIZE', MAX_PAGE_SIZE)
+    if requested in (None, ''):
+        return default
+    return max(1, min(int(requested), maximum))
+
+
+def collect_changes(cursor=None, limit=None, store_ids=None):
+    """
+    Collect one page of changes after ``cursor``, for ``store_ids`` only if given.
+
+    Rows written in the last ``SYNC_SETTLE_SECONDS`` are held back until the
+    next sync: ``auto_now`` stamps are taken before commit, so a slow
+    transaction could otherwise land behind a cursor that already moved on.
+
+    Returns a dict with active ``employees``, ``skills``, ``availability``,
+    ``tombstones`` (deactivated employees plus deleted skills/availability),
+    the ``next_cursor`` and ``has_more``.
+    """
+    positions = decode_cursor(cursor)
+    limit = limit or get_page_size()
+    settle = getattr(settings, 'SYNC_SETTLE_SECONDS', DEFAULT_SETTLE_SECONDS)
+    until = timezone.now() - timedelta(seconds=settle)
+
+    changes = {'has_more': False}
+    for name, (queryset, field) in _stream_querysets(store_ids).items():
+        rows, more = _read_stream(queryset, field, positions.get(name), until, limit)
+        if rows:
+            last = rows[-1]
+            positions[name] = (getattr(last, field), last.pk)
+        changes[name] = rows
+        changes['has_more'] = changes['has_more'] or more
+
+    tombstones = [
+        {'entity': 'employee', 'id': employee.pk, 'deleted_at': employee.updated_at}
+        for employee in changes['employees']
+        if not employee.is_active
+    ]
+    tombstones.extend(
+        {'entity': row.entity, 'id': row.entity_id, 'deleted_at': row.deleted_at} for row in changes['tombstones']
+    )
+    changes['employees'] = [e for e in changes['employees'] if e.is_active]
+    changes['tombstones'] = tombstones
+    changes['next_cursor'] = encode_cursor(positions)
+    return changes
@@ -0,0 +1,21 @@
+"""Background job handlers for the employees app (see ``apps.jobs``)."""
+from rest_framework.exceptions import ValidationError
+
+from apps.jobs.registry import PermanentError, register
+
+from .bulk import BulkUpdateError, apply_bulk_update
+from .models import Employee
+from .serializers import EmployeeBulkUpdateSerializer
+
+
+@register('employees.bulk_update')
+def bulk_update_employees(context, ids, data):
+    """Run a queued ``POST /api/employees/bulk-update/?async=true``."""
+    serializer = EmployeeBulkUpdateSerializer(data=data)
+    try:
+        serializer.is_valid(raise_exception=True)
+        context.progress(0, message=f'Updating {len(ids)} employees')
+        return apply_bulk_update(Employee.objects.filter(pk__in=ids), serializer.validated_data)
+    except (ValidationError, BulkUpdateError) as exc:
+        # The same input fails the same way on every attempt.
+        raise PermanentError(str(exc)) from exc
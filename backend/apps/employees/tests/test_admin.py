@@ -0,0 +1,149 @@
+import pytest
+from datetime import date, time, timedelta
+from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from apps.audit.models import AuditEntry
+from apps.core.paginators import ApproximateCountPaginator
+from apps.employees.models import Employee, Skill, Availability, minor_birth_date_cutoff
+from apps.jobs.models import Job
+from apps.stores.models import Store
+
+
+def add_rows(count, offset=0):
+    """Create ``count`` employees, each with a store, a skill and a slot, plus audit/job rows."""
+    skill, _ = Skill.objects.get_or_create(name='Register')
+    for i in range(offset, offset + count):
+        store = Store.objects.create(name=f'Store #{i}')
+        employee = Employee.objects.create(
+            first_name=f'First{i}',
+            last_name=f'Last{i}',
+            email=f'employee{i}@example.com',
+            phone_number='555-0100',
+            hourly_rate=Decimal('15.00'),
+            hire_date=date(2024, 1, 1),
+            birth_date=date(2000, 1, 1),
+            store=store,
+        )
+        employee.skills.add(skill)
+        Availability.objects.create(employee=employee, day_of_week=i % 7, start_time=time(9, 0), end_time=time(17, 0))
+        AuditEntry.objects.create(entity='employee', entity_id=employee.id, action='update')
+        Job.objects.create(name='tests.echo', kwargs={'value': i})
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(queries.captured_queries)
+
+
+@pytest.mark.django_db
+class TestChangelistQueries:
+    """Tests that admin changelists run a fixed number of queries."""
+
+    @pytest.mark.parametrize(
+        'url',
+        [
+            '/admin/employees/employee/',
+            '/admin/employees/employee/?is_active__exact=1',
+            '/admin/employees/availability/',
+            '/admin/employees/skill/',
+            '/admin/stores/store/',
+            '/admin/audit/auditentry/',
+            '/admin/jobs/job/',
+        ],
+    )
+    def test_query_count_does_not_grow_with_rows(self, admin_client, url):
+        """Test that the changelist costs the same for 3 rows as for 30."""
+        add_rows(3)
+        small = count_queries(admin_client, url)
+        add_rows(27, offset=3)
+        assert count_queries(admin_client, url) == small
+
+    def test_filtered_changelist_counts_once(self, admin_client):
+        """Test that filtering does not trigger a second full-table COUNT."""
+        add_rows(3)
+        with CaptureQueriesContext(connection) as queries:
+            admin_client.get('/admin/employees/employee/?is_active__exact=1')
+        counts = [q for q in queries.captured_queries if 'COUNT(' in q['sql'] and 'employees_employee' in q['sql']]
+        assert len(counts) == 1
+
+    def test_skill_filter_avoids_distinct(self, admin_client):
+        """Test that filtering by skill uses EXISTS rather than a join with DISTINCT."""
+        add_rows(3)
+        skill = Skill.objects.get()
+        with CaptureQueriesContext(connection) as queries:
+            response = admin_client.get(f'/admin/employees/employee/?skill={skill.id}')
+        assert response.context['cl'].result_count == 3
+        employee_queries = [q['sql'] for q in queries.captured_queries if 'employees_employee_skills' in q['sql']]
+        assert employee_queries
+        assert all('EXISTS' in sql and 'DISTINCT' not in sql for sql in employee_queries)
+
+
+@pytest.mark.django_db
+class TestEmployeeAdmin:
+    """Tests for the employee admin pages."""
+
+    def test_is_minor_is_annotated(self, admin_client):
+        """Test that the minor flag comes from the database annotation."""
+        add_rows(1)
+        Employee.objects.create(
+            first_name='Young',
+            last_name='Worker',
+            email='young@example.com',
+            phone_number='555-0101',
+            hourly_rate=Decimal('12.00'),
+            hire_date=date(2024, 1, 1),
+            birth_date=date.today() - timedelta(days=16 * 365),
+        )
+        flags = dict(Employee.objects.with_is_minor().values_list('first_name', 'is_under_18'))
+        assert flags == {'First0': False, 'Young': True}
+
+        response = admin_client.get('/admin/employees/employee/?o=7')
+        assert response.status_code == 200
+
+    def test_minor_cutoff_on_leap_day(self):
+        """Test that the cutoff is valid on Feb 29."""
+        assert minor_birth_date_cutoff(date(2024, 2, 29)) == date(2006, 2, 28)
+
+    def test_availability_inline_is_paginated(self, admin_client):
+        """Test that the change form only loads one page of availability slots."""
+        add_rows(1)
+        employee = Employee.objects.get()
+        Availability.objects.bulk_create(
+            [
+                Availability(employee=employee, day_of_week=day, start_time=time(hour, 0), end_time=time(hour, 30))
+                for day in range(7)
+                for hour in range(12, 18)
+            ]
+        )
+        url = f'/admin/employees/employee/{employee.id}/change/'
+
+        formset = admin_client.get(url).context['inline_admin_formsets'][0].formset
+        assert len(formset.initial_forms) == 28
+        assert formset.has_next and not formset.has_previous
+
+        formset = admin_client.get(f'{url}?availability_page=2').context['inline_admin_formsets'][0].formset
+        assert len(formset.initial_forms) == 15
+        assert formset.has_previous and not formset.has_next
+
+    def test_change_form_does_not_load_every_skill(self, admin_client):
+        """Test that skills and store use autocomplete widgets instead of full option lists."""
+        add_rows(3)
+        employee = Employee.objects.first()
+        response = admin_client.get(f'/admin/employees/employee/{employee.id}/change/')
+        content = response.content.decode()
+        assert 'admin-autocomplete' in content
+        assert 'Store #2' not in content
+
+
+class TestApproximateCountPaginator:
+    """Tests for the approximate-count paginator."""
+
+    @pytest.mark.django_db
+    def test_falls_back_to_exact_count(self):
+        """Test that databases without an estimate get an exact count."""
+        add_rows(2)
+        paginator = ApproximateCountPaginator(Employee.objects.all(), 100)
+        assert paginator.count == 2
@@ -0,0 +1,166 @@
+import pytest
+from datetime import date, timedelta
+from decimal import Decimal
+from django.contrib.auth.models import User
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.employees import typeahead
+from apps.employees.models import Employee
+from apps.stores.models import Store
+
+URL = '/api/employees/autocomplete/'
+
+
+@pytest.fixture
+def api_client():
+    """Pytest fixture for API client."""
+    return APIClient()
+
+
+@pytest.fixture(autouse=True)
+def fresh_index(monkeypatch, settings):
+    """Give each test its own index, checked for changes on every query."""
+    monkeypatch.setattr(typeahead, '_index', None)
+    settings.AUTOCOMPLETE_REFRESH_SECONDS = 0
+
+
+def make_employee(first_name, last_name, email=None, **kwargs):
+    return Employee.objects.create(
+        first_name=first_name,
+        last_name=last_name,
+        email=email or f'{first_name}.{last_name}@example.com'.lower().replace(' ', ''),
+        phone_number='555-0100',
+        hourly_rate=Decimal('16.00'),
+        hire_date=date(2024, 1, 1),
+        birth_date=date(1990, 1, 1),
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def roster():
+    stores = Store.objects.create(name='Store #1'), Store.objects.create(name='Store #2')
+    return {
+        'jane': make_employee('Jane', 'Smith', store=stores[0]),
+        'janet': make_employee('Janet', 'Jones', store=stores[1]),
+        'maria': make_employee('Maria', 'De La Cruz', email='mcruz@example.com', store=stores[0]),
+        'former': make_employee('Jan', 'Old', is_active=False),
+        'stores': stores,
+    }
+
+
+def names(response):
+    return [row['full_name'] for row in response.data['results']]
+
+
+@pytest.mark.django_db
+class TestAutocomplete:
+    """Tests for GET /api/employees/autocomplete/."""
+
+    def test_prefix_matches(self, api_client, roster):
+        response = api_client.get(URL, {'q': 'Jan'})
+        assert response.status_code == status.HTTP_200_OK
+        assert names(response) == ['Jane Smith', 'Janet Jones']
+        assert response.data['results'][0] == {
+            'id': roster['jane'].pk,
+            'full_name': 'Jane Smith',
+            'email': 'jane.smith@example.com',
+            'store': roster['stores'][0].pk,
+        }
+
+        assert names(api_client.get(URL, {'q': 'jan sm'})) == ['Jane Smith']
+        assert names(api_client.get(URL, {'q': 'cruz'})) == ['Maria De La Cruz']
+        assert names(api_client.get(URL, {'q': 'MCRUZ@'})) == ['Maria De La Cruz']
+        assert names(api_client.get(URL, {'q': 'jan', 'limit': 1})) == ['Jane Smith']
+        assert names(api_client.get(URL, {'q': 'zed'})) == []
+        assert api_client.get(URL).status_code == status.HTTP_400_BAD_REQUEST
+        assert api_client.get(URL, {'q': 'jan', 'limit': 0}).status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_scoped_to_the_callers_stores(self, api_client, roster):
+        manager = User.objects.create_user('manager5', password='pw')
+        roster['stores'][1].managers.add(manager)
+        api_client.force_authenticate(manager)
+        assert names(api_client.get(URL, {'q': 'jan'})) == ['Janet Jones']
+
+    def test_changes_are_picked_up_incrementally(self, api_client, roster):
+        assert names(api_client.get(URL, {'q': 'jan'})) == ['Jane Smith', 'Janet Jones']
+        index = typeahead._index
+
+        roster['jane'].last_name = 'Baker'
+        roster['jane'].save()
+        roster['janet'].is_active = False
+        roster['janet'].save()
+        roster['former'].is_active = True
+        roster['former'].save()
+        make_employee('Janelle', 'Park')
+
+        assert names(api_client.get(URL, {'q': 'jan'})) == ['Jan Old', 'Jane Baker', 'Janelle Park']
+        assert names(api_client.get(URL, {'q': 'smith'})) == []
+        # Patched in place, not rebuilt.
+        assert typeahead._index is index
+        assert all(len(terms) == len(ids) for terms, ids in index.stores.values())
+
+    def test_watermark_and_rebuild(self, roster):
+        index = typeahead.TypeaheadIndex().build()
+        assert index.watermark == Employee.objects.latest('updated_at').updated_at
+
+        # Rows older than the watermark (less the settle window) are not re-read.
+        Employee.objects.filter(pk=roster['jane'].pk).update(
+            first_name='Joan', updated_at=timezone.now() - timedelta(hours=1)
+        )
+        assert [record.id for record in index.refresh().search('jane sm')] == [roster['jane'].pk]
+
+        # A hard delete leaves a tombstone; a store move's tombstone drops nobody.
+        Employee.objects.filter(pk=roster['maria'].pk).delete()
+        roster['janet'].store = roster['stores'][0]
+        roster['janet'].save()
+        index.refresh()
+        assert roster['maria'].pk not in index.records
+        assert [record.full_name for record in index.search('j', store_ids=[roster['stores'][0].pk])] == [
+            'Jane Smith',
+            'Janet Jones',
+        ]
+        assert index.search('cruz') == []
+        assert all(len(terms) == len(ids) for terms, ids in index.stores.values())
+
+    def test_memory_stays_bounded(self):
+        Employee.objects.bulk_create(
+            Employee(
+                first_name=f'First{n % 50}',
+                last_name=f'Last{n}',
+                email=f'employee{n}@example.com',
+                phone_number='555-0100',
+                hourly_rate=Decimal('16.00'),
+                hire_date=date(2024, 1, 1),
+                birth_date=date(1990, 1, 1),
+            )
+            for n in range(2000)
+        )
+        index = typeahead.TypeaheadIndex().build()
+        size = index.nbytes()
+        assert size / 2000 < 500
+
+        # Updating every employee in place leaves the footprint as it was.
+        for pk, first_name, last_name, email, store_id in Employee.objects.values_list(
+            'pk', 'first_name', 'last_name', 'email', 'store_id'
+        ):
+            index.apply(pk, first_name, f'{last_name}x', email, store_id)
+        terms, ids = index.stores[None]
+        assert len(terms) == len(ids) == 6000
+        assert index.nbytes() <= size * 1.05
+
+    def test_stores_are_searched_separately(self, roster, settings):
+        """Test that a scoped search only walks its own stores, and the walk is capped."""
+        index = typeahead.TypeaheadIndex().build()
+        stores = [store.pk for store in roster['stores']]
+        assert [record.full_name for record in index.search('jan', store_ids=stores[:1])] == ['Jane Smith']
+        assert index.search('jan', store_ids=[999]) == []
+
+        make_employee('Jack', 'Quinn', store=roster['stores'][0])
+        settings.AUTOCOMPLETE_MAX_SCAN = 2
+        index = typeahead.TypeaheadIndex().build()
+        # Two entries only reach Jack's terms, so Jane Smith is not found.
+        assert [record.full_name for record in index.search('j s', store_ids=stores[:1])] == []
+        settings.AUTOCOMPLETE_MAX_SCAN = 100
+        assert [record.full_name for record in index.search('j s', store_ids=stores[:1])] == ['Jane Smith']
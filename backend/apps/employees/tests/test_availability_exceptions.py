@@ -0,0 +1,230 @@
+import pytest
+from datetime import date, time
+from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework import status
+from apps.employees.models import Employee, Availability, AvailabilityException
+from apps.employees.resolver import covers, merge, resolve_availability, subtract
+
+# 2026-11-02 is a Monday.
+MONDAY = date(2026, 11, 2)
+TUESDAY = date(2026, 11, 3)
+
+
+@pytest.fixture
+def api_client():
+    """Pytest fixture for API client."""
+    return APIClient()
+
+
+def make_employee(number):
+    return Employee.objects.create(
+        first_name=f'Worker{number}',
+        last_name='Shift',
+        email=f'worker{number}@example.com',
+        phone_number='555-0100',
+        hourly_rate=Decimal('15.00'),
+        hire_date=date(2024, 1, 1),
+        birth_date=date(2000, 1, 1),
+    )
+
+
+@pytest.fixture
+def staff():
+    """Three employees available 09:00-17:00 every weekday."""
+    employees = [make_employee(number) for number in (1, 2, 3)]
+    for employee in employees:
+        for day in range(5):
+            Availability.objects.create(employee=employee, day_of_week=day, start_time=time(9, 0), end_time=time(17, 0))
+    return employees
+
+
+class TestIntervals:
+    """Tests for the interval helpers."""
+
+    def test_merge(self):
+        """Test that overlapping and touching intervals merge."""
+        assert merge([(600, 700), (540, 600), (800, 900), (850, 860)]) == [(540, 700), (800, 900)]
+
+    def test_subtract(self):
+        """Test removing a window from the middle and the edges."""
+        assert subtract([(540, 1020)], 720, 780) == [(540, 720), (780, 1020)]
+        assert subtract([(540, 1020)], 0, 600) == [(600, 1020)]
+        assert subtract([(540, 600)], 540, 600) == []
+
+    def test_covers(self):
+        """Test that a window must sit inside a single interval."""
+        intervals = [(540, 720), (780, 1020)]
+        assert covers(intervals, 540, 720)
+        assert covers(intervals, 800, 900)
+        assert not covers(intervals, 700, 800)
+        assert not covers([], 0, 10)
+
+
+@pytest.mark.django_db
+class TestResolver:
+    """Tests for combining weekly availability with exceptions."""
+
+    def test_weekly_pattern_without_exceptions(self, staff):
+        """Test that plain weeks repeat the weekly pattern."""
+        calendar = resolve_availability([e.pk for e in staff], MONDAY, date(2026, 11, 8))
+        days = calendar.for_employee(staff[0].pk)
+        assert days[MONDAY] == [(540, 1020)]
+        assert days[date(2026, 11, 7)] == []
+
+    def test_whole_day_time_off(self, staff):
+        """Test that a vacation closes every day it covers."""
+        AvailabilityException.objects.create(employee=staff[0], start_date=MONDAY, end_date=TUESDAY, reason='Vacation')
+        calendar = resolve_availability(Employee.objects.all(), MONDAY, date(2026, 11, 4))
+        assert calendar.intervals(staff[0].pk, MONDAY) == []
+        assert calendar.intervals(staff[0].pk, TUESDAY) == []
+        assert calendar.intervals(staff[0].pk, date(2026, 11, 4)) == [(540, 1020)]
+        assert calendar.intervals(staff[1].pk, MONDAY) == [(540, 1020)]
+
+    def test_partial_time_off_and_extra_hours(self, staff):
+        """Test a windowed absence and a one-off late shift on the same day."""
+        AvailabilityException.objects.create(
+            employee=staff[0], start_date=TUESDAY, end_date=TUESDAY, start_time=time(12, 0), end_time=time(13, 0)
+        )
+        AvailabilityException.objects.create(
+            employee=staff[0],
+            start_date=TUESDAY,
+            end_date=TUESDAY,
+            start_time=time(17, 0),
+            end_time=time(21, 0),
+            is_available=True,
+        )
+        calendar = resolve_availability(staff, TUESDAY, TUESDAY)
+        assert calendar.intervals(staff[0].pk, TUESDAY) == [(540, 720), (780, 1260)]
+
+    def test_unavailable_wins_over_available(self, staff):
+        """Test that time off overrides extra availability on the same day."""
+        AvailabilityException.objects.create(
+            employee=staff[0], start_date=date(2026, 11, 7), end_date=date(2026, 11, 7), is_available=True
+        )
+        AvailabilityException.objects.create(
+            employee=staff[0], start_date=date(2026, 11, 1), end_date=date(2026, 11, 30)
+        )
+        calendar = resolve_availability(staff, MONDAY, date(2026, 11, 8))
+        assert all(not intervals for intervals in calendar.for_employee(staff[0].pk).values())
+
+    def test_weekly_unavailable_slot_is_cut_out(self, staff):
+        """Test that weekly rows marked unavailable remove their hours."""
+        Availability.objects.create(
+            employee=staff[1], day_of_week=0, start_time=time(12, 0), end_time=time(12, 30), is_available=False
+        )
+        calendar = resolve_availability(staff, MONDAY, MONDAY)
+        assert calendar.intervals(staff[1].pk, MONDAY) == [(540, 720), (750, 1020)]
+
+    def test_available_for_window(self, staff):
+        """Test answering who can work 14:00-18:00 on a given date."""
+        AvailabilityException.objects.create(
+            employee=staff[0],
+            start_date=TUESDAY,
+            end_date=TUESDAY,
+            start_time=time(17, 0),
+            end_time=time(19, 0),
+            is_available=True,
+        )
+        AvailabilityException.objects.create(employee=staff[1], start_date=TUESDAY, end_date=TUESDAY)
+        calendar = resolve_availability(staff, TUESDAY, TUESDAY)
+        assert calendar.available(TUESDAY, time(14, 0), time(18, 0)) == [staff[0].pk]
+        assert calendar.available(TUESDAY, time(9, 0), time(12, 0)) == [staff[0].pk, staff[2].pk]
+
+    def test_fixed_number_of_queries(self, staff):
+        """Test that the query count does not grow with employees or days."""
+        for employee in staff:
+            AvailabilityException.objects.create(employee=employee, start_date=MONDAY, end_date=MONDAY)
+        with CaptureQueriesContext(connection) as queries:
+            calendar = resolve_availability([e.pk for e in staff], date(2026, 11, 1), date(2026, 11, 30))
+            for employee in staff:
+                calendar.for_employee(employee.pk)
+        assert len(queries) == 2
+
+    def test_out_of_range_day(self, staff):
+        """Test that asking outside the resolved range is an error."""
+        calendar = resolve_availability(staff, MONDAY, MONDAY)
+        with pytest.raises(ValueError):
+            calendar.intervals(staff[0].pk, TUESDAY)
+
+
+@pytest.mark.django_db
+class TestAvailabilityExceptionAPI:
+    """Tests for /api/availability-exceptions/ and the calendar endpoints."""
+
+    def test_create_and_filter(self, api_client, staff):
+        """Test creating an exception and finding it by overlapping dates."""
+        response = api_client.post(
+            '/api/availability-exceptions/',
+            {
+                'employee': staff[0].id,
+                'start_date': '2026-11-03',
+                'end_date': '2026-11-05',
+                'reason': 'Sick',
+            },
+            format='json',
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['is_available'] is False
+
+        response = api_client.get('/api/availability-exceptions/?date_from=2026-11-05&date_to=2026-11-09')
+        assert response.data['count'] == 1
+        response = api_client.get('/api/availability-exceptions/?date_from=2026-11-06')
+        assert response.data['count'] == 0
+
+    @pytest.mark.parametrize(
+        'data, field',
+        [
+            ({'start_date': '2026-11-05', 'end_date': '2026-11-03'}, 'end_date'),
+            ({'start_date': '2026-11-03', 'end_date': '2026-11-03', 'start_time': '10:00'}, 'end_time'),
+            (
+                {'start_date': '2026-11-03', 'end_date': '2026-11-03', 'start_time': '10:00', 'end_time': '09:00'},
+                'end_time',
+            ),
+        ],
+    )
+    def test_validation(self, api_client, staff, data, field):
+        """Test that bad ranges and half-open windows are rejected."""
+        response = api_client.post('/api/availability-exceptions/', {'employee': staff[0].id, **data}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert field in response.data
+
+    def test_calendar(self, api_client, staff):
+        """Test the resolved calendar for a page of employees."""
+        AvailabilityException.objects.create(
+            employee=staff[0], start_date=TUESDAY, end_date=TUESDAY, start_time=time(12, 0), end_time=time(13, 0)
+        )
+        response = api_client.get(f'/api/employees/availability-calendar/?start={MONDAY}&end={TUESDAY}&search=Worker1')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == 1
+        row = response.data['results'][0]
+        assert row['employee'] == staff[0].id
+        assert row['days'] == {
+            '2026-11-02': [[540, 1020]],
+            '2026-11-03': [[540, 720], [780, 1020]],
+        }
+
+    def test_calendar_range_is_limited(self, api_client, staff, settings):
+        """Test that very long ranges are rejected."""
+        settings.AVAILABILITY_CALENDAR_MAX_DAYS = 31
+        response = api_client.get('/api/employees/availability-calendar/?start=2026-11-01&end=2026-12-31')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_available(self, api_client, staff):
+        """Test listing employees free for a window on a date."""
+        AvailabilityException.objects.create(employee=staff[1], start_date=TUESDAY, end_date=TUESDAY)
+        response = api_client.get('/api/employees/available/?date=2026-11-03&start_time=14:00&end_time=17:00')
+        assert response.status_code == status.HTTP_200_OK
+        assert sorted(e['id'] for e in response.data['results']) == [staff[0].id, staff[2].id]
+
+        # Former employees are left out unless asked for.
+        staff[2].is_active = False
+        staff[2].save()
+        url = '/api/employees/available/?date=2026-11-03&start_time=14:00&end_time=17:00'
+        assert [e['id'] for e in api_client.get(url).data['results']] == [staff[0].id]
+        assert [e['id'] for e in api_client.get(f'{url}&is_active=false').data['results']] == [staff[2].id]
+
+        response = api_client.get('/api/employees/available/?date=2026-11-03&start_time=14:00')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,154 @@
+import pytest
+from datetime import date
+from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework import status
+from apps.employees.models import Employee, Skill
+
+URL = '/api/employees/bulk-update/'
+
+
+@pytest.fixture
+def api_client():
+    """Pytest fixture for API client."""
+    return APIClient()
+
+
+@pytest.fixture
+def cashier():
+    """Create the Register skill."""
+    return Skill.objects.create(name='Register')
+
+
+@pytest.fixture
+def staff(cashier):
+    """Two cashiers and one stocker."""
+    employees = []
+    for i, rate in enumerate(['15.00', '20.00', '18.00']):
+        employees.append(
+            Employee.objects.create(
+                first_name=f'Worker{i}',
+                last_name='Bulk',
+                email=f'worker{i}@example.com',
+                phone_number='555-0100',
+                hourly_rate=Decimal(rate),
+                hire_date=date(2024, 1, 1),
+                birth_date=date(2000, 1, 1),
+            )
+        )
+    employees[0].skills.add(cashier)
+    employees[1].skills.add(cashier)
+    return employees
+
+
+@pytest.mark.django_db
+class TestEmployeeBulkUpdateAPI:
+    """Tests for POST /api/employees/bulk-update/."""
+
+    def test_percentage_raise_for_filtered_employees(self, api_client, cashier, staff):
+        """Test raising every cashier's rate by 3%."""
+        response = api_client.post(
+            f'{URL}?skills={cashier.id}', {'operation': 'rate_percent', 'value': '3'}, format='json'
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['matched'] == 2
+        assert response.data['updated'] == 2
+        assert response.data['changes']['hourly_rate'] == {
+            'from': {'min': '15.00', 'max': '20.00'},
+            'to': {'min': '15.45', 'max': '20.60'},
+        }
+        rates = dict(Employee.objects.values_list('email', 'hourly_rate'))
+        assert rates['worker0@example.com'] == Decimal('15.45')
+        assert rates['worker1@example.com'] == Decimal('20.60')
+        assert rates['worker2@example.com'] == Decimal('18.00')
+
+    def test_delta_for_explicit_ids(self, api_client, staff):
+        """Test adding a flat amount to selected employees."""
+        response = api_client.post(
+            URL, {'ids': [staff[2].id], 'operation': 'rate_delta', 'value': '0.50'}, format='json'
+        )
+        assert response.status_code == status.HTTP_200_OK
+        staff[2].refresh_from_db()
+        assert staff[2].hourly_rate == Decimal('18.50')
+
+    def test_rate_cannot_drop_to_zero(self, api_client, staff):
+        """Test that a negative delta below zero is rejected and nothing changes."""
+        response = api_client.post(
+            URL, {'ids': [staff[0].id], 'operation': 'rate_delta', 'value': '-15.00'}, format='json'
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        staff[0].refresh_from_db()
+        assert staff[0].hourly_rate == Decimal('15.00')
+
+    def test_set_field_validates_value(self, api_client, staff):
+        """Test that "set" applies the same validation as a single update."""
+        response = api_client.post(
+            URL, {'ids': [staff[0].id], 'operation': 'set', 'field': 'hourly_rate', 'value': '0'}, format='json'
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'value' in response.data
+
+    def test_set_field(self, api_client, staff):
+        """Test setting a field on every matched employee."""
+        response = api_client.post(
+            f'{URL}?search=Worker', {'operation': 'set', 'field': 'hire_date', 'value': '2025-01-01'}, format='json'
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['updated'] == 3
+        assert set(Employee.objects.values_list('hire_date', flat=True)) == {date(2025, 1, 1)}
+
+    def test_add_and_remove_skill(self, api_client, staff):
+        """Test skill links are added and removed through the through table."""
+        stock = Skill.objects.create(name='Stock')
+        ids = [e.id for e in staff]
+
+        response = api_client.post(URL, {'ids': ids, 'operation': 'add_skill', 'skill_id': stock.id}, format='json')
+        assert response.data['updated'] == 3
+        assert stock.employees.count() == 3
+
+        response = api_client.post(
+            URL, {'ids': ids[:1], 'operation': 'remove_skill', 'skill_id': stock.id}, format='json'
+        )
+        assert response.data['updated'] == 1
+        assert stock.employees.count() == 2
+
+    def test_deactivate_bumps_updated_at(self, api_client, staff):
+        """Test deactivation and that updated_at moves forward for sync."""
+        before = {e.id: e.updated_at for e in staff}
+        response = api_client.post(URL, {'ids': [staff[0].id, staff[1].id], 'operation': 'deactivate'}, format='json')
+        assert response.data['updated'] == 2
+        for employee in Employee.objects.filter(id__in=[staff[0].id, staff[1].id]):
+            assert employee.is_active is False
+            assert employee.updated_at > before[employee.id]
+        assert Employee.objects.get(id=staff[2].id).is_active is True
+
+    def test_requires_ids_or_filter(self, api_client, staff):
+        """Test that an unscoped request does not touch every employee."""
+        response = api_client.post(URL, {'operation': 'deactivate'}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert Employee.objects.filter(is_active=True).count() == 3
+
+    def test_query_count_does_not_scale_with_rows(self, api_client, cashier):
+        """Test that a bulk raise issues the same statements for 3 or 300 rows."""
+        Employee.objects.bulk_create(
+            [
+                Employee(
+                    first_name='Many',
+                    last_name=str(i),
+                    email=f'many{i}@example.com',
+                    phone_number='555-0100',
+                    hourly_rate=Decimal('15.00'),
+                    hire_date=date(2024, 1, 1),
+                    birth_date=date(2000, 1, 1),
+                )
+                for i in range(300)
+            ]
+        )
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.post(
+                f'{URL}?is_active=true', {'operation': 'rate_percent', 'value': '3'}, format='json'
+            )
+        assert response.data['updated'] == 300
+        assert len(queries) <= 8
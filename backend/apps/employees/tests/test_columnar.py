@@ -0,0 +1,194 @@
+import json
+import pytest
+from datetime import date, time
+from decimal import Decimal
+from rest_framework.test import APIClient
+from rest_framework import status
+from apps.core import columnar
+from apps.employees.models import Employee, Skill, Availability
+
+COLUMNAR = columnar.MEDIA_TYPE
+DATE_FIELDS = {'hire_date', 'birth_date'}
+TIME_FIELDS = {'start_time', 'end_time'}
+
+
+@pytest.fixture
+def api_client():
+    """Pytest fixture for API client."""
+    return APIClient()
+
+
+@pytest.fixture
+def roster():
+    """Two employees with skills and a week of availability."""
+    skills = [Skill.objects.create(name=name) for name in ('Register', 'Stock')]
+    employees = []
+    for number in (1, 2):
+        employee = Employee.objects.create(
+            first_name=f'Worker{number}',
+            last_name='Roster',
+            email=f'worker{number}@example.com',
+            phone_number='555-0100',
+            hourly_rate=Decimal('15.50'),
+            hire_date=date(2024, 1, 15),
+            birth_date=date(2000, 5, 20),
+        )
+        employee.skills.set(skills[:number])
+        for day in range(7):
+            Availability.objects.create(
+                employee=employee, day_of_week=day, start_time=time(9, 30), end_time=time(17, 0)
+            )
+        employees.append(employee)
+    return employees
+
+
+def json_form(data):
+    """Unpack a columnar body and spell its dates and times like the JSON API."""
+
+    def convert(value):
+        if isinstance(value, list):
+            return [convert(item) for item in value]
+        if not isinstance(value, dict):
+            return value
+        result = {}
+        for key, item in value.items():
+            if key in DATE_FIELDS and isinstance(item, int):
+                item = columnar.epoch_days_to_date(item).isoformat()
+            elif key in TIME_FIELDS and isinstance(item, int):
+                item = columnar.minutes_to_time(item).isoformat()
+            result[key] = convert(item)
+        return result
+
+    return convert(columnar.unpack(data))
+
+
+@pytest.mark.django_db
+class TestColumnarRoundTrip:
+    """Tests that columnar responses carry exactly the JSON representation."""
+
+    @pytest.mark.parametrize(
+        'url',
+        [
+            '/api/employees/',
+            '/api/employees/{id}/',
+            '/api/employees/{id}/availability/',
+            '/api/availability/',
+            '/api/skills/',
+        ],
+    )
+    def test_matches_json(self, api_client, roster, url):
+        """Test that decoding a columnar response gives the JSON response."""
+        url = url.format(id=roster[0].id)
+        expected = api_client.get(url, HTTP_ACCEPT='application/json').json()
+
+        response = api_client.get(url, HTTP_ACCEPT=COLUMNAR)
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'] == COLUMNAR
+        assert json_form(json.loads(response.content)) == expected
+
+    def test_format_suffix(self, api_client, roster):
+        """Test that ?format=columnar selects the format too."""
+        response = api_client.get('/api/skills/?format=columnar')
+        assert response['Content-Type'] == COLUMNAR
+
+    def test_rows_and_compact_temporals(self, api_client, roster):
+        """Test the packed layout and the integer dates and times."""
+        body = json.loads(api_client.get(f'/api/employees/{roster[1].id}/', HTTP_ACCEPT=COLUMNAR).content)
+        assert body['hire_date'] == (date(2024, 1, 15) - date(1970, 1, 1)).days
+        availability = body['availability']
+        assert availability['$columns'][:5] == ['id', 'employee', 'day_of_week', 'day_of_week_display', 'start_time']
+        assert [row[4] for row in availability['$rows']] == [9 * 60 + 30] * 7
+        assert [row[5] for row in availability['$rows']] == [17 * 60] * 7
+
+    def test_seconds_keep_iso_time(self, api_client, roster):
+        """Test that a time that isn't on a whole minute stays an ISO string."""
+        Availability.objects.filter(employee=roster[0]).update(end_time=time(17, 0, 30))
+        body = json.loads(api_client.get(f'/api/employees/{roster[0].id}/availability/', HTTP_ACCEPT=COLUMNAR).content)
+        assert {row[5] for row in body['$rows']} == {'17:00:30'}
+
+    def test_payload_is_smaller(self, api_client, roster):
+        """Test that the columnar body is smaller than the JSON one."""
+        url = '/api/availability/'
+        json_size = len(api_client.get(url, HTTP_ACCEPT='application/json').content)
+        assert len(api_client.get(url, HTTP_ACCEPT=COLUMNAR).content) < json_size * 0.6
+
+
+@pytest.mark.django_db
+class TestColumnarRequests:
+    """Tests for columnar request bodies."""
+
+    def test_create_employee(self, api_client):
+        """Test creating an employee with epoch-day dates."""
+        body = {
+            'first_name': 'New',
+            'last_name': 'Hire',
+            'email': 'new.hire@example.com',
+            'phone_number': '555-0101',
+            'hourly_rate': '16.00',
+            'hire_date': columnar.date_to_epoch_days(date(2024, 2, 1)),
+            'birth_date': columnar.date_to_epoch_days(date(1998, 3, 15)),
+        }
+        response = api_client.post(
+            '/api/employees/', json.dumps(body), content_type=COLUMNAR, HTTP_ACCEPT='application/json'
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['hire_date'] == '2024-02-01'
+        assert Employee.objects.get(email='new.hire@example.com').birth_date == date(1998, 3, 15)
+
+    def test_create_availability_rows(self, api_client, roster):
+        """Test posting packed availability rows with minute-of-day times."""
+        employee = roster[0]
+        employee.availability.all().delete()
+        body = columnar.pack([{'day_of_week': day, 'start_time': 8 * 60, 'end_time': 12 * 60 + 15} for day in (0, 1)])
+        response = api_client.post(
+            f'/api/employees/{employee.id}/availability/', json.dumps(body), content_type=COLUMNAR, HTTP_ACCEPT=COLUMNAR
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        slots = employee.availability.order_by('day_of_week')
+        assert [(s.start_time, s.end_time) for s in slots] == [(time(8, 0), time(12, 15))] * 2
+        rows = json.loads(response.content)['$rows']
+        assert [row[4:6] for row in rows] == [[480, 735], [480, 735]]
+
+    def test_iso_strings_still_accepted(self, api_client, roster):
+        """Test that columnar bodies may still spell dates as ISO strings."""
+        response = api_client.patch(
+            f'/api/employees/{roster[0].id}/', json.dumps({'hire_date': '2023-06-01'}), content_type=COLUMNAR
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert json.loads(response.content)['hire_date'] == '2023-06-01'
+
+    def test_out_of_range_minutes_rejected(self, api_client, roster):
+        """Test that invalid minute values are validation errors."""
+        response = api_client.post(
+            '/api/availability/',
+            json.dumps(
+                {
+                    'employee': roster[0].id,
+                    'day_of_week': 0,
+                    'start_time': 60,
+                    'end_time': 24 * 60,
+                }
+            ),
+            content_type=COLUMNAR,
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'end_time' in json.loads(response.content)
+
+    def test_json_bodies_reject_integers(self, api_client, roster):
+        """Test that plain JSON requests keep rejecting integer dates."""
+        response = api_client.patch(f'/api/employees/{roster[0].id}/', {'hire_date': 19000}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_pack_round_trip():
+    """Test pack/unpack on mixed and nested lists."""
+    data = {
+        'results': [{'a': 1, 'b': [{'x': 1}, {'x': 2}]}, {'a': 2, 'b': []}],
+        'mixed': [{'a': 1}, {'b': 2}],
+        'plain': [1, 2],
+        'empty': [],
+    }
+    packed = columnar.pack(data)
+    assert packed['results'][columnar.COLUMNS] == ['a', 'b']
+    assert packed['mixed'] == [{'a': 1}, {'b': 2}]
+    assert columnar.unpack(packed) == data
@@ -0,0 +1,235 @@
+import pytest
+from datetime import date, time
+from decimal import Decimal
+from rest_framework.test import APIClient
+from rest_framework import status
+from apps.employees import replacements
+from apps.employees.labor_rules import minor_may_work
+from apps.employees.models import Employee, Skill, Availability, AvailabilityException
+from apps.stores.models import Store
+
+# 2026-11-02 is a Monday.
+MONDAY = date(2026, 11, 2)
+URL = '/api/employees/replacements/'
+
+
+def weekly_hours(employee_ids, week_start, week_end):
+    """Hours source used by the tests: employee id times two."""
+    assert (week_start, week_end) == (MONDAY, date(2026, 11, 8))
+    return {pk: pk * 2 for pk in employee_ids}
+
+
+@pytest.fixture
+def api_client():
+    """Pytest fixture for API client."""
+    return APIClient()
+
+
+@pytest.fixture(autouse=True)
+def fresh_index(monkeypatch, settings):
+    """Give each test its own index, checked for changes on every query."""
+    monkeypatch.setattr(replacements, '_index', replacements.ReplacementIndex())
+    settings.REPLACEMENT_REFRESH_SECONDS = 0
+
+
+def make_employee(name, rate, start=time(9, 0), end=time(17, 0), birth_date=date(1990, 1, 1), **kwargs):
+    employee = Employee.objects.create(
+        first_name=name,
+        last_name='Cover',
+        email=f'{name.lower()}@example.com',
+        phone_number='555-0100',
+        hourly_rate=Decimal(rate),
+        hire_date=date(2024, 1, 1),
+        birth_date=birth_date,
+        **kwargs,
+    )
+    Availability.objects.create(employee=employee, day_of_week=0, start_time=start, end_time=end)
+    return employee
+
+
+@pytest.fixture
+def crew():
+    """Three adults available Monday with different rates and hours."""
+    return {
+        'ann': make_employee('Ann', '18.00'),
+        'bob': make_employee('Bob', '15.00'),
+        'cy': make_employee('Cy', '16.00', start=time(12, 0), end=time(22, 0)),
+    }
+
+
+def names(response):
+    return [row['full_name'].split()[0] for row in response.data['results']]
+
+
+@pytest.mark.django_db
+class TestReplacementFinder:
+    """Tests for GET /api/employees/replacements/."""
+
+    def test_ranks_available_employees_by_cost(self, api_client, crew):
+        """Test that only employees covering the window are returned, cheapest first."""
+        response = api_client.get(URL, {'day': MONDAY, 'start': '13:00', 'end': '17:00'})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == 3
+        assert names(response) == ['Bob', 'Cy', 'Ann']
+        assert response.data['results'][0]['hourly_rate'] == '15.00'
+
+        response = api_client.get(URL, {'day': MONDAY, 'start': '10:00', 'end': '14:00'})
+        assert names(response) == ['Bob', 'Ann']
+
+    def test_partial_slots_do_not_count(self, api_client, crew):
+        """Test that a window must be fully covered, down to the quarter hour."""
+        response = api_client.get(URL, {'day': MONDAY, 'start': '08:50', 'end': '12:00'})
+        assert response.data['count'] == 0
+
+    def test_other_weekday_has_no_candidates(self, api_client, crew):
+        """Test that the weekly pattern is matched by weekday."""
+        response = api_client.get(URL, {'day': '2026-11-03', 'start': '13:00', 'end': '17:00'})
+        assert response.data['count'] == 0
+
+    def test_skills_are_required(self, api_client, crew):
+        """Test that every requested skill must be held."""
+        register = Skill.objects.create(name='Register')
+        deli = Skill.objects.create(name='Deli')
+        crew['ann'].skills.add(register, deli)
+        crew['bob'].skills.add(register)
+
+        response = api_client.get(
+            URL, {'day': MONDAY, 'start': '13:00', 'end': '17:00', 'skills': f'{register.id},{deli.id}'}
+        )
+        assert names(response) == ['Ann']
+
+    def test_minors_outside_allowed_hours_are_dropped(self, api_client, crew):
+        """Test that a 16-year-old can't cover a school-night close."""
+        make_employee('Teen', '14.00', start=time(15, 0), end=time(23, 0), birth_date=date(2010, 6, 1))
+
+        response = api_client.get(URL, {'day': MONDAY, 'start': '15:00', 'end': '19:00'})
+        assert names(response)[0] == 'Teen'
+        response = api_client.get(URL, {'day': MONDAY, 'start': '19:00', 'end': '22:30'})
+        assert 'Teen' not in names(response)
+
+    def test_exceptions_apply_to_the_day(self, api_client, crew):
+        """Test that time off removes and extra hours add candidates."""
+        AvailabilityException.objects.create(employee=crew['bob'], start_date=MONDAY, end_date=MONDAY)
+        AvailabilityException.objects.create(
+            employee=crew['ann'],
+            start_date=MONDAY,
+            end_date=MONDAY,
+            start_time=time(17, 0),
+            end_time=time(21, 0),
+            is_available=True,
+        )
+        response = api_client.get(URL, {'day': MONDAY, 'start': '16:00', 'end': '20:00'})
+        assert names(response) == ['Cy', 'Ann']
+
+    def test_exception_changes_show_up(self, api_client, crew):
+        """Test that the cached day is refreshed when exceptions change."""
+        params = {'day': MONDAY, 'start': '13:00', 'end': '17:00'}
+        assert api_client.get(URL, params).data['count'] == 3
+
+        time_off = AvailabilityException.objects.create(employee=crew['bob'], start_date=MONDAY, end_date=MONDAY)
+        assert 'Bob' not in names(api_client.get(URL, params))
+
+        time_off.delete()
+        assert api_client.get(URL, params).data['count'] == 3
+
+    def test_hours_score_uses_hours_source(self, api_client, crew, settings):
+        """Test ranking by fewest hours this week."""
+        settings.REPLACEMENT_HOURS_SOURCE = 'apps.employees.tests.test_replacements.weekly_hours'
+        response = api_client.get(URL, {'day': MONDAY, 'start': '13:00', 'end': '17:00', 'score': 'hours', 'limit': 2})
+        assert names(response) == ['Ann', 'Bob']
+        assert response.data['results'][0]['hours_this_week'] == crew['ann'].id * 2
+        assert response.data['count'] == 3
+
+    def test_index_notices_changes(self, api_client, crew):
+        """Test that new availability and deactivations show up on the next query."""
+        params = {'day': MONDAY, 'start': '13:00', 'end': '17:00'}
+        assert api_client.get(URL, params).data['count'] == 3
+
+        new = make_employee('Dee', '14.00')
+        assert names(api_client.get(URL, params))[0] == 'Dee'
+
+        new.is_active = False
+        new.save()
+        Availability.objects.filter(employee=crew['cy']).delete()
+        assert names(api_client.get(URL, params)) == ['Bob', 'Ann']
+
+    def test_changes_are_patched_in_place(self, api_client, crew, monkeypatch):
+        """Test that changes are read from the watermarks without rebuilding the index."""
+        params = {'day': MONDAY, 'start': '13:00', 'end': '17:00'}
+        assert api_client.get(URL, params).data['count'] == 3
+        index = replacements._index
+
+        def rebuild():
+            raise AssertionError('rebuilt')
+
+        monkeypatch.setattr(index, 'build', rebuild)
+
+        dee = make_employee('Dee', '14.00')
+        crew['bob'].hourly_rate = Decimal('19.00')
+        crew['bob'].save()
+        assert names(api_client.get(URL, params)) == ['Dee', 'Cy', 'Ann', 'Bob']
+
+        # A deleted availability row only names the store, so the store's employees are re-read.
+        Availability.objects.filter(employee=crew['cy']).delete()
+        crew['ann'].delete()
+        dee.is_active = False
+        dee.save()
+        assert names(api_client.get(URL, params)) == ['Bob']
+        assert sorted(index.ids) == [crew['bob'].pk, crew['cy'].pk]
+        assert index.positions == {pk: position for position, pk in enumerate(index.ids)}
+        assert all(len(column) == 2 for column in index.columns())
+
+    def test_deleted_skill_rebuilds(self, api_client, crew):
+        skill = Skill.objects.create(name='Forklift')
+        crew['bob'].skills.add(skill)
+        params = {'day': MONDAY, 'start': '13:00', 'end': '17:00', 'skills': str(skill.pk)}
+        assert names(api_client.get(URL, params)) == ['Bob']
+
+        skill.delete()
+        replacements.get_index()
+        assert replacements._index.skills[replacements._index.positions[crew['bob'].pk]] == 0
+
+    def test_exclude_and_store_scope(self, api_client, crew):
+        """Test dropping the caller-out and narrowing to one store."""
+        store = Store.objects.create(name='Store #1')
+        Employee.objects.filter(pk__in=[crew['ann'].pk, crew['bob'].pk]).update(store=store)
+
+        response = api_client.get(
+            URL,
+            {'day': MONDAY, 'start': '13:00', 'end': '17:00', 'exclude': crew['bob'].id},
+            HTTP_X_STORE_ID=str(store.id),
+        )
+        assert names(response) == ['Ann']
+
+    def test_invalid_parameters(self, api_client, crew):
+        """Test validation of the query string."""
+        response = api_client.get(URL, {'day': MONDAY, 'start': '13:00', 'end': '17:00', 'score': 'vibes'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        response = api_client.get(URL, {'day': MONDAY, 'start': '13:00', 'end': '12:00'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.parametrize(
+    'age, day, start, end, allowed',
+    [
+        (17, MONDAY, 16 * 60, 20 * 60, True),
+        (17, MONDAY, 16 * 60, 21 * 60, False),  # more than 4 hours on a school day
+        (17, date(2026, 11, 7), 16 * 60, 24 * 60, True),  # Saturday
+        (17, date(2026, 11, 8), 15 * 60, 23 * 60, False),  # Sunday is a school night
+        (15, MONDAY, 16 * 60, 19 * 60, True),
+        (15, MONDAY, 17 * 60, 20 * 60, False),
+        (16, date(2026, 11, 7), 6 * 60, 10 * 60, False),  # before 7am
+        (13, date(2026, 11, 7), 10 * 60, 12 * 60, False),
+        (14, date(2026, 10, 10), 17 * 60, 20 * 60, False),  # Saturday in October: done by 19:00
+        (14, date(2026, 10, 10), 16 * 60, 19 * 60, True),
+        (14, date(2026, 7, 11), 17 * 60, 21 * 60, True),  # Saturday in summer: until 21:00
+        (14, date(2026, 9, 6), 17 * 60, 21 * 60, True),  # the Sunday before Labor Day
+        (14, date(2026, 9, 13), 17 * 60, 20 * 60, False),  # the Sunday after it
+        (14, date(2026, 10, 12), 7 * 60, 9 * 60, False),  # weekday morning runs into school hours
+        (16, MONDAY, 7 * 60, 8 * 60, True),  # before school
+        (30, MONDAY, 0, 24 * 60, True),
+    ],
+)
+def test_minor_rules(age, day, start, end, allowed):
+    """Test the NY minor hour limits."""
+    assert minor_may_work(age, day, start, end) is allowed
@@ -0,0 +1,144 @@
+import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.employees import skillcatalog
+from apps.employees.models import Employee, Skill
+from apps.employees.skillmask import MASK_WIDTH, compute_masks
+
+
+@pytest.fixture
+def api_client():
+    """Pytest fixture for API client."""
+    return APIClient()
+
+
+@pytest.fixture(autouse=True)
+def catalog_cache(settings):
+    """Keep the catalog version in this process's cache, start cold and flush audit entries on commit."""
+    settings.SKILL_CATALOG_CACHE = 'default'
+    settings.AUDIT_FLUSH_MODE = 'commit'
+    caches['default'].delete(skillcatalog.VERSION_KEY)
+    skillcatalog._catalog = skillcatalog.SkillCatalog()
+    yield
+    skillcatalog._catalog = skillcatalog.SkillCatalog()
+
+
+@pytest.fixture
+def skills():
+    return [Skill.objects.create(name=name) for name in ('Stock', 'Register', 'Manager')]
+
+
+def skill_queries(queries):
+    return [q['sql'] for q in queries.captured_queries if '"employees_skill"' in q['sql']]
+
+
+def employee_data(email, skill_ids):
+    return {
+        'first_name': 'Jane',
+        'last_name': 'Smith',
+        'email': email,
+        'phone_number': '555-0101',
+        'hourly_rate': '16.00',
+        'hire_date': '2024-02-01',
+        'birth_date': '1998-03-15',
+        'skill_ids': skill_ids,
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class TestSteadyState:
+    """Tests that a warm catalog serves employee writes without skill queries."""
+
+    def test_create_and_update(self, api_client, skills):
+        """Test that creating and updating an employee never reads the skill table."""
+        skillcatalog.get_catalog()
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.post(
+                '/api/employees/', employee_data('jane@example.com', [skills[0].id, skills[1].id]), format='json'
+            )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert [skill['name'] for skill in response.data['skills']] == ['Register', 'Stock']
+        employee_id = response.data['id']
+
+        with CaptureQueriesContext(connection) as more:
+            response = api_client.patch(f'/api/employees/{employee_id}/', {'skill_ids': [skills[2].id]}, format='json')
+            listing = api_client.get('/api/employees/')
+        assert [skill['name'] for skill in response.data['skills']] == ['Manager']
+        assert listing.data['results'][0]['skills'] == response.data['skills']
+        assert skill_queries(queries) == skill_queries(more) == []
+        assert list(Employee.objects.get(pk=employee_id).skills.all()) == [skills[2]]
+
+    def test_skill_changes_reload_after_commit(self, api_client, skills):
+        """Test that saving, deleting or renaming a skill moves the shared version."""
+        first = skillcatalog.get_catalog()
+        Skill.objects.create(name='Forklift')
+        second = skillcatalog.get_catalog()
+        assert second is not first
+        assert 'Forklift' in [skill.name for skill in second.skills.values()]
+
+        skills[0].delete()
+        assert skills[0].pk not in skillcatalog.get_catalog().skills
+
+        Skill.objects.filter(pk=skills[1].pk).update(name='Till')
+        assert skillcatalog.get_catalog().skills[skills[1].pk].name == 'Register'
+        skillcatalog.invalidate()
+        assert skillcatalog.get_catalog().skills[skills[1].pk].name == 'Till'
+
+    def test_other_worker_version(self, skills):
+        """Test that a version written by another worker triggers a reload."""
+        catalog = skillcatalog.get_catalog()
+        assert skillcatalog.get_catalog() is catalog
+        caches['default'].set(skillcatalog.VERSION_KEY, 'from-another-worker', None)
+        assert skillcatalog.get_catalog() is not catalog
+
+
+@pytest.mark.django_db
+class TestSkillFields:
+    """Tests for the catalog-backed skill fields."""
+
+    def test_unknown_id_is_rejected(self, api_client, skills):
+        """Test the same error as a primary key field for a missing skill."""
+        response = api_client.post(
+            '/api/employees/', employee_data('jane@example.com', [skills[0].id, 9999]), format='json'
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['skill_ids'] == ['Invalid pk "9999" - object does not exist.']
+
+    @pytest.mark.parametrize(
+        'value, error',
+        [
+            ('1', 'Expected a list of items but got type "str".'),
+            ([{'id': 1}], 'Incorrect type. Expected pk value, received dict.'),
+        ],
+    )
+    def test_bad_input(self, api_client, skills, value, error):
+        response = api_client.post('/api/employees/', employee_data('jane@example.com', value), format='json')
+        assert response.data['skill_ids'] == [error]
+
+    def test_skills_beyond_mask_width(self, api_client, skills):
+        """Test that skills the masks can't hold are read from the through table."""
+        wide = Skill.objects.create(id=MASK_WIDTH + 5, name='Forklift')
+        response = api_client.post(
+            '/api/employees/', employee_data('jane@example.com', [wide.id, skills[0].id]), format='json'
+        )
+        assert [skill['name'] for skill in response.data['skills']] == ['Forklift', 'Stock']
+        listing = api_client.get('/api/employees/')
+        assert [skill['name'] for skill in listing.data['results'][0]['skills']] == ['Forklift', 'Stock']
+
+    def test_skill_changes_are_queued_for_commit(self, skills, django_capture_on_commit_callbacks):
+        """Test that the version only moves once the transaction commits."""
+        version = skillcatalog.current_version()
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            skills[0].save()
+            assert skillcatalog.current_version() == version
+        assert callbacks
+        assert skillcatalog.current_version() != version
+
+
+def test_mask_skill_ids():
+    """Test decoding the masks, including the sign bit and the last word."""
+    employee = Employee(**compute_masks([1, 64, 65, MASK_WIDTH]))
+    assert skillcatalog.mask_skill_ids(employee) == [1, 64, 65, MASK_WIDTH]
@@ -0,0 +1,177 @@
+import pytest
+from datetime import date
+from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from apps.employees.models import Employee, Skill, Availability
+from apps.employees.skillmask import MASK_WIDTH, compute_masks
+
+
+@pytest.fixture
+def api_client():
+    """Pytest fixture for API client."""
+    return APIClient()
+
+
+@pytest.fixture
+def skills():
+    """Skills at the low end, the sign bit, and beyond the mask width."""
+    return {
+        'register': Skill.objects.create(id=1, name='Register'),
+        'stock': Skill.objects.create(id=2, name='Stock'),
+        'manager': Skill.objects.create(id=64, name='Manager'),
+        'forklift': Skill.objects.create(id=MASK_WIDTH + 10, name='Forklift'),
+    }
+
+
+def make_employee(name, *skills):
+    employee = Employee.objects.create(
+        first_name=name,
+        last_name='Worker',
+        email=f'{name.lower()}@example.com',
+        phone_number='555-0100',
+        hourly_rate=Decimal('15.00'),
+        hire_date=date(2024, 1, 1),
+        birth_date=date(2000, 1, 1),
+    )
+    employee.skills.add(*skills)
+    return employee
+
+
+@pytest.fixture
+def roster(skills):
+    """Employees with different skill combinations."""
+    return {
+        'ann': make_employee('Ann', skills['register'], skills['manager']),
+        'bob': make_employee('Bob', skills['register'], skills['stock']),
+        'cat': make_employee('Cat', skills['stock'], skills['forklift']),
+        'dan': make_employee('Dan'),
+    }
+
+
+def names(response):
+    return sorted(row['first_name'] for row in response.data['results'])
+
+
+def stored_masks(employee):
+    return compute_masks(employee.skills.values_list('pk', flat=True))
+
+
+@pytest.mark.django_db
+class TestSkillFilters:
+    """Tests for ?skills_all / ?skills_any / ?skills_none."""
+
+    def test_skills_all(self, api_client, roster, skills):
+        """Test that every listed skill is required."""
+        ids = f"{skills['register'].id},{skills['manager'].id}"
+        assert names(api_client.get(f'/api/employees/?skills_all={ids}')) == ['Ann']
+
+    def test_skills_any(self, api_client, roster, skills):
+        """Test that any listed skill matches, including ones beyond the mask."""
+        ids = f"{skills['manager'].id},{skills['forklift'].id}"
+        assert names(api_client.get(f'/api/employees/?skills_any={ids}')) == ['Ann', 'Cat']
+
+    def test_skills_none(self, api_client, roster, skills):
+        """Test that employees holding a listed skill are excluded."""
+        ids = f"{skills['register'].id},{skills['forklift'].id}"
+        assert names(api_client.get(f'/api/employees/?skills_none={ids}')) == ['Dan']
+
+    def test_combined(self, api_client, roster, skills):
+        """Test combining all/any/none in one request."""
+        response = api_client.get(
+            f"/api/employees/?skills_all={skills['register'].id}"
+            f"&skills_any={skills['stock'].id},{skills['manager'].id}"
+            f"&skills_none={skills['manager'].id}"
+        )
+        assert names(response) == ['Bob']
+
+    def test_overflow_skills_use_group_by(self, api_client, roster, skills):
+        """Test that skills beyond the mask width fall back to GROUP BY/HAVING."""
+        ids = f"{skills['stock'].id},{skills['forklift'].id}"
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(f'/api/employees/?skills_all={ids}')
+        assert names(response) == ['Cat']
+        assert any('HAVING' in q['sql'] for q in queries.captured_queries)
+
+    def test_masked_skills_avoid_joins(self, api_client, roster, skills):
+        """Test that skills within the mask never touch the through table."""
+        ids = f"{skills['register'].id},{skills['stock'].id}"
+        with CaptureQueriesContext(connection) as queries:
+            api_client.get(f'/api/employees/?skills_all={ids}')
+        listing = [q['sql'] for q in queries.captured_queries if 'skill_mask_0' in q['sql']]
+        assert listing
+        assert all('employees_employee_skills' not in sql for sql in listing)
+
+    def test_availability_filter(self, api_client, roster, skills):
+        """Test that availability can be filtered by the employee's skills."""
+        from datetime import time
+
+        for employee in roster.values():
+            Availability.objects.create(employee=employee, day_of_week=0, start_time=time(9, 0), end_time=time(17, 0))
+        response = api_client.get(f"/api/availability/?skills_all={skills['stock'].id}")
+        assert sorted(row['employee'] for row in response.data['results']) == [roster['bob'].id, roster['cat'].id]
+
+    def test_invalid_ids_are_rejected(self, api_client, roster):
+        """Test that non-numeric skill ids are a 400."""
+        assert api_client.get('/api/employees/?skills_all=abc').status_code == 400
+
+
+@pytest.mark.django_db
+class TestSkillMaskMaintenance:
+    """Tests that the masks follow every kind of skill change."""
+
+    def test_add_remove_and_clear(self, roster, skills):
+        """Test forward M2M changes."""
+        ann = roster['ann']
+        ann.skills.remove(skills['manager'])
+        ann.refresh_from_db()
+        assert (ann.skill_mask_0, ann.skill_mask_1) == (1, 0)
+
+        ann.skills.add(skills['manager'])
+        ann.refresh_from_db()
+        assert ann.skill_mask_0 == compute_masks([1, 64])['skill_mask_0'] < 0
+
+        ann.skills.clear()
+        ann.refresh_from_db()
+        assert ann.skill_mask_0 == 0
+
+    def test_reverse_changes(self, roster, skills):
+        """Test changes made from the skill side."""
+        skills['stock'].employees.add(roster['dan'])
+        skills['register'].employees.clear()
+        for employee in Employee.objects.all():
+            assert employee.skill_mask_0 == stored_masks(employee)['skill_mask_0']
+
+    def test_deleting_skill_clears_bit(self, roster, skills):
+        """Test that deleting a skill clears its bit even though no m2m_changed is sent."""
+        skills['register'].delete()
+        assert not Employee.objects.filter(skill_mask_0=1).exists()
+        for employee in Employee.objects.all():
+            assert employee.skill_mask_0 == stored_masks(employee)['skill_mask_0']
+
+    def test_bulk_skill_operations_update_masks(self, api_client, roster, skills):
+        """Test that set-based bulk skill operations keep the masks in step."""
+        api_client.post(
+            '/api/employees/bulk-update/',
+            {'ids': [roster['dan'].id], 'operation': 'add_skill', 'skill_id': skills['manager'].id},
+            format='json',
+        )
+        api_client.post(
+            '/api/employees/bulk-update/',
+            {'ids': [roster['ann'].id], 'operation': 'remove_skill', 'skill_id': skills['register'].id},
+            format='json',
+        )
+        for employee in Employee.objects.all():
+            assert employee.skill_mask_0 == stored_masks(employee)['skill_mask_0']
+
+    def test_stale_instance_does_not_overwrite_masks(self, roster, skills):
+        """Test that saving an instance loaded before a skill change keeps the new mask."""
+        stale = Employee.objects.get(pk=roster['dan'].pk)
+        roster['dan'].skills.add(skills['stock'])
+
+        stale.first_name = 'Daniel'
+        stale.save()
+        stale.refresh_from_db()
+        assert stale.first_name == 'Daniel'
+        assert stale.skill_mask_0 == 2
@@ -0,0 +1,173 @@
+import pytest
+from datetime import date, time, timedelta
+from decimal import Decimal
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from apps.employees.models import Employee, Skill, Availability
+
+
+@pytest.fixture
+def api_client():
+    """Pytest fixture for API client."""
+    return APIClient()
+
+
+@pytest.fixture(autouse=True)
+def no_settle_window(settings):
+    """Return rows immediately instead of holding back fresh writes."""
+    settings.SYNC_SETTLE_SECONDS = 0
+
+
+def make_employee(email, **kwargs):
+    """Create an employee with sensible defaults."""
+    defaults = {
+        'first_name': 'Sync',
+        'last_name': 'Worker',
+        'phone_number': '555-0100',
+        'hourly_rate': Decimal('15.00'),
+        'hire_date': date(2024, 1, 1),
+        'birth_date': date(2000, 1, 1),
+    }
+    defaults.update(kwargs)
+    return Employee.objects.create(email=email, **defaults)
+
+
+def sync_all(client, cursor=None, limit=None):
+    """Follow next_cursor until has_more is false, collecting every page."""
+    pages = []
+    while True:
+        params = {}
+        if cursor:
+            params['since'] = cursor
+        if limit:
+            params['limit'] = limit
+        response = client.get('/api/sync/', params)
+        assert response.status_code == status.HTTP_200_OK
+        pages.append(response.data)
+        cursor = response.data['next_cursor']
+        if not response.data['has_more']:
+            return pages, cursor
+
+
+@pytest.mark.django_db
+class TestSyncAPI:
+    """Tests for the delta sync endpoint."""
+
+    def test_initial_sync_returns_everything(self, api_client):
+        """Test a cursor-less sync returns all current rows."""
+        skill = Skill.objects.create(name='Register')
+        employee = make_employee('a@example.com')
+        employee.skills.add(skill)
+        Availability.objects.create(employee=employee, day_of_week=0, start_time=time(9, 0), end_time=time(17, 0))
+
+        response = api_client.get('/api/sync/')
+        assert response.status_code == status.HTTP_200_OK
+        assert [e['id'] for e in response.data['employees']] == [employee.id]
+        assert response.data['employees'][0]['skill_ids'] == [skill.id]
+        assert len(response.data['skills']) == 1
+        assert len(response.data['availability']) == 1
+        assert response.data['tombstones'] == []
+        assert response.data['has_more'] is False
+
+    def test_steady_state_sync_is_empty(self, api_client):
+        """Test syncing again with the returned cursor transfers nothing."""
+        make_employee('a@example.com')
+        cursor = api_client.get('/api/sync/').data['next_cursor']
+
+        response = api_client.get('/api/sync/', {'since': cursor})
+        assert response.data['employees'] == []
+        assert response.data['skills'] == []
+        assert response.data['availability'] == []
+        assert response.data['tombstones'] == []
+
+    def test_only_changed_rows_are_returned(self, api_client):
+        """Test that an update after the cursor is picked up alone."""
+        make_employee('a@example.com')
+        changed = make_employee('b@example.com')
+        cursor = api_client.get('/api/sync/').data['next_cursor']
+
+        changed.hourly_rate = Decimal('20.00')
+        changed.save()
+
+        response = api_client.get('/api/sync/', {'since': cursor})
+        assert [e['id'] for e in response.data['employees']] == [changed.id]
+        assert response.data['employees'][0]['hourly_rate'] == '20.00'
+
+    def test_skill_assignment_bumps_employee(self, api_client):
+        """Test that M2M skill changes make the employee re-sync."""
+        skill = Skill.objects.create(name='Stock')
+        employee = make_employee('a@example.com')
+        cursor = api_client.get('/api/sync/').data['next_cursor']
+
+        skill.employees.add(employee)
+
+        response = api_client.get('/api/sync/', {'since': cursor})
+        assert [e['id'] for e in response.data['employees']] == [employee.id]
+        assert response.data['employees'][0]['skill_ids'] == [skill.id]
+
+    def test_deactivated_employee_becomes_tombstone(self, api_client):
+        """Test that soft-deleted employees are sent as tombstones."""
+        employee = make_employee('a@example.com')
+        cursor = api_client.get('/api/sync/').data['next_cursor']
+
+        api_client.delete(f'/api/employees/{employee.id}/')
+
+        response = api_client.get('/api/sync/', {'since': cursor})
+        assert response.data['employees'] == []
+        assert response.data['tombstones'] == [
+            {
+                'entity': 'employee',
+                'id': employee.id,
+                'deleted_at': response.data['tombstones'][0]['deleted_at'],
+            }
+        ]
+
+    def test_deleted_availability_becomes_tombstone(self, api_client):
+        """Test that hard-deleted availability rows are sent as tombstones."""
+        employee = make_employee('a@example.com')
+        slot = Availability.objects.create(
+            employee=employee, day_of_week=2, start_time=time(9, 0), end_time=time(12, 0)
+        )
+        slot_id = slot.id
+        cursor = api_client.get('/api/sync/').data['next_cursor']
+
+        api_client.delete(f'/api/availability/{slot_id}/')
+
+        response = api_client.get('/api/sync/', {'since': cursor})
+        assert response.data['availability'] == []
+        assert [(t['entity'], t['id']) for t in response.data['tombstones']] == [('availability', slot_id)]
+
+    def test_pagination_resumes_mid_stream(self, api_client):
+        """Test that small pages resume from the cursor without gaps or repeats."""
+        employees = [make_employee(f'e{i}@example.com') for i in range(7)]
+
+        pages, _ = sync_all(api_client, limit=3)
+        assert len(pages) == 3
+        synced = [e['id'] for page in pages for e in page['employees']]
+        assert synced == [e.id for e in employees]
+
+    def test_rows_sharing_a_timestamp_are_not_skipped(self, api_client):
+        """Test the (updated_at, id) cursor handles timestamp ties."""
+        make_employee('a@example.com')
+        make_employee('b@example.com')
+        make_employee('c@example.com')
+        Employee.objects.update(updated_at=timezone.now() - timedelta(minutes=1))
+
+        pages, _ = sync_all(api_client, limit=1)
+        synced = [e['id'] for page in pages for e in page['employees']]
+        assert sorted(synced) == sorted(Employee.objects.values_list('id', flat=True))
+
+    def test_settle_window_holds_back_fresh_rows(self, api_client, settings):
+        """Test rows newer than the settle window wait for the next sync."""
+        settings.SYNC_SETTLE_SECONDS = 60
+        make_employee('a@example.com')
+
+        response = api_client.get('/api/sync/')
+        assert response.data['employees'] == []
+
+    def test_invalid_cursor_rejected(self, api_client):
+        """Test that a tampered cursor returns 400."""
+        response = api_client.get('/api/sync/', {'since': 'not-a-cursor'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'since' in response.data
@@ -0,0 +1,220 @@
+"""
+In-memory typeahead index for employee name autocomplete.
+
+``TypeaheadIndex`` keeps every active employee in worker memory as a
+``Record`` (``__slots__``, no per-instance dict) holding its index terms:
+the lowercased words of the first and last names and the whole email. The
+index is partitioned by store; each store has two parallel arrays sorted by
+term, ``terms`` (a list of strings) and ``ids`` (an ``array('q')`` of
+employee ids). A query is a ``bisect`` in each of the caller's stores to
+the first term starting with the longest query word, then a walk along the
+terms until ``limit`` distinct employees match every other word too. The
+walk stops after ``AUTOCOMPLETE_MAX_SCAN`` entries per store, so a one-letter
+word can't scan a whole store; such a query returns what it found by then.
+
+The index is built once per process and then refreshed incrementally: the
+rows whose ``updated_at`` is at or after the newest one already seen (less
+``AUTOCOMPLETE_SETTLE_SECONDS``, for transactions that commit late) are
+re-read and patched in, at most every ``AUTOCOMPLETE_REFRESH_SECONDS``.
+Employees are mostly soft-deleted; a hard delete leaves an ``employee``
+tombstone, and the refresh drops the employees named by new tombstones
+that no longer exist. No row count is needed.
+
+Memory: terms are cut to ``TERM_LENGTH`` characters and interned, so
+employees sharing a first name share its string. With the ids arrays and
+the records (each keeping a tuple of its terms) that comes to roughly 400
+bytes per employee (about 40 MB at 100k); ``nbytes()`` reports the figure
+for the live index.
+"""
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Max
+
+from .models import Employee, Tombstone
+
+TERM_LENGTH = 32
+REFRESH_SECONDS = 1.0
+SETTLE_SECONDS = 2
+MAX_SCAN = 2000
+FIELDS = ('pk', 'first_name', 'last_name', 'email', 'store_id', 'is_active')
+
+
+class Record:
+    """One active employee as returned by the autocomplete endpoint."""
+
+    __slots__ = ('id', 'first_name', 'last_name', 'email', 'store_id', 'terms')
+
+    def __init__(self, pk, first_name, last_name, email, store_id):
+        self.id = pk
+        self.first_name = sys.intern(first_name)
+        self.last_name = sys.intern(last_name)
+        self.email = email
+        self.store_id = store_id
+        words = f'{first_name} {last_name}'.lower().split()
+        terms = {sys.intern(word[:TERM_LENGTH]) for word in words}
+        if email:
+            terms.add(email.lower()[:TERM_LENGTH])
+        self.terms = tuple(terms)
+
+    @property
+    def full_name(self):
+        return f'{self.first_name} {self.last_name}'
+
+    def fields(self):
+        return self.first_name, self.last_name, self.email, self.store_id
+
+    def matches(self, word):
+        """Whether one of this employee's terms starts with ``word``."""
+        return any(term.startswith(word) for term in self.terms)
+
+
+class TypeaheadIndex:
+    """Per-store sorted ``terms``/``ids`` arrays over active employees, keyed by id in ``records``."""
+
+    def __init__(self):
+        self.records = {}
+        self.stores = {}
+        self.watermark = None
+        self.tombstones = None
+        self.checked = None
+
+    def build(self):
+        """Load every active employee."""
+        self.watermark = Employee.objects.aggregate(last=Max('updated_at'))['last']
+        self.tombstones = Tombstone.objects.aggregate(last=Max('deleted_at'))['last']
+        rows = Employee.objects.filter(is_active=True).values_list(*FIELDS[:-1])
+        self.records = {pk: Record(pk, *fields) for pk, *fields in rows.iterator(chunk_size=2000)}
+        pairs = defaultdict(list)
+        for pk, record in self.records.items():
+            pairs[record.store_id].extend((term, pk) for term in record.terms)
+        self.stores = {}
+        for store_id, store_pairs in pairs.items():
+            store_pairs.sort()
+            self.stores[store_id] = ([term for term, _ in store_pairs], array('q', (pk for _, pk in store_pairs)))
+        self.checked = time.monotonic()
+        return self
+
+    def refresh(self):
+        """Patch in employees changed or deleted since the last build or refresh."""
+        settle = timedelta(seconds=getattr(settings, 'AUTOCOMPLETE_SETTLE_SECONDS', SETTLE_SECONDS))
+        changed = Employee.objects.values_list(*FIELDS, 'updated_at').order_by('updated_at', 'pk')
+        if self.watermark is not None:
+            changed = changed.filter(updated_at__gte=self.watermark - settle)
+        for pk, first_name, last_name, email, store_id, active, updated_at in changed:
+            self.apply(pk, first_name, last_name, email, store_id, active)
+            self.watermark = max(self.watermark or updated_at, updated_at)
+
+        deleted = Tombstone.objects.filter(entity=Tombstone.ENTITY_EMPLOYEE).values_list('entity_id', 'deleted_at')
+        if self.tombstones is not None:
+            deleted = deleted.filter(deleted_at__gte=self.tombstones - settle)
+        gone = set()
+        for pk, deleted_at in deleted:
+            gone.add(pk)
+            self.tombstones = max(self.tombstones or deleted_at, deleted_at)
+        # Employees moving store leave a tombstone too; they are still there.
+        gone = {pk for pk in gone if pk in self.records}
+        if gone:
+            gone -= set(Employee.objects.filter(pk__in=gone).values_list('pk', flat=True))
+        for pk in gone:
+            self._unindex(self.records.pop(pk))
+        self.checked = time.monotonic()
+        return self
+
+    def apply(self, pk, first_name, last_name, email, store_id, active=True):
+        """Add, update or (when ``active`` is false) drop one employee."""
+        old = self.records.get(pk)
+        if old is not None:
+            if active and old.fields() == (first_name, last_name, email, store_id):
+                return
+            self._unindex(old)
+            if not active:
+                del self.records[pk]
+        if active:
+            # Replacing the value in place keeps the dict from growing.
+            record = self.records[pk] = Record(pk, first_name, last_name, email, store_id)
+            terms, ids = self.stores.setdefault(store_id, ([], array('q')))
+            for term in record.terms:
+                position = bisect_right(terms, term)
+                terms.insert(position, term)
+                ids.insert(position, pk)
+
+    def _unindex(self, record):
+        terms, ids = self.stores[record.store_id]
+        for term in record.terms:
+            position = bisect_left(terms, term)
+            while position < len(terms) and terms[position] == term:
+                if ids[position] == record.id:
+                    del terms[position]
+                    del ids[position]
+                    break
+                position += 1
+
+    def search(self, query, limit=10, store_ids=None):
+        """Up to ``limit`` ``Record``\\ s with a term starting with each word of ``query``, in term order."""
+        words = sorted((word[:TERM_LENGTH] for word in query.lower().split()), key=len, reverse=True)
+        if not words:
+            return []
+        stores = self.stores.keys() if store_ids is None else set(store_ids) & self.stores.keys()
+        max_scan = getattr(settings, 'AUTOCOMPLETE_MAX_SCAN', MAX_SCAN)
+        found = []
+        for store_id in stores:
+            found.extend(self._search_store(store_id, words[0], words[1:], limit, max_scan))
+        # Each store's matches are in term order already; a stable sort merges them.
+        found.sort(key=lambda match: match[0])
+        return [record for _, record in found[:limit]]
+
+    def _search_store(self, store_id, head, rest, limit, max_scan):
+        terms, ids = self.stores[store_id]
+        records = self.records
+        found, seen = [], set()
+        start = bisect_left(terms, head)
+        for position in range(start, min(start + max_scan, len(terms))):
+            term = terms[position]
+            if not term.startswith(head):
+                break
+            pk = ids[position]
+            if pk in seen:
+                continue
+            seen.add(pk)
+            record = records[pk]
+            if all(record.matches(word) for word in rest):
+                found.append((term, record))
+                if len(found) == limit:
+                    break
+        return found
+
+    def nbytes(self):
+        """Approximate memory held by the index, counting shared strings once."""
+        strings = {}
+        size = sys.getsizeof(self.records) + sys.getsizeof(self.stores)
+        for terms, ids in self.stores.values():
+            size += sys.getsizeof(terms) + sys.getsizeof(ids)
+            strings.update((id(term), term) for term in terms)
+        for record in self.records.values():
+            size += sys.getsizeof(record) + sys.getsizeof(record.terms)
+            for value in (record.first_name, record.last_name, record.email):
+                strings[id(value)] = value
+        return size + sum(sys.getsizeof(value) for value in strings.values())
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def find_matches(query, limit=10, store_ids=None):
+    """Autocomplete ``query`` from this process's index, refreshing it first if it is due."""
+    global _index
+    interval = getattr(settings, 'AUTOCOMPLETE_REFRESH_SECONDS', REFRESH_SECONDS)
+    with _index_lock:
+        if _index is None:
+            _index = TypeaheadIndex().build()
+        elif time.monotonic() - _index.checked >= interval:
+            _index = _index.refresh()
+        return _index.search(query, limit, store_ids)
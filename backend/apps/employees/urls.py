@@ -1,13 +1,21 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import EmployeeViewSet, SkillViewSet, AvailabilityViewSet
+from .views import (
+    AvailabilityExceptionViewSet,
+    AvailabilityViewSet,
+    EmployeeViewSet,
+    SkillViewSet,
+    SyncView,
+)
 
 # Create a router and register our viewsets
 router = DefaultRouter()
 router.register(r'employees', EmployeeViewSet, basename='employee')
 router.register(r'skills', SkillViewSet, basename='skill')
 router.register(r'availability', AvailabilityViewSet, basename='availability')
+router.register(r'availability-exceptions', AvailabilityExceptionViewSet, basename='availability-exception')
 
 urlpatterns = [
+    path('sync/', SyncView.as_view(), name='sync'),
     path('', include(router.urls)),
 ]
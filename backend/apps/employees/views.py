@@ -1,19 +1,94 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
+from rest_framework.views import APIView
+from django import forms
+from django.conf import settings
+from django_filters import rest_framework as filters
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
-from .models import Employee, Skill, Availability
+from .models import Employee, Skill, Availability, AvailabilityException
 from .serializers import (
+    AutocompleteQuerySerializer,
+    AutocompleteSerializer,
+    AvailabilityCalendarQuerySerializer,
+    AvailabilityExceptionSerializer,
+    AvailableQuerySerializer,
     EmployeeSerializer,
     EmployeeListSerializer,
+    EmployeeBulkUpdateSerializer,
+    EmployeeSyncSerializer,
+    ReplacementQuerySerializer,
+    ReplacementSerializer,
     SkillSerializer,
-    AvailabilitySerializer
+    AvailabilitySerializer,
+    TombstoneSerializer
 )
+from apps.archive.archiver import archived_rows
+from apps.core.views import ColumnarFormatMixin
+from apps.jobs.registry import enqueue
+from apps.jobs.serializers import JobSerializer
+from apps.stores.scoping import StoreScopedMixin, get_request_store_ids
 
+from .bulk import BulkUpdateError, apply_bulk_update
+from .replacements import find_replacements
+from .resolver import resolve_availability
+from .skillcatalog import get_catalog
+from .skillmask import filter_by_skills
+from .sync import InvalidCursor, collect_changes, get_page_size
+from .typeahead import find_matches
 
-class SkillViewSet(viewsets.ModelViewSet):
+
+class SkillIdsFilter(filters.BaseInFilter, filters.NumberFilter):
+    """Comma-separated skill ids, e.g. ``?skills_all=1,3``."""
+    field_class = forms.IntegerField
+
+
+class SkillFilterSet(filters.FilterSet):
+    """``skills_all`` / ``skills_any`` / ``skills_none`` backed by the employee skill masks."""
+    skills_all = SkillIdsFilter(method='filter_skills', help_text='Has every listed skill.')
+    skills_any = SkillIdsFilter(method='filter_skills', help_text='Has at least one listed skill.')
+    skills_none = SkillIdsFilter(method='filter_skills', help_text='Has none of the listed skills.')
+
+    # Path from the filtered model to the employee.
+    employee_prefix = ''
+
+    def filter_skills(self, queryset, name, value):
+        argument = {'skills_all': 'all_of', 'skills_any': 'any_of', 'skills_none': 'none_of'}[name]
+        return filter_by_skills(queryset, prefix=self.employee_prefix, **{argument: value})
+
+
+class EmployeeFilter(SkillFilterSet):
+    """Filters for the employee list."""
+
+    class Meta:
+        model = Employee
+        fields = ['is_active', 'skills', 'store']
+
+
+class AvailabilityFilter(SkillFilterSet):
+    """Filters for availability, including the employee's skills."""
+    employee_prefix = 'employee__'
+
+    class Meta:
+        model = Availability
+        fields = ['employee', 'day_of_week', 'is_available']
+
+
+class AvailabilityExceptionFilter(filters.FilterSet):
+    """Filter exceptions by employee, kind, and the dates they overlap."""
+    date_from = filters.DateFilter(field_name='end_date', lookup_expr='gte')
+    date_to = filters.DateFilter(field_name='start_date', lookup_expr='lte')
+
+    class Meta:
+        model = AvailabilityException
+        fields = ['employee', 'is_available']
+
+
+class SkillViewSet(ColumnarFormatMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing skills.
     
@@ -27,7 +102,7 @@ class SkillViewSet(viewsets.ModelViewSet):
     ordering = ['name']
 
 
-class EmployeeViewSet(viewsets.ModelViewSet):
+class EmployeeViewSet(ColumnarFormatMixin, StoreScopedMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing employees.
     
@@ -39,29 +114,82 @@ class EmployeeViewSet(viewsets.ModelViewSet):
     - Partial Update: PATCH /api/employees/{id}/
     - Delete: DELETE /api/employees/{id}/ (soft delete - sets is_active=False)
     - Availability: GET/POST /api/employees/{id}/availability/
+    - Archived rows: ``?include_archived=true`` on retrieve and availability
+      adds what ``archive_inactive`` moved to the archive tables
+    - Bulk Update: POST /api/employees/bulk-update/
+    - Availability Calendar: GET /api/employees/availability-calendar/?start=&end=
+    - Available: GET /api/employees/available/?date=&start_time=&end_time=
+    - Replacements: GET /api/employees/replacements/?day=&start=&end=&skills=
+    - Autocomplete: GET /api/employees/autocomplete/?q=
+
+    Results are scoped to the caller's stores (see ``apps.stores.scoping``).
+    Responses and request bodies may also use columnar JSON
+    (``apps.core.columnar``).
     """
     queryset = Employee.objects.all()
+    throttle_scopes = {
+        'availability_calendar': 'availability',
+        'available': 'availability',
+        'replacements': 'availability',
+        'autocomplete': 'autocomplete',
+    }
+    # Cases for ``explain_endpoints`` beyond the generated filter/ordering ones
+    explain_params = {
+        'list': [{'skills_all': '1,2'}, {'skills_any': '1,2', 'is_active': 'true'}],
+        'availability_calendar': [{'start': '2026-01-05', 'end': '2026-01-11'}],
+        'available': [{'date': '2026-01-05', 'start_time': '09:00', 'end_time': '17:00'}],
+        'replacements': [{'day': '2026-01-05', 'start': '09:00', 'end': '17:00', 'skills': '1'}],
+        'autocomplete': [{'q': 'jan'}],
+    }
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_fields = ['is_active', 'skills']
+    filterset_class = EmployeeFilter
     search_fields = ['first_name', 'last_name', 'email']
     ordering_fields = ['first_name', 'last_name', 'hire_date', 'hourly_rate']
     ordering = ['last_name', 'first_name']
     
     def get_serializer_class(self):
         """Use lightweight serializer for list view."""
-        if self.action == 'list':
+        if self.action in ('list', 'available'):
             return EmployeeListSerializer
+        if self.action == 'bulk_update':
+            return EmployeeBulkUpdateSerializer
         return EmployeeSerializer
     
     def get_queryset(self):
         """Optimize queries with select_related and prefetch_related."""
         queryset = super().get_queryset()
-        if self.action == 'list':
+        if self.action in ('list', 'available', 'retrieve') and get_catalog().has_overflow:
+            # Nested skills come from the skill masks unless some ids are beyond them.
             queryset = queryset.prefetch_related('skills')
-        elif self.action == 'retrieve':
-            queryset = queryset.prefetch_related('skills', 'availability')
+        if self.action == 'retrieve':
+            queryset = queryset.prefetch_related('availability')
         return queryset
+
+    def get_throttle_scope(self):
+        """Searches are throttled as ``employee-search``; plain roster pages use the default scope."""
+        if self.action == 'list' and self.request.query_params.get(SearchFilter.search_param):
+            return 'employee-search'
+        return None
     
+    def _archived_rows(self, employee):
+        """The employee's archived rows if ``?include_archived=true`` asked for them, else ``None``."""
+        if self.request.query_params.get('include_archived', '').lower() not in ('1', 'true', 'yes'):
+            return None
+        return archived_rows(employee)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        data = self.get_serializer(instance).data
+        archived = self._archived_rows(instance)
+        if archived is not None:
+            availability, _, skill_ids = archived
+            data['skills'] = get_catalog().represent({skill['id'] for skill in data['skills']} | set(skill_ids))
+            data['availability'] += AvailabilitySerializer(
+                availability, many=True, context=self.get_serializer_context()
+            ).data
+            data['archived'] = True
+        return Response(data)
+
     def destroy(self, request, *args, **kwargs):
         """
         Soft delete - set is_active to False instead of deleting.
@@ -85,8 +213,13 @@ class EmployeeViewSet(viewsets.ModelViewSet):
         employee = self.get_object()
         
         if request.method == 'GET':
-            availabilities = employee.availability.all()
-            serializer = AvailabilitySerializer(availabilities, many=True)
+            availabilities = list(employee.availability.all())
+            archived = self._archived_rows(employee)
+            if archived is not None:
+                availabilities += archived[0]
+            serializer = AvailabilitySerializer(
+                availabilities, many=True, context=self.get_serializer_context()
+            )
             return Response(serializer.data)
         
         elif request.method == 'POST':
@@ -101,14 +234,162 @@ class EmployeeViewSet(viewsets.ModelViewSet):
             else:
                 data['employee'] = employee.id
             
-            serializer = AvailabilitySerializer(data=data, many=is_many)
+            serializer = AvailabilitySerializer(
+                data=data, many=is_many, context=self.get_serializer_context()
+            )
             serializer.is_valid(raise_exception=True)
             serializer.save()
             
             return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+    @action(detail=False, methods=['get'], url_path='availability-calendar')
+    def availability_calendar(self, request):
+        """
+        Resolved availability per day for a page of employees.
+
+        Combines the weekly pattern with availability exceptions (see
+        ``apps.employees.resolver``) for ``?start=`` through ``?end=``.
+        The list filters apply. Each day maps to ``[start, end]`` pairs in
+        minutes since midnight.
+        """
+        params = AvailabilityCalendarQuerySerializer(
+            data=request.query_params,
+            context={'max_days': getattr(settings, 'AVAILABILITY_CALENDAR_MAX_DAYS', 62)}
+        )
+        params.is_valid(raise_exception=True)
+        start, end = params.validated_data['start'], params.validated_data['end']
+
+        queryset = self.filter_queryset(self.get_queryset()).only('id', 'first_name', 'last_name')
+        page = self.paginate_queryset(queryset)
+        calendar = resolve_availability(page, start, end)
+        results = [
+            {
+                'employee': employee.pk,
+                'full_name': employee.full_name,
+                'days': {
+                    day.isoformat(): [list(interval) for interval in intervals]
+                    for day, intervals in calendar.for_employee(employee.pk).items()
+                },
+            }
+            for employee in page
+        ]
+        return self.get_paginated_response(results)
+
+    @action(detail=False, methods=['get'])
+    def available(self, request):
+        """
+        Employees free for all of ``?start_time=``-``?end_time=`` on ``?date=``.
+
+        Without a window the whole day must be free. Weekly availability and
+        exceptions are both taken into account; the list filters apply, and
+        only active employees are listed unless ``?is_active=`` says otherwise.
+        """
+        params = AvailableQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        day = params.validated_data['date']
+
+        queryset = self.filter_queryset(self.get_queryset())
+        if 'is_active' not in request.query_params:
+            queryset = queryset.filter(is_active=True)
+        calendar = resolve_availability(queryset, day, day)
+        free = calendar.available(
+            day, params.validated_data.get('start_time'), params.validated_data.get('end_time')
+        )
+        page = self.paginate_queryset(queryset.filter(pk__in=free))
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+    @action(detail=False, methods=['get'])
+    def replacements(self, request):
+        """
+        Rank active employees who could cover a shift on ``?day=``.
+
+        Candidates must be available for all of ``?start=``-``?end=``
+        (weekly pattern plus exceptions), hold every skill in ``?skills=``
+        and, if under 18, be allowed to work those hours. ``?score=`` picks
+        the ranking (``cost`` or ``hours``); ``?exclude=`` drops the
+        employee who called out. Served from ``apps.employees.replacements``.
+        """
+        params = ReplacementQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
 
-class AvailabilityViewSet(viewsets.ModelViewSet):
+        count, candidates = find_replacements(
+            data['day'], data['start'], data['end'],
+            skill_ids=data.get('skills', ()),
+            store_ids=get_request_store_ids(request),
+            exclude=[data['exclude']] if 'exclude' in data else (),
+            score=data['score'],
+            limit=data['limit'],
+        )
+        return Response({
+            'count': count,
+            'results': ReplacementSerializer(candidates, many=True).data,
+        })
+
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """
+        Active employees whose name words or email start with the words of ``?q=``.
+
+        Served from the worker's in-memory index (``apps.employees.typeahead``)
+        instead of the database, so pickers can query on every keystroke.
+        """
+        params = AutocompleteQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        records = find_matches(
+            params.validated_data['q'], params.validated_data['limit'], get_request_store_ids(request)
+        )
+        return Response({'results': AutocompleteSerializer(records, many=True).data})
+
+    @action(detail=False, methods=['post'], url_path='bulk-update')
+    def bulk_update(self, request):
+        """
+        Apply one operation to many employees in a single transaction.
+
+        Targets are chosen with the list filters in the query string
+        (``?is_active=``, ``?skills=``, ``?search=``), an ``ids`` list in
+        the body, or both. At least one of them is required.
+
+        With ``?async=true`` the update is queued as a background job and
+        202 Accepted is returned with the job's status URL.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        filter_params = set(self.filterset_class.base_filters) | {SearchFilter.search_param}
+        has_filter = any(request.query_params.get(param) for param in filter_params)
+        if 'ids' not in data and not has_filter:
+            raise ValidationError(
+                {'detail': 'Provide "ids" or at least one filter to select employees.'}
+            )
+
+        queryset = self.filter_queryset(self.get_queryset())
+        if 'ids' in data:
+            queryset = queryset.filter(pk__in=data['ids'])
+
+        if request.query_params.get('async', '').lower() in ('1', 'true', 'yes'):
+            job = enqueue(
+                'employees.bulk_update',
+                ids=list(queryset.values_list('pk', flat=True)),
+                data={key: value for key, value in request.data.items() if key != 'ids'},
+                stores=get_request_store_ids(request),
+            )
+            status_url = reverse('job-detail', args=[job.pk], request=request)
+            return Response(
+                JobSerializer(job).data,
+                status=status.HTTP_202_ACCEPTED,
+                headers={'Location': status_url}
+            )
+
+        try:
+            summary = apply_bulk_update(queryset, data)
+        except BulkUpdateError as exc:
+            raise ValidationError({'value': str(exc)})
+        return Response(summary, status=status.HTTP_200_OK)
+
+
+class AvailabilityViewSet(ColumnarFormatMixin, StoreScopedMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing employee availability.
     
@@ -117,11 +398,65 @@ class AvailabilityViewSet(viewsets.ModelViewSet):
     """
     queryset = Availability.objects.all()
     serializer_class = AvailabilitySerializer
+    store_field = 'employee__store'
+    explain_params = {'list': [{'skills_any': '1,2', 'day_of_week': '0'}]}
     filter_backends = [DjangoFilterBackend, OrderingFilter]
-    filterset_fields = ['employee', 'day_of_week', 'is_available']
+    filterset_class = AvailabilityFilter
     ordering_fields = ['day_of_week', 'start_time']
     ordering = ['employee', 'day_of_week', 'start_time']
     
     def get_queryset(self):
         """Optimize queries."""
         return super().get_queryset().select_related('employee')
+
+
+class AvailabilityExceptionViewSet(ColumnarFormatMixin, StoreScopedMixin, viewsets.ModelViewSet):
+    """
+    ViewSet for date-specific availability exceptions (time off, extra hours).
+
+    ``?date_from=``/``?date_to=`` return exceptions overlapping that range.
+    """
+    queryset = AvailabilityException.objects.all()
+    serializer_class = AvailabilityExceptionSerializer
+    store_field = 'employee__store'
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_class = AvailabilityExceptionFilter
+    ordering_fields = ['start_date', 'end_date']
+    ordering = ['start_date', 'employee', 'start_time']
+
+    def get_queryset(self):
+        """Optimize queries."""
+        return super().get_queryset().select_related('employee')
+
+
+class SyncView(APIView):
+    """
+    Delta sync for offline clients.
+
+    GET /api/sync/?since=<cursor>&limit=<n>
+
+    Returns employees, skills and availability changed after ``since`` plus
+    tombstones for deactivated employees and deleted rows, scoped to the
+    caller's stores (skills are chain-wide). Keep calling with
+    ``next_cursor`` while ``has_more`` is true, then store it for next launch.
+    """
+    throttle_scope = 'sync'
+
+    def get(self, request):
+        try:
+            limit = get_page_size(request.query_params.get('limit'))
+        except ValueError:
+            raise ValidationError({'limit': 'Must be an integer.'})
+        try:
+            changes = collect_changes(request.query_params.get('since'), limit, get_request_store_ids(request))
+        except InvalidCursor:
+            raise ValidationError({'since': 'Invalid sync cursor.'})
+
+        return Response({
+            'employees': EmployeeSyncSerializer(changes['employees'], many=True).data,
+            'skills': SkillSerializer(changes['skills'], many=True).data,
+            'availability': AvailabilitySerializer(changes['availability'], many=True).data,
+            'tombstones': TombstoneSerializer(changes['tombstones'], many=True).data,
+            'next_cursor': changes['next_cursor'],
+            'has_more': changes['has_more'],
+        })
@@ -0,0 +1,28 @@
+from django.contrib import admin
+from apps.core.paginators import ApproximateCountPaginator
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    """Admin interface for background jobs."""
+
+    list_display = ['id', 'name', 'status', 'progress', 'attempts', 'created_at', 'finished_at']
+    list_filter = ['status', 'name']
+    ordering = ['-created_at']
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
+    readonly_fields = [
+        'name',
+        'kwargs',
+        'attempts',
+        'progress',
+        'progress_message',
+        'result',
+        'error',
+        'locked_by',
+        'locked_at',
+        'created_at',
+        'updated_at',
+        'finished_at',
+    ]
@@ -0,0 +1,71 @@
+import multiprocessing
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from apps.jobs.runner import work
+
+DEFAULT_PROCESSES = 2
+
+
+def _worker_main(poll_interval, burst, stop_event):
+    """Entry point of each worker process."""
+    # The parent coordinates shutdown; children finish their current job.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda *args: stop_event.set())
+    work(poll_interval=poll_interval, burst=burst, should_stop=stop_event.is_set)
+
+
+class Command(BaseCommand):
+    help = 'Run background job workers against the database-backed queue.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=getattr(settings, 'JOB_WORKER_PROCESSES', DEFAULT_PROCESSES),
+            help='Number of worker processes (default: JOB_WORKER_PROCESSES).',
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=1.0, help='Seconds to sleep when the queue is empty.'
+        )
+        parser.add_argument(
+            '--burst', action='store_true', help='Exit once the queue is empty instead of polling forever.'
+        )
+
+    def handle(self, *args, **options):
+        processes = max(1, options['processes'])
+        poll_interval = options['poll_interval']
+        burst = options['burst']
+
+        if processes == 1:
+            self.stdout.write('Starting 1 worker in-process')
+            work(poll_interval=poll_interval, burst=burst)
+            return
+
+        # Never share a database socket across fork().
+        connections.close_all()
+        stop_event = multiprocessing.Event()
+        workers = [
+            multiprocessing.Process(
+                target=_worker_main,
+                args=(poll_interval, burst, stop_event),
+                name=f'job-worker-{index}',
+            )
+            for index in range(processes)
+        ]
+        for process in workers:
+            process.start()
+        self.stdout.write(f'Started {processes} worker processes')
+
+        def shutdown(*args):
+            self.stdout.write('Stopping workers after their current job...')
+            stop_event.set()
+
+        signal.signal(signal.SIGINT, shutdown)
+        signal.signal(signal.SIGTERM, shutdown)
+        for process in workers:
+            process.join()
+        self.stdout.write(self.style.SUCCESS('All workers stopped'))
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-19 05:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("jobs", "0002_heartbeat"),
+        ("stores", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="stores",
+            field=models.ManyToManyField(blank=True, related_name="jobs", to="stores.store"),
+        ),
+    ]
@@ -0,0 +1,70 @@
+"""
+Job handler registry.
+
+Apps register handlers in their ``tasks`` module::
+
+    from apps.jobs.registry import register
+
+    @register('employees.bulk_update')
+    def bulk_update_employees(context, ids, data):
+        ...
+        context.progress(done, total)
+        return {'updated': done}
+
+Handlers receive a ``JobContext`` plus the JSON kwargs given to ``enqueue``
+and return a JSON-serializable result. Any exception fails the attempt and
+is retried with backoff; raise ``PermanentError`` for failures a retry can't
+fix (bad input), and the job fails at once.
+"""
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+
+from .models import Job
+
+DEFAULT_MAX_ATTEMPTS = 3
+
+_handlers = {}
+
+
+class PermanentError(Exception):
+    """Raised by a handler to fail its job without further attempts."""
+
+
+def register(name):
+    """Register the decorated function as the handler for ``name``."""
+
+    def decorator(func):
+        existing = _handlers.get(name)
+        if existing is not None and existing is not func:
+            raise ImproperlyConfigured(f'Job handler "{name}" is already registered.')
+        _handlers[name] = func
+        return func
+
+    return decorator
+
+
+def get_handler(name):
+    """Return the handler registered for ``name`` or raise ``KeyError``."""
+    return _handlers[name]
+
+
+def enqueue(name, *, max_attempts=None, run_after=None, stores=None, **kwargs):
+    """
+    Queue a job for ``name`` and return it. ``kwargs`` must be JSON-serializable.
+
+    ``stores`` is the enqueuing caller's store scope (see
+    ``get_request_store_ids``); ``None`` makes the job visible to unscoped
+    callers only.
+    """
+    if name not in _handlers:
+        raise ImproperlyConfigured(f'No job handler registered for "{name}".')
+    job = Job.objects.create(
+        name=name,
+        kwargs=kwargs,
+        max_attempts=max_attempts or getattr(settings, 'JOB_MAX_ATTEMPTS', DEFAULT_MAX_ATTEMPTS),
+        run_after=run_after or timezone.now(),
+    )
+    if stores:
+        job.stores.set(stores)
+    return job
@@ -0,0 +1,220 @@
+"""
+Claiming and running queued jobs.
+
+On Postgres a worker claims the oldest due job with
+``SELECT ... FOR UPDATE SKIP LOCKED`` so concurrent workers never wait on
+each other. SQLite has no row locks; there a worker claims a job by
+inserting its ``JobLock`` row, and the primary key lets only one insert win.
+
+While a job runs, a ``Heartbeat`` thread bumps its ``heartbeat_at`` every
+``JOB_HEARTBEAT_SECONDS`` (as does ``JobContext.progress``). Running jobs
+whose heartbeat is older than ``JOB_LOCK_TIMEOUT_SECONDS`` belonged to a
+worker that died, and are requeued; long jobs on a live worker are not.
+"""
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job, JobLock
+from .registry import PermanentError, get_handler
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETRY_BASE_SECONDS = 5
+DEFAULT_RETRY_MAX_SECONDS = 600
+DEFAULT_HEARTBEAT_SECONDS = 30
+DEFAULT_LOCK_TIMEOUT_SECONDS = 300
+
+
+def worker_name():
+    """Identify this worker process in ``Job.locked_by``."""
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def retry_delay(attempts):
+    """Exponential backoff after the ``attempts``-th failure."""
+    base = getattr(settings, 'JOB_RETRY_BASE_SECONDS', DEFAULT_RETRY_BASE_SECONDS)
+    cap = getattr(settings, 'JOB_RETRY_MAX_SECONDS', DEFAULT_RETRY_MAX_SECONDS)
+    return timedelta(seconds=min(cap, base * 2 ** (attempts - 1)))
+
+
+def heartbeat_interval():
+    return getattr(settings, 'JOB_HEARTBEAT_SECONDS', DEFAULT_HEARTBEAT_SECONDS)
+
+
+def beat(job):
+    """Mark ``job`` as still running on the worker that claimed it."""
+    return Job.objects.filter(pk=job.pk, status=Job.STATUS_RUNNING, locked_by=job.locked_by).update(
+        heartbeat_at=timezone.now()
+    )
+
+
+class Heartbeat(threading.Thread):
+    """Calls ``beat(job)`` every ``interval`` seconds while the ``with`` block runs."""
+
+    def __init__(self, job, interval=None):
+        super().__init__(name=f'job-{job.pk}-heartbeat', daemon=True)
+        self.job = job
+        self.interval = heartbeat_interval() if interval is None else interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        try:
+            while not self.stopped.wait(self.interval):
+                try:
+                    beat(self.job)
+                except Exception:
+                    logger.exception('Heartbeat for job %s failed', self.job.pk)
+        finally:
+            connection.close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        self.join()
+
+
+class JobContext:
+    """Passed to handlers so they can report progress."""
+
+    def __init__(self, job):
+        self.job = job
+        self.beaten = time.monotonic()
+
+    def progress(self, done, total=None, message=''):
+        """Record progress as ``done`` of ``total`` (or a percentage if no total)."""
+        percent = done if total is None else (100 * done // total if total else 100)
+        percent = max(0, min(100, int(percent)))
+        if percent == self.job.progress and message == self.job.progress_message:
+            if time.monotonic() - self.beaten >= heartbeat_interval():
+                beat(self.job)
+                self.beaten = time.monotonic()
+            return
+        self.job.progress = percent
+        self.job.progress_message = message[:200]
+        now = timezone.now()
+        Job.objects.filter(pk=self.job.pk).update(
+            progress=percent, progress_message=self.job.progress_message, heartbeat_at=now, updated_at=now
+        )
+        self.beaten = time.monotonic()
+
+
+def _uses_skip_locked():
+    return connection.features.has_select_for_update_skip_locked
+
+
+def requeue_stale_jobs():
+    """Return jobs whose worker stopped sending heartbeats to the queue."""
+    timeout = getattr(settings, 'JOB_LOCK_TIMEOUT_SECONDS', DEFAULT_LOCK_TIMEOUT_SECONDS)
+    cutoff = timezone.now() - timedelta(seconds=timeout)
+    stale = Job.objects.filter(status=Job.STATUS_RUNNING, heartbeat_at__lt=cutoff)
+    with transaction.atomic():
+        JobLock.objects.filter(job__in=stale).delete()
+        return stale.update(
+            status=Job.STATUS_QUEUED,
+            locked_by='',
+            locked_at=None,
+            heartbeat_at=None,
+            error='Worker stopped responding; requeued.',
+            updated_at=timezone.now(),
+        )
+
+
+def _mark_running(pk, worker, now):
+    return Job.objects.filter(pk=pk, status=Job.STATUS_QUEUED).update(
+        status=Job.STATUS_RUNNING,
+        locked_by=worker,
+        locked_at=now,
+        heartbeat_at=now,
+        attempts=F('attempts') + 1,
+        updated_at=now,
+    )
+
+
+def claim_job(worker):
+    """Claim the oldest due job for ``worker``; return it or ``None``."""
+    now = timezone.now()
+    due = Job.objects.filter(status=Job.STATUS_QUEUED, run_after__lte=now).order_by('run_after', 'id')
+
+    if _uses_skip_locked():
+        with transaction.atomic():
+            job = due.select_for_update(skip_locked=True).first()
+            if job is None:
+                return None
+            _mark_running(job.pk, worker, now)
+        return Job.objects.get(pk=job.pk)
+
+    for pk in due.values_list('pk', flat=True)[:20]:
+        try:
+            with transaction.atomic():
+                JobLock.objects.create(job_id=pk, worker=worker, acquired_at=now)
+                if not _mark_running(pk, worker, now):
+                    # Finished or claimed between our read and the lock.
+                    raise IntegrityError
+        except IntegrityError:
+            continue
+        return Job.objects.get(pk=pk)
+    return None
+
+
+def _release(job, **fields):
+    fields.update(locked_by='', locked_at=None, heartbeat_at=None, updated_at=timezone.now())
+    with transaction.atomic():
+        JobLock.objects.filter(job_id=job.pk).delete()
+        Job.objects.filter(pk=job.pk).update(**fields)
+    for name, value in fields.items():
+        setattr(job, name, value)
+
+
+def run_job(job):
+    """Execute a claimed job and record its outcome, scheduling a retry on failure."""
+    try:
+        handler = get_handler(job.name)
+        with Heartbeat(job):
+            result = handler(JobContext(job), **job.kwargs)
+    except Exception as exc:
+        error = traceback.format_exc()
+        logger.exception('Job %s (%s) failed on attempt %d', job.pk, job.name, job.attempts)
+        if job.attempts < job.max_attempts and not isinstance(exc, PermanentError):
+            _release(job, status=Job.STATUS_QUEUED, error=error, run_after=timezone.now() + retry_delay(job.attempts))
+        else:
+            _release(job, status=Job.STATUS_FAILED, error=error, finished_at=timezone.now())
+        return job
+
+    _release(job, status=Job.STATUS_SUCCEEDED, result=result, error='', progress=100, finished_at=timezone.now())
+    return job
+
+
+def run_next(worker=None):
+    """Claim and run one job. Returns the job, or ``None`` if nothing was due."""
+    job = claim_job(worker or worker_name())
+    if job is not None:
+        run_job(job)
+    return job
+
+
+def work(poll_interval=1.0, burst=False, should_stop=lambda: False):
+    """Run jobs until ``should_stop()`` (or, with ``burst``, until the queue is empty)."""
+    worker = worker_name()
+    last_reap = 0.0
+    while not should_stop():
+        close_old_connections()
+        if time.monotonic() - last_reap > 60:
+            requeue_stale_jobs()
+            last_reap = time.monotonic()
+        if run_next(worker) is None:
+            if burst:
+                return
+            time.sleep(poll_interval)
@@ -0,0 +1,25 @@
+from rest_framework import serializers
+from .models import Job
+
+
+class JobSerializer(serializers.ModelSerializer):
+    """Serializer for Job status (read-only)."""
+
+    class Meta:
+        model = Job
+        fields = [
+            'id',
+            'name',
+            'status',
+            'progress',
+            'progress_message',
+            'attempts',
+            'max_attempts',
+            'run_after',
+            'result',
+            'error',
+            'created_at',
+            'updated_at',
+            'finished_at',
+        ]
+        read_only_fields = fields
@@ -0,0 +1,253 @@
+import pytest
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from apps.employees.models import Employee
+from apps.jobs.models import Job, JobLock
+from apps.jobs import runner
+from apps.jobs.registry import PermanentError, enqueue, register
+from apps.jobs.runner import JobContext, claim_job, requeue_stale_jobs, retry_delay, run_next
+from apps.stores.models import Store
+
+calls = []
+
+
+@register('tests.echo')
+def echo(context, value):
+    """Report progress and return the value."""
+    context.progress(1, 2, message='halfway')
+    return {'value': value}
+
+
+@register('tests.flaky')
+def flaky(context):
+    """Always fail."""
+    calls.append('flaky')
+    raise RuntimeError('boom')
+
+
+@register('tests.rejected')
+def rejected(context):
+    """Fail in a way a retry can't fix."""
+    calls.append('rejected')
+    raise PermanentError('bad input')
+
+
+@register('tests.slow')
+def slow(context):
+    """Run long enough for a few heartbeats."""
+    time.sleep(0.2)
+
+
+@pytest.fixture
+def api_client():
+    """Pytest fixture for API client."""
+    return APIClient()
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    calls.clear()
+
+
+@pytest.mark.django_db
+class TestJobRunner:
+    """Tests for claiming and running jobs."""
+
+    def test_run_next_executes_job(self):
+        """Test that a queued job runs and records its result."""
+        job = enqueue('tests.echo', value=42)
+
+        assert run_next('worker-1').pk == job.pk
+        job.refresh_from_db()
+        assert job.status == Job.STATUS_SUCCEEDED
+        assert job.result == {'value': 42}
+        assert job.progress == 100
+        assert job.attempts == 1
+        assert job.finished_at is not None
+        assert not JobLock.objects.exists()
+
+    def test_empty_queue(self):
+        """Test that nothing is claimed when the queue is empty."""
+        assert run_next('worker-1') is None
+
+    def test_failure_is_retried_with_backoff(self, settings):
+        """Test that a failed job is requeued with exponential backoff."""
+        settings.JOB_RETRY_BASE_SECONDS = 10
+        job = enqueue('tests.flaky', max_attempts=2)
+
+        run_next('worker-1')
+        job.refresh_from_db()
+        assert job.status == Job.STATUS_QUEUED
+        assert 'RuntimeError: boom' in job.error
+        assert job.run_after > timezone.now() + timedelta(seconds=5)
+
+        # Not due yet.
+        assert run_next('worker-1') is None
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        run_next('worker-1')
+        job.refresh_from_db()
+        assert job.status == Job.STATUS_FAILED
+        assert job.attempts == 2
+        assert calls == ['flaky', 'flaky']
+
+    def test_permanent_errors_are_not_retried(self):
+        """Test that a handler can fail its job without using up the attempts."""
+        job = enqueue('tests.rejected', max_attempts=3)
+
+        run_next('worker-1')
+        job.refresh_from_db()
+        assert job.status == Job.STATUS_FAILED
+        assert 'PermanentError: bad input' in job.error
+        assert calls == ['rejected']
+
+    def test_retry_delay_doubles_and_caps(self, settings):
+        """Test the backoff schedule."""
+        settings.JOB_RETRY_BASE_SECONDS = 5
+        settings.JOB_RETRY_MAX_SECONDS = 30
+        assert [retry_delay(n).total_seconds() for n in range(1, 6)] == [5, 10, 20, 30, 30]
+
+    def test_locked_job_is_not_claimed_twice(self):
+        """Test that a job already holding a lock row is skipped."""
+        first = enqueue('tests.echo', value=1)
+        second = enqueue('tests.echo', value=2)
+
+        assert claim_job('worker-1').pk == first.pk
+        assert claim_job('worker-2').pk == second.pk
+        assert claim_job('worker-3') is None
+        assert JobLock.objects.get(job=first).worker == 'worker-1'
+
+    def test_stale_running_job_is_requeued(self, settings):
+        """Test that jobs abandoned by a dead worker go back to the queue."""
+        settings.JOB_LOCK_TIMEOUT_SECONDS = 60
+        job = enqueue('tests.echo', value=1)
+        claim_job('dead-worker')
+        Job.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - timedelta(minutes=5))
+
+        assert requeue_stale_jobs() == 1
+        assert not JobLock.objects.exists()
+        assert run_next('worker-2').pk == job.pk
+
+    def test_long_running_job_with_a_heartbeat_is_kept(self, settings):
+        """Test that a job claimed long ago is not reaped while its worker reports progress."""
+        settings.JOB_LOCK_TIMEOUT_SECONDS = 60
+        settings.JOB_HEARTBEAT_SECONDS = 0
+        job = enqueue('tests.echo', value=1)
+        job = claim_job('busy-worker')
+        long_ago = timezone.now() - timedelta(hours=2)
+        Job.objects.filter(pk=job.pk).update(locked_at=long_ago, heartbeat_at=long_ago)
+
+        context = JobContext(job)
+        context.progress(10, message='working')
+        assert requeue_stale_jobs() == 0
+
+        # Unchanged progress still counts as a heartbeat.
+        Job.objects.filter(pk=job.pk).update(heartbeat_at=long_ago)
+        context.progress(10, message='working')
+        assert requeue_stale_jobs() == 0
+        assert Job.objects.get(pk=job.pk).status == Job.STATUS_RUNNING
+
+    def test_heartbeat_thread_runs_with_the_job(self, settings, monkeypatch):
+        """Test that the runner beats while the handler runs, and stops afterwards."""
+        settings.JOB_HEARTBEAT_SECONDS = 0.02
+        beats = []
+        monkeypatch.setattr(runner, 'beat', beats.append)
+        job = enqueue('tests.slow')
+
+        run_next('worker-1')
+        assert len(beats) >= 3
+        assert all(beaten.pk == job.pk for beaten in beats)
+        count = len(beats)
+        time.sleep(0.05)
+        assert len(beats) == count
+        assert Job.objects.get(pk=job.pk).heartbeat_at is None
+
+    def test_run_workers_burst(self):
+        """Test the management command drains the queue and exits."""
+        jobs = [enqueue('tests.echo', value=i) for i in range(3)]
+
+        call_command('run_workers', processes=1, burst=True)
+        assert all(
+            status_ == Job.STATUS_SUCCEEDED
+            for status_ in Job.objects.filter(pk__in=[j.pk for j in jobs]).values_list('status', flat=True)
+        )
+
+
+@pytest.mark.django_db
+class TestJobAPI:
+    """Tests for job status and async endpoints."""
+
+    def test_job_status(self, api_client):
+        """Test retrieving a job's status."""
+        job = enqueue('tests.echo', value=1)
+
+        response = api_client.get(f'/api/jobs/{job.id}/')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['status'] == Job.STATUS_QUEUED
+        assert response.data['progress'] == 0
+
+    def test_jobs_are_scoped_to_the_queuing_stores(self, api_client):
+        """Test that a store manager only sees jobs queued within their stores."""
+        store_a = Store.objects.create(name='Store #1')
+        store_b = Store.objects.create(name='Store #2')
+        manager = User.objects.create_user('manager1', password='pw')
+        store_a.managers.add(manager)
+        own = enqueue('tests.echo', value=1, stores=[store_a.id])
+        other = enqueue('tests.echo', value=2, stores=[store_b.id])
+        both = enqueue('tests.echo', value=3, stores=[store_a.id, store_b.id])
+        chain = enqueue('tests.echo', value=4)
+
+        api_client.force_authenticate(manager)
+        response = api_client.get('/api/jobs/')
+        assert [job['id'] for job in response.data['results']] == [own.id]
+        for job in (other, both, chain):
+            assert api_client.get(f'/api/jobs/{job.id}/').status_code == status.HTTP_404_NOT_FOUND
+
+        api_client.force_authenticate(None)
+        response = api_client.get('/api/jobs/')
+        assert response.data['count'] == 4
+
+    def test_async_bulk_update_returns_202(self, api_client):
+        """Test that a heavy bulk update can be queued instead of run inline."""
+        employee = Employee.objects.create(
+            first_name='Queued',
+            last_name='Worker',
+            email='queued@example.com',
+            phone_number='555-0100',
+            hourly_rate=Decimal('15.00'),
+            hire_date=date(2024, 1, 1),
+            birth_date=date(2000, 1, 1),
+        )
+
+        response = api_client.post(
+            '/api/employees/bulk-update/?async=true&is_active=true',
+            {'operation': 'rate_delta', 'value': '1.00'},
+            format='json',
+        )
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response['Location'].endswith(f"/api/jobs/{response.data['id']}/")
+        employee.refresh_from_db()
+        assert employee.hourly_rate == Decimal('15.00')
+
+        run_next('worker-1')
+        employee.refresh_from_db()
+        assert employee.hourly_rate == Decimal('16.00')
+        job = api_client.get(f"/api/jobs/{response.data['id']}/").data
+        assert job['status'] == Job.STATUS_SUCCEEDED
+        assert job['result']['updated'] == 1
+
+    def test_invalid_bulk_update_fails_without_retrying(self):
+        """Test that a queued bulk update with bad data fails on its first attempt."""
+        job = enqueue('employees.bulk_update', ids=[], data={'operation': 'rate_delta'})
+
+        run_next('worker-1')
+        job.refresh_from_db()
+        assert job.status == Job.STATUS_FAILED
+        assert job.attempts == 1
+        assert 'ValidationError' in job.error
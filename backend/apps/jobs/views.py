@@ -0,0 +1,35 @@
+from rest_framework import viewsets
+from django_filters.rest_framework import DjangoFilterBackend
+
+from apps.stores.scoping import get_request_store_ids
+
+from .models import Job
+from .serializers import JobSerializer
+
+
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    ViewSet for checking background job status.
+
+    Provides:
+    - List: GET /api/jobs/
+    - Retrieve: GET /api/jobs/{id}/
+
+    A store-scoped caller only sees jobs queued for stores within its scope;
+    chain-wide and system jobs are left to unscoped callers.
+    """
+
+    queryset = Job.objects.all()
+    serializer_class = JobSerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['name', 'status']
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        store_ids = get_request_store_ids(self.request)
+        if store_ids is None:
+            return queryset
+        job_stores = Job.stores.through.objects
+        return queryset.filter(pk__in=job_stores.filter(store_id__in=store_ids).values('job_id')).exclude(
+            pk__in=job_stores.exclude(store_id__in=store_ids).values('job_id')
+        )
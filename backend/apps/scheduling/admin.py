@@ -0,0 +1,35 @@
+from django.contrib import admin
+from apps.stores.scoping import StoreScopedAdminMixin
+from .models import Schedule, ScheduleVersion, Shift
+
+
+class ShiftInline(admin.TabularInline):
+    """Inline admin for the shifts of a schedule."""
+
+    model = Shift
+    extra = 0
+    fields = ['employee', 'skill', 'start', 'end']
+    raw_id_fields = ['employee']
+
+
+@admin.register(Schedule)
+class ScheduleAdmin(StoreScopedAdminMixin, admin.ModelAdmin):
+    """Admin interface for weekly store schedules."""
+
+    list_display = ['store', 'week_start', 'updated_at']
+    list_filter = ['store']
+    date_hierarchy = 'week_start'
+    inlines = [ShiftInline]
+
+
+@admin.register(ScheduleVersion)
+class ScheduleVersionAdmin(StoreScopedAdminMixin, admin.ModelAdmin):
+    """Read-only admin for published schedule versions."""
+
+    store_field = 'schedule__store'
+    list_display = ['schedule', 'number', 'published_at', 'published_by']
+    list_select_related = ['schedule__store']
+    readonly_fields = ['schedule', 'number', 'published_at', 'published_by', 'shifts']
+
+    def has_add_permission(self, request):
+        return False
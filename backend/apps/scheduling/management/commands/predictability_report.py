@@ -0,0 +1,46 @@
+import json
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+
+from apps.scheduling.predictability import pay_period_report
+
+
+class Command(BaseCommand):
+    help = 'Fair Workweek predictability pay owed for a pay period, across all stores.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', required=True, help='First day of the pay period (YYYY-MM-DD).')
+        parser.add_argument('--end', required=True, help='Last day of the pay period (YYYY-MM-DD).')
+        parser.add_argument(
+            '--store',
+            type=int,
+            action='append',
+            dest='stores',
+            help='Only this store id (repeatable; default: all stores).',
+        )
+        parser.add_argument('--format', choices=['text', 'json'], default='text', help='Output format (default: text).')
+
+    def handle(self, *args, **options):
+        try:
+            start, end = date.fromisoformat(options['start']), date.fromisoformat(options['end'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        if end < start:
+            raise CommandError('--end must not be before --start.')
+
+        report = pay_period_report(start, end, options['stores'])
+        if options['format'] == 'json':
+            self.stdout.write(json.dumps(report, cls=DjangoJSONEncoder, indent=2))
+            return
+
+        names = {row['store']: row['name'] for row in report['stores']}
+        for row in report['employees']:
+            self.stdout.write(
+                f"{names[row['store']]:<20} {row['employee']:>8}  {row['full_name']:<30} "
+                f"{row['changes']:>4} changes  {row['premium']:>9}"
+            )
+        for row in report['stores']:
+            self.stdout.write(f"{row['name']:<20} {row['changes']:>4} changes  {row['premium']:>9}")
+        self.stdout.write(self.style.SUCCESS(f"{start} to {end}: {report['total']} predictability pay"))
@@ -0,0 +1,145 @@
+# Generated by Django 5.0.1 on 2026-10-19 04:39
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        ("employees", "0005_availability_exceptions"),
+        ("stores", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Schedule",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("week_start", models.DateField(help_text="Monday, store-local")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "store",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="schedules",
+                        to="stores.store",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-week_start", "store"],
+            },
+        ),
+        migrations.CreateModel(
+            name="ScheduleVersion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("number", models.PositiveIntegerField()),
+                (
+                    "published_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("published_by", models.CharField(blank=True, max_length=150)),
+                ("shifts", models.JSONField(default=list)),
+                (
+                    "schedule",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="versions",
+                        to="scheduling.schedule",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["schedule", "number"],
+            },
+        ),
+        migrations.CreateModel(
+            name="Shift",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("start", models.DateTimeField()),
+                ("end", models.DateTimeField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "employee",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="shifts",
+                        to="employees.employee",
+                    ),
+                ),
+                (
+                    "schedule",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="shifts",
+                        to="scheduling.schedule",
+                    ),
+                ),
+                (
+                    "skill",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to="employees.skill",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["start", "employee"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="schedule",
+            constraint=models.UniqueConstraint(fields=("store", "week_start"), name="schedule_unique_store_week"),
+        ),
+        migrations.AddConstraint(
+            model_name="scheduleversion",
+            constraint=models.UniqueConstraint(fields=("schedule", "number"), name="schedule_version_unique_number"),
+        ),
+        migrations.AddIndex(
+            model_name="shift",
+            index=models.Index(
+                fields=["schedule", "employee", "start"],
+                name="scheduling__schedul_19a0e7_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="shift",
+            constraint=models.CheckConstraint(
+                check=models.Q(("end__gt", models.F("start"))),
+                name="shift_end_after_start",
+            ),
+        ),
+    ]
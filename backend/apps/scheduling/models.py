@@ -0,0 +1,83 @@
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.utils import timezone
+
+
+class Schedule(models.Model):
+    """
+    A store's schedule for one week (``week_start`` is a Monday).
+
+    Its shifts can be edited freely; publishing stores them as a new
+    immutable ``ScheduleVersion``.
+    """
+
+    store = models.ForeignKey('stores.Store', on_delete=models.CASCADE, related_name='schedules')
+    week_start = models.DateField(help_text="Monday, store-local")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-week_start', 'store']
+        constraints = [
+            models.UniqueConstraint(fields=['store', 'week_start'], name='schedule_unique_store_week'),
+        ]
+
+    def __str__(self):
+        return f"{self.store} week of {self.week_start}"
+
+
+class Shift(models.Model):
+    """One employee's shift in the current (unpublished) state of a schedule."""
+
+    schedule = models.ForeignKey(Schedule, on_delete=models.CASCADE, related_name='shifts')
+    employee = models.ForeignKey('employees.Employee', on_delete=models.CASCADE, related_name='shifts')
+    skill = models.ForeignKey('employees.Skill', on_delete=models.SET_NULL, null=True, blank=True)
+    start = models.DateTimeField()
+    end = models.DateTimeField()
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['start', 'employee']
+        indexes = [
+            models.Index(fields=['schedule', 'employee', 'start']),
+        ]
+        constraints = [
+            models.CheckConstraint(check=models.Q(end__gt=models.F('start')), name='shift_end_after_start'),
+        ]
+
+    def __str__(self):
+        return f"{self.employee} {self.start:%Y-%m-%d %H:%M}-{self.end:%H:%M}"
+
+
+class ScheduleVersion(models.Model):
+    """
+    Immutable snapshot of a schedule's shifts at publication.
+
+    ``shifts`` is sorted by employee and start: ``[employee_id, start, end,
+    skill_id]`` with start and end in epoch seconds (see
+    ``apps.scheduling.predictability``).
+    """
+
+    schedule = models.ForeignKey(Schedule, on_delete=models.CASCADE, related_name='versions')
+    number = models.PositiveIntegerField()
+    published_at = models.DateTimeField(default=timezone.now)
+    published_by = models.CharField(max_length=150, blank=True)
+    shifts = models.JSONField(default=list)
+
+    class Meta:
+        ordering = ['schedule', 'number']
+        constraints = [
+            models.UniqueConstraint(fields=['schedule', 'number'], name='schedule_version_unique_number'),
+        ]
+
+    def __str__(self):
+        return f"{self.schedule} v{self.number}"
+
+    def save(self, *args, **kwargs):
+        """Published versions are immutable once written."""
+        if self.pk is not None:
+            raise ValidationError('Published schedule versions cannot be modified.')
+        super().save(*args, **kwargs)
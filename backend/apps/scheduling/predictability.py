@@ -0,0 +1,308 @@
+"""
+Fair Workweek predictability pay (NYC; see docs/compliance/ny-labor-laws.md).
+
+Publishing a schedule stores its shifts as one array sorted by employee and
+start, ``[employee_id, start, end, skill_id]`` in epoch seconds.
+``diff()`` walks two such arrays together, one employee at a time. Old
+and new shifts that overlap form a group, so a merge or a split is one
+change; what is left over on either side is paired in order within the
+same store-local week, so a shift moved to another day is one change too.
+Every difference is classified:
+
+- ``added``: a new shift with no counterpart in the old version
+- ``removed``: an old shift with no counterpart in the new version
+- ``reduced``: paired, and the new shifts cover fewer hours
+- ``moved``: paired, with other times but no fewer hours
+
+Hours lost are the old shifts' hours less those of the new shifts they
+were paired with, each side counted as a union so overlaps count once.
+
+``price()`` places each change in a notice window, measured from the
+publication of the change to the earlier start of the affected shifts, and
+prices it with the flat premium of that window
+(``FAIR_WORKWEEK_NOTICE_PREMIUMS``). Removals inside the cancellation window
+pay at least ``FAIR_WORKWEEK_CANCELLATION``, and reductions and removals
+also pay the lost hours at ``FAIR_WORKWEEK_LOST_HOURS_RATE`` times the
+employee's hourly rate. Changes with enough notice cost nothing.
+"""
+from collections import defaultdict, namedtuple
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from heapq import merge
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils import timezone
+
+from apps.employees.models import Employee
+
+from .models import Schedule, ScheduleVersion
+
+ADDED = 'added'
+REMOVED = 'removed'
+MOVED = 'moved'
+REDUCED = 'reduced'
+
+# (window, notice under this many hours, premium); the first match applies
+NOTICE_PREMIUMS = [('24h', 24, '45.00'), ('7d', 7 * 24, '15.00'), ('14d', 14 * 24, '10.00')]
+CANCELLATION = (72, '75.00')
+LOST_HOURS_RATE = '0.5'
+
+CENT = Decimal('0.01')
+ZERO = Decimal('0.00')
+
+Change = namedtuple('Change', 'employee_id kind old new lost')
+PricedChange = namedtuple(
+    'PricedChange',
+    'employee_id kind old_start old_end new_start new_end window notice_hours hours_lost premium',
+)
+
+
+def epoch(moment):
+    return int(moment.timestamp())
+
+
+def from_epoch(seconds):
+    return datetime.fromtimestamp(seconds, tz=dt_timezone.utc)
+
+
+def snapshot(shifts):
+    """Sorted shift array of a ``Shift`` queryset."""
+    rows = shifts.order_by('employee_id', 'start', 'end').values_list('employee_id', 'start', 'end', 'skill_id')
+    return [[employee, epoch(start), epoch(end), skill] for employee, start, end, skill in rows]
+
+
+def publish(schedule, published_by=''):
+    """Store the schedule's current shifts as its next version and return it."""
+    with transaction.atomic():
+        Schedule.objects.select_for_update().filter(pk=schedule.pk).first()
+        last = schedule.versions.order_by('-number').values_list('number', flat=True).first() or 0
+        return ScheduleVersion.objects.create(
+            schedule=schedule,
+            number=last + 1,
+            published_by=published_by,
+            shifts=snapshot(schedule.shifts.all()),
+        )
+
+
+def diff(old, new, tz=dt_timezone.utc):
+    """Changes from shift array ``old`` to ``new``, both sorted by (employee, start); weeks are ``tz``-local."""
+    changes = []
+    i = j = 0
+    while i < len(old) or j < len(new):
+        employee = min(shifts[k][0] for shifts, k in ((old, i), (new, j)) if k < len(shifts))
+        before, after = [], []
+        while i < len(old) and old[i][0] == employee:
+            before.append((old[i][1], old[i][2]))
+            i += 1
+        while j < len(new) and new[j][0] == employee:
+            after.append((new[j][1], new[j][2]))
+            j += 1
+        changes.extend(_employee_changes(employee, before, after, tz))
+    return changes
+
+
+def _employee_changes(employee, old, new, tz):
+    groups, reach = [], None
+    for start, end, is_new in merge(((*span, False) for span in old), ((*span, True) for span in new)):
+        if reach is None or start >= reach:
+            groups.append(([], []))
+            reach = end
+        else:
+            reach = max(reach, end)
+        groups[-1][is_new].append((start, end))
+
+    changes = []
+    weeks = defaultdict(lambda: ([], []))
+    for before, after in groups:
+        if before and after:
+            if before != after:
+                changes.append(_paired(employee, before, after))
+        else:
+            for span in before or after:
+                weeks[_week(span[0], tz)][bool(after)].append(span)
+
+    for before, after in weeks.values():
+        changes.extend(_paired(employee, [a], [b]) for a, b in zip(before, after))
+        changes.extend(Change(employee, REMOVED, span, None, span[1] - span[0]) for span in before[len(after) :])
+        changes.extend(Change(employee, ADDED, None, span, 0) for span in after[len(before) :])
+    return changes
+
+
+def _paired(employee, before, after):
+    lost = max(0, _covered(before) - _covered(after))
+    return Change(
+        employee,
+        REDUCED if lost else MOVED,
+        (before[0][0], max(end for _, end in before)),
+        (after[0][0], max(end for _, end in after)),
+        lost,
+    )
+
+
+def _covered(spans):
+    """Seconds covered by ``(start, end)`` spans sorted by start, counting overlaps once."""
+    total, reach = 0, None
+    for start, end in spans:
+        if reach is None or start >= reach:
+            total += end - start
+            reach = end
+        elif end > reach:
+            total += end - reach
+            reach = end
+    return total
+
+
+def _week(seconds, tz):
+    day = from_epoch(seconds).astimezone(tz).date()
+    return day - timedelta(days=day.weekday())
+
+
+def _policy():
+    tiers = sorted(
+        (hours * 3600, window, Decimal(str(premium)))
+        for window, hours, premium in getattr(settings, 'FAIR_WORKWEEK_NOTICE_PREMIUMS', NOTICE_PREMIUMS)
+    )
+    hours, premium = getattr(settings, 'FAIR_WORKWEEK_CANCELLATION', CANCELLATION)
+    lost_rate = Decimal(str(getattr(settings, 'FAIR_WORKWEEK_LOST_HOURS_RATE', LOST_HOURS_RATE)))
+    return tiers, (hours * 3600, Decimal(str(premium))), lost_rate
+
+
+def price(changes, changed_at, rates):
+    """
+    Price ``changes`` published at ``changed_at`` (epoch seconds).
+
+    ``rates`` maps employee ids to hourly rates.
+    """
+    tiers, (cancel_before, cancel_premium), lost_rate = _policy()
+    priced = []
+    for change in changes:
+        old, new = change.old, change.new
+        notice = min(span[0] for span in (old, new) if span) - changed_at
+        window, premium = next(((name, amount) for limit, name, amount in tiers if notice < limit), (None, ZERO))
+
+        lost = change.lost
+        hours_lost = Decimal(lost) / 3600
+        if window is not None:
+            if change.kind == REMOVED and notice < cancel_before:
+                premium = max(premium, cancel_premium)
+            if lost:
+                premium += rates.get(change.employee_id, ZERO) * lost_rate * hours_lost
+
+        priced.append(
+            PricedChange(
+                change.employee_id,
+                change.kind,
+                from_epoch(old[0]) if old else None,
+                from_epoch(old[1]) if old else None,
+                from_epoch(new[0]) if new else None,
+                from_epoch(new[1]) if new else None,
+                window,
+                round(notice / 3600, 1),
+                hours_lost.quantize(CENT),
+                premium.quantize(CENT),
+            )
+        )
+    return priced
+
+
+def _rates(changes):
+    employee_ids = {change.employee_id for change in changes}
+    return dict(Employee.objects.filter(pk__in=employee_ids).values_list('pk', 'hourly_rate'))
+
+
+def compare(schedule, old_version=None, new_version=None, at=None):
+    """
+    Priced changes from ``old_version`` to ``new_version`` of ``schedule``.
+
+    ``old_version=None`` is the empty schedule; ``new_version=None`` is the
+    current shifts, priced as if published ``at`` (default: now).
+    """
+    old = old_version.shifts if old_version is not None else []
+    if new_version is None:
+        new, changed_at = snapshot(schedule.shifts.all()), at or timezone.now()
+    else:
+        new, changed_at = new_version.shifts, new_version.published_at
+    changes = diff(old, new, ZoneInfo(schedule.store.timezone))
+    return price(changes, epoch(changed_at), _rates(changes))
+
+
+def pay_period_report(start, end, store_ids=None):
+    """
+    Predictability pay for the changes published to every schedule, for shifts starting
+    between ``start`` and ``end`` (dates, inclusive, store-local).
+
+    Each version is compared with the one before it (the first with an
+    empty schedule, so publishing late is priced too).
+    """
+    schedules = (
+        Schedule.objects.filter(week_start__gte=start - timedelta(days=6), week_start__lte=end)
+        .select_related('store')
+        .prefetch_related(Prefetch('versions', queryset=ScheduleVersion.objects.order_by('number')))
+        .order_by('store', 'week_start')
+    )
+    if store_ids is not None:
+        schedules = schedules.filter(store__in=store_ids)
+
+    pending = []
+    for schedule in schedules:
+        tz = ZoneInfo(schedule.store.timezone)
+        period = (
+            epoch(datetime.combine(start, time.min, tzinfo=tz)),
+            epoch(datetime.combine(end + timedelta(days=1), time.min, tzinfo=tz)),
+        )
+        previous = []
+        for version in schedule.versions.all():
+            changes = [
+                change
+                for change in diff(previous, version.shifts, tz)
+                if period[0] <= min(span[0] for span in (change.old, change.new) if span) < period[1]
+            ]
+            pending.append((schedule.store, changes, epoch(version.published_at)))
+            previous = version.shifts
+
+    employee_ids = {change.employee_id for _, changes, _ in pending for change in changes}
+    employees = {
+        row['pk']: row
+        for row in Employee.objects.filter(pk__in=employee_ids).values('pk', 'first_name', 'last_name', 'hourly_rate')
+    }
+    rates = {pk: row['hourly_rate'] for pk, row in employees.items()}
+
+    by_store, by_employee = {}, {}
+    for store, changes, changed_at in pending:
+        for change in price(changes, changed_at, rates):
+            if change.window is None:
+                continue
+            store_total = by_store.setdefault(
+                store.pk,
+                {
+                    'store': store.pk,
+                    'name': store.name,
+                    'changes': 0,
+                    'premium': ZERO,
+                },
+            )
+            employee = employees.get(change.employee_id, {})
+            employee_total = by_employee.setdefault(
+                (store.pk, change.employee_id),
+                {
+                    'employee': change.employee_id,
+                    'full_name': f"{employee.get('first_name', '')} {employee.get('last_name', '')}".strip(),
+                    'store': store.pk,
+                    'changes': 0,
+                    'premium': ZERO,
+                },
+            )
+            for total in (store_total, employee_total):
+                total['changes'] += 1
+                total['premium'] += change.premium
+
+    return {
+        'start': start,
+        'end': end,
+        'total': sum((row['premium'] for row in by_store.values()), ZERO),
+        'stores': list(by_store.values()),
+        'employees': sorted(by_employee.values(), key=lambda row: (row['store'], -row['premium'], row['employee'])),
+    }
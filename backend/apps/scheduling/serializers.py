@@ -0,0 +1,100 @@
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from rest_framework import serializers
+
+from .models import Schedule, ScheduleVersion, Shift
+
+
+class ScheduleSerializer(serializers.ModelSerializer):
+    """Serializer for weekly store schedules."""
+
+    published_version = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Schedule
+        fields = ['id', 'store', 'week_start', 'published_version', 'created_at', 'updated_at']
+        read_only_fields = ['created_at', 'updated_at']
+
+    def get_published_version(self, obj) -> int | None:
+        return getattr(obj, 'published_version', None)
+
+    def validate_week_start(self, value):
+        if value.weekday() != 0:
+            raise serializers.ValidationError('Schedules start on a Monday.')
+        return value
+
+
+class ShiftSerializer(serializers.ModelSerializer):
+    """Serializer for the shifts of a schedule."""
+
+    class Meta:
+        model = Shift
+        fields = ['id', 'schedule', 'employee', 'skill', 'start', 'end', 'created_at', 'updated_at']
+        read_only_fields = ['created_at', 'updated_at']
+
+    def validate(self, data):
+        start = data.get('start', getattr(self.instance, 'start', None))
+        end = data.get('end', getattr(self.instance, 'end', None))
+        if start and end and end <= start:
+            raise serializers.ValidationError({'end': 'End must be after start.'})
+        schedule = data.get('schedule', getattr(self.instance, 'schedule', None))
+        employee = data.get('employee', getattr(self.instance, 'employee', None))
+        if schedule is None:
+            return data
+        # The schedule's store is what scoping checks, so its employees have to be that store's.
+        if employee is not None and employee.store_id != schedule.store_id:
+            raise serializers.ValidationError({'employee': "The employee does not work at the schedule's store."})
+        tz = ZoneInfo(schedule.store.timezone)
+        week = datetime.combine(schedule.week_start, time.min, tzinfo=tz)
+        if start and not week <= start < week + timedelta(days=7):
+            raise serializers.ValidationError({'start': "The shift must start in the schedule's week."})
+        return data
+
+
+class ScheduleVersionSerializer(serializers.ModelSerializer):
+    """A published version; the shift array itself is left out."""
+
+    shift_count = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ScheduleVersion
+        fields = ['id', 'schedule', 'number', 'published_at', 'published_by', 'shift_count']
+        read_only_fields = fields
+
+    def get_shift_count(self, obj) -> int:
+        return len(obj.shifts)
+
+
+class PricedChangeSerializer(serializers.Serializer):
+    """One schedule change and the predictability pay it triggers."""
+
+    employee = serializers.IntegerField(source='employee_id')
+    kind = serializers.CharField()
+    old_start = serializers.DateTimeField(allow_null=True)
+    old_end = serializers.DateTimeField(allow_null=True)
+    new_start = serializers.DateTimeField(allow_null=True)
+    new_end = serializers.DateTimeField(allow_null=True)
+    window = serializers.CharField(allow_null=True)
+    notice_hours = serializers.FloatField()
+    hours_lost = serializers.DecimalField(max_digits=8, decimal_places=2)
+    premium = serializers.DecimalField(max_digits=10, decimal_places=2)
+
+
+class ScheduleDiffQuerySerializer(serializers.Serializer):
+    """Query parameters of ``GET /api/schedules/{id}/diff/``."""
+
+    from_version = serializers.IntegerField(min_value=0, required=False)
+    to_version = serializers.IntegerField(min_value=1, required=False)
+
+
+class PayPeriodQuerySerializer(serializers.Serializer):
+    """Query parameters of the predictability pay report."""
+
+    start = serializers.DateField()
+    end = serializers.DateField()
+
+    def validate(self, data):
+        if data['end'] < data['start']:
+            raise serializers.ValidationError({'end': 'End must not be before start.'})
+        return data
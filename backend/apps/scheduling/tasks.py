@@ -0,0 +1,13 @@
+"""Background job handlers for the scheduling app (see ``apps.jobs``)."""
+from datetime import date
+
+from apps.jobs.registry import register
+
+from .predictability import pay_period_report
+
+
+@register('scheduling.predictability_report')
+def predictability_report(context, start, end, store_ids=None):
+    """Run a queued ``GET /api/schedules/predictability-report/?async=true``."""
+    context.progress(0, message=f'Pricing schedule changes for {start} to {end}')
+    return pay_period_report(date.fromisoformat(start), date.fromisoformat(end), store_ids)
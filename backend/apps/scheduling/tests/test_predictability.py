@@ -0,0 +1,329 @@
+import pytest
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from zoneinfo import ZoneInfo
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.employees.models import Employee
+from apps.jobs.models import Job
+from apps.jobs.runner import run_next
+from apps.scheduling import predictability
+from apps.scheduling.models import Schedule, ScheduleVersion, Shift
+from apps.scheduling.predictability import ADDED, MOVED, REDUCED, REMOVED, Change, diff, price
+from apps.stores.models import Store
+
+NY = ZoneInfo('America/New_York')
+WEEK = date(2026, 2, 9)
+HOUR = 3600
+
+
+def at(day, hour, minute=0):
+    return datetime(2026, 2, day, hour, minute, tzinfo=NY)
+
+
+@pytest.fixture
+def api_client():
+    """Pytest fixture for API client."""
+    return APIClient()
+
+
+@pytest.fixture
+def store():
+    return Store.objects.create(name='Store #1', timezone='America/New_York')
+
+
+def make_employee(store, name, rate='20.00'):
+    return Employee.objects.create(
+        first_name=name,
+        last_name='Worker',
+        email=f'{name.lower()}@example.com',
+        phone_number='555-0100',
+        hourly_rate=Decimal(rate),
+        hire_date=date(2024, 1, 1),
+        birth_date=date(1990, 1, 1),
+        store=store,
+    )
+
+
+def publish(schedule, published_at):
+    """A version of the current shifts, published at a chosen time."""
+    number = schedule.versions.count() + 1
+    return ScheduleVersion.objects.create(
+        schedule=schedule,
+        number=number,
+        published_at=published_at,
+        shifts=predictability.snapshot(schedule.shifts.all()),
+    )
+
+
+@pytest.fixture
+def schedule(store):
+    """Published three weeks ahead, then changed four days and one hour before the week."""
+    ann = make_employee(store, 'Ann')
+    ben = make_employee(store, 'Ben')
+    schedule = Schedule.objects.create(store=store, week_start=WEEK)
+    monday = Shift.objects.create(schedule=schedule, employee=ann, start=at(9, 9), end=at(9, 17))
+    tuesday = Shift.objects.create(schedule=schedule, employee=ann, start=at(10, 9), end=at(10, 17))
+    wednesday = Shift.objects.create(schedule=schedule, employee=ann, start=at(11, 12), end=at(11, 16))
+    publish(schedule, at(9, 9) - timedelta(days=21))
+
+    Shift.objects.filter(pk=monday.pk).update(start=at(9, 10), end=at(9, 18))
+    Shift.objects.filter(pk=tuesday.pk).update(end=at(10, 13))
+    wednesday.delete()
+    Shift.objects.create(schedule=schedule, employee=ben, start=at(15, 9), end=at(15, 13))
+    publish(schedule, at(5, 12))
+
+    Shift.objects.filter(pk=monday.pk).delete()
+    publish(schedule, at(9, 8))
+    return schedule
+
+
+class TestDiff:
+    """Tests for comparing sorted shift arrays."""
+
+    def test_classifies_changes_per_employee(self):
+        """Test additions, removals, moves and reductions across employees in one pass."""
+        next_week = 8 * 24 * HOUR
+        old = [[1, 0, 8 * HOUR, None], [1, 24 * HOUR, 32 * HOUR, None], [2, 0, 4 * HOUR, None], [3, 0, HOUR, None]]
+        new = [
+            [1, HOUR, 9 * HOUR, None],
+            [1, 24 * HOUR, 28 * HOUR, None],
+            [2, next_week, next_week + 2 * HOUR, None],
+            [4, 0, HOUR, None],
+        ]
+        assert sorted(diff(old, new)) == sorted(
+            [
+                Change(1, MOVED, (0, 8 * HOUR), (HOUR, 9 * HOUR), 0),
+                Change(1, REDUCED, (24 * HOUR, 32 * HOUR), (24 * HOUR, 28 * HOUR), 4 * HOUR),
+                Change(2, REMOVED, (0, 4 * HOUR), None, 4 * HOUR),
+                Change(2, ADDED, None, (next_week, next_week + 2 * HOUR), 0),
+                Change(3, REMOVED, (0, HOUR), None, HOUR),
+                Change(4, ADDED, None, (0, HOUR), 0),
+            ]
+        )
+
+    def test_merge_is_one_change(self):
+        """Test that two shifts joined into one are a single move, with the gap as extra hours."""
+        old = [[1, 9 * HOUR, 13 * HOUR, None], [1, 14 * HOUR, 18 * HOUR, None]]
+        new = [[1, 9 * HOUR, 18 * HOUR, None]]
+        assert diff(old, new) == [Change(1, MOVED, (9 * HOUR, 18 * HOUR), (9 * HOUR, 18 * HOUR), 0)]
+
+    def test_split_loses_only_the_gap(self):
+        """Test that one shift split in two is a single reduction by the hour between them."""
+        old = [[1, 9 * HOUR, 18 * HOUR, None]]
+        new = [[1, 9 * HOUR, 13 * HOUR, None], [1, 14 * HOUR, 18 * HOUR, None]]
+        assert diff(old, new) == [Change(1, REDUCED, (9 * HOUR, 18 * HOUR), (9 * HOUR, 18 * HOUR), HOUR)]
+        assert price(diff(old, new), 0, {1: Decimal('20.00')})[0].hours_lost == Decimal('1.00')
+
+    def test_day_move_within_the_week(self):
+        """Test that a shift moved to another day of its week is one move, in store-local weeks."""
+        sunday = int(at(15, 9).timestamp())
+        monday = int(at(9, 9).timestamp())
+        tuesday = int(at(10, 9).timestamp())
+        old = [[1, monday, monday + 8 * HOUR, None]]
+        assert diff(old, [[1, tuesday, tuesday + 8 * HOUR, None]], NY) == [
+            Change(1, MOVED, (monday, monday + 8 * HOUR), (tuesday, tuesday + 8 * HOUR), 0)
+        ]
+        assert diff(old, [[1, tuesday, tuesday + 6 * HOUR, None]], NY)[0].kind == REDUCED
+
+        # Sunday 21:00 New York is already Monday in UTC, but the same week locally.
+        late = sunday + 12 * HOUR
+        assert [change.kind for change in diff(old, [[1, late, late + 8 * HOUR, None]], NY)] == [MOVED]
+        next_monday = monday + 7 * 24 * HOUR
+        assert sorted(change.kind for change in diff(old, [[1, next_monday, next_monday + 8 * HOUR, None]], NY)) == [
+            ADDED,
+            REMOVED,
+        ]
+
+    def test_identical_versions(self):
+        shifts = [[1, 0, 8 * HOUR, 3], [2, 0, 8 * HOUR, None]]
+        assert diff(shifts, [list(shift) for shift in shifts]) == []
+        assert diff([], []) == []
+
+    def test_notice_windows_and_pricing(self):
+        """Test flat premiums by notice, the cancellation premium and lost hours at half the rate."""
+        day = 24 * HOUR
+        changes = [
+            Change(1, ADDED, None, (15 * day, 15 * day + 4 * HOUR), 0),
+            Change(1, ADDED, None, (10 * day, 10 * day + 4 * HOUR), 0),
+            Change(1, MOVED, (3 * day, 3 * day + 8 * HOUR), (3 * day + HOUR, 3 * day + 9 * HOUR), 0),
+            Change(1, REDUCED, (3 * day, 3 * day + 8 * HOUR), (3 * day, 3 * day + 4 * HOUR), 4 * HOUR),
+            Change(1, REMOVED, (2 * day, 2 * day + 8 * HOUR), None, 8 * HOUR),
+            Change(1, REMOVED, (2 * HOUR, 6 * HOUR), None, 4 * HOUR),
+        ]
+        priced = price(changes, 0, {1: Decimal('20.00')})
+        assert [(change.window, change.premium) for change in priced] == [
+            (None, Decimal('0.00')),
+            ('14d', Decimal('10.00')),
+            ('7d', Decimal('15.00')),
+            ('7d', Decimal('55.00')),
+            ('7d', Decimal('155.00')),
+            ('24h', Decimal('115.00')),
+        ]
+        assert priced[3].hours_lost == Decimal('4.00')
+
+
+@pytest.mark.django_db
+class TestScheduleVersions:
+    """Tests for publishing immutable schedule versions."""
+
+    def test_publish(self, api_client, store):
+        """Test that publishing snapshots the shifts and later edits leave the version alone."""
+        ann = make_employee(store, 'Ann')
+        schedule = Schedule.objects.create(store=store, week_start=WEEK)
+        shift = Shift.objects.create(schedule=schedule, employee=ann, start=at(9, 9), end=at(9, 17))
+
+        response = api_client.post(f'/api/schedules/{schedule.pk}/publish/')
+        assert response.status_code == status.HTTP_201_CREATED
+        assert (response.data['number'], response.data['shift_count']) == (1, 1)
+        shift.delete()
+        assert api_client.post(f'/api/schedules/{schedule.pk}/publish/').data['number'] == 2
+
+        versions = api_client.get(f'/api/schedules/{schedule.pk}/versions/').data
+        assert [version['shift_count'] for version in versions] == [1, 0]
+        assert api_client.get(f'/api/schedules/{schedule.pk}/').data['published_version'] == 2
+
+        version = ScheduleVersion.objects.get(number=1)
+        assert version.shifts == [[ann.pk, int(at(9, 9).timestamp()), int(at(9, 17).timestamp()), None]]
+        version.published_by = 'someone'
+        with pytest.raises(ValidationError):
+            version.save()
+
+    def test_schedules_start_on_monday(self, api_client, store):
+        response = api_client.post('/api/schedules/', {'store': store.pk, 'week_start': '2026-02-10'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_shift_must_end_after_start(self, api_client, store):
+        ann = make_employee(store, 'Ann')
+        schedule = Schedule.objects.create(store=store, week_start=WEEK)
+        response = api_client.post(
+            '/api/shifts/',
+            {
+                'schedule': schedule.pk,
+                'employee': ann.pk,
+                'start': '2026-02-09T17:00:00-05:00',
+                'end': '2026-02-09T09:00:00-05:00',
+            },
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_shift_employee_must_work_at_the_store(self, api_client, store):
+        """Test that a schedule only takes its own store's employees, so managers can't price others."""
+        other = Store.objects.create(name='Store #2', timezone='America/New_York')
+        outsider = make_employee(other, 'Olga')
+        schedule = Schedule.objects.create(store=store, week_start=WEEK)
+        manager = User.objects.create_user('manager4', password='pw')
+        store.managers.add(manager)
+        api_client.force_authenticate(manager)
+
+        response = api_client.post(
+            '/api/shifts/',
+            {
+                'schedule': schedule.pk,
+                'employee': outsider.pk,
+                'start': '2026-02-09T09:00:00-05:00',
+                'end': '2026-02-09T17:00:00-05:00',
+            },
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'employee' in response.data
+
+        ann = make_employee(store, 'Ann')
+        shift = Shift.objects.create(schedule=schedule, employee=ann, start=at(9, 9), end=at(9, 17))
+        response = api_client.patch(f'/api/shifts/{shift.pk}/', {'employee': outsider.pk})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not Shift.objects.filter(employee=outsider).exists()
+
+    def test_shift_must_start_in_the_schedule_week(self, api_client, store):
+        """Test the store-local week bounds, including a shift running past Sunday midnight."""
+        ann = make_employee(store, 'Ann')
+        schedule = Schedule.objects.create(store=store, week_start=WEEK)
+
+        def post(start, end):
+            return api_client.post(
+                '/api/shifts/',
+                {
+                    'schedule': schedule.pk,
+                    'employee': ann.pk,
+                    'start': start,
+                    'end': end,
+                },
+            )
+
+        # Sunday 23:00 before the week (04:00 Monday UTC), and the next Monday.
+        assert post('2026-02-08T23:00:00-05:00', '2026-02-09T03:00:00-05:00').status_code == 400
+        assert post('2026-02-16T00:00:00-05:00', '2026-02-16T04:00:00-05:00').status_code == 400
+        assert post('2026-02-09T00:00:00-05:00', '2026-02-09T04:00:00-05:00').status_code == 201
+        assert post('2026-02-15T22:00:00-05:00', '2026-02-16T02:00:00-05:00').status_code == 201
+
+        shift = Shift.objects.get(start=at(9, 0))
+        response = api_client.patch(f'/api/shifts/{shift.pk}/', {'start': '2026-02-02T09:00:00-05:00'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_diff_between_versions(self, api_client, schedule):
+        """Test pricing the second publication against the first."""
+        response = api_client.get(f'/api/schedules/{schedule.pk}/diff/', {'from_version': 1, 'to_version': 2})
+        assert response.status_code == status.HTTP_200_OK
+        kinds = {(change['kind'], change['window'], change['premium']) for change in response.data['changes']}
+        assert kinds == {
+            (MOVED, '7d', '15.00'),
+            (REDUCED, '7d', '55.00'),
+            (REMOVED, '7d', '55.00'),
+            (ADDED, '14d', '10.00'),
+        }
+        assert response.data['premium'] == Decimal('135.00')
+
+    def test_diff_of_unpublished_changes(self, api_client, schedule):
+        """Test that by default the current shifts are compared with the latest version."""
+        response = api_client.get(f'/api/schedules/{schedule.pk}/diff/')
+        assert (response.data['from_version'], response.data['to_version']) == (3, None)
+        assert response.data['changes'] == []
+
+        response = api_client.get(f'/api/schedules/{schedule.pk}/diff/', {'from_version': 9})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestPayPeriodReport:
+    """Tests for the predictability pay report across stores."""
+
+    def test_report(self, api_client, schedule):
+        """Test that every publication is priced against the one before it."""
+        response = api_client.get('/api/schedules/predictability-report/', {'start': '2026-02-09', 'end': '2026-02-22'})
+        assert response.status_code == status.HTTP_200_OK
+        # 135.00 for the second publication, 75.00 + 8 lost hours for cancelling Monday two hours ahead
+        assert response.data['total'] == Decimal('290.00')
+        assert response.data['stores'] == [
+            {'store': schedule.store_id, 'name': 'Store #1', 'changes': 5, 'premium': Decimal('290.00')}
+        ]
+        assert response.data['employees'][0]['full_name'] == 'Ann Worker'
+
+        response = api_client.get('/api/schedules/predictability-report/', {'start': '2026-02-12', 'end': '2026-02-22'})
+        assert response.data['total'] == Decimal('10.00')
+
+    def test_managers_only_see_their_stores(self, api_client, schedule):
+        manager = User.objects.create_user('manager2', password='pw')
+        Store.objects.create(name='Store #2').managers.add(manager)
+        api_client.force_authenticate(manager)
+
+        response = api_client.get('/api/schedules/predictability-report/', {'start': '2026-02-09', 'end': '2026-02-22'})
+        assert (response.data['total'], response.data['stores']) == (Decimal('0.00'), [])
+        assert api_client.get(f'/api/schedules/{schedule.pk}/diff/').status_code == status.HTTP_404_NOT_FOUND
+
+    def test_async_report(self, api_client, schedule):
+        response = api_client.get(
+            '/api/schedules/predictability-report/', {'start': '2026-02-09', 'end': '2026-02-22', 'async': 'true'}
+        )
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert run_next('worker-1') is not None
+        job = Job.objects.get(pk=response.data['id'])
+        assert (job.status, job.result['total']) == (Job.STATUS_SUCCEEDED, '290.00')
+
+    def test_command(self, schedule, capsys):
+        call_command('predictability_report', '--start', '2026-02-09', '--end', '2026-02-22')
+        output = capsys.readouterr().out
+        assert 'Ann Worker' in output
+        assert '2026-02-09 to 2026-02-22: 290.00 predictability pay' in output
@@ -0,0 +1,11 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import ScheduleViewSet, ShiftViewSet
+
+router = DefaultRouter()
+router.register(r'schedules', ScheduleViewSet, basename='schedule')
+router.register(r'shifts', ShiftViewSet, basename='shift')
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
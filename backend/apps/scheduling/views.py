@@ -0,0 +1,142 @@
+from django.db.models import Max
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django_filters.rest_framework import DjangoFilterBackend
+from drf_spectacular.utils import extend_schema
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.filters import OrderingFilter
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
+
+from apps.jobs.registry import enqueue
+from apps.jobs.serializers import JobSerializer
+from apps.stores.scoping import StoreScopedMixin, get_request_store_ids
+
+from . import predictability
+from .models import Schedule, Shift
+from .serializers import (
+    PayPeriodQuerySerializer,
+    PricedChangeSerializer,
+    ScheduleDiffQuerySerializer,
+    ScheduleSerializer,
+    ScheduleVersionSerializer,
+    ShiftSerializer,
+)
+
+
+class ScheduleViewSet(StoreScopedMixin, viewsets.ModelViewSet):
+    """
+    Weekly store schedules, their published versions and predictability pay.
+
+    - Publish: POST /api/schedules/{id}/publish/
+    - Versions: GET /api/schedules/{id}/versions/
+    - Diff: GET /api/schedules/{id}/diff/?from_version=&to_version=
+    - Pay period report: GET /api/schedules/predictability-report/?start=&end=
+    """
+
+    queryset = Schedule.objects.all()
+    serializer_class = ScheduleSerializer
+    explain_params = {'predictability_report': [{'start': '2026-01-05', 'end': '2026-01-18'}]}
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_fields = ['store', 'week_start']
+    ordering_fields = ['week_start']
+    ordering = ['-week_start', 'store']
+
+    def get_queryset(self):
+        return super().get_queryset().annotate(published_version=Max('versions__number'))
+
+    @extend_schema(request=None, responses={201: ScheduleVersionSerializer})
+    @action(detail=True, methods=['post'])
+    def publish(self, request, pk=None):
+        """Snapshot the current shifts as the next immutable version."""
+        schedule = self.get_object()
+        user = request.user
+        version = predictability.publish(schedule, user.get_username() if user.is_authenticated else '')
+        return Response(ScheduleVersionSerializer(version).data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(responses=ScheduleVersionSerializer(many=True))
+    @action(detail=True, methods=['get'])
+    def versions(self, request, pk=None):
+        """Published versions, oldest first."""
+        schedule = self.get_object()
+        return Response(ScheduleVersionSerializer(schedule.versions.all(), many=True).data)
+
+    @extend_schema(parameters=[ScheduleDiffQuerySerializer])
+    @action(detail=True, methods=['get'])
+    def diff(self, request, pk=None):
+        """
+        Changes between two versions and the predictability pay they trigger.
+
+        ``?from_version=`` defaults to the latest published version (``0``
+        is the empty schedule); without ``?to_version=`` the current shifts
+        are priced as if published now.
+        """
+        schedule = self.get_object()
+        params = ScheduleDiffQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        versions = schedule.versions.all()
+
+        number = params.validated_data.get('from_version')
+        if number is None:
+            old = versions.order_by('-number').first()
+        else:
+            old = get_object_or_404(versions, number=number) if number else None
+        new = None
+        if 'to_version' in params.validated_data:
+            new = get_object_or_404(versions, number=params.validated_data['to_version'])
+
+        changed_at = new.published_at if new is not None else timezone.now()
+        changes = predictability.compare(schedule, old, new, at=changed_at)
+        return Response(
+            {
+                'from_version': old.number if old is not None else 0,
+                'to_version': new.number if new is not None else None,
+                'changed_at': changed_at,
+                'premium': sum((change.premium for change in changes), predictability.ZERO),
+                'changes': PricedChangeSerializer(changes, many=True).data,
+            }
+        )
+
+    @extend_schema(parameters=[PayPeriodQuerySerializer])
+    @action(detail=False, methods=['get'], url_path='predictability-report')
+    def predictability_report(self, request):
+        """
+        Predictability pay per store and employee for shifts in a pay period.
+
+        With ``?async=true`` the report is built by a background job and 202
+        Accepted is returned with the job's status URL.
+        """
+        params = PayPeriodQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        start, end = params.validated_data['start'], params.validated_data['end']
+        store_ids = get_request_store_ids(request)
+
+        if request.query_params.get('async', '').lower() in ('1', 'true', 'yes'):
+            job = enqueue(
+                'scheduling.predictability_report',
+                start=start.isoformat(),
+                end=end.isoformat(),
+                store_ids=store_ids,
+                stores=store_ids,
+            )
+            status_url = reverse('job-detail', args=[job.pk], request=request)
+            return Response(JobSerializer(job).data, status=status.HTTP_202_ACCEPTED, headers={'Location': status_url})
+        return Response(predictability.pay_period_report(start, end, store_ids))
+
+
+class ShiftViewSet(StoreScopedMixin, viewsets.ModelViewSet):
+    """
+    Shifts of the current (unpublished) schedules.
+
+    Editing a shift never changes a published version; publish the schedule
+    again to make the change official.
+    """
+
+    queryset = Shift.objects.all()
+    serializer_class = ShiftSerializer
+    store_field = 'schedule__store'
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_fields = ['schedule', 'employee']
+    ordering_fields = ['start']
+    ordering = ['start', 'employee']
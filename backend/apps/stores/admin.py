@@ -0,0 +1,14 @@
+from django.contrib import admin
+from .models import Store
+from .scoping import StoreScopedAdminMixin
+
+
+@admin.register(Store)
+class StoreAdmin(StoreScopedAdminMixin, admin.ModelAdmin):
+    """Admin interface for Store model."""
+
+    list_display = ['name', 'city', 'state', 'labor_budget', 'timezone']
+    search_fields = ['name', 'city', 'zip_code']
+    autocomplete_fields = ['managers']
+    ordering = ['name']
+    store_field = 'pk'
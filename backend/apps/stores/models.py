@@ -0,0 +1,36 @@
+from django.conf import settings as django_settings
+from django.db import models
+from django.core.validators import MinValueValidator
+from decimal import Decimal
+
+
+class Store(models.Model):
+    """A physical store location. Employees and their schedules belong to one store."""
+
+    name = models.CharField(max_length=100, unique=True, help_text='e.g. "Store #1247"')
+    address = models.CharField(max_length=200, blank=True)
+    city = models.CharField(max_length=100, blank=True)
+    state = models.CharField(max_length=2, blank=True, default='NY')
+    zip_code = models.CharField(max_length=10, blank=True)
+    phone_number = models.CharField(max_length=20, blank=True)
+    labor_budget = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        validators=[MinValueValidator(Decimal('0.00'))],
+        help_text="Weekly labor budget",
+    )
+    timezone = models.CharField(max_length=50, default='America/New_York')
+    settings = models.JSONField(default=dict, blank=True, help_text="Store-specific configuration")
+
+    # Users who manage this store; their API and admin views are scoped to it
+    managers = models.ManyToManyField(django_settings.AUTH_USER_MODEL, related_name='managed_stores', blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
@@ -0,0 +1,135 @@
+"""
+Resolve which stores a request may see.
+
+- Superusers, chain-level staff without store assignments, and anonymous
+  callers (the API is still ``AllowAny``) are unrestricted.
+- Users listed in ``Store.managers`` only see their own stores.
+- Any caller may narrow to one store with the ``X-Store-Id`` header, which
+  must be one of the stores they are allowed to see.
+
+A bad header is a 400 (or 403 outside the caller's stores): DRF exceptions
+for API requests, Django's ``BadRequest``/``PermissionDenied`` for plain
+Django (admin) requests, so neither ends up as a 500.
+"""
+from django.core import exceptions as django_exceptions
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.request import Request
+
+STORE_HEADER = 'HTTP_X_STORE_ID'
+
+
+def get_allowed_store_ids(user):
+    """Return the set of store ids ``user`` may see, or ``None`` for all stores."""
+    if user is None or not user.is_authenticated or user.is_superuser:
+        return None
+    cached = getattr(user, '_allowed_store_ids', False)
+    if cached is not False:
+        return cached
+    store_ids = set(user.managed_stores.values_list('id', flat=True))
+    if not store_ids and user.is_staff:
+        store_ids = None
+    user._allowed_store_ids = store_ids
+    return store_ids
+
+
+def get_request_store_ids(request):
+    """
+    Return the store ids this request is scoped to, or ``None`` if unscoped.
+
+    Works for both DRF and plain Django (admin) requests.
+    """
+    if hasattr(request, '_store_ids'):
+        return request._store_ids
+
+    allowed = get_allowed_store_ids(getattr(request, 'user', None))
+    requested = request.META.get(STORE_HEADER)
+    if requested:
+        api = isinstance(request, Request)
+        try:
+            requested = int(requested)
+        except ValueError:
+            message = 'X-Store-Id must be a store id.'
+            raise ValidationError({'detail': message}) if api else django_exceptions.BadRequest(message)
+        if allowed is not None and requested not in allowed:
+            message = 'You do not have access to this store.'
+            raise PermissionDenied(message) if api else django_exceptions.PermissionDenied(message)
+        store_ids = [requested]
+    else:
+        store_ids = None if allowed is None else sorted(allowed)
+
+    request._store_ids = store_ids
+    return store_ids
+
+
+def scope_queryset(queryset, request, store_field='store'):
+    """Filter ``queryset`` to the request's stores via ``store_field``."""
+    store_ids = get_request_store_ids(request)
+    if store_ids is None:
+        return queryset
+    if len(store_ids) == 1:
+        return queryset.filter(**{store_field: store_ids[0]})
+    return queryset.filter(**{f'{store_field}__in': store_ids})
+
+
+class StoreScopedMixin:
+    """
+    Scope a viewset's queryset to the caller's stores.
+
+    ``store_field`` is the lookup path from the model to ``Store``. When the
+    caller is scoped to a single store, new rows are assigned to it; an
+    explicit store outside the caller's scope is rejected.
+    """
+
+    store_field = 'store'
+
+    def get_queryset(self):
+        return scope_queryset(super().get_queryset(), self.request, self.store_field)
+
+    def _check_store(self, serializer, creating):
+        """Validate the row's store against the caller's scope; return save() kwargs."""
+        store_ids = get_request_store_ids(self.request)
+        if store_ids is None:
+            return {}
+
+        if self.store_field != 'store':
+            # e.g. 'employee__store': check the store of the related row.
+            related = serializer.validated_data.get(self.store_field.split('__')[0])
+            if related is not None and related.store_id not in store_ids:
+                raise PermissionDenied('You do not have access to this store.')
+            return {}
+
+        store = serializer.validated_data.get('store')
+        if store is None:
+            if not creating:
+                return {}
+            if len(store_ids) == 1:
+                return {'store_id': store_ids[0]}
+            raise ValidationError({'store': 'Select one of your stores.'})
+        if store.pk not in store_ids:
+            raise PermissionDenied('You do not have access to this store.')
+        return {}
+
+    def perform_create(self, serializer):
+        serializer.save(**self._check_store(serializer, creating=True))
+
+    def perform_update(self, serializer):
+        serializer.save(**self._check_store(serializer, creating=False))
+
+
+class StoreScopedAdminMixin:
+    """Scope a ModelAdmin's changelist and store choices to the admin user's stores."""
+
+    store_field = 'store'
+
+    def get_queryset(self, request):
+        return scope_queryset(super().get_queryset(request), request, self.store_field)
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        store_ids = get_request_store_ids(request)
+        if store_ids is not None:
+            if db_field.name == 'store':
+                kwargs['queryset'] = db_field.related_model.objects.filter(pk__in=store_ids)
+            elif db_field.name == self.store_field.split('__')[0]:
+                # e.g. Availability.employee: only offer rows from the user's stores
+                kwargs['queryset'] = db_field.related_model.objects.filter(store__in=store_ids)
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
@@ -0,0 +1,24 @@
+from rest_framework import serializers
+from .models import Store
+
+
+class StoreSerializer(serializers.ModelSerializer):
+    """Serializer for Store model."""
+
+    class Meta:
+        model = Store
+        fields = [
+            'id',
+            'name',
+            'address',
+            'city',
+            'state',
+            'zip_code',
+            'phone_number',
+            'labor_budget',
+            'timezone',
+            'settings',
+            'created_at',
+            'updated_at',
+        ]
+        read_only_fields = ['created_at', 'updated_at']
@@ -0,0 +1,246 @@
+import pytest
+from datetime import date, time
+from decimal import Decimal
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework import status
+from apps.audit.models import AuditEntry
+from apps.employees.admin import EmployeeAdmin
+from apps.employees.models import Employee, Availability
+from apps.stores.models import Store
+
+
+@pytest.fixture
+def api_client():
+    """Pytest fixture for API client."""
+    return APIClient()
+
+
+@pytest.fixture
+def stores():
+    """Two stores with one employee (and one availability slot) each."""
+    result = []
+    for number in (1, 2):
+        store = Store.objects.create(name=f'Store #{number}')
+        employee = Employee.objects.create(
+            first_name=f'Worker{number}',
+            last_name='Store',
+            email=f'worker{number}@example.com',
+            phone_number='555-0100',
+            hourly_rate=Decimal('15.00'),
+            hire_date=date(2024, 1, 1),
+            birth_date=date(2000, 1, 1),
+            store=store,
+        )
+        Availability.objects.create(employee=employee, day_of_week=0, start_time=time(9, 0), end_time=time(17, 0))
+        result.append(store)
+    return result
+
+
+@pytest.fixture
+def manager(stores):
+    """A non-staff user who manages store #1."""
+    user = User.objects.create_user('manager1', password='pw')
+    stores[0].managers.add(user)
+    return user
+
+
+@pytest.mark.django_db
+class TestStoreScoping:
+    """Tests for store-scoped employee and availability access."""
+
+    def test_manager_sees_only_their_store(self, api_client, stores, manager):
+        """Test that employees and availability are scoped to the manager's store."""
+        api_client.force_authenticate(manager)
+
+        response = api_client.get('/api/employees/')
+        assert [e['store'] for e in response.data['results']] == [stores[0].id]
+
+        response = api_client.get('/api/availability/')
+        assert response.data['count'] == 1
+
+        other = Employee.objects.get(store=stores[1])
+        response = api_client.get(f'/api/employees/{other.id}/')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_unscoped_caller_sees_chain(self, api_client, stores):
+        """Test that anonymous callers keep chain-wide access and can filter by store."""
+        assert api_client.get('/api/employees/').data['count'] == 2
+        response = api_client.get(f'/api/employees/?store={stores[1].id}')
+        assert [e['store'] for e in response.data['results']] == [stores[1].id]
+
+    def test_store_header_narrows_scope(self, api_client, stores):
+        """Test that X-Store-Id selects a single store."""
+        response = api_client.get('/api/employees/', HTTP_X_STORE_ID=str(stores[1].id))
+        assert [e['store'] for e in response.data['results']] == [stores[1].id]
+
+    def test_store_header_outside_scope_is_forbidden(self, api_client, stores, manager):
+        """Test that managers cannot switch into another store."""
+        api_client.force_authenticate(manager)
+        response = api_client.get('/api/employees/', HTTP_X_STORE_ID=str(stores[1].id))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_create_assigns_managers_store(self, api_client, stores, manager):
+        """Test that new employees land in the manager's store automatically."""
+        api_client.force_authenticate(manager)
+        data = {
+            'first_name': 'New',
+            'last_name': 'Hire',
+            'email': 'new.hire@example.com',
+            'phone_number': '555-0101',
+            'hourly_rate': '16.00',
+            'hire_date': '2024-02-01',
+            'birth_date': '1998-03-15',
+        }
+        response = api_client.post('/api/employees/', data, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+        assert Employee.objects.get(email='new.hire@example.com').store == stores[0]
+
+        data['email'] = 'other.hire@example.com'
+        data['store'] = stores[1].id
+        response = api_client.post('/api/employees/', data, format='json')
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_availability_for_other_store_is_forbidden(self, api_client, stores, manager):
+        """Test that managers cannot add availability to another store's employee."""
+        api_client.force_authenticate(manager)
+        other = Employee.objects.get(store=stores[1])
+        response = api_client.post(
+            '/api/availability/',
+            {
+                'employee': other.id,
+                'day_of_week': 1,
+                'start_time': '09:00:00',
+                'end_time': '17:00:00',
+            },
+            format='json',
+        )
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_bulk_update_is_scoped(self, api_client, stores, manager):
+        """Test that bulk updates never reach another store's staff."""
+        api_client.force_authenticate(manager)
+        response = api_client.post(
+            '/api/employees/bulk-update/?is_active=true', {'operation': 'deactivate'}, format='json'
+        )
+        assert response.data['updated'] == 1
+        assert Employee.objects.get(store=stores[1]).is_active is True
+
+    def test_scoped_list_filters_on_store_index(self, api_client, stores, manager):
+        """Test that the scoped list query filters by store first."""
+        api_client.force_authenticate(manager)
+        with CaptureQueriesContext(connection) as queries:
+            api_client.get('/api/employees/?is_active=true')
+        employee_queries = [
+            q['sql']
+            for q in queries.captured_queries
+            if 'FROM "employees_employee"' in q['sql'] and 'COUNT' not in q['sql']
+        ]
+        assert f'"employees_employee"."store_id" = {stores[0].id}' in employee_queries[0]
+
+    def test_sync_is_scoped(self, api_client, stores, manager, settings):
+        """Test that a manager's delta sync only carries their store's rows and tombstones."""
+        settings.SYNC_SETTLE_SECONDS = 0
+        mine, other = Employee.objects.get(store=stores[0]), Employee.objects.get(store=stores[1])
+        api_client.force_authenticate(manager)
+        response = api_client.get('/api/sync/')
+        assert [row['id'] for row in response.data['employees']] == [mine.id]
+        assert [row['employee'] for row in response.data['availability']] == [mine.id]
+        cursor = response.data['next_cursor']
+
+        Availability.objects.filter(employee=other).delete()
+        response = api_client.get('/api/sync/', {'since': cursor})
+        assert response.data['tombstones'] == []
+
+        # Moving an employee away tombstones them for the store they left.
+        mine.store = stores[1]
+        mine.save()
+        response = api_client.get('/api/sync/', {'since': cursor})
+        assert response.data['employees'] == []
+        assert [(row['entity'], row['id']) for row in response.data['tombstones']] == [('employee', mine.id)]
+
+    def test_audit_is_scoped(self, api_client, stores, manager):
+        """Test that managers only read their own employees' history (and skills)."""
+        mine, other = Employee.objects.get(store=stores[0]), Employee.objects.get(store=stores[1])
+        AuditEntry.objects.bulk_create(
+            [
+                AuditEntry(entity='employee', entity_id=mine.id, employee_id=mine.id, action='update'),
+                AuditEntry(entity='employee', entity_id=other.id, employee_id=other.id, action='update'),
+                AuditEntry(entity='skill', entity_id=1, action='create'),
+            ]
+        )
+        api_client.force_authenticate(manager)
+        response = api_client.get('/api/audit/')
+        assert sorted((row['entity'], row['entity_id']) for row in response.data['results']) == [
+            ('employee', mine.id),
+            ('skill', 1),
+        ]
+
+
+@pytest.mark.django_db
+class TestStoreAdminScoping:
+    """Tests for admin queryset scoping."""
+
+    def test_admin_changelist_is_scoped(self, stores, manager):
+        """Test that a store manager's admin queryset only covers their store."""
+        from django.contrib import admin
+
+        manager.is_staff = True
+        manager.save()
+        request = RequestFactory().get('/admin/employees/employee/')
+        request.user = manager
+
+        queryset = EmployeeAdmin(Employee, admin.site).get_queryset(request)
+        assert list(queryset.values_list('store', flat=True)) == [stores[0].id]
+
+    def test_chain_staff_without_stores_sees_all(self, stores):
+        """Test that staff without store assignments are unrestricted."""
+        from django.contrib import admin
+
+        staff = User.objects.create_user('district', password='pw', is_staff=True)
+        request = RequestFactory().get('/admin/employees/employee/')
+        request.user = staff
+
+        assert EmployeeAdmin(Employee, admin.site).get_queryset(request).count() == 2
+
+    def test_bad_store_header_is_a_client_error(self, client, stores, manager):
+        """Test that a bad X-Store-Id in the admin is a 400/403, not a 500."""
+        from django.contrib.auth.models import Permission
+
+        manager.is_staff = True
+        manager.save()
+        manager.user_permissions.add(Permission.objects.get(codename='view_employee'))
+        client.force_login(manager)
+        assert client.get('/admin/employees/employee/').status_code == 200
+        response = client.get('/admin/employees/employee/', HTTP_X_STORE_ID='abc')
+        assert response.status_code == 400
+        response = client.get('/admin/employees/employee/', HTTP_X_STORE_ID=str(stores[1].id))
+        assert response.status_code == 403
+
+
+@pytest.mark.django_db
+class TestStoreAPI:
+    """Tests for the store endpoints."""
+
+    def test_manager_lists_only_their_stores(self, api_client, stores, manager):
+        """Test that /api/stores/ is scoped too."""
+        api_client.force_authenticate(manager)
+        response = api_client.get('/api/stores/')
+        assert [s['name'] for s in response.data['results']] == ['Store #1']
+
+    def test_managers_cannot_create_or_change_other_stores(self, api_client, stores, manager):
+        """Test that only chain-level callers create stores and managers only edit their own."""
+        api_client.force_authenticate(manager)
+        response = api_client.post('/api/stores/', {'name': 'Store #3'}, format='json')
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert not Store.objects.filter(name='Store #3').exists()
+
+        response = api_client.patch(f'/api/stores/{stores[0].id}/', {'name': 'Store #1 East'}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        for method in (api_client.patch, api_client.delete):
+            response = method(f'/api/stores/{stores[1].id}/', {'name': 'Mine now'}, format='json')
+            assert response.status_code in (status.HTTP_403_FORBIDDEN, status.HTTP_404_NOT_FOUND)
+        assert Store.objects.filter(pk=stores[1].id, name='Store #2').exists()
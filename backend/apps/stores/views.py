@@ -0,0 +1,42 @@
+from rest_framework import viewsets
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.filters import SearchFilter, OrderingFilter
+
+from .models import Store
+from .scoping import StoreScopedMixin, get_request_store_ids
+from .serializers import StoreSerializer
+
+
+class StoreViewSet(StoreScopedMixin, viewsets.ModelViewSet):
+    """
+    ViewSet for managing stores.
+
+    Store managers only see and change the stores they manage; only
+    unscoped (chain-level) callers may create stores.
+    """
+
+    queryset = Store.objects.all()
+    serializer_class = StoreSerializer
+    store_field = 'pk'
+    filter_backends = [SearchFilter, OrderingFilter]
+    search_fields = ['name', 'city', 'zip_code']
+    ordering_fields = ['name', 'created_at']
+    ordering = ['name']
+
+    def _check_store_access(self, store):
+        store_ids = get_request_store_ids(self.request)
+        if store_ids is not None and store.pk not in store_ids:
+            raise PermissionDenied('You do not have access to this store.')
+
+    def perform_create(self, serializer):
+        if get_request_store_ids(self.request) is not None:
+            raise PermissionDenied('Only chain-level users can create stores.')
+        serializer.save()
+
+    def perform_update(self, serializer):
+        self._check_store_access(serializer.instance)
+        serializer.save()
+
+    def perform_destroy(self, instance):
+        self._check_store_access(instance)
+        instance.delete()
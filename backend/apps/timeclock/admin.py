@@ -0,0 +1,30 @@
+from django.contrib import admin
+from apps.stores.scoping import StoreScopedAdminMixin
+from .models import Punch, WeeklyHours
+
+
+@admin.register(Punch)
+class PunchAdmin(StoreScopedAdminMixin, admin.ModelAdmin):
+    """Read-only admin for timeclock punches."""
+
+    store_field = 'employee__store'
+    list_display = ['employee', 'kind', 'ts', 'device', 'rolled_up']
+    list_filter = ['kind', 'rolled_up']
+    search_fields = ['device', 'idempotency_key']
+    date_hierarchy = 'ts'
+    raw_id_fields = ['employee']
+    readonly_fields = ['employee', 'kind', 'ts', 'device', 'idempotency_key', 'received_at', 'rolled_up']
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(WeeklyHours)
+class WeeklyHoursAdmin(StoreScopedAdminMixin, admin.ModelAdmin):
+    """Read-only admin for cached weekly hours."""
+
+    store_field = 'employee__store'
+    list_display = ['employee', 'week_start', 'hours', 'intervals', 'updated_at']
+    date_hierarchy = 'week_start'
+    raw_id_fields = ['employee']
+    readonly_fields = ['employee', 'week_start', 'hours', 'intervals', 'updated_at']
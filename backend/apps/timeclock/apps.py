@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class TimeclockConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.timeclock'
+    verbose_name = 'Timeclock'
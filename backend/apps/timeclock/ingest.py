@@ -0,0 +1,142 @@
+"""
+Batched punch ingestion.
+
+A batch is validated in Python against one query for its employees and one
+per thousand keys for already-stored punches. It is then written with
+multi-row ``INSERT ... ON CONFLICT DO NOTHING`` statements of
+``INSERT_ROWS`` punches, with values adapted once instead of through the
+ORM's per-field ``bulk_create`` path. Other backends fall back to
+``bulk_create(..., ignore_conflicts=True)``. A resent batch therefore costs
+a few statements, whatever its size. The ``(device, idempotency_key)``
+unique constraint still drops a duplicate that a concurrent request wrote
+in between, so it may be counted as accepted twice but is stored once.
+
+Bad punches are reported by position and don't stop the rest of the batch.
+"""
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.employees.models import Employee
+
+from .models import Punch
+from .rollup import schedule_rollup
+
+MAX_BATCH = 5000
+LOOKUP_CHUNK = 1000
+INSERT_ROWS = 500
+INSERT_COLUMNS = ['employee_id', 'kind', 'ts', 'device', 'idempotency_key', 'received_at', 'rolled_up']
+KINDS = {Punch.KIND_IN, Punch.KIND_OUT}
+
+
+class BatchError(ValueError):
+    """The batch as a whole is unusable."""
+
+
+def _parse(record, default_device):
+    if not isinstance(record, dict):
+        raise ValueError('Expected an object.')
+    kind = record.get('kind')
+    if kind not in KINDS:
+        raise ValueError('kind must be "in" or "out".')
+    employee = record.get('employee')
+    if not isinstance(employee, int) or isinstance(employee, bool):
+        raise ValueError('employee must be an employee id.')
+    stamp = record.get('ts')
+    ts = parse_datetime(stamp) if isinstance(stamp, str) else None
+    if ts is None:
+        raise ValueError('ts must be an ISO 8601 timestamp.')
+    if timezone.is_naive(ts):
+        raise ValueError('ts needs a UTC offset.')
+    device = record.get('device') or default_device
+    key = record.get('key')
+    if not isinstance(device, str) or not device or len(device) > 100:
+        raise ValueError('device must be a non-empty string of up to 100 characters.')
+    if not isinstance(key, str) or not key or len(key) > 64:
+        raise ValueError('key must be a non-empty string of up to 64 characters.')
+    return employee, kind, ts, device, key
+
+
+def ingest(records, default_device=None, store_ids=None):
+    """
+    Store a batch of punch records.
+
+    ``store_ids`` limits the employees punches may be for (``None``: any).
+    Returns ``{'accepted', 'duplicates', 'rejected': [{'index', 'error'}]}``.
+    """
+    max_batch = getattr(settings, 'TIMECLOCK_MAX_BATCH', MAX_BATCH)
+    if not isinstance(records, list):
+        raise BatchError('Send a list of punches.')
+    if len(records) > max_batch:
+        raise BatchError(f'At most {max_batch} punches per batch.')
+
+    parsed, rejected = [], []
+    for index, record in enumerate(records):
+        try:
+            parsed.append((index, _parse(record, default_device)))
+        except ValueError as exc:
+            rejected.append({'index': index, 'error': str(exc)})
+
+    employees = Employee.objects.filter(pk__in={punch[0] for _, punch in parsed})
+    if store_ids is not None:
+        employees = employees.filter(store__in=store_ids)
+    known = set(employees.values_list('pk', flat=True))
+
+    devices = {punch[3] for _, punch in parsed}
+    keys = sorted({punch[4] for _, punch in parsed})
+    seen = set()
+    for offset in range(0, len(keys), LOOKUP_CHUNK):
+        stored = Punch.objects.filter(device__in=devices, idempotency_key__in=keys[offset : offset + LOOKUP_CHUNK])
+        seen.update(stored.values_list('device', 'idempotency_key'))
+
+    now = timezone.now()
+    punches, duplicates = [], 0
+    for index, (employee, kind, ts, device, key) in parsed:
+        if (device, key) in seen:
+            duplicates += 1
+            continue
+        if employee not in known:
+            rejected.append({'index': index, 'error': f'Unknown employee {employee}.'})
+            continue
+        seen.add((device, key))
+        punches.append((employee, kind, ts, device, key, now, False))
+
+    if punches:
+        write(punches)
+        transaction.on_commit(schedule_rollup)
+    rejected.sort(key=lambda error: error['index'])
+    return {'accepted': len(punches), 'duplicates': duplicates, 'rejected': rejected}
+
+
+def write(punches):
+    """Insert ``INSERT_COLUMNS`` tuples, skipping any whose device and key are already stored."""
+    if connection.vendor not in ('sqlite', 'postgresql'):
+        Punch.objects.bulk_create(
+            (Punch(**dict(zip(INSERT_COLUMNS, punch))) for punch in punches),
+            batch_size=INSERT_ROWS,
+            ignore_conflicts=True,
+        )
+        return
+    ops = connection.ops
+    table = ops.quote_name(Punch._meta.db_table)
+    columns = ', '.join(ops.quote_name(column) for column in INSERT_COLUMNS)
+    row = '(' + ', '.join(['%s'] * len(INSERT_COLUMNS)) + ')'
+    with connection.cursor() as cursor:
+        for offset in range(0, len(punches), INSERT_ROWS):
+            chunk = punches[offset : offset + INSERT_ROWS]
+            params = []
+            for employee, kind, ts, device, key, received_at, rolled_up in chunk:
+                params += [
+                    employee,
+                    kind,
+                    ops.adapt_datetimefield_value(ts),
+                    device,
+                    key,
+                    ops.adapt_datetimefield_value(received_at),
+                    rolled_up,
+                ]
+            cursor.execute(
+                f'INSERT INTO {table} ({columns}) VALUES {", ".join([row] * len(chunk))} ON CONFLICT DO NOTHING',
+                params,
+            )
@@ -0,0 +1,164 @@
+# Generated by Django 5.0.1 on 2026-10-19 04:44
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        ("employees", "0005_availability_exceptions"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Punch",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(choices=[("in", "Clock in"), ("out", "Clock out")], max_length=3),
+                ),
+                (
+                    "ts",
+                    models.DateTimeField(help_text="When the employee punched, as recorded by the device"),
+                ),
+                ("device", models.CharField(max_length=100)),
+                ("idempotency_key", models.CharField(max_length=64)),
+                (
+                    "received_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("rolled_up", models.BooleanField(default=False)),
+                (
+                    "employee",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="punches",
+                        to="employees.employee",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Punches",
+                "ordering": ["-ts", "-id"],
+            },
+        ),
+        migrations.CreateModel(
+            name="WeeklyHours",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("week_start", models.DateField(help_text="Monday, store-local")),
+                (
+                    "hours",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=6),
+                ),
+                ("intervals", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "employee",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="weekly_hours",
+                        to="employees.employee",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Weekly hours",
+                "ordering": ["-week_start", "employee"],
+            },
+        ),
+        migrations.CreateModel(
+            name="WorkedInterval",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "week_start",
+                    models.DateField(help_text="Monday of the week the interval started in, store-local"),
+                ),
+                ("start", models.DateTimeField()),
+                ("end", models.DateTimeField()),
+                (
+                    "employee",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="worked_intervals",
+                        to="employees.employee",
+                    ),
+                ),
+                (
+                    "punch_in",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="timeclock.punch",
+                    ),
+                ),
+                (
+                    "punch_out",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="timeclock.punch",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["employee", "start"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="punch",
+            index=models.Index(fields=["employee", "ts"], name="timeclock_p_employe_1bb6de_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="punch",
+            index=models.Index(
+                condition=models.Q(("rolled_up", False)),
+                fields=["id"],
+                name="punch_pending_rollup",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="punch",
+            constraint=models.UniqueConstraint(fields=("device", "idempotency_key"), name="punch_unique_device_key"),
+        ),
+        migrations.AddConstraint(
+            model_name="weeklyhours",
+            constraint=models.UniqueConstraint(
+                fields=("employee", "week_start"),
+                name="weekly_hours_unique_employee_week",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="workedinterval",
+            index=models.Index(fields=["employee", "week_start"], name="timeclock_w_employe_b53fbd_idx"),
+        ),
+    ]
@@ -0,0 +1,89 @@
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.utils import timezone
+
+
+class Punch(models.Model):
+    """
+    One clock-in or clock-out event sent by a timeclock device.
+
+    Append-only: rows are written in batches by ``apps.timeclock.ingest`` and
+    never edited, except for the ``rolled_up`` flag set by the rollup job.
+    ``(device, idempotency_key)`` is unique, so a device can resend a batch
+    safely.
+    """
+
+    KIND_IN = 'in'
+    KIND_OUT = 'out'
+    KIND_CHOICES = [
+        (KIND_IN, 'Clock in'),
+        (KIND_OUT, 'Clock out'),
+    ]
+
+    employee = models.ForeignKey('employees.Employee', on_delete=models.CASCADE, related_name='punches')
+    kind = models.CharField(max_length=3, choices=KIND_CHOICES)
+    ts = models.DateTimeField(help_text="When the employee punched, as recorded by the device")
+    device = models.CharField(max_length=100)
+    idempotency_key = models.CharField(max_length=64)
+    received_at = models.DateTimeField(default=timezone.now)
+    rolled_up = models.BooleanField(default=False)
+
+    class Meta:
+        ordering = ['-ts', '-id']
+        verbose_name_plural = 'Punches'
+        indexes = [
+            models.Index(fields=['employee', 'ts']),
+            models.Index(fields=['id'], condition=models.Q(rolled_up=False), name='punch_pending_rollup'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['device', 'idempotency_key'], name='punch_unique_device_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.employee_id} {self.kind} at {self.ts}"
+
+    def save(self, *args, **kwargs):
+        """Punches are immutable once written."""
+        if self.pk is not None:
+            raise ValidationError('Punches cannot be modified.')
+        super().save(*args, **kwargs)
+
+
+class WorkedInterval(models.Model):
+    """A clock-in paired with the clock-out that ended it (see ``apps.timeclock.rollup``)."""
+
+    employee = models.ForeignKey('employees.Employee', on_delete=models.CASCADE, related_name='worked_intervals')
+    week_start = models.DateField(help_text="Monday of the week the interval started in, store-local")
+    start = models.DateTimeField()
+    end = models.DateTimeField()
+    punch_in = models.ForeignKey(Punch, on_delete=models.CASCADE, related_name='+')
+    punch_out = models.ForeignKey(Punch, on_delete=models.CASCADE, related_name='+')
+
+    class Meta:
+        ordering = ['employee', 'start']
+        indexes = [
+            models.Index(fields=['employee', 'week_start']),
+        ]
+
+    def __str__(self):
+        return f"{self.employee_id} {self.start} - {self.end}"
+
+
+class WeeklyHours(models.Model):
+    """Cached hours worked per employee and week, refreshed by the rollup job."""
+
+    employee = models.ForeignKey('employees.Employee', on_delete=models.CASCADE, related_name='weekly_hours')
+    week_start = models.DateField(help_text="Monday, store-local")
+    hours = models.DecimalField(max_digits=6, decimal_places=2, default=0)
+    intervals = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-week_start', 'employee']
+        verbose_name_plural = 'Weekly hours'
+        constraints = [
+            models.UniqueConstraint(fields=['employee', 'week_start'], name='weekly_hours_unique_employee_week'),
+        ]
+
+    def __str__(self):
+        return f"{self.employee_id} week of {self.week_start}: {self.hours}h"
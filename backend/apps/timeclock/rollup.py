@@ -0,0 +1,196 @@
+"""
+Pair punches into worked intervals and cache weekly hours.
+
+The ``timeclock.rollup`` job takes the punches not yet rolled up, in
+batches of ``TIMECLOCK_ROLLUP_BATCH``. For every (employee, store-local
+week) they touch, or could pair across into (one longest shift either
+side), it pairs all of that week's punches again and rewrites
+its ``WorkedInterval`` rows and its ``WeeklyHours`` row, so late or resent
+punches can't double count. Pairing walks an employee's punches in time
+order:
+
+- a clock-out closes the open clock-in if the interval is at most
+  ``TIMECLOCK_MAX_SHIFT_HOURS`` long
+- a clock-in while another is open is a repeated tap and is ignored, unless
+  the open one is older than that (a forgotten clock-out)
+- a clock-out with nothing open is ignored
+
+An interval belongs to the week its clock-in falls in. Ingestion queues the
+job at most once at a time, ``TIMECLOCK_ROLLUP_DELAY`` seconds ahead, so the
+batches of a shift change are rolled up together.
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from itertools import groupby
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.employees.models import Employee
+from apps.jobs.models import Job
+from apps.jobs.registry import enqueue
+
+from .models import Punch, WeeklyHours, WorkedInterval
+
+JOB_NAME = 'timeclock.rollup'
+ROLLUP_BATCH = 20000
+ROLLUP_DELAY = 5  # seconds
+MAX_SHIFT_HOURS = 16
+CHUNK = 1000
+CENT = Decimal('0.01')
+
+
+def schedule_rollup():
+    """Queue the rollup job unless one is already waiting."""
+    if Job.objects.filter(name=JOB_NAME, status=Job.STATUS_QUEUED).exists():
+        return None
+    delay = getattr(settings, 'TIMECLOCK_ROLLUP_DELAY', ROLLUP_DELAY)
+    return enqueue(JOB_NAME, run_after=timezone.now() + timedelta(seconds=delay))
+
+
+def week_of(moment, tz):
+    day = moment.astimezone(tz).date()
+    return day - timedelta(days=day.weekday())
+
+
+def _zones(employee_ids):
+    rows = Employee.objects.filter(pk__in=employee_ids).values_list('pk', 'store__timezone')
+    return {pk: ZoneInfo(name or settings.TIME_ZONE) for pk, name in rows}
+
+
+def pair(punches, max_shift):
+    """``(punch_in, punch_out)`` pairs of one employee's ``(pk, kind, ts)`` punches in time order."""
+    intervals = []
+    opened = None
+    for punch in punches:
+        if punch[1] == Punch.KIND_IN:
+            if opened is None or punch[2] - opened[2] > max_shift:
+                opened = punch
+        elif opened is not None:
+            if punch[2] - opened[2] <= max_shift:
+                intervals.append((opened, punch))
+            opened = None
+    return intervals
+
+
+def _max_shift():
+    return timedelta(hours=getattr(settings, 'TIMECLOCK_MAX_SHIFT_HOURS', MAX_SHIFT_HOURS))
+
+
+def rollup(batch_size=None):
+    """Roll up every pending punch; returns how many were processed."""
+    batch_size = batch_size or getattr(settings, 'TIMECLOCK_ROLLUP_BATCH', ROLLUP_BATCH)
+    max_shift = _max_shift()
+    total = 0
+    while True:
+        pending = list(
+            Punch.objects.filter(rolled_up=False).order_by('pk').values_list('pk', 'employee_id', 'ts')[:batch_size]
+        )
+        if not pending:
+            return total
+        zones = _zones({employee for _, employee, _ in pending})
+        keys = set()
+        for _, employee, ts in pending:
+            keys.add((employee, week_of(ts, zones[employee])))
+            # A clock-out may close an interval that started the week before;
+            # a late clock-in may take over punches paired in the week after.
+            keys.add((employee, week_of(ts - max_shift, zones[employee])))
+            keys.add((employee, week_of(ts + max_shift, zones[employee])))
+
+        with transaction.atomic():
+            refresh(keys, zones)
+            pks = [pk for pk, _, _ in pending]
+            for offset in range(0, len(pks), CHUNK):
+                Punch.objects.filter(pk__in=pks[offset : offset + CHUNK]).update(rolled_up=True)
+        total += len(pending)
+
+
+def refresh(keys, zones=None):
+    """Recompute intervals and hours for ``(employee id, week start)`` keys."""
+    if not keys:
+        return
+    employees = {employee for employee, _ in keys}
+    zones = zones or _zones(employees)
+    max_shift = _max_shift()
+    weeks = {week for _, week in keys}
+    # A day of slack covers every store timezone; the longest shift covers
+    # punches that open or close an interval across the edge.
+    window = (
+        datetime.combine(min(weeks) - timedelta(days=1), time.min, tzinfo=dt_timezone.utc) - max_shift,
+        datetime.combine(max(weeks) + timedelta(days=8), time.min, tzinfo=dt_timezone.utc) + max_shift,
+    )
+
+    rows = (
+        Punch.objects.filter(employee_id__in=employees, ts__gte=window[0], ts__lt=window[1])
+        .order_by('employee_id', 'ts', 'pk')
+        .values_list('pk', 'employee_id', 'kind', 'ts')
+    )
+    intervals = []
+    hours = {key: [0, 0] for key in keys}
+    for employee, punches in groupby(rows.iterator(chunk_size=5000), key=lambda row: row[1]):
+        tz = zones[employee]
+        for punch_in, punch_out in pair([(pk, kind, ts) for pk, _, kind, ts in punches], max_shift):
+            key = (employee, week_of(punch_in[2], tz))
+            if key not in hours:
+                continue
+            intervals.append(
+                WorkedInterval(
+                    employee_id=employee,
+                    week_start=key[1],
+                    start=punch_in[2],
+                    end=punch_out[2],
+                    punch_in_id=punch_in[0],
+                    punch_out_id=punch_out[0],
+                )
+            )
+            hours[key][0] += (punch_out[2] - punch_in[2]).total_seconds()
+            hours[key][1] += 1
+
+    for week, week_employees in _by_week(keys).items():
+        for offset in range(0, len(week_employees), CHUNK):
+            WorkedInterval.objects.filter(
+                week_start=week, employee_id__in=week_employees[offset : offset + CHUNK]
+            ).delete()
+    WorkedInterval.objects.bulk_create(intervals, batch_size=CHUNK)
+
+    idle = [key for key, (_, count) in hours.items() if not count]
+    for week, week_employees in _by_week(idle).items():
+        for offset in range(0, len(week_employees), CHUNK):
+            WeeklyHours.objects.filter(
+                week_start=week, employee_id__in=week_employees[offset : offset + CHUNK]
+            ).delete()
+
+    now = timezone.now()
+    WeeklyHours.objects.bulk_create(
+        (
+            WeeklyHours(
+                employee_id=employee,
+                week_start=week,
+                hours=(Decimal(seconds) / 3600).quantize(CENT),
+                intervals=count,
+                updated_at=now,
+            )
+            for (employee, week), (seconds, count) in hours.items()
+            if count
+        ),
+        batch_size=CHUNK,
+        update_conflicts=True,
+        unique_fields=['employee', 'week_start'],
+        update_fields=['hours', 'intervals', 'updated_at'],
+    )
+
+
+def _by_week(keys):
+    by_week = defaultdict(list)
+    for employee, week in keys:
+        by_week[week].append(employee)
+    return by_week
+
+
+def weekly_hours(employee_ids, week_start, week_end):
+    """Hours worked per employee in the week starting ``week_start`` (a ``REPLACEMENT_HOURS_SOURCE``)."""
+    rows = WeeklyHours.objects.filter(employee_id__in=employee_ids, week_start=week_start)
+    return {employee: float(hours) for employee, hours in rows.values_list('employee_id', 'hours')}
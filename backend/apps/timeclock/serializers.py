@@ -0,0 +1,53 @@
+from rest_framework import serializers
+
+from .models import Punch, WeeklyHours, WorkedInterval
+
+
+class PunchSerializer(serializers.ModelSerializer):
+    """Serializer for stored punches."""
+
+    class Meta:
+        model = Punch
+        fields = ['id', 'employee', 'kind', 'ts', 'device', 'idempotency_key', 'received_at', 'rolled_up']
+        read_only_fields = fields
+
+
+class PunchInputSerializer(serializers.Serializer):
+    """One punch as sent by a device (documentation only; batches are checked in ``ingest``)."""
+
+    employee = serializers.IntegerField()
+    kind = serializers.ChoiceField(choices=Punch.KIND_CHOICES)
+    ts = serializers.DateTimeField(help_text='ISO 8601 with a UTC offset')
+    device = serializers.CharField(required=False, help_text='Defaults to the batch "device"')
+    key = serializers.CharField(max_length=64, help_text='Idempotency key, unique per device')
+
+
+class PunchRejectionSerializer(serializers.Serializer):
+    index = serializers.IntegerField()
+    error = serializers.CharField()
+
+
+class PunchBatchResultSerializer(serializers.Serializer):
+    """Outcome of one punch batch."""
+
+    accepted = serializers.IntegerField()
+    duplicates = serializers.IntegerField()
+    rejected = PunchRejectionSerializer(many=True)
+
+
+class WorkedIntervalSerializer(serializers.ModelSerializer):
+    """Serializer for paired clock-in/clock-out intervals."""
+
+    class Meta:
+        model = WorkedInterval
+        fields = ['id', 'employee', 'week_start', 'start', 'end', 'punch_in', 'punch_out']
+        read_only_fields = fields
+
+
+class WeeklyHoursSerializer(serializers.ModelSerializer):
+    """Serializer for cached weekly hours."""
+
+    class Meta:
+        model = WeeklyHours
+        fields = ['id', 'employee', 'week_start', 'hours', 'intervals', 'updated_at']
+        read_only_fields = fields
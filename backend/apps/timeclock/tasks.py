@@ -0,0 +1,11 @@
+"""Background job handlers for the timeclock app (see ``apps.jobs``)."""
+from apps.jobs.registry import register
+
+from .rollup import JOB_NAME, rollup
+
+
+@register(JOB_NAME)
+def rollup_punches(context):
+    """Pair the punches ingested since the last run and refresh weekly hours."""
+    context.progress(0, message='Rolling up punches')
+    return {'punches': rollup()}
@@ -0,0 +1,196 @@
+import pytest
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from zoneinfo import ZoneInfo
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.employees.models import Employee
+from apps.jobs.models import Job
+from apps.jobs.runner import run_next
+from apps.stores.models import Store
+from apps.timeclock import rollup
+from apps.timeclock.models import Punch, WeeklyHours, WorkedInterval
+
+PUNCHES = '/api/timeclock/punches/'
+NY = ZoneInfo('America/New_York')
+WEEK = date(2026, 2, 9)
+
+
+@pytest.fixture
+def api_client():
+    """Pytest fixture for API client."""
+    return APIClient()
+
+
+@pytest.fixture
+def employees():
+    store = Store.objects.create(name='Store #1', timezone='America/New_York')
+    return [
+        Employee.objects.create(
+            first_name=name,
+            last_name='Worker',
+            email=f'{name.lower()}@example.com',
+            phone_number='555-0100',
+            hourly_rate=Decimal('20.00'),
+            hire_date=date(2024, 1, 1),
+            birth_date=date(1990, 1, 1),
+            store=store,
+        )
+        for name in ('Ann', 'Ben')
+    ]
+
+
+def punch(employee, kind, day, hour, minute=0, key=None):
+    ts = datetime(2026, 2, day, hour, minute, tzinfo=NY)
+    return {
+        'employee': employee.pk,
+        'kind': kind,
+        'ts': ts.isoformat(),
+        'key': key or f'{employee.pk}-{kind}-{day}-{hour}-{minute}',
+    }
+
+
+@pytest.mark.django_db
+class TestPunchIngest:
+    """Tests for batched punch ingestion."""
+
+    def test_batch(self, api_client, employees, django_capture_on_commit_callbacks):
+        """Test that a batch is stored at once and queues one rollup."""
+        ann, ben = employees
+        batch = [punch(ann, 'in', 9, 9), punch(ben, 'in', 9, 9, 2), punch(ann, 'out', 9, 17)]
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.post(PUNCHES, {'device': 'kiosk-1', 'punches': batch}, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data == {'accepted': 3, 'duplicates': 0, 'rejected': []}
+        assert set(Punch.objects.values_list('device', flat=True)) == {'kiosk-1'}
+
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.post(PUNCHES, {'device': 'kiosk-1', 'punches': [punch(ben, 'out', 9, 17)]}, format='json')
+        assert Job.objects.filter(name=rollup.JOB_NAME).count() == 1
+
+    def test_resent_batch_is_deduplicated(self, api_client, employees):
+        """Test that the idempotency key makes retries safe, per device."""
+        ann = employees[0]
+        batch = [punch(ann, 'in', 9, 9), punch(ann, 'in', 9, 9)]
+        response = api_client.post(PUNCHES, {'device': 'kiosk-1', 'punches': batch}, format='json')
+        assert (response.data['accepted'], response.data['duplicates']) == (1, 1)
+
+        response = api_client.post(PUNCHES, {'device': 'kiosk-1', 'punches': batch[:1]}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert (response.data['accepted'], response.data['duplicates']) == (0, 1)
+
+        other_device = [{**batch[0], 'device': 'kiosk-2'}]
+        assert api_client.post(PUNCHES, other_device, format='json').data['accepted'] == 1
+        assert Punch.objects.count() == 2
+
+    def test_bad_punches_are_rejected_individually(self, api_client, employees):
+        ann = employees[0]
+        batch = [
+            punch(ann, 'in', 9, 9),
+            {**punch(ann, 'out', 9, 17), 'ts': '2026-02-09T17:00:00'},
+            {**punch(ann, 'out', 9, 17), 'kind': 'break'},
+            {**punch(ann, 'out', 9, 17), 'employee': 999},
+            {**punch(ann, 'out', 9, 17), 'key': ''},
+            'in',
+        ]
+        response = api_client.post(PUNCHES, {'device': 'kiosk-1', 'punches': batch}, format='json')
+        assert response.data['accepted'] == 1
+        assert [error['index'] for error in response.data['rejected']] == [1, 2, 3, 4, 5]
+        assert response.data['rejected'][0]['error'] == 'ts needs a UTC offset.'
+        assert response.data['rejected'][2]['error'] == 'Unknown employee 999.'
+
+    def test_rejected_batches(self, api_client, employees, settings):
+        settings.TIMECLOCK_MAX_BATCH = 2
+        ann = employees[0]
+        batch = [punch(ann, 'in', 9, 9), punch(ann, 'out', 9, 17), punch(ann, 'in', 10, 9)]
+        assert api_client.post(PUNCHES, batch, format='json').status_code == status.HTTP_400_BAD_REQUEST
+        assert api_client.post(PUNCHES, {'punches': 'x'}, format='json').status_code == status.HTTP_400_BAD_REQUEST
+        assert not Punch.objects.exists()
+
+    def test_managers_only_punch_for_their_stores(self, api_client, employees):
+        other = Store.objects.create(name='Store #2')
+        manager = User.objects.create_user('manager3', password='pw')
+        other.managers.add(manager)
+        api_client.force_authenticate(manager)
+
+        response = api_client.post(PUNCHES, [{**punch(employees[0], 'in', 9, 9), 'device': 'k'}], format='json')
+        assert response.data['rejected'][0]['error'] == f'Unknown employee {employees[0].pk}.'
+
+    def test_punches_are_immutable(self, employees):
+        stored = Punch.objects.create(
+            employee=employees[0], kind='in', ts=datetime(2026, 2, 9, 9, tzinfo=NY), device='k', idempotency_key='1'
+        )
+        stored.kind = 'out'
+        with pytest.raises(ValidationError):
+            stored.save()
+
+
+@pytest.mark.django_db
+class TestRollup:
+    """Tests for pairing punches into intervals and weekly hours."""
+
+    def send(self, api_client, *punches):
+        return api_client.post(PUNCHES, {'device': 'kiosk-1', 'punches': list(punches)}, format='json')
+
+    def test_pairs_punches_into_weekly_hours(self, api_client, employees, settings, django_capture_on_commit_callbacks):
+        """Test pairing, a repeated tap, a forgotten clock-out and an orphan clock-out."""
+        settings.TIMECLOCK_ROLLUP_DELAY = 0
+        ann, ben = employees
+        with django_capture_on_commit_callbacks(execute=True):
+            self.send(
+                api_client,
+                punch(ann, 'in', 9, 9),
+                punch(ann, 'in', 9, 9, 1),
+                punch(ann, 'out', 9, 17, 30),
+                punch(ann, 'in', 10, 9),
+                punch(ann, 'in', 11, 12),
+                punch(ann, 'out', 11, 16),
+                punch(ann, 'out', 12, 8),
+                punch(ben, 'in', 15, 22),
+                punch(ben, 'out', 16, 2),
+            )
+        assert run_next('worker-1').result == {'punches': 9}
+
+        hours = {row.employee_id: row for row in WeeklyHours.objects.filter(week_start=WEEK)}
+        assert (hours[ann.pk].hours, hours[ann.pk].intervals) == (Decimal('12.50'), 2)
+        # Sunday night into Monday counts for the week the shift started in.
+        assert hours[ben.pk].hours == Decimal('4.00')
+        assert not WeeklyHours.objects.filter(week_start=WEEK + timedelta(days=7)).exists()
+        assert not Punch.objects.filter(rolled_up=False).exists()
+
+    def test_late_punches_recompute_the_week(self, api_client, employees):
+        """Test that a punch arriving later is paired with the earlier ones, without double counting."""
+        ann = employees[0]
+        self.send(api_client, punch(ann, 'in', 9, 9), punch(ann, 'out', 9, 13), punch(ann, 'in', 10, 9))
+        rollup.rollup()
+        assert WeeklyHours.objects.get(employee=ann).hours == Decimal('4.00')
+
+        self.send(api_client, punch(ann, 'out', 10, 15, 15))
+        assert rollup.rollup() == 1
+        assert WeeklyHours.objects.get(employee=ann).hours == Decimal('10.25')
+        assert WorkedInterval.objects.filter(employee=ann).count() == 2
+
+    def test_late_clock_in_refreshes_the_next_week(self, api_client, employees):
+        """Test that a late clock-in taking over next week's punches drops their old interval."""
+        ann = employees[0]
+        self.send(api_client, punch(ann, 'in', 16, 1), punch(ann, 'out', 16, 6))
+        rollup.rollup()
+        assert WeeklyHours.objects.get(employee=ann, week_start=WEEK + timedelta(days=7)).hours == Decimal('5.00')
+
+        # Sunday 22:00 opens the shift; the 01:00 clock-in becomes a repeated tap.
+        self.send(api_client, punch(ann, 'in', 15, 22))
+        rollup.rollup()
+        assert WeeklyHours.objects.get(employee=ann, week_start=WEEK).hours == Decimal('8.00')
+        assert not WeeklyHours.objects.filter(employee=ann, week_start=WEEK + timedelta(days=7)).exists()
+        assert WorkedInterval.objects.filter(employee=ann).count() == 1
+
+    def test_hours_feed_the_replacement_finder(self, api_client, employees):
+        ann, ben = employees
+        self.send(api_client, punch(ann, 'in', 9, 9), punch(ann, 'out', 9, 17))
+        rollup.rollup()
+        assert rollup.weekly_hours([ann.pk, ben.pk], WEEK, WEEK + timedelta(days=6)) == {ann.pk: 8.0}
+
+        response = api_client.get('/api/timeclock/hours/', {'employee': ann.pk})
+        assert response.data['results'][0]['hours'] == '8.00'
@@ -0,0 +1,12 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import PunchViewSet, WeeklyHoursViewSet, WorkedIntervalViewSet
+
+router = DefaultRouter()
+router.register(r'timeclock/punches', PunchViewSet, basename='punch')
+router.register(r'timeclock/intervals', WorkedIntervalViewSet, basename='worked-interval')
+router.register(r'timeclock/hours', WeeklyHoursViewSet, basename='weekly-hours')
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
@@ -0,0 +1,100 @@
+from django_filters import rest_framework as filters
+from django_filters.rest_framework import DjangoFilterBackend
+from drf_spectacular.utils import extend_schema
+from rest_framework import mixins, status, viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import OrderingFilter
+from rest_framework.response import Response
+
+from apps.stores.scoping import StoreScopedMixin, get_request_store_ids
+
+from .ingest import BatchError, ingest
+from .models import Punch, WeeklyHours, WorkedInterval
+from .serializers import (
+    PunchBatchResultSerializer,
+    PunchInputSerializer,
+    PunchSerializer,
+    WeeklyHoursSerializer,
+    WorkedIntervalSerializer,
+)
+
+
+class PunchFilter(filters.FilterSet):
+    """Filter punches by employee, device and time."""
+
+    ts_after = filters.IsoDateTimeFilter(field_name='ts', lookup_expr='gte')
+    ts_before = filters.IsoDateTimeFilter(field_name='ts', lookup_expr='lt')
+
+    class Meta:
+        model = Punch
+        fields = ['employee', 'device', 'kind']
+
+
+class PunchViewSet(StoreScopedMixin, mixins.CreateModelMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Timeclock punches (see ``apps.timeclock.ingest``).
+
+    - List: GET /api/timeclock/punches/?employee=&ts_after=&ts_before=
+    - Ingest: POST /api/timeclock/punches/ with a list of punches, or
+      ``{"device": "...", "punches": [...]}``
+    """
+
+    queryset = Punch.objects.all()
+    serializer_class = PunchSerializer
+    store_field = 'employee__store'
+    throttle_scopes = {'create': 'timeclock'}
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_class = PunchFilter
+    ordering_fields = ['ts']
+    ordering = ['-ts', '-id']
+
+    @extend_schema(
+        request=PunchInputSerializer(many=True),
+        responses={200: PunchBatchResultSerializer, 201: PunchBatchResultSerializer},
+    )
+    def create(self, request, *args, **kwargs):
+        """
+        Store a batch of punches; resending punches already stored is a no-op.
+
+        Returns 201 when at least one punch was new, else 200.
+        """
+        data, device = request.data, None
+        if isinstance(data, dict):
+            data, device = data.get('punches'), data.get('device')
+        try:
+            result = ingest(data, default_device=device, store_ids=get_request_store_ids(request))
+        except BatchError as exc:
+            raise ValidationError({'detail': str(exc)})
+        return Response(result, status=status.HTTP_201_CREATED if result['accepted'] else status.HTTP_200_OK)
+
+
+class WorkedIntervalViewSet(StoreScopedMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Clock-in/clock-out pairs built by the rollup job.
+
+    - List: GET /api/timeclock/intervals/?employee=&week_start=
+    """
+
+    queryset = WorkedInterval.objects.all()
+    serializer_class = WorkedIntervalSerializer
+    store_field = 'employee__store'
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_fields = ['employee', 'week_start']
+    ordering_fields = ['start']
+    ordering = ['employee', 'start']
+
+
+class WeeklyHoursViewSet(StoreScopedMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Hours worked per employee and week, as of the last rollup.
+
+    - List: GET /api/timeclock/hours/?employee=&week_start=
+    """
+
+    queryset = WeeklyHours.objects.all()
+    serializer_class = WeeklyHoursSerializer
+    store_field = 'employee__store'
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_fields = ['employee', 'week_start']
+    ordering_fields = ['week_start', 'hours']
+    ordering = ['-week_start', 'employee']
@@ -0,0 +1,133 @@
+"""
+Employee autocomplete latency and memory.
+
+Builds active employees in a throwaway SQLite database, then reports:
+
+- the index build time and ``nbytes()`` (total and per employee)
+- an incremental refresh after a few employees change
+- ``TypeaheadIndex.search`` for one- to three-letter prefixes and two words,
+  chain-wide and scoped to one store
+- the full ``GET /api/employees/autocomplete/`` request
+
+Usage (from backend/):
+    python benchmarks/autocomplete.py
+    python benchmarks/autocomplete.py --employees 100000 --repeat 200
+"""
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time as clock
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+TMP_DIR = tempfile.mkdtemp()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+os.environ['DATABASE_URL'] = f'sqlite:///{TMP_DIR}/bench.sqlite3'
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from apps.employees import typeahead  # noqa: E402
+from apps.employees.models import Employee  # noqa: E402
+from apps.stores.models import Store  # noqa: E402
+
+FIRST_NAMES = ['James', 'Mary', 'Jose', 'Maria', 'Wei', 'Aisha', 'Juan', 'Jane', 'John', 'Priya', 'Olga', 'Ken']
+LAST_NAMES = ['Smith', 'Garcia', 'Nguyen', 'Johnson', 'Kim', 'Patel', 'Lopez', 'Brown', 'Jones', 'Cruz']
+QUERIES = ['j', 'ma', 'smi', 'jan smi', 'l q', 'employee123']
+STORES = 200
+
+
+def build(count):
+    rng = random.Random(7)
+    stores = Store.objects.bulk_create(Store(name=f'Store #{n}') for n in range(STORES))
+    Employee.objects.bulk_create(
+        (
+            Employee(
+                first_name=f'{rng.choice(FIRST_NAMES)}{"" if i % 3 else rng.randrange(100)}',
+                last_name=f'{rng.choice(LAST_NAMES)}{rng.randrange(1000)}',
+                email=f'employee{i}@example.com',
+                phone_number='555-0100',
+                hourly_rate=Decimal('16.00'),
+                hire_date=date(2020, 1, 1),
+                birth_date=date(1990, 1, 1),
+                store=stores[i % STORES],
+            )
+            for i in range(count)
+        ),
+        batch_size=5000,
+    )
+    # Changed days ago except one, as in a live table, so a refresh only re-reads what the benchmark changes.
+    Employee.objects.update(updated_at=timezone.now() - timedelta(days=2))
+    Employee.objects.filter(pk=Employee.objects.latest('pk').pk).update(updated_at=timezone.now() - timedelta(days=1))
+
+
+def timed(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = clock.perf_counter()
+        func()
+        samples.append((clock.perf_counter() - started) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--employees', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=100)
+    args = parser.parse_args()
+
+    call_command('migrate', verbosity=0)
+    build(args.employees)
+    store_ids = [Store.objects.order_by('pk').values_list('pk', flat=True).first()]
+
+    started = clock.perf_counter()
+    index = typeahead.TypeaheadIndex().build()
+    size = index.nbytes()
+    print(
+        f'{args.employees} employees; index build {(clock.perf_counter() - started) * 1000:.0f}ms, '
+        f'{size / 2 ** 20:.1f} MB ({size / args.employees:.0f} bytes per employee)'
+    )
+
+    changed = random.Random(8).sample(list(index.records), 20)
+    Employee.objects.filter(pk__in=changed).update(last_name='Changed', updated_at=timezone.now())
+    started = clock.perf_counter()
+    index.refresh()
+    print(f'refresh after 20 changes  {(clock.perf_counter() - started) * 1000:6.2f}ms')
+    median, worst = timed(index.refresh, 10)
+    print(f'refresh, nothing changed  median {median:6.2f}ms  max {worst:6.2f}ms')
+
+    for query in QUERIES:
+        median, worst = timed(lambda: index.search(query, 10), args.repeat)
+        print(f'search {query!r:14}     median {median:6.3f}ms  max {worst:6.3f}ms')
+        median, worst = timed(lambda: index.search(query, 10, store_ids), args.repeat)
+        print(f'  one store               median {median:6.3f}ms  max {worst:6.3f}ms')
+
+    settings.THROTTLE_RATES = {**settings.THROTTLE_RATES, 'autocomplete': None}
+    setup_test_environment()
+    client = APIClient()
+    typeahead._index = index
+    for query in QUERIES[:3]:
+        assert client.get('/api/employees/autocomplete/', {'q': query}).status_code == 200
+        median, worst = timed(lambda: client.get('/api/employees/autocomplete/', {'q': query}), args.repeat)
+        print(f'GET /autocomplete/?q={query:5}  median {median:6.2f}ms  max {worst:6.2f}ms')
+
+
+if __name__ == '__main__':
+    try:
+        main()
+    finally:
+        shutil.rmtree(TMP_DIR, ignore_errors=True)
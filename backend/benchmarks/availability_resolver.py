@@ -0,0 +1,123 @@
+"""
+Availability resolver benchmark.
+
+Builds employees with a five-day weekly pattern plus a mix of vacations,
+partial absences and extra shifts in a throwaway SQLite database, then
+times ``resolve_availability`` for a whole month (queries included),
+expanding every employee's calendar, and a "who is free 14:00-18:00"
+lookup.
+
+Usage (from backend/):
+    python benchmarks/availability_resolver.py
+    python benchmarks/availability_resolver.py --employees 2000 --days 31 --repeat 5
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import timeit
+from datetime import date, time, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+TMP_DIR = tempfile.mkdtemp()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+os.environ['DATABASE_URL'] = f'sqlite:///{TMP_DIR}/bench.sqlite3'
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+
+from apps.employees.models import Availability, AvailabilityException, Employee  # noqa: E402
+from apps.employees.resolver import resolve_availability  # noqa: E402
+
+START = date(2026, 11, 1)
+
+
+def build(employees, days):
+    rng = random.Random(42)
+    Employee.objects.bulk_create(
+        Employee(
+            first_name=f'First{i}',
+            last_name=f'Last{i}',
+            email=f'employee{i}@example.com',
+            phone_number='555-0100',
+            hourly_rate=Decimal('15.00'),
+            hire_date=date(2020, 1, 1),
+            birth_date=date(1990, 1, 1),
+        )
+        for i in range(employees)
+    )
+    pks = list(Employee.objects.values_list('pk', flat=True))
+    Availability.objects.bulk_create(
+        Availability(
+            employee_id=pk,
+            day_of_week=(pk + offset) % 7,
+            start_time=time(rng.choice([6, 8, 9, 12])),
+            end_time=time(rng.choice([17, 20, 22])),
+        )
+        for pk in pks
+        for offset in range(5)
+    )
+    exceptions = []
+    for pk in pks:
+        for _ in range(rng.choice([0, 0, 1, 2, 3])):
+            start = START + timedelta(days=rng.randrange(days))
+            length = rng.choice([0, 0, 1, 4, 13])
+            windowed = rng.random() < 0.5
+            exceptions.append(
+                AvailabilityException(
+                    employee_id=pk,
+                    start_date=start,
+                    end_date=start + timedelta(days=length),
+                    start_time=time(12) if windowed else None,
+                    end_time=time(19) if windowed else None,
+                    is_available=rng.random() < 0.3,
+                )
+            )
+    AvailabilityException.objects.bulk_create(exceptions)
+    return len(exceptions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--employees', type=int, default=2000)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (best is kept).')
+    args = parser.parse_args()
+
+    call_command('migrate', verbosity=0)
+    count = build(args.employees, args.days)
+    end = START + timedelta(days=args.days - 1)
+    print(f'{args.employees} employees, {count} exceptions, {START}..{end}')
+
+    def resolve():
+        return resolve_availability(Employee.objects.all(), START, end)
+
+    def expand():
+        calendar = resolve()
+        return [calendar.for_employee(pk) for pk in calendar.employee_ids]
+
+    def who_is_free():
+        day = START + timedelta(days=2)
+        return resolve_availability(Employee.objects.all(), day, day).available(day, time(14), time(18))
+
+    for name, func in [
+        ('resolve month', resolve),
+        ('resolve + expand all', expand),
+        ('free 14:00-18:00 one day', who_is_free),
+    ]:
+        print(f'{name:<26} {min(timeit.repeat(func, number=1, repeat=args.repeat)) * 1000:8.1f}ms')
+
+
+if __name__ == '__main__':
+    try:
+        main()
+    finally:
+        shutil.rmtree(TMP_DIR, ignore_errors=True)
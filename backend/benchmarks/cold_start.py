@@ -0,0 +1,149 @@
+"""
+Cold-start benchmark: time to first response and per-worker RSS.
+
+Each run starts a fresh interpreter that imports ``config.wsgi`` or
+``config.asgi`` under a settings profile, serves one request in-process and
+reports how long that took and how much memory the worker holds. Runs use a
+throwaway SQLite database so nothing touches your local data.
+
+Usage (from backend/):
+    python benchmarks/cold_start.py
+    python benchmarks/cold_start.py --runs 5 --path /api/employees/ --json results.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+PROFILES = ['config.settings', 'config.settings_production']
+SERVERS = ['wsgi', 'asgi']
+
+CHILD = r'''
+import json, os, sys, time
+started = time.perf_counter()
+server, path = sys.argv[1], sys.argv[2]
+
+if server == 'wsgi':
+    from config.wsgi import application
+    loaded = time.perf_counter()
+    from wsgiref.util import setup_testing_defaults
+    environ = {'PATH_INFO': path, 'HTTP_HOST': 'localhost', 'HTTP_ACCEPT': 'application/json'}
+    setup_testing_defaults(environ)
+    status = []
+    body = b''.join(application(environ, lambda s, h, e=None: status.append(s)))
+    code = int(status[0].split()[0])
+else:
+    import asyncio
+    from config.asgi import application
+    loaded = time.perf_counter()
+    messages = []
+    requests = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        # Only disconnect once the response has been sent.
+        while not (messages and messages[-1].get('type') == 'http.response.body'
+                   and not messages[-1].get('more_body')):
+            await asyncio.sleep(0.001)
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+        'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': b'',
+        'headers': [(b'host', b'localhost'), (b'accept', b'application/json')],
+        'server': ('localhost', 80), 'client': ('127.0.0.1', 1234),
+    }
+    asyncio.run(application(scope, receive, send))
+    code = messages[0]['status']
+responded = time.perf_counter()
+
+rss_kb = 0
+try:
+    with open('/proc/self/status') as status_file:
+        for line in status_file:
+            if line.startswith('VmRSS:'):
+                rss_kb = int(line.split()[1])
+except OSError:
+    import resource
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+print(json.dumps({
+    'status': code,
+    'import_s': loaded - started,
+    'first_response_s': responded - started,
+    'rss_mb': rss_kb / 1024,
+}))
+'''
+
+
+def run_once(server, settings_module, path, env):
+    env = dict(env, DJANGO_SETTINGS_MODULE=settings_module)
+    spawned = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, '-c', CHILD, server, path],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    # Includes interpreter start-up, which a fresh worker pays too.
+    result['process_s'] = time.perf_counter() - spawned
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=3, help='Fresh processes per combination.')
+    parser.add_argument('--path', default='/api/skills/', help='URL of the first request.')
+    parser.add_argument('--json', dest='json_path', help='Also write the results to this file.')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(
+            os.environ,
+            DATABASE_URL=f'sqlite:///{tmp}/bench.sqlite3',
+            SECRET_KEY=os.environ.get('SECRET_KEY', 'benchmark-only'),
+            OPENAPI_SCHEMA_PATH=f'{tmp}/openapi-schema.json',
+        )
+        subprocess.run([sys.executable, 'manage.py', 'migrate', '-v', '0'], cwd=BACKEND_DIR, env=env, check=True)
+
+        results = []
+        print(f"{'server':<6} {'profile':<28} {'import':>8} {'first resp':>11} {'process':>9} {'rss MB':>8}")
+        for server in SERVERS:
+            for profile in PROFILES:
+                runs = [run_once(server, profile, args.path, env) for _ in range(args.runs)]
+                summary = {
+                    'server': server,
+                    'profile': profile,
+                    'path': args.path,
+                    'status': runs[-1]['status'],
+                    **{
+                        key: round(statistics.median(run[key] for run in runs), 4)
+                        for key in ('import_s', 'first_response_s', 'process_s', 'rss_mb')
+                    },
+                }
+                results.append(summary)
+                print(
+                    f"{server:<6} {profile:<28} {summary['import_s']:>7.3f}s "
+                    f"{summary['first_response_s']:>10.3f}s {summary['process_s']:>8.3f}s "
+                    f"{summary['rss_mb']:>8.1f}"
+                )
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
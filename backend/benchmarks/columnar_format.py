@@ -0,0 +1,144 @@
+"""
+Payload size and encode/decode time: JSON vs columnar JSON.
+
+Builds 1k and 10k employees, each with two skills and a week of
+availability, in a throwaway SQLite database. For full rosters
+(``EmployeeSerializer``) and availability lists it measures, per format:
+
+- body size, raw and gzipped
+- encode time (serialize + render, as the API does)
+- decode time (parse, and unpack for columnar)
+
+Usage (from backend/):
+    python benchmarks/columnar_format.py
+    python benchmarks/columnar_format.py --sizes 1000 --repeat 10 --json results.json
+"""
+import argparse
+import gzip
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+from datetime import date, time
+from decimal import Decimal
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+TMP_DIR = tempfile.mkdtemp()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+os.environ['DATABASE_URL'] = f'sqlite:///{TMP_DIR}/bench.sqlite3'
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from rest_framework.request import Request  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from apps.core.parsers import ColumnarJSONParser, FastJSONParser  # noqa: E402
+from apps.core.renderers import ColumnarJSONRenderer, FastJSONRenderer  # noqa: E402
+from apps.employees.models import Availability, Employee, Skill  # noqa: E402
+from apps.employees.serializers import AvailabilitySerializer, EmployeeSerializer  # noqa: E402
+
+FORMATS = [
+    ('json', FastJSONRenderer, FastJSONParser),
+    ('columnar', ColumnarJSONRenderer, ColumnarJSONParser),
+]
+
+
+def build_roster(size):
+    Availability.objects.all().delete()
+    Employee.objects.all().delete()
+    skills = list(Skill.objects.all()) or Skill.objects.bulk_create(
+        Skill(name=name, description=f'{name} duties') for name in ['Register', 'Stock', 'Manager', 'Deli']
+    )
+    Employee.objects.bulk_create(
+        Employee(
+            first_name=f'First{i}',
+            last_name=f'Last{i}',
+            email=f'employee{i}@example.com',
+            phone_number='555-0100',
+            hourly_rate=Decimal('15.00') + Decimal(i % 700) / 100,
+            hire_date=date(2020, 1, 1),
+            birth_date=date(1990, 1, 1),
+        )
+        for i in range(size)
+    )
+    pks = list(Employee.objects.values_list('pk', flat=True))
+    through = Employee.skills.through
+    through.objects.bulk_create(
+        through(employee_id=pk, skill_id=skills[(pk + n) % len(skills)].pk) for pk in pks for n in range(2)
+    )
+    Availability.objects.bulk_create(
+        Availability(employee_id=pk, day_of_week=day, start_time=time(9, 0), end_time=time(17, 30))
+        for pk in pks
+        for day in range(7)
+    )
+
+
+def request_for(renderer_class):
+    request = Request(APIRequestFactory().get('/'))
+    request.accepted_renderer = renderer_class()
+    return request
+
+
+def best_of(func, repeat):
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (best is kept).')
+    parser.add_argument('--json', dest='json_path', help='Also write the results to this file.')
+    args = parser.parse_args()
+
+    call_command('migrate', verbosity=0)
+    payloads = {
+        'roster': lambda: (EmployeeSerializer, Employee.objects.prefetch_related('skills', 'availability')),
+        'availability': lambda: (AvailabilitySerializer, Availability.objects.all()),
+    }
+    print(f"{'payload':<20} {'format':<9} {'bytes':>10} {'gzip':>9} {'encode':>9} {'decode':>9}")
+
+    results = []
+    for size in args.sizes:
+        build_roster(size)
+        for name, payload in payloads.items():
+            serializer_class, queryset = payload()
+            rows = list(queryset)
+            for fmt, renderer_class, parser_class in FORMATS:
+                context = {'request': request_for(renderer_class)}
+
+                def encode():
+                    data = serializer_class(rows, many=True, context=context).data
+                    return renderer_class().render(data)
+
+                body = encode()
+                row = {
+                    'payload': f'{name} x{size}',
+                    'format': fmt,
+                    'bytes': len(body),
+                    'gzip_bytes': len(gzip.compress(body)),
+                    'encode_ms': best_of(encode, args.repeat) * 1000,
+                    'decode_ms': best_of(lambda: parser_class().parse(io.BytesIO(body)), args.repeat) * 1000,
+                }
+                results.append(row)
+                print(
+                    f"{row['payload']:<20} {fmt:<9} {row['bytes']:>10} {row['gzip_bytes']:>9} "
+                    f"{row['encode_ms']:>7.1f}ms {row['decode_ms']:>7.1f}ms"
+                )
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    try:
+        main()
+    finally:
+        shutil.rmtree(TMP_DIR, ignore_errors=True)
@@ -0,0 +1,122 @@
+"""
+Demand ingestion throughput.
+
+Writes a synthetic POS export (one row per store per minute, some with a
+skill) for a number of stores and days, then times ``ingest_demand``-style
+aggregation and the database write in a throwaway SQLite database, and
+projects the time for a year of per-minute data. A second run of the same
+file checks that re-ingesting is a no-op.
+
+Usage (from backend/):
+    python benchmarks/demand_ingest.py
+    python benchmarks/demand_ingest.py --stores 100 --days 14 --format ndjson
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time as clock
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+TMP_DIR = tempfile.mkdtemp()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+os.environ['DATABASE_URL'] = f'sqlite:///{TMP_DIR}/bench.sqlite3'
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+
+from apps.demand import ingest  # noqa: E402
+from apps.demand.models import DemandImport, DemandWeek  # noqa: E402
+from apps.employees.models import Skill  # noqa: E402
+from apps.stores.models import Store  # noqa: E402
+
+START = datetime(2026, 1, 5)
+
+
+def write_export(path, stores, days, fmt):
+    rng = random.Random(7)
+    skills = [None, None, None, 'Pharmacy', 'Deli']
+    with open(path, 'w', newline='') as out:
+        if fmt == DemandImport.FORMAT_CSV:
+            out.write('store,timestamp,skill,transactions,sales\n')
+        rows = 0
+        for minute in range(days * 24 * 60):
+            stamp = (START + timedelta(minutes=minute)).isoformat()
+            for store in stores:
+                skill, count = rng.choice(skills), rng.randrange(1, 6)
+                sales = f'{count * rng.uniform(3, 40):.2f}'
+                if fmt == DemandImport.FORMAT_CSV:
+                    out.write(f"{store},{stamp},{skill or ''},{count},{sales}\n")
+                else:
+                    out.write(
+                        json.dumps(
+                            {
+                                'store': store,
+                                'timestamp': stamp,
+                                'skill': skill,
+                                'transactions': count,
+                                'sales': sales,
+                            }
+                        )
+                        + '\n'
+                    )
+                rows += 1
+    return rows
+
+
+def ingest_file(path, fmt):
+    started = clock.perf_counter()
+    with open(path, 'rb') as stream:
+        aggregation = ingest.aggregate(stream, fmt)
+    parsed = clock.perf_counter() - started
+    demand_import, outcome = ingest.apply(aggregation, Path(path).name)
+    return aggregation, outcome, parsed, clock.perf_counter() - started - parsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--stores', type=int, default=100)
+    parser.add_argument('--days', type=int, default=7)
+    parser.add_argument('--format', choices=[DemandImport.FORMAT_CSV, DemandImport.FORMAT_NDJSON], default='csv')
+    args = parser.parse_args()
+
+    call_command('migrate', verbosity=0)
+    Skill.objects.bulk_create(Skill(name=name) for name in ('Pharmacy', 'Deli'))
+    stores = [
+        store.pk
+        for store in Store.objects.bulk_create(
+            Store(name=f'Store #{n}', timezone='America/New_York') for n in range(1, args.stores + 1)
+        )
+    ]
+
+    path = Path(TMP_DIR) / f'pos.{args.format}'
+    rows = write_export(path, stores, args.days, args.format)
+    size = path.stat().st_size / 1e6
+    print(f'{rows} rows ({size:.0f} MB), {args.stores} stores x {args.days} days')
+
+    aggregation, outcome, parsed, written = ingest_file(path, args.format)
+    assert (outcome, aggregation.rows, aggregation.skipped) == ('created', rows, 0), (outcome, aggregation.skipped)
+    total = parsed + written
+    print(f'aggregate {parsed:7.2f}s  ({rows / parsed:,.0f} rows/s, {size / parsed:.1f} MB/s)')
+    print(f'write     {written:7.2f}s  ({DemandWeek.objects.count()} store weeks)')
+    print(f'projected year of {args.stores} stores: {total * 365 / args.days / 60:.1f} min')
+
+    _, outcome, parsed, written = ingest_file(path, args.format)
+    assert outcome == 'unchanged', outcome
+    print(f're-ingest {parsed + written:7.2f}s  ({outcome})')
+
+
+if __name__ == '__main__':
+    try:
+        main()
+    finally:
+        shutil.rmtree(TMP_DIR, ignore_errors=True)
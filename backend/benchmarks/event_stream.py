@@ -0,0 +1,110 @@
+"""
+Cost of idle Server-Sent Events streams.
+
+Opens a number of ``/api/events/`` streams in-process against a throwaway
+SQLite database, measures the CPU the process spends while they sit idle,
+then writes one change and times how long it takes to reach every stream.
+
+Usage (from backend/):
+    python benchmarks/event_stream.py
+    python benchmarks/event_stream.py --streams 10000 --idle 30
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+TMP_DIR = tempfile.mkdtemp()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+os.environ['DATABASE_URL'] = f'sqlite:///{TMP_DIR}/bench.sqlite3'
+
+import django  # noqa: E402
+
+django.setup()
+
+from asgiref.sync import sync_to_async  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+
+from apps.audit.events import get_broadcaster  # noqa: E402
+from apps.audit.models import AuditEntry  # noqa: E402
+from config.asgi import application  # noqa: E402
+
+
+async def run(streams, idle):
+    gone = asyncio.Event()
+    received = [0] * streams
+    arrived = []
+
+    def client(index):
+        requests = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+
+        async def receive():
+            if requests:
+                return requests.pop()
+            await gone.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            if b'data: ' in message.get('body', b''):
+                received[index] += 1
+                arrived.append(time.perf_counter())
+
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': '/api/events/',
+            'raw_path': b'/api/events/',
+            'query_string': b'',
+            'headers': [(b'host', b'localhost')],
+            'server': ('localhost', 80),
+            'client': ('127.0.0.1', 1234),
+        }
+        return application(scope, receive, send)
+
+    started = time.perf_counter()
+    tasks = [asyncio.ensure_future(client(index)) for index in range(streams)]
+    while len(get_broadcaster().subscribers) < streams:
+        await asyncio.sleep(0.05)
+    print(f'{streams} streams open in {time.perf_counter() - started:.2f}s')
+
+    cpu, wall = time.process_time(), time.perf_counter()
+    await asyncio.sleep(idle)
+    cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+    print(f'idle      {cpu:7.3f}s CPU over {wall:.1f}s ({100 * cpu / wall:.2f}% of a core)')
+
+    written = time.perf_counter()
+    await sync_to_async(AuditEntry.objects.create)(
+        entity='skill', entity_id=1, action='update', changes={'name': ['Stock', 'Stocking']}
+    )
+    while sum(received) < streams:
+        await asyncio.sleep(0.001)
+    print(f'fan-out   {arrived[0] - written:7.3f}s to the first stream, {arrived[-1] - written:.3f}s to all')
+
+    gone.set()
+    await asyncio.gather(*tasks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--streams', type=int, default=5000)
+    parser.add_argument('--idle', type=float, default=10, help='Seconds to leave the streams idle.')
+    args = parser.parse_args()
+
+    call_command('migrate', verbosity=0)
+    asyncio.run(run(args.streams, args.idle))
+
+
+if __name__ == '__main__':
+    try:
+        main()
+    finally:
+        shutil.rmtree(TMP_DIR, ignore_errors=True)
@@ -0,0 +1,118 @@
+"""
+JSON renderer/parser benchmark on employee list payloads.
+
+Builds 1k and 10k employees (with skills) in an throwaway SQLite database,
+serializes them with the list and detail serializers, then times DRF's
+``JSONRenderer``/``JSONParser`` against ``FastJSONRenderer``/``FastJSONParser``
+and checks the rendered bytes are identical.
+
+Usage (from backend/):
+    python benchmarks/json_render.py
+    python benchmarks/json_render.py --sizes 1000 10000 --repeat 20 --json results.json
+"""
+import argparse
+import io
+import json
+import shutil
+import os
+import sys
+import tempfile
+import timeit
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+TMP_DIR = tempfile.mkdtemp()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+os.environ['DATABASE_URL'] = f'sqlite:///{TMP_DIR}/bench.sqlite3'
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from apps.core.parsers import FastJSONParser  # noqa: E402
+from apps.core.renderers import FastJSONRenderer, orjson  # noqa: E402
+from apps.employees.models import Employee, Skill  # noqa: E402
+from apps.employees.serializers import EmployeeListSerializer, EmployeeSerializer  # noqa: E402
+
+
+def build_payloads(size):
+    Employee.objects.all().delete()
+    skills = list(Skill.objects.all()) or Skill.objects.bulk_create(
+        Skill(name=name) for name in ['Register', 'Stock', 'Manager', 'Deli', 'Bakery']
+    )
+    Employee.objects.bulk_create(
+        Employee(
+            first_name=f'First{i}',
+            last_name=f'Lâst{i}',
+            email=f'employee{i}@example.com',
+            phone_number='555-0100',
+            hourly_rate=Decimal('15.00') + Decimal(i % 700) / 100,
+            hire_date=date(2020, 1, 1),
+            birth_date=date(1990, 1, 1),
+        )
+        for i in range(size)
+    )
+    through = Employee.skills.through
+    through.objects.bulk_create(
+        through(employee_id=pk, skill_id=skills[pk % len(skills)].pk)
+        for pk in Employee.objects.values_list('pk', flat=True)
+    )
+    employees = Employee.objects.prefetch_related('skills', 'availability')
+    return {
+        'list': {'count': size, 'results': EmployeeListSerializer(employees, many=True).data},
+        'detail': {'count': size, 'results': EmployeeSerializer(employees, many=True).data},
+    }
+
+
+def best_of(func, repeat):
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--repeat', type=int, default=10, help='Runs per measurement (best is kept).')
+    parser.add_argument('--json', dest='json_path', help='Also write the results to this file.')
+    args = parser.parse_args()
+
+    call_command('migrate', verbosity=0)
+    print(f"orjson: {getattr(orjson, '__version__', 'not installed')}")
+    print(f"{'payload':<14} {'bytes':>10} {'render drf':>11} {'render fast':>12} {'parse drf':>10} {'parse fast':>11}")
+
+    results = []
+    for size in args.sizes:
+        for shape, data in build_payloads(size).items():
+            slow = JSONRenderer().render(data)
+            fast = FastJSONRenderer().render(data)
+            assert fast == slow, f'{shape} x{size}: fast renderer output differs'
+
+            row = {
+                'payload': f'{shape} x{size}',
+                'bytes': len(slow),
+                'render_drf_ms': best_of(lambda: JSONRenderer().render(data), args.repeat) * 1000,
+                'render_fast_ms': best_of(lambda: FastJSONRenderer().render(data), args.repeat) * 1000,
+                'parse_drf_ms': best_of(lambda: JSONParser().parse(io.BytesIO(slow)), args.repeat) * 1000,
+                'parse_fast_ms': best_of(lambda: FastJSONParser().parse(io.BytesIO(slow)), args.repeat) * 1000,
+            }
+            results.append(row)
+            print(
+                f"{row['payload']:<14} {row['bytes']:>10} {row['render_drf_ms']:>9.1f}ms "
+                f"{row['render_fast_ms']:>10.1f}ms {row['parse_drf_ms']:>8.1f}ms {row['parse_fast_ms']:>9.1f}ms"
+            )
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    try:
+        main()
+    finally:
+        shutil.rmtree(TMP_DIR, ignore_errors=True)
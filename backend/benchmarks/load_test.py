@@ -0,0 +1,505 @@
+"""
+Load test: concurrent API clients replaying a traffic mix.
+
+Starts the API locally on a throwaway SQLite database seeded with a roster
+(or targets a running server with ``--url``). Then ``--clients`` asyncio
+clients, each with its own keep-alive connection and client address,
+replay a weighted mix of requests for ``--duration`` seconds:
+
+    roster              GET   /api/employees/?page=<n>
+    search              GET   /api/employees/?search=<name>
+    skills              GET   /api/skills/
+    availability_read   GET   /api/availability/?employee=<id>
+    availability_write  PATCH /api/availability/<id>/
+    employee_patch      PATCH /api/employees/<id>/
+
+For each scenario and in total it reports throughput, p50/p95/p99 latency
+and the error rate. Errors are responses with status >= 400 and connection
+failures; statuses are counted individually, so throttling (429) and load
+shedding (503) show up as such. ``--json`` writes the results, and
+``--compare`` prints the change against an earlier results file.
+
+Against a loopback server each client connects from its own 127.x.y.z
+address, so the per-client throttle treats them as separate store managers.
+Against a remote ``--url`` they all share this host's address; exempt it
+with ``THROTTLE_CLIENT_RATES`` there or expect 429s. The clients all run in
+this one process; if it saturates a core, lower ``--clients`` or raise
+``--think-ms``.
+
+Usage (from backend/):
+    python benchmarks/load_test.py
+    python benchmarks/load_test.py --clients 300 --duration 60 --think-ms 500 --json after.json
+    python benchmarks/load_test.py --mix roster=5,search=3,employee_patch=2 --compare before.json
+    python benchmarks/load_test.py --url http://127.0.0.1:8000
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import date, datetime, time as dt_time, timezone
+from decimal import Decimal
+from pathlib import Path
+from urllib.parse import urlsplit
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+DEFAULT_MIX = {
+    'roster': 30,
+    'search': 25,
+    'skills': 10,
+    'availability_read': 20,
+    'availability_write': 5,
+    'employee_patch': 10,
+}
+PERCENTILES = (50, 95, 99)
+
+
+class ProtocolError(Exception):
+    pass
+
+
+def roster(rng, ids):
+    return 'GET', f'/api/employees/?page={rng.randint(1, ids["pages"])}', None
+
+
+def search(rng, ids):
+    return 'GET', f'/api/employees/?search=Last{rng.randrange(ids["employee_count"])}', None
+
+
+def skills(rng, ids):
+    return 'GET', '/api/skills/', None
+
+
+def availability_read(rng, ids):
+    return 'GET', f'/api/availability/?employee={rng.choice(ids["employees"])}', None
+
+
+def availability_write(rng, ids):
+    end = f'{rng.randint(16, 21)}:{rng.choice(["00", "30"])}'
+    return 'PATCH', f'/api/availability/{rng.choice(ids["availability"])}/', {'end_time': end}
+
+
+def employee_patch(rng, ids):
+    return (
+        'PATCH',
+        f'/api/employees/{rng.choice(ids["employees"])}/',
+        {'phone_number': f'555-{rng.randrange(10000):04d}'},
+    )
+
+
+SCENARIOS = {
+    'roster': roster,
+    'search': search,
+    'skills': skills,
+    'availability_read': availability_read,
+    'availability_write': availability_write,
+    'employee_patch': employee_patch,
+}
+
+
+def parse_mix(value):
+    """``'roster=3,search=1'`` -> ``{'roster': 3, 'search': 1}``."""
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f'unknown scenario {name!r} (choose from {", ".join(SCENARIOS)})')
+        try:
+            mix[name] = float(weight or 1)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f'invalid weight for {name!r}: {weight!r}') from None
+    return mix
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection."""
+
+    def __init__(self, host, port, headers, timeout, source=None):
+        self.host, self.port = host, port
+        self.headers = headers
+        self.local_addr = None if source is None else (source, 0)
+        self.timeout = timeout
+        self.reader = self.writer = None
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+    async def request(self, method, path, body=None):
+        """Send one request and read the whole response; returns the status code."""
+        return await asyncio.wait_for(self._request(method, path, body), self.timeout)
+
+    async def _request(self, method, path, body):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port, local_addr=self.local_addr)
+        payload = b'' if body is None else json.dumps(body).encode()
+        head = [f'{method} {path} HTTP/1.1', f'Host: {self.host}:{self.port}', *self.headers]
+        if body is not None:
+            head += ['Content-Type: application/json', f'Content-Length: {len(payload)}']
+        self.writer.write(('\r\n'.join(head) + '\r\n\r\n').encode() + payload)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ProtocolError('connection closed')
+        status = int(status_line.split()[1])
+        length, chunked, close = None, False, False
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            name, value = name.strip().lower(), value.strip().lower()
+            if name == 'content-length':
+                length = int(value)
+            elif name == 'transfer-encoding':
+                chunked = 'chunked' in value
+            elif name == 'connection':
+                close = value == 'close'
+        if chunked:
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        elif length is not None:
+            await self.reader.readexactly(length)
+        else:
+            await self.reader.read()
+            close = True
+        if close or status_line.startswith(b'HTTP/1.0'):
+            await self.close()
+        return status
+
+
+class Stats:
+    """Latencies and statuses for one scenario."""
+
+    def __init__(self):
+        self.latencies = []
+        self.statuses = Counter()
+
+    def record(self, seconds, status):
+        self.latencies.append(seconds * 1000)
+        self.statuses[status] += 1
+
+    def merge(self, other):
+        self.latencies += other.latencies
+        self.statuses.update(other.statuses)
+
+    def summary(self, elapsed):
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+        errors = sum(n for status, n in self.statuses.items() if status == 'error' or int(status) >= 400)
+        result = {
+            'requests': count,
+            'throughput_rps': round(count / elapsed, 2) if elapsed else 0.0,
+            'errors': errors,
+            'error_rate': round(errors / count, 4) if count else 0.0,
+            'statuses': {str(status): n for status, n in sorted(self.statuses.items(), key=str)},
+        }
+        for p in PERCENTILES:
+            result[f'p{p}_ms'] = round(latencies[max(0, -(-count * p // 100) - 1)], 2) if count else None
+        result['max_ms'] = round(latencies[-1], 2) if count else None
+        return result
+
+
+def source_address(number, host):
+    """A loopback address of the client's own for a loopback ``host``, else ``None``."""
+    if not host.startswith('127.'):
+        return None
+    return f'127.{1 + number // 65536 % 255}.{number // 256 % 256}.{number % 256}'
+
+
+async def client(number, args, ids, mix, stats, started, deadline):
+    rng = random.Random(args.seed * 100003 + number)
+    headers = ['Accept: application/json', 'User-Agent: retailsync-load-test']
+    connection = Connection(args.host, args.port, headers, args.timeout, source_address(number, args.host))
+    names, weights = list(mix), list(mix.values())
+    # Spread the clients' first requests over the ramp-up.
+    await asyncio.sleep(args.ramp_up * number / max(args.clients, 1))
+    try:
+        while time.monotonic() < deadline:
+            name = rng.choices(names, weights)[0]
+            method, path, body = SCENARIOS[name](rng, ids)
+            sent = time.monotonic()
+            try:
+                status = await connection.request(method, path, body)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ProtocolError, ValueError):
+                status = 'error'
+                await connection.close()
+            done = time.monotonic()
+            if sent >= started + args.warmup:
+                stats[name].record(done - sent, status)
+            if args.think_ms:
+                await asyncio.sleep(rng.expovariate(1000 / args.think_ms))
+    finally:
+        await connection.close()
+
+
+async def run(args, ids, mix):
+    stats = {name: Stats() for name in mix}
+    started = time.monotonic()
+    deadline = started + args.warmup + args.duration
+    await asyncio.gather(*(client(number, args, ids, mix, stats, started, deadline) for number in range(args.clients)))
+    return stats, min(args.duration, time.monotonic() - started - args.warmup)
+
+
+async def fetch_json(host, port, path):
+    """GET ``path`` on a fresh connection and decode the JSON body."""
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(
+        f'GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\nAccept: application/json\r\n'
+        f'Connection: close\r\n\r\n'.encode()
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b'\r\n\r\n')
+    status = int(head.split()[1])
+    if status != 200:
+        raise RuntimeError(f'GET {path} returned {status}')
+    if b'transfer-encoding: chunked' in head.lower():
+        raise RuntimeError(f'GET {path} came back chunked; only Content-Length bodies are supported here')
+    return json.loads(body)
+
+
+async def sample_ids(host, port, path, pages=10):
+    """Ids from up to ``pages`` pages spread over a list endpoint, plus its count and page count."""
+    first = await fetch_json(host, port, path)
+    total_pages = max(1, -(-first['count'] // max(len(first['results']), 1)))
+    ids = [row['id'] for row in first['results']]
+    step = max(1, total_pages // pages)
+    for page in range(1 + step, total_pages + 1, step):
+        ids += [row['id'] for row in (await fetch_json(host, port, f'{path}?page={page}'))['results']]
+    return ids, first['count'], total_pages
+
+
+async def discover(host, port):
+    """Ids the scenarios pick from, read through the API."""
+    employees, employee_count, pages = await sample_ids(host, port, '/api/employees/')
+    availability, _, _ = await sample_ids(host, port, '/api/availability/')
+    if not employees or not availability:
+        raise RuntimeError('The target needs employees with availability to run the mix.')
+    return {
+        'employees': employees,
+        'employee_count': employee_count,
+        'pages': pages,
+        'availability': availability,
+    }
+
+
+def seed(count):
+    """Migrate and fill the throwaway database (runs in this process)."""
+    sys.path.insert(0, str(BACKEND_DIR))
+    import django
+
+    django.setup()
+    from django.core.management import call_command
+    from apps.employees import skillmask
+    from apps.employees.models import Availability, Employee, Skill
+
+    call_command('migrate', verbosity=0)
+    catalog = Skill.objects.bulk_create(
+        Skill(name=name, description=f'{name} duties')
+        for name in ['Register', 'Stock', 'Manager', 'Deli', 'Bakery', 'Forklift']
+    )
+    held = {i: [catalog[i % 6].pk, catalog[(i + 1) % 6].pk] for i in range(count)}
+    Employee.objects.bulk_create(
+        (
+            Employee(
+                first_name=f'First{i}',
+                last_name=f'Last{i}',
+                email=f'employee{i}@example.com',
+                phone_number='555-0100',
+                hourly_rate=Decimal('15.00') + Decimal(i % 700) / 100,
+                hire_date=date(2020, 1, 1),
+                birth_date=date(1990, 1, 1),
+                **skillmask.compute_masks(held[i]),
+            )
+            for i in range(count)
+        ),
+        batch_size=2000,
+    )
+    pks = list(Employee.objects.order_by('pk').values_list('pk', flat=True))
+    through = Employee.skills.through
+    through.objects.bulk_create(
+        (through(employee_id=pk, skill_id=skill_id) for i, pk in enumerate(pks) for skill_id in held[i]),
+        batch_size=5000,
+    )
+    Availability.objects.bulk_create(
+        (
+            Availability(employee_id=pk, day_of_week=day, start_time=dt_time(9, 0), end_time=dt_time(17, 0))
+            for pk in pks
+            for day in range(7)
+        ),
+        batch_size=5000,
+    )
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(args, env, log_path):
+    """Start the server with its stderr in ``log_path``; a pipe nobody reads would fill up and stall it."""
+    command = args.server_cmd.format(python=sys.executable, host=args.host, port=args.port).split()
+    with open(log_path, 'w') as log:
+        process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=log)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'Server exited with {process.returncode}:\n{Path(log_path).read_text()}')
+        try:
+            with socket.create_connection((args.host, args.port), timeout=0.5):
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError('Server did not start listening within 60s')
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_table(endpoints, total):
+    print(f"{'scenario':<20} {'reqs':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for name, row in [*endpoints.items(), ('total', total)]:
+        if not row['requests']:
+            print(f'{name:<20} {0:>7}')
+            continue
+        print(
+            f"{name:<20} {row['requests']:>7} {row['throughput_rps']:>8.1f} {row['p50_ms']:>8.1f} "
+            f"{row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['error_rate']:>7.1%}"
+        )
+
+
+def print_comparison(results, path):
+    """Changes in throughput, p95 and error rate against an earlier run."""
+    previous = json.loads(Path(path).read_text())
+    print(f"\nvs {path} ({previous['meta'].get('git_revision') or 'unknown revision'})")
+    print(f"{'scenario':<20} {'req/s':^18} {'p95 ms':^26} {'errors':^16}")
+    rows = [*results['endpoints'].items(), ('total', results['total'])]
+    for name, row in rows:
+        before = previous['total'] if name == 'total' else previous['endpoints'].get(name)
+        if not before or not before['requests'] or not row['requests']:
+            continue
+        change = (row['p95_ms'] - before['p95_ms']) / before['p95_ms'] if before['p95_ms'] else 0.0
+        print(
+            f"{name:<20} {before['throughput_rps']:>7.1f} -> {row['throughput_rps']:<7.1f} "
+            f"{before['p95_ms']:>7.1f} -> {row['p95_ms']:<7.1f} {change:>+6.0%} "
+            f"{before['error_rate']:>6.1%} -> {row['error_rate']:<6.1%}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--url', help='Target a running server instead of starting one.')
+    parser.add_argument('--clients', type=int, default=50, help='Concurrent clients (one connection each).')
+    parser.add_argument('--duration', type=float, default=20, help='Measured seconds.')
+    parser.add_argument('--warmup', type=float, default=3, help='Seconds of traffic before measuring.')
+    parser.add_argument('--ramp-up', type=float, default=2, help='Seconds over which clients start.')
+    parser.add_argument('--think-ms', type=float, default=0, help='Mean pause between a client\'s requests.')
+    parser.add_argument('--timeout', type=float, default=10, help='Per-request timeout in seconds.')
+    parser.add_argument(
+        '--mix', type=parse_mix, default=DEFAULT_MIX, help='Scenario weights, e.g. roster=3,search=2,employee_patch=1.'
+    )
+    parser.add_argument('--employees', type=int, default=2000, help='Employees to seed (local server only).')
+    parser.add_argument(
+        '--settings', default='config.settings_production', help='DJANGO_SETTINGS_MODULE for the local server.'
+    )
+    parser.add_argument(
+        '--server-cmd',
+        default='{python} manage.py runserver {host}:{port} --noreload',
+        help='Command starting the local server ({python}, {host}, {port} are filled in).',
+    )
+    parser.add_argument('--seed', type=int, default=1, help='Random seed for the traffic.')
+    parser.add_argument('--json', dest='json_path', help='Write the results to this file.')
+    parser.add_argument('--compare', help='Earlier results file to compare against.')
+    args = parser.parse_args()
+
+    tmp = server = None
+    if args.url:
+        target = urlsplit(args.url)
+        args.host, args.port = target.hostname, target.port or 80
+    else:
+        tmp = tempfile.mkdtemp()
+        args.host, args.port = '127.0.0.1', free_port()
+        env = dict(
+            os.environ,
+            DJANGO_SETTINGS_MODULE=args.settings,
+            DATABASE_URL=f'sqlite:///{tmp}/load.sqlite3',
+            SECRET_KEY=os.environ.get('SECRET_KEY', 'load-test-only'),
+            OPENAPI_SCHEMA_PATH=f'{tmp}/openapi-schema.json',
+            THROTTLE_STORE_PATH=f'{tmp}/throttle.sqlite3',
+            SHARED_CACHE_DIR=f'{tmp}/cache',
+        )
+        os.environ.update(env)
+        seed(args.employees)
+        server = start_server(args, env, f'{tmp}/server.log')
+
+    try:
+        ids = asyncio.run(discover(args.host, args.port))
+        print(
+            f'{args.clients} clients, {args.duration:g}s against {args.host}:{args.port} '
+            f'({ids["employee_count"]} employees)'
+        )
+        stats, elapsed = asyncio.run(run(args, ids, args.mix))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+        if tmp is not None:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    total = Stats()
+    for scenario in stats.values():
+        total.merge(scenario)
+    results = {
+        'meta': {
+            'started_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'git_revision': git_revision(),
+            'target': args.url or f'local ({args.settings}): {args.server_cmd}',
+            'python': platform.python_version(),
+            'clients': args.clients,
+            'duration_s': round(elapsed, 2),
+            'warmup_s': args.warmup,
+            'think_ms': args.think_ms,
+            'mix': args.mix,
+            'employees': ids['employee_count'],
+        },
+        'endpoints': {name: scenario.summary(elapsed) for name, scenario in stats.items()},
+        'total': total.summary(elapsed),
+    }
+    print_table(results['endpoints'], results['total'])
+    if args.compare:
+        print_comparison(results, args.compare)
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
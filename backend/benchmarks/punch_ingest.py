@@ -0,0 +1,129 @@
+"""
+Timeclock punch ingestion throughput.
+
+Simulates shift changes for a number of employees in a throwaway SQLite
+database: every employee clocks in and out once a day. Batches are posted
+to ``POST /api/timeclock/punches/`` in-process and timed, each batch is
+then resent to time the deduplication path, and the rollup that pairs the
+punches into weekly hours is timed last.
+
+Usage (from backend/):
+    python benchmarks/punch_ingest.py
+    python benchmarks/punch_ingest.py --employees 5000 --days 7 --batch 1000
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time as clock
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+TMP_DIR = tempfile.mkdtemp()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+os.environ['DATABASE_URL'] = f'sqlite:///{TMP_DIR}/bench.sqlite3'
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from apps.employees.models import Employee  # noqa: E402
+from apps.stores.models import Store  # noqa: E402
+from apps.timeclock import rollup  # noqa: E402
+from apps.timeclock.models import WeeklyHours  # noqa: E402
+
+NY = ZoneInfo('America/New_York')
+MONDAY = datetime(2026, 2, 9, tzinfo=NY)
+
+
+def build(count):
+    stores = Store.objects.bulk_create(Store(name=f'Store #{n}') for n in range(1, 21))
+    Employee.objects.bulk_create(
+        (
+            Employee(
+                first_name=f'First{i}',
+                last_name=f'Last{i}',
+                email=f'employee{i}@example.com',
+                phone_number='555-0100',
+                hourly_rate=Decimal('18.00'),
+                hire_date=date(2020, 1, 1),
+                birth_date=date(1990, 5, 1),
+                store=stores[i % len(stores)],
+            )
+            for i in range(count)
+        ),
+        batch_size=2000,
+    )
+    return list(Employee.objects.values_list('pk', flat=True))
+
+
+def punches(employee_ids, days):
+    """Punches in arrival order: each day's clock-ins, then its clock-outs."""
+    rng = random.Random(7)
+    for day in range(days):
+        start = MONDAY + timedelta(days=day, hours=8)
+        for kind, offset in (('in', 0), ('out', 8)):
+            for pk in employee_ids:
+                ts = start + timedelta(hours=offset, seconds=rng.randrange(-600, 600))
+                yield {'employee': pk, 'kind': kind, 'ts': ts.isoformat(), 'key': f'{pk}-{day}-{kind}'}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--employees', type=int, default=2000)
+    parser.add_argument('--days', type=int, default=7)
+    parser.add_argument('--batch', type=int, default=500)
+    args = parser.parse_args()
+
+    call_command('migrate', verbosity=0)
+    employee_ids = build(args.employees)
+    records = list(punches(employee_ids, args.days))
+    batches = [records[i : i + args.batch] for i in range(0, len(records), args.batch)]
+
+    settings.REST_FRAMEWORK = {**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_CLASSES': []}
+    setup_test_environment()
+    client = APIClient()
+
+    def send(batch):
+        response = client.post('/api/timeclock/punches/', {'device': 'kiosk', 'punches': batch}, format='json')
+        assert response.status_code in (200, 201), response.data
+        return response.data
+
+    started = clock.perf_counter()
+    accepted = sum(send(batch)['accepted'] for batch in batches)
+    elapsed = clock.perf_counter() - started
+    assert accepted == len(records), accepted
+    print(f'{len(records)} punches in {len(batches)} batches of {args.batch}')
+    print(f'ingest    {elapsed:7.2f}s  ({len(records) / elapsed:,.0f} punches/s)')
+
+    started = clock.perf_counter()
+    duplicates = sum(send(batch)['duplicates'] for batch in batches)
+    elapsed = clock.perf_counter() - started
+    assert duplicates == len(records), duplicates
+    print(f'resend    {elapsed:7.2f}s  ({len(records) / elapsed:,.0f} punches/s, all duplicates)')
+
+    started = clock.perf_counter()
+    processed = rollup.rollup()
+    elapsed = clock.perf_counter() - started
+    print(
+        f'rollup    {elapsed:7.2f}s  ({processed / elapsed:,.0f} punches/s, '
+        f'{WeeklyHours.objects.count()} employee weeks)'
+    )
+
+
+if __name__ == '__main__':
+    try:
+        main()
+    finally:
+        shutil.rmtree(TMP_DIR, ignore_errors=True)
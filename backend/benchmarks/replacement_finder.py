@@ -0,0 +1,132 @@
+"""
+Replacement finder latency.
+
+Builds active employees with skills, a five-day weekly pattern and a few
+exceptions in a throwaway SQLite database, then times:
+
+- the index build (first query after a change)
+- ``find_replacements`` with a warm index (the day's exceptions included;
+  the index refreshes at most every ``REPLACEMENT_REFRESH_SECONDS``)
+- the full ``GET /api/employees/replacements/`` request
+
+Usage (from backend/):
+    python benchmarks/replacement_finder.py
+    python benchmarks/replacement_finder.py --employees 10000 --repeat 50
+"""
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time as clock
+from datetime import date, time, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+TMP_DIR = tempfile.mkdtemp()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+os.environ['DATABASE_URL'] = f'sqlite:///{TMP_DIR}/bench.sqlite3'
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from apps.employees import replacements, skillmask  # noqa: E402
+from apps.employees.models import Availability, AvailabilityException, Employee, Skill  # noqa: E402
+
+DAY = date(2026, 11, 2)
+
+
+def build(count):
+    rng = random.Random(7)
+    skills = Skill.objects.bulk_create(Skill(name=f'Skill {n}') for n in range(12))
+    employees = []
+    for i in range(count):
+        held = rng.sample([s.pk for s in skills], 3)
+        employees.append(
+            Employee(
+                first_name=f'First{i}',
+                last_name=f'Last{i}',
+                email=f'employee{i}@example.com',
+                phone_number='555-0100',
+                hourly_rate=Decimal(rng.randrange(1500, 3000)) / 100,
+                hire_date=date(2020, 1, 1),
+                birth_date=date(rng.choice([1980, 1995, 2009, 2010]), 5, 1),
+                **skillmask.compute_masks(held),
+            )
+        )
+    Employee.objects.bulk_create(employees, batch_size=2000)
+    pks = list(Employee.objects.values_list('pk', flat=True))
+    Availability.objects.bulk_create(
+        (
+            Availability(
+                employee_id=pk,
+                day_of_week=(pk + offset) % 7,
+                start_time=time(rng.choice([6, 8, 9, 12])),
+                end_time=time(rng.choice([17, 20, 22])),
+            )
+            for pk in pks
+            for offset in range(5)
+        ),
+        batch_size=5000,
+    )
+    AvailabilityException.objects.bulk_create(
+        AvailabilityException(employee_id=pk, start_date=DAY - timedelta(days=2), end_date=DAY + timedelta(days=5))
+        for pk in rng.sample(pks, count // 20)
+    )
+    return skills
+
+
+def timed(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = clock.perf_counter()
+        func()
+        samples.append((clock.perf_counter() - started) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--employees', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+
+    call_command('migrate', verbosity=0)
+    skills = build(args.employees)
+    skill_ids = [skills[0].pk]
+
+    started = clock.perf_counter()
+    replacements.get_index()
+    print(f'{args.employees} employees; index build {(clock.perf_counter() - started) * 1000:.1f}ms')
+
+    def query():
+        return replacements.find_replacements(DAY, time(13), time(17), skill_ids=skill_ids, limit=args.limit)
+
+    count, top = query()
+    print(f'{count} eligible, returning top {len(top)}')
+    median, worst = timed(query, args.repeat)
+    print(f'find_replacements         median {median:6.2f}ms  max {worst:6.2f}ms')
+
+    setup_test_environment()
+    client = APIClient()
+    params = {'day': DAY, 'start': '13:00', 'end': '17:00', 'skills': skill_ids[0], 'limit': args.limit}
+    assert client.get('/api/employees/replacements/', params).status_code == 200
+    median, worst = timed(lambda: client.get('/api/employees/replacements/', params), args.repeat)
+    print(f'GET /replacements/        median {median:6.2f}ms  max {worst:6.2f}ms')
+
+
+if __name__ == '__main__':
+    try:
+        main()
+    finally:
+        shutil.rmtree(TMP_DIR, ignore_errors=True)
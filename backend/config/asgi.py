@@ -2,6 +2,8 @@
 ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+``/api/events/`` (a Server-Sent Events stream, see apps/audit/sse.py) is
+served here directly; everything else goes to Django.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
@@ -13,4 +15,20 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from django.conf import settings  # noqa: E402
+
+from apps.audit.sse import EVENTS_PATH, stream  # noqa: E402
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'http' and scope['path'] == EVENTS_PATH:
+        return await stream(scope, receive, send)
+    return await django_application(scope, receive, send)
+
+
+if settings.WARMUP_ON_STARTUP:
+    from apps.core.warmup import warm_up
+
+    warm_up()
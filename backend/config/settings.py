@@ -10,17 +10,14 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
+import tempfile
 from pathlib import Path
-import sys
 from decouple import config, Csv
 import dj_database_url
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-# Add apps directory to Python path
-sys.path.insert(0, str(BASE_DIR / 'apps'))
-
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.0/howto/deployment/checklist/
@@ -51,16 +48,27 @@ INSTALLED_APPS = [
     'drf_spectacular',
     
     # Local apps
+    'apps.core',
+    'apps.stores',
     'apps.employees',
+    'apps.audit',
+    'apps.jobs',
+    'apps.demand',
+    'apps.scheduling',
+    'apps.timeclock',
+    'apps.archive',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'apps.core.loadshed.LoadMonitorMiddleware',
     'corsheaders.middleware.CorsMiddleware',  # Should be as high as possible
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.core.profiling.ProfilingMiddleware',
+    'apps.audit.context.AuditContextMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -90,10 +98,7 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': dj_database_url.config(default=f'sqlite:///{BASE_DIR / "db.sqlite3"}')
 }
 
 
@@ -143,6 +148,24 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',  # Change in production
     ],
+    # orjson-backed, byte-compatible with DRF's JSON renderer/parser (apps/core/renderers.py)
+    'DEFAULT_RENDERER_CLASSES': [
+        'apps.core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'apps.core.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    # Token buckets shared by all workers, then load shedding (see THROTTLE_* / LOAD_SHED_*)
+    'DEFAULT_THROTTLE_CLASSES': [
+        'apps.core.loadshed.LoadShedThrottle',
+        'apps.core.throttling.TokenBucketThrottle',
+    ],
+    # Reverse proxies in front of the app. Anonymous clients are throttled by REMOTE_ADDR unless this
+    # is set, in which case the address the outermost trusted proxy saw in X-Forwarded-For is used
+    'NUM_PROXIES': config('NUM_PROXIES', default=0, cast=int),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 100,
     'DEFAULT_FILTER_BACKENDS': [
@@ -169,3 +192,126 @@ SPECTACULAR_SETTINGS = {
     'VERSION': '1.0.0',
     'SERVE_INCLUDE_SCHEMA': False,
 }
+
+# Precomputed schema served by /api/schema/ (build with `manage.py build_openapi_schema`)
+OPENAPI_SCHEMA_PATH = config('OPENAPI_SCHEMA_PATH', default=str(BASE_DIR / 'openapi-schema.json'))
+OPENAPI_SCHEMA_MAX_AGE = config('OPENAPI_SCHEMA_MAX_AGE', default=86400, cast=int)
+
+# Delta sync (/api/sync/)
+SYNC_PAGE_SIZE = config('SYNC_PAGE_SIZE', default=500, cast=int)
+SYNC_MAX_PAGE_SIZE = 1000
+# Hold back rows this fresh so a cursor never skips a slow, late-committing write
+SYNC_SETTLE_SECONDS = config('SYNC_SETTLE_SECONDS', default=2, cast=int)
+
+# Availability calendar (/api/employees/availability-calendar/): longest range per request
+AVAILABILITY_CALENDAR_MAX_DAYS = 62
+# Replacement finder: dotted path to (employee_ids, week_start, week_end) -> {id: hours}
+# used by the "hours" score (default: timeclock hours, apps/timeclock/rollup.py); None counts 0 hours
+REPLACEMENT_HOURS_SOURCE = 'apps.timeclock.rollup.weekly_hours'
+# Each worker's replacement index (apps/employees/replacements.py) checks for changes at most this
+# often, re-reading rows updated up to REPLACEMENT_SETTLE_SECONDS before the newest one it has seen
+REPLACEMENT_REFRESH_SECONDS = 1.0
+REPLACEMENT_SETTLE_SECONDS = 2
+
+# Caches. "shared" holds small values every worker must agree on (e.g. the skill catalog
+# version); point it at memcached/redis when workers run on more than one host
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': config('SHARED_CACHE_DIR', default=str(Path(tempfile.gettempdir()) / 'retailsync-cache')),
+    },
+}
+# Process-local skill catalog (apps/employees/skillcatalog.py), versioned through this cache
+SKILL_CATALOG_CACHE = 'shared'
+
+# API throttling (apps/core/throttling.py): token buckets in a SQLite file shared by every
+# worker on the host. Rates are "<tokens>/<s|min|h|day>" plus an optional " burst <n>"; None disables
+THROTTLE_STORE_PATH = config(
+    'THROTTLE_STORE_PATH', default=str(Path(tempfile.gettempdir()) / 'retailsync-throttle.sqlite3')
+)
+THROTTLE_RATES = {
+    'default': '100/s burst 300',
+    'employee-search': '20/s burst 100',
+    'availability': '10/s burst 50',
+    'sync': '10/s burst 50',
+    'timeclock': '50/s burst 200',  # punch batches
+    'batch': '5/s burst 20',  # POST /api/batch/; each request in it also counts against its own scope
+    'autocomplete': '50/s burst 200',  # GET /api/employees/autocomplete/, one request per keystroke
+}
+# Per-client overrides keyed by "user:<username>" or "ip:<address>",
+# e.g. {'ip:10.0.4.21': {'employee-search': '1/s burst 5'}}
+THROTTLE_CLIENT_RATES = {}
+
+# Load shedding (apps/core/loadshed.py): 503 + Retry-After for these scopes while a worker's
+# p95 latency or number of in-flight requests (≈ database connections in use) is too high
+LOAD_SHED_SCOPES = ['employee-search', 'availability', 'sync']
+LOAD_SHED_P95_MS = config('LOAD_SHED_P95_MS', default=2000, cast=int)
+LOAD_SHED_MAX_IN_FLIGHT = config('LOAD_SHED_MAX_IN_FLIGHT', default=0, cast=int)  # 0: no limit
+LOAD_SHED_WINDOW_SECONDS = 30
+LOAD_SHED_MIN_SAMPLES = 20
+LOAD_SHED_RETRY_AFTER = 5  # seconds
+
+# On-demand request profiling (apps/core/profiling.py): requests with a signed X-Profile token
+# (POST /api/profiles/token/) or in the random sample are profiled and stored here
+PROFILE_DIR = config('PROFILE_DIR', default=str(Path(tempfile.gettempdir()) / 'retailsync-profiles'))
+PROFILE_SAMPLE_RATE = config('PROFILE_SAMPLE_RATE', default=0.0, cast=float)  # e.g. 0.001
+PROFILE_TOKEN_MAX_AGE = 3600  # seconds
+PROFILE_MAX_FILES = 200
+PROFILE_MAX_AGE_DAYS = 7
+
+# Audit trail (write-behind, see apps/audit/buffer.py)
+AUDIT_FLUSH_MODE = config('AUDIT_FLUSH_MODE', default='background')  # or 'commit'
+AUDIT_QUEUE_SIZE = 10000
+AUDIT_BATCH_SIZE = 500
+AUDIT_FLUSH_INTERVAL = 1.0  # seconds
+
+# Background jobs (python manage.py run_workers)
+JOB_WORKER_PROCESSES = config('JOB_WORKER_PROCESSES', default=2, cast=int)
+JOB_MAX_ATTEMPTS = 3
+JOB_RETRY_BASE_SECONDS = 5  # doubled after each failed attempt
+JOB_RETRY_MAX_SECONDS = 600
+JOB_HEARTBEAT_SECONDS = 30  # how often a worker bumps a running job's heartbeat_at
+JOB_LOCK_TIMEOUT_SECONDS = 300  # running jobs without a heartbeat for this long are requeued
+
+# Fair Workweek predictability pay (apps/scheduling/predictability.py): flat premium per changed
+# shift by notice window (window, notice under N hours, premium); removals inside the cancellation
+# window pay at least its premium, and reductions/removals also pay lost hours at this rate x hourly rate
+FAIR_WORKWEEK_NOTICE_PREMIUMS = [('24h', 24, '45.00'), ('7d', 7 * 24, '15.00'), ('14d', 14 * 24, '10.00')]
+FAIR_WORKWEEK_CANCELLATION = (72, '75.00')
+FAIR_WORKWEEK_LOST_HOURS_RATE = '0.5'
+
+# Timeclock punches (apps/timeclock): largest batch per request, and the rollup job that pairs
+# punches into worked intervals (queued this many seconds after a batch, so bursts coalesce)
+TIMECLOCK_MAX_BATCH = 5000
+TIMECLOCK_ROLLUP_DELAY = 5
+TIMECLOCK_ROLLUP_BATCH = 20000
+TIMECLOCK_MAX_SHIFT_HOURS = 16  # longer clock-in/clock-out pairs are not counted
+
+# Server-Sent Events stream of roster changes at /api/events/ (ASGI only, see apps/audit/events.py).
+# Each process reads the audit log this often while clients are connected.
+EVENTS_POLL_INTERVAL = 0.5  # seconds
+EVENTS_SETTLE_SECONDS = 2  # how long a gap in audit entry ids may wait for its transaction to commit
+EVENTS_KEEPALIVE_SECONDS = 15
+EVENTS_REPLAY_LIMIT = 1000  # a client that missed more events on reconnect is told to reset
+EVENTS_QUEUE_SIZE = 1000  # unsent events per client before it is told to reset
+
+# POST /api/batch/ (apps/core/batch.py): requests per batch and SQL statements per batch
+BATCH_MAX_REQUESTS = 20
+BATCH_MAX_QUERIES = 500
+
+# Archive tier for deactivated employees (python manage.py archive_inactive, see apps/archive/archiver.py):
+# employees per batch, and the pause between batches so the move never hogs the database
+ARCHIVE_BATCH_SIZE = 200
+ARCHIVE_PAUSE = 0.5  # seconds
+
+# Employee autocomplete (apps/employees/typeahead.py): each worker checks for changed employees at most
+# this often, re-reading rows updated up to AUTOCOMPLETE_SETTLE_SECONDS before the newest one it has seen
+AUTOCOMPLETE_REFRESH_SECONDS = 1.0
+AUTOCOMPLETE_SETTLE_SECONDS = 2
+AUTOCOMPLETE_MAX_SCAN = 2000  # index entries walked per store before a broad query gives up
+
+# Warm URL resolvers and serializers before serving (see apps/core/warmup.py)
+WARMUP_ON_STARTUP = config('WARMUP_ON_STARTUP', default=False, cast=bool)
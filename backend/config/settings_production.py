@@ -0,0 +1,40 @@
+"""
+Production profile: ``DJANGO_SETTINGS_MODULE=config.settings_production``.
+
+Starts from the development settings and trims startup work for workers
+that are spun up under load:
+- ``SimpleAdminConfig`` skips admin autodiscovery at startup; the admin and
+  docs URLconfs are imported on first use (see ``config.urls``)
+- only the JSON renderer, so API requests never load the browsable API's
+  templates and forms
+- persistent database connections from ``DATABASE_URL``
+- ``WARMUP_ON_STARTUP`` prepares URL resolvers and serializers before the
+  worker accepts traffic
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR, INSTALLED_APPS, REST_FRAMEWORK, config, dj_database_url
+
+DEBUG = False
+
+SECRET_KEY = config('SECRET_KEY')
+
+INSTALLED_APPS = [
+    'django.contrib.admin.apps.SimpleAdminConfig' if app == 'django.contrib.admin' else app for app in INSTALLED_APPS
+]
+
+DATABASES = {
+    'default': dj_database_url.config(
+        default=f'sqlite:///{BASE_DIR / "db.sqlite3"}',
+        conn_max_age=config('DB_CONN_MAX_AGE', default=600, cast=int),
+        conn_health_checks=True,
+    )
+}
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': [
+        'apps.core.renderers.FastJSONRenderer',
+    ],
+}
+
+WARMUP_ON_STARTUP = config('WARMUP_ON_STARTUP', default=True, cast=bool)
@@ -14,18 +14,23 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.contrib import admin
 from django.urls import path, include
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
+from apps.core.lazy_urls import lazy_include
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
+    # Admin and docs are imported on first use (see apps/core/lazy_urls.py)
+    lazy_include('admin/', 'config.urls_admin', namespace='admin'),
     
     # API endpoints
+    path('api/', include('apps.stores.urls')),
     path('api/', include('apps.employees.urls')),
+    path('api/', include('apps.audit.urls')),
+    path('api/', include('apps.jobs.urls')),
+    path('api/', include('apps.demand.urls')),
+    path('api/', include('apps.scheduling.urls')),
+    path('api/', include('apps.timeclock.urls')),
+    path('api/', include('apps.core.urls')),
     
-    # API Documentation
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
-    path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
-    path('api/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
+    # API Documentation: /api/schema/, /api/docs/, /api/redoc/
+    lazy_include('api/', 'config.urls_docs'),
 ]
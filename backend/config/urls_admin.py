@@ -0,0 +1,11 @@
+"""
+Django admin URLs, included lazily from ``config.urls``.
+
+The production profile uses ``SimpleAdminConfig``, which skips admin
+autodiscovery at startup; it happens here, on the first admin request.
+"""
+from django.contrib import admin
+
+admin.autodiscover()
+
+urlpatterns = admin.site.get_urls()
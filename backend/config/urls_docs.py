@@ -0,0 +1,12 @@
+"""
+API documentation URLs, included lazily from ``config.urls``.
+"""
+from django.urls import path
+from drf_spectacular.views import SpectacularSwaggerView, SpectacularRedocView
+from apps.core.views import CachedSpectacularAPIView
+
+urlpatterns = [
+    path('schema/', CachedSpectacularAPIView.as_view(), name='schema'),
+    path('docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
+    path('redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
+]